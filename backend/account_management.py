@@ -13,6 +13,7 @@ from flask import Blueprint, request, jsonify
 from werkzeug.security import generate_password_hash
 
 from .db import users_col
+from .mail_outbox import enqueue_code_email
 
 
 # =========================================================
@@ -311,9 +312,13 @@ def request_reset():
             user
         )
 
+    enqueue_code_email(
+        contact,
+        code,
+        "reset",
+    )
+
     # Keep this only for development.
-    # Replace with your SMS/email delivery system
-    # before production.
     return jsonify(
         success=True,
         debug_code=code,
@@ -661,6 +666,12 @@ def request_delete():
             user
         )
 
+    enqueue_code_email(
+        contact,
+        code,
+        "delete",
+    )
+
     return jsonify(
         success=True,
         debug_code=code,
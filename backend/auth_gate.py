@@ -18,6 +18,8 @@ from werkzeug.security import (
     generate_password_hash,
 )
 
+from backend.mail_outbox import enqueue_code_email
+
 
 # =========================================================
 # ENVIRONMENT
@@ -637,6 +639,14 @@ def request_code():
         user
     )
 
+    # Delivery happens on the mail outbox worker; the
+    # request only spools the message.
+    enqueue_code_email(
+        contact,
+        code,
+        "verify",
+    )
+
     return jsonify(
         success=True,
 
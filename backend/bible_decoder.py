@@ -4,6 +4,7 @@ import json
 import logging
 import os
 import re
+import threading
 from typing import Any, Dict, List, Optional
 
 
@@ -66,7 +67,35 @@ def load_symbols_data() -> Dict[str, Any]:
         }
 
 
-SYMBOLS_DATA = load_symbols_data()
+_SYMBOLS_DATA: Optional[Dict[str, Any]] = None
+_SYMBOLS_LOCK = threading.Lock()
+
+
+def get_symbols_data() -> Dict[str, Any]:
+    """
+    Parse symbols_data.json on first use instead of at
+    import time, so app startup does not pay for it.
+    """
+
+    global _SYMBOLS_DATA
+
+    if _SYMBOLS_DATA is None:
+        with _SYMBOLS_LOCK:
+            if _SYMBOLS_DATA is None:
+                _SYMBOLS_DATA = load_symbols_data()
+
+    return _SYMBOLS_DATA
+
+
+def __getattr__(name: str) -> Any:
+    # Backwards compatibility for `from backend.bible_decoder
+    # import SYMBOLS_DATA`.
+    if name == "SYMBOLS_DATA":
+        return get_symbols_data()
+
+    raise AttributeError(
+        f"module {__name__!r} has no attribute {name!r}"
+    )
 
 
 # =========================================================
@@ -95,11 +124,16 @@ class BibleDecoder:
         }
         """
 
-        source = (
-            symbols
-            if symbols is not None
-            else SYMBOLS_DATA
-        )
+        # The shared dataset is bound lazily on first access.
+        self._dataset: Optional[Dict[str, Any]] = None
+
+        if symbols is not None:
+            self._bind(symbols)
+
+    def _bind(
+        self,
+        source: Dict[str, Any],
+    ) -> None:
 
         if (
             isinstance(source, dict)
@@ -108,20 +142,45 @@ class BibleDecoder:
                 dict,
             )
         ):
-            self.source = source
-            self.schema_version = source.get(
-                "schema_version",
-                "unknown",
-            )
-            self.symbols = source["symbols"]
+            self._dataset = {
+                "source": source,
+                "schema_version": source.get(
+                    "schema_version",
+                    "unknown",
+                ),
+                "symbols": source["symbols"],
+            }
 
         else:
-            self.source = {
+            self._dataset = {
+                "source": {
+                    "schema_version": "unknown",
+                    "symbols": source or {},
+                },
                 "schema_version": "unknown",
                 "symbols": source or {},
             }
-            self.schema_version = "unknown"
-            self.symbols = source or {}
+
+    def _loaded(self) -> Dict[str, Any]:
+
+        if self._dataset is None:
+            self._bind(
+                get_symbols_data()
+            )
+
+        return self._dataset
+
+    @property
+    def source(self) -> Dict[str, Any]:
+        return self._loaded()["source"]
+
+    @property
+    def schema_version(self) -> str:
+        return self._loaded()["schema_version"]
+
+    @property
+    def symbols(self) -> Dict[str, Any]:
+        return self._loaded()["symbols"]
 
     # =====================================================
     # NORMALIZATION
@@ -19,6 +19,11 @@ LOCK_FILE = os.path.join(
     ".daily_runner.lock"
 )
 
+RECONCILIATION_LOCK_FILE = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)),
+    ".reconciliation.lock"
+)
+
 BASE_DIR = os.path.dirname(
     os.path.dirname(os.path.abspath(__file__))
 )
@@ -48,16 +53,16 @@ logger = logging.getLogger("daily_runner")
 # LOCKING
 # ======================================================
 
-def acquire_lock():
-    if os.path.exists(LOCK_FILE):
+def acquire_lock(path=LOCK_FILE):
+    if os.path.exists(path):
         return False
-    with open(LOCK_FILE, "w") as f:
+    with open(path, "w") as f:
         f.write(str(os.getpid()))
     return True
 
-def release_lock():
-    if os.path.exists(LOCK_FILE):
-        os.remove(LOCK_FILE)
+def release_lock(path=LOCK_FILE):
+    if os.path.exists(path):
+        os.remove(path)
 
 # ======================================================
 # PIPELINE
@@ -121,6 +126,58 @@ def run_pipeline():
 
     logger.info("✅ Daily pipeline finished")
 
+# ======================================================
+# JUMUIYA RECONCILIATION
+# ======================================================
+
+# (name, "module:function") pairs; each job rebuilds a
+# materialized rollup from its source collections or
+# prunes data derived from them.
+RECONCILIATION_JOBS = [
+    (
+        "biashara_business_stats",
+        "backend.jumuiya.biashara.stats:rebuild_all_business_stats",
+    ),
+    (
+        "wallet_balances",
+        "backend.jumuiya.wallet.balances:reconcile_balances",
+    ),
+    (
+        "community_post_counters",
+        "backend.jumuiya.community.services:reconcile_post_counters",
+    ),
+    (
+        "community_hot_scores",
+        "backend.jumuiya.community.services:recompute_hot_scores",
+    ),
+    (
+        "shamba_farm_stats",
+        "backend.jumuiya.shamba.stats:rebuild_all_farm_stats",
+    ),
+    (
+        "elimu_counters",
+        "backend.jumuiya.elimu.stats:rebuild_counters",
+    ),
+    (
+        "study_upload_gc",
+        "backend.study.upload_gc:collect_upload_garbage",
+    ),
+]
+
+def run_reconciliation_jobs():
+    import importlib
+
+    for name, target in RECONCILIATION_JOBS:
+        module_name, function_name = target.split(":")
+
+        try:
+            module = importlib.import_module(module_name)
+            result = getattr(module, function_name)()
+            logger.info(f"🧮 Reconciled {name}: {result}")
+
+        except Exception as e:
+            logger.error(f"❌ Reconciliation {name} failed: {e}")
+
 # ======================================================
 # SCHEDULER LOOP
 # ======================================================
@@ -148,9 +205,38 @@ def scheduler_loop():
 
         time.sleep(CHECK_INTERVAL)
 
+def reconciliation_loop():
+    """
+    Run the reconciliation jobs once a day at RUN_HOUR (never
+    at startup: they rebuild every rollup and would compete
+    with requests after each deploy).
+    """
+    logger.info("⏰ Reconciliation scheduler started")
+
+    last_run_date = None
+
+    while True:
+        now = datetime.now()
+
+        if (
+            now.hour == RUN_HOUR
+            and last_run_date != now.date()
+        ):
+            if not acquire_lock(RECONCILIATION_LOCK_FILE):
+                logger.warning("🔒 Reconciliation already running in another worker")
+            else:
+                try:
+                    run_reconciliation_jobs()
+                    last_run_date = now.date()
+                finally:
+                    release_lock(RECONCILIATION_LOCK_FILE)
+
+        time.sleep(CHECK_INTERVAL)
+
 # ======================================================
 # MANUAL RUN SUPPORT
 # ======================================================
 
 if __name__ == "__main__":
     run_pipeline()
+    run_reconciliation_jobs()
@@ -1,9 +1,13 @@
 # backend/db.py
 import os
 import logging
-from pymongo import MongoClient, errors
+import threading
+from collections import Counter
+from pymongo import MongoClient, ReadPreference, errors, monitoring
 from dotenv import load_dotenv
 
+from backend.services.request_profiler import mongo_event_listeners
+
 load_dotenv()
 
 # ---------------------------- LOGGING ----------------------------
@@ -17,14 +21,139 @@ DB_NAME = os.getenv("MONGO_DB_NAME", "revelacode")
 if not MONGO_URI:
     raise RuntimeError("MONGO_URI is not set in environment variables")
 
-# ---------------------------- MONGO CONNECTION ----------------------------
-try:
-    client = MongoClient(
-        MONGO_URI,
+# Pool sizing defaults suit a small Atlas tier with one web worker.
+MONGO_MAX_POOL_SIZE = int(os.getenv("MONGO_MAX_POOL_SIZE", "20"))
+MONGO_MIN_POOL_SIZE = int(os.getenv("MONGO_MIN_POOL_SIZE", "0"))
+MONGO_MAX_IDLE_TIME_MS = int(os.getenv("MONGO_MAX_IDLE_TIME_MS", "60000"))
+MONGO_COMPRESSORS = os.getenv("MONGO_COMPRESSORS", "zstd,snappy,zlib")
+MONGO_READ_ONLY_PREFERENCE = os.getenv(
+    "MONGO_READ_ONLY_PREFERENCE", "secondaryPreferred"
+)
+
+READ_PREFERENCES = {
+    "primary": ReadPreference.PRIMARY,
+    "primaryPreferred": ReadPreference.PRIMARY_PREFERRED,
+    "secondary": ReadPreference.SECONDARY,
+    "secondaryPreferred": ReadPreference.SECONDARY_PREFERRED,
+    "nearest": ReadPreference.NEAREST,
+}
+
+
+# ---------------------------- POOL STATS ----------------------------
+class PoolStatsListener(monitoring.ConnectionPoolListener):
+    """Tracks connection pool activity for the health endpoint"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counters = Counter()
+
+    def _inc(self, name, amount=1):
+        with self._lock:
+            self.counters[name] += amount
+
+    def pool_created(self, event):
+        self._inc("pools_created")
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        self._inc("pools_cleared")
+
+    def pool_closed(self, event):
+        self._inc("pools_closed")
+
+    def connection_created(self, event):
+        self._inc("open")
+        self._inc("created")
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        self._inc("open", -1)
+        self._inc("closed")
+
+    def connection_check_out_started(self, event):
+        pass
+
+    def connection_check_out_failed(self, event):
+        self._inc("checkout_failed")
+
+    def connection_checked_out(self, event):
+        self._inc("in_use")
+        self._inc("checkouts")
+
+    def connection_checked_in(self, event):
+        self._inc("in_use", -1)
+
+    def snapshot(self):
+        with self._lock:
+            return dict(self.counters)
+
+
+pool_listener = PoolStatsListener()
+
+
+# ---------------------------- CLIENT FACTORY ----------------------------
+def available_compressors(requested=MONGO_COMPRESSORS):
+    """Keep only the wire compressors whose libraries are installed"""
+    modules = {"zstd": "zstandard", "snappy": "snappy", "zlib": "zlib"}
+    available = []
+
+    for name in [c.strip() for c in requested.split(",") if c.strip()]:
+        module = modules.get(name)
+        if not module:
+            continue
+        try:
+            __import__(module)
+        except ImportError:
+            continue
+        available.append(name)
+
+    return available
+
+
+def client_options():
+    """Options shared by every MongoClient in the process"""
+    options = dict(
         serverSelectionTimeoutMS=10000,
         connectTimeoutMS=10000,
         socketTimeoutMS=10000,
+        maxPoolSize=MONGO_MAX_POOL_SIZE,
+        minPoolSize=MONGO_MIN_POOL_SIZE,
+        maxIdleTimeMS=MONGO_MAX_IDLE_TIME_MS,
+        retryReads=True,
+        retryWrites=True,
+        appname="revelacode-backend",
+        event_listeners=[pool_listener] + mongo_event_listeners(),
     )
+
+    compressors = available_compressors()
+    if compressors:
+        options["compressors"] = ",".join(compressors)
+
+    return options
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client():
+    """Return the single shared MongoClient, creating it on first use"""
+    global _client
+
+    with _client_lock:
+        if _client is None:
+            _client = MongoClient(MONGO_URI, **client_options())
+
+    return _client
+
+
+# ---------------------------- MONGO CONNECTION ----------------------------
+try:
+    client = get_client()
     # Force immediate connection
     client.admin.command("ping")
 
@@ -38,22 +167,83 @@ except errors.PyMongoError as e:
 
 # ---------------------------- COLLECTIONS ----------------------------
 # Ensure all collections exist
-def get_or_create_collection(name):
-    if name in db.list_collection_names():
+CORE_COLLECTIONS = [
+    "users",
+    "scriptures",
+    "admin_actions",
+    "support_tickets",
+    "legaldocs",
+    "notifications",
+    "domains",  # for domain-specific data
+]
+
+
+def get_or_create_collection(name, existing=None):
+    if existing is None:
+        existing = set(db.list_collection_names())
+
+    if name in existing:
         return db[name]
     else:
         logger.info(f"⚡ Creating collection '{name}'")
-        return db.create_collection(name)
+        try:
+            return db.create_collection(name)
+        except errors.CollectionInvalid:
+            # Created concurrently by another worker.
+            return db[name]
+
+
+def ensure_collections(names):
+    """Create any missing collections using a single list_collection_names call"""
+    existing = set(db.list_collection_names())
+
+    return {
+        name: get_or_create_collection(name, existing)
+        for name in names
+    }
 
-users_col = get_or_create_collection("users")
-scriptures_col = get_or_create_collection("scriptures")
-admin_actions_col = get_or_create_collection("admin_actions")
-support_tickets_col = get_or_create_collection("support_tickets")
-legal_docs_col = get_or_create_collection("legaldocs")
-notifications_col = get_or_create_collection("notifications")
-domains_col = get_or_create_collection("domains")  # for domain-specific data
+
+_core = ensure_collections(CORE_COLLECTIONS)
+
+users_col = _core["users"]
+scriptures_col = _core["scriptures"]
+admin_actions_col = _core["admin_actions"]
+support_tickets_col = _core["support_tickets"]
+legal_docs_col = _core["legaldocs"]
+notifications_col = _core["notifications"]
+domains_col = _core["domains"]
 
 # ---------------------------- HELPERS ----------------------------
 def get_db():
     """Return active MongoDB database instance"""
     return db
+
+
+_read_db = db.with_options(
+    read_preference=READ_PREFERENCES.get(
+        MONGO_READ_ONLY_PREFERENCE, ReadPreference.SECONDARY_PREFERRED
+    )
+)
+
+
+def get_read_db():
+    """
+    Database handle for read-only endpoints (events, feed, study
+    materials). Reads may be served by secondaries, so results can lag
+    the primary slightly.
+    """
+    return _read_db
+
+
+def pool_stats():
+    """Connection pool configuration and live counters for /health"""
+    pool_options = client.options.pool_options
+
+    return {
+        "max_pool_size": pool_options.max_pool_size,
+        "min_pool_size": pool_options.min_pool_size,
+        "max_idle_time_seconds": pool_options.max_idle_time_seconds,
+        "compressors": available_compressors(),
+        "read_only_preference": MONGO_READ_ONLY_PREFERENCE,
+        **pool_listener.snapshot(),
+    }
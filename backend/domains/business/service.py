@@ -1,14 +1,14 @@
 # backend/domains/business/service.py
 
-from services.ai_router import ask_ai
-from services.domain_registry import register_domain
+from backend.services.ai_router import ask_ai
+from backend.services.domain_registry import register_domain
 
-def business_handler(query, user_context=None):
+def business_prompt(query):
     """
     Business, markets, innovation, and strategy intelligence.
     """
 
-    prompt = f"""
+    return f"""
     You are a business strategist and market analyst.
     Analyze the topic with a forward-thinking, practical mindset.
 
@@ -26,10 +26,11 @@ def business_handler(query, user_context=None):
     {query}
     """
 
+def business_handler(query, user_context=None):
     return ask_ai(
-        prompt=prompt,
+        prompt=business_prompt(query),
         domain="business",
         context=user_context
     )
 
-register_domain("business", business_handler)
+register_domain("business", business_handler, prompt=business_prompt)
@@ -1,15 +1,15 @@
 # backend/domains/culture/service.py
 
-from services.ai_router import ask_ai
-from services.domain_registry import register_domain
+from backend.services.ai_router import ask_ai
+from backend.services.domain_registry import register_domain
 
-def culture_handler(query, user_context=None):
+def culture_prompt(query):
     """
     Cultural & societal intelligence.
     Explains human behavior, trends, history, symbols, and movements.
     """
 
-    prompt = f"""
+    return f"""
     You are a cultural analyst and social historian.
     Analyze the topic below in a neutral, academic, and accessible way.
 
@@ -26,10 +26,11 @@ def culture_handler(query, user_context=None):
     {query}
     """
 
+def culture_handler(query, user_context=None):
     return ask_ai(
-        prompt=prompt,
+        prompt=culture_prompt(query),
         domain="culture",
         context=user_context
     )
 
-register_domain("culture", culture_handler)
+register_domain("culture", culture_handler, prompt=culture_prompt)
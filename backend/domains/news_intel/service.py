@@ -1,14 +1,15 @@
-from services.ai_router import ask_ai
-from services.domain_registry import register_domain
+from backend.services.ai_router import ask_ai
+from backend.services.domain_registry import register_domain
 
-def news_handler(query, user_context=None):
-    prompt = f"""
+def news_prompt(query):
+    return f"""
     Decode current events, trends, and implications.
     Be neutral, factual, and forward-looking.
 
     Topic: {query}
     """
 
-    return ask_ai(prompt, domain="news")
+def news_handler(query, user_context=None):
+    return ask_ai(news_prompt(query), domain="news", context=user_context)
 
-register_domain("news_intel", news_handler)
+register_domain("news_intel", news_handler, prompt=news_prompt, ai_domain="news")
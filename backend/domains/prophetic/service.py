@@ -1,15 +1,15 @@
 # backend/domains/prophetic/service.py
 
-from services.ai_router import ask_ai
-from services.domain_registry import register_domain
+from backend.services.ai_router import ask_ai
+from backend.services.domain_registry import register_domain
 
-def prophetic_handler(query, user_context=None):
+def prophetic_prompt(query):
     """
     Prophetic and symbolic interpretation.
     Multi-faith aware, not Christian-only.
     """
 
-    prompt = f"""
+    return f"""
     You are a symbolic and prophetic analyst.
     Interpret the input using:
     - Symbolism
@@ -26,10 +26,11 @@ def prophetic_handler(query, user_context=None):
     {query}
     """
 
+def prophetic_handler(query, user_context=None):
     return ask_ai(
-        prompt=prompt,
+        prompt=prophetic_prompt(query),
         domain="prophetic",
         context=user_context
     )
 
-register_domain("prophetic", prophetic_handler)
+register_domain("prophetic", prophetic_handler, prompt=prophetic_prompt)
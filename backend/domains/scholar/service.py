@@ -1,8 +1,8 @@
-from services.ai_router import ask_ai
-from services.domain_registry import register_domain
+from backend.services.ai_router import ask_ai
+from backend.services.domain_registry import register_domain
 
-def scholar_handler(query, user_context=None):
-    prompt = f"""
+def scholar_prompt(query):
+    return f"""
     You are an academic research assistant.
     Analyze the following content objectively, cite reasoning,
     avoid religious framing unless requested.
@@ -10,6 +10,7 @@ def scholar_handler(query, user_context=None):
     Query: {query}
     """
 
-    return ask_ai(prompt, domain="scholar", context=user_context)
+def scholar_handler(query, user_context=None):
+    return ask_ai(scholar_prompt(query), domain="scholar", context=user_context)
 
-register_domain("scholar", scholar_handler)
+register_domain("scholar", scholar_handler, prompt=scholar_prompt)
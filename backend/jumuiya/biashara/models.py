@@ -84,6 +84,10 @@ def product_document(business_id, payload):
             payload.get("stock_quantity", 0)
         ),
 
+        # Bumped on every stock change; `set` adjustments
+        # compare-and-set against it.
+        "stock_version": 0,
+
         "unit": payload.get(
             "unit",
             "piece",
@@ -8,9 +8,11 @@ from backend.jumuiya.core.permissions import (
 from backend.jumuiya.core.responses import (
     ok,
     created,
+    paged,
 )
 
 from backend.jumuiya.core.errors import APIError
+from backend.jumuiya.core.pagination import page_args
 
 from backend.jumuiya.biashara import (
     schemas,
@@ -133,11 +135,15 @@ def save_business():
 @require_authenticated
 def get_products():
 
-    return ok(
+    cursor, limit = page_args(services.LIST_PAGE_SIZE)
+
+    return paged(
         services.list_products(
             user_id(),
             request.args.get("status"),
             request.args.get("category"),
+            cursor=cursor,
+            limit=limit,
         )
     )
 
@@ -243,6 +249,26 @@ def adjust_inventory(product_id):
     )
 
 
+@biashara_bp.post(
+    "/inventory/adjust"
+)
+@require_authenticated
+def bulk_adjust_inventory():
+
+    payload = validate(
+        schemas.bulk_inventory_payload,
+        body(),
+    )
+
+    return ok(
+        services.bulk_inventory_adjustment(
+            user_id(),
+            payload,
+        ),
+        "Inventory updated.",
+    )
+
+
 # =========================================================
 # CUSTOMERS
 # =========================================================
@@ -251,10 +277,14 @@ def adjust_inventory(product_id):
 @require_authenticated
 def get_customers():
 
-    return ok(
+    cursor, limit = page_args(services.LIST_PAGE_SIZE)
+
+    return paged(
         services.list_customers(
             user_id(),
             request.args.get("search"),
+            cursor=cursor,
+            limit=limit,
         )
     )
 
@@ -285,10 +315,14 @@ def add_customer():
 @require_authenticated
 def get_orders():
 
-    return ok(
+    cursor, limit = page_args(services.LIST_PAGE_SIZE)
+
+    return paged(
         services.list_orders(
             user_id(),
             request.args.get("status"),
+            cursor=cursor,
+            limit=limit,
         )
     )
 
@@ -388,9 +422,13 @@ def record_sale():
 @require_authenticated
 def get_expenses():
 
-    return ok(
+    cursor, limit = page_args(services.LIST_PAGE_SIZE)
+
+    return paged(
         services.list_expenses(
-            user_id()
+            user_id(),
+            cursor=cursor,
+            limit=limit,
         )
     )
 
@@ -425,4 +463,37 @@ def get_dashboard():
         services.dashboard(
             user_id()
         )
-    )
\ No newline at end of file
+    )
+
+
+@biashara_bp.get("/dashboard/series")
+@require_authenticated
+def get_dashboard_series():
+
+    return ok(
+        services.dashboard_series(
+            user_id(),
+            request.args.get(
+                "period",
+                "day",
+            ),
+            request.args.get("from"),
+            request.args.get("to"),
+            request.args.get(
+                "limit",
+                90,
+            ),
+        )
+    )
+
+
+@biashara_bp.post("/dashboard/rebuild")
+@require_authenticated
+def rebuild_dashboard():
+
+    return ok(
+        services.rebuild_dashboard(
+            user_id()
+        ),
+        "Dashboard statistics rebuilt.",
+    )
@@ -574,4 +574,97 @@ def inventory_payload(data):
             "reason",
             max_len=300,
         ),
-    }
\ No newline at end of file
+
+        "expected_version": _version(
+            data,
+            "expected_version",
+        ),
+    }
+
+
+def _version(
+    data,
+    key,
+):
+    value = data.get(key)
+
+    if value is None:
+        return None
+
+    if (
+        isinstance(value, bool)
+        or not isinstance(value, int)
+        or value < 0
+    ):
+        raise ValueError(
+            f"{key} must be a non-negative whole number."
+        )
+
+    return value
+
+
+def bulk_inventory_payload(data):
+
+    _object(data)
+
+    adjustments = data.get(
+        "adjustments"
+    )
+
+    if not isinstance(
+        adjustments,
+        list,
+    ) or not adjustments:
+        raise ValueError(
+            "adjustments must be a non-empty list."
+        )
+
+    if len(adjustments) > 500:
+        raise ValueError(
+            "A bulk adjustment cannot contain more than 500 products."
+        )
+
+    cleaned = []
+
+    for index, item in enumerate(adjustments):
+
+        if not isinstance(
+            item,
+            dict,
+        ):
+            raise ValueError(
+                f"Adjustment {index + 1} must be an object."
+            )
+
+        product_id = item.get(
+            "product_id"
+        )
+
+        if not product_id:
+            raise ValueError(
+                f"Adjustment {index + 1} requires product_id."
+            )
+
+        try:
+
+            adjustment = inventory_payload(
+                item
+            )
+
+        except ValueError as exc:
+
+            raise ValueError(
+                f"Adjustment {index + 1}: {exc}"
+            )
+
+        adjustment["product_id"] = str(
+            product_id
+        )
+
+        cleaned.append(
+            adjustment
+        )
+
+    return {
+        "adjustments": cleaned,
+    }
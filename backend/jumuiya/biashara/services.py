@@ -5,11 +5,20 @@ from datetime import datetime, timezone
 
 from bson import ObjectId
 from bson.errors import InvalidId
-from pymongo import ReturnDocument
+from pymongo import ReturnDocument, UpdateOne
 
-from backend.jumuiya.core.database import collection
+from backend.jumuiya.core.database import (
+    collection,
+    run_in_transaction,
+)
 from backend.jumuiya.core.errors import APIError
 from backend.jumuiya.core.audit import log_action
+from backend.jumuiya.core.pagination import (
+    cursor_meta,
+    paginate_keyset,
+)
+
+from backend.jumuiya.biashara import stats
 
 from backend.jumuiya.biashara.models import (
     business_document,
@@ -22,6 +31,10 @@ from backend.jumuiya.biashara.models import (
 )
 
 
+# Default page size for list endpoints (keyset-paginated).
+LIST_PAGE_SIZE = 50
+
+
 # =========================================================
 # HELPERS
 # =========================================================
@@ -55,6 +68,12 @@ def serialise(doc):
 
     out = dict(doc)
 
+    # Checkout bookkeeping left on products by older releases.
+    out.pop(
+        "stock_holds",
+        None,
+    )
+
     if "_id" in out:
         out["id"] = str(out.pop("_id"))
 
@@ -292,6 +311,12 @@ def create_product(
 
     document["_id"] = result.inserted_id
 
+    stats.record_product_change(
+        business["id"],
+        None,
+        document,
+    )
+
     log_action(
         user_id,
         "product.created",
@@ -308,6 +333,8 @@ def list_products(
     user_id,
     status=None,
     category=None,
+    cursor=None,
+    limit=LIST_PAGE_SIZE,
 ):
 
     business = _require_business(
@@ -324,19 +351,25 @@ def list_products(
     if category:
         query["category"] = category
 
-    documents = (
+    documents, next_cursor = paginate_keyset(
         collection(
             "jumuiya_products"
-        )
-        .find(query)
-        .sort(
-            "created_at",
-            -1,
-        )
+        ),
+        query,
+        "created_at",
+        cursor=cursor,
+        limit=limit,
     )
 
-    return serialise_many(
-        documents
+    return (
+        serialise_many(
+            documents
+        ),
+        cursor_meta(
+            limit,
+            next_cursor,
+            cursor,
+        ),
     )
 
 
@@ -381,23 +414,33 @@ def update_product(
         "jumuiya_products"
     )
 
-    document = products.find_one_and_update(
+    changes = {
+        **update,
+        "updated_at": now_utc(),
+    }
+
+    operation = {
+        "$set": changes
+    }
+
+    if "stock_quantity" in changes:
+
+        operation["$inc"] = {
+            "stock_version": 1,
+        }
+
+    previous = products.find_one_and_update(
         {
             "_id": clean_id(
                 product_id
             ),
             "business_id": business["id"],
         },
-        {
-            "$set": {
-                **update,
-                "updated_at": now_utc(),
-            }
-        },
-        return_document=ReturnDocument.AFTER,
+        operation,
+        return_document=ReturnDocument.BEFORE,
     )
 
-    if not document:
+    if not previous:
 
         raise APIError(
             "Product not found.",
@@ -405,6 +448,26 @@ def update_product(
             "product_not_found",
         )
 
+    document = {
+        **previous,
+        **changes,
+    }
+
+    if "$inc" in operation:
+
+        document["stock_version"] = int(
+            previous.get(
+                "stock_version",
+                0,
+            )
+        ) + 1
+
+    stats.record_product_change(
+        business["id"],
+        previous,
+        document,
+    )
+
     log_action(
         user_id,
         "product.updated",
@@ -430,7 +493,12 @@ def delete_product(
         "jumuiya_products"
     )
 
-    document = products.find_one_and_update(
+    changes = {
+        "status": "deleted",
+        "updated_at": now_utc(),
+    }
+
+    previous = products.find_one_and_update(
         {
             "_id": clean_id(
                 product_id
@@ -438,15 +506,12 @@ def delete_product(
             "business_id": business["id"],
         },
         {
-            "$set": {
-                "status": "deleted",
-                "updated_at": now_utc(),
-            }
+            "$set": changes
         },
-        return_document=ReturnDocument.AFTER,
+        return_document=ReturnDocument.BEFORE,
     )
 
-    if not document:
+    if not previous:
 
         raise APIError(
             "Product not found.",
@@ -454,6 +519,17 @@ def delete_product(
             "product_not_found",
         )
 
+    document = {
+        **previous,
+        **changes,
+    }
+
+    stats.record_product_change(
+        business["id"],
+        previous,
+        document,
+    )
+
     log_action(
         user_id,
         "product.deleted",
@@ -521,50 +597,192 @@ def low_stock(
     )
 
 
-def inventory_adjustment(
-    user_id,
+STOCK_SET_ATTEMPTS = 3
+
+
+def _version_filter(version):
+    """
+    Products created before stock versioning have no
+    `stock_version`; they count as version 0.
+    """
+
+    if not version:
+
+        return {
+            "$in": [
+                0,
+                None,
+            ]
+        }
+
+    return version
+
+
+def _adjust_stock(
+    business_id,
     product_id,
-    payload,
+    adjustment,
+    session=None,
 ):
-
-    business = _require_business(
-        user_id
-    )
+    """
+    Apply one inventory movement atomically on the server.
+
+    add/remove use a single conditional `$inc` (remove only
+    matches while enough stock is left). set is a
+    compare-and-set on `stock_version`: against
+    `expected_version` when the caller sends one, otherwise
+    against the version just read, retried a few times if
+    another till gets in first.
+
+    Returns (previous, updated, movement); the movement
+    document is built from the pre-image, so its
+    previous/new quantities are exact. The caller inserts it.
+    """
 
     products = collection(
         "jumuiya_products"
     )
 
-    product = products.find_one({
+    product_filter = {
         "_id": clean_id(
             product_id
         ),
-        "business_id": business["id"],
-    })
+        "business_id": business_id,
+    }
+
+    movement_type = adjustment[
+        "movement_type"
+    ]
+
+    quantity = float(
+        adjustment["quantity"]
+    )
+
+    expected_version = adjustment.get(
+        "expected_version"
+    )
+
+    attempts = (
+        STOCK_SET_ATTEMPTS
+        if movement_type == "set"
+        and expected_version is None
+        else 1
+    )
+
+    previous = None
+
+    for _ in range(attempts):
+
+        query = dict(
+            product_filter
+        )
+
+        update = {
+            "$inc": {
+                "stock_version": 1,
+            },
+            "$set": {
+                "updated_at": now_utc(),
+            },
+        }
+
+        if movement_type == "add":
+
+            update["$inc"]["stock_quantity"] = quantity
+
+        elif movement_type == "remove":
+
+            query["stock_quantity"] = {
+                "$gte": quantity,
+            }
+
+            update["$inc"]["stock_quantity"] = -quantity
+
+        elif movement_type == "set":
+
+            version = expected_version
+
+            if version is None:
+
+                current = products.find_one(
+                    product_filter,
+                    {
+                        "stock_version": 1,
+                    },
+                    session=session,
+                )
+
+                if not current:
+                    break
+
+                version = current.get(
+                    "stock_version",
+                    0,
+                )
+
+            query["stock_version"] = _version_filter(
+                version
+            )
+
+            update["$set"]["stock_quantity"] = quantity
+
+        else:
+
+            raise APIError(
+                "Invalid inventory movement.",
+                422,
+                "invalid_movement",
+            )
+
+        previous = products.find_one_and_update(
+            query,
+            update,
+            return_document=ReturnDocument.BEFORE,
+            session=session,
+        )
+
+        if previous:
+            break
+
+    if not previous:
+
+        exists = products.find_one(
+            product_filter,
+            {
+                "_id": 1,
+            },
+            session=session,
+        )
+
+        if not exists:
+
+            raise APIError(
+                "Product not found.",
+                404,
+                "product_not_found",
+            )
 
-    if not product:
+        if movement_type == "remove":
+
+            raise APIError(
+                "Insufficient stock.",
+                409,
+                "insufficient_stock",
+            )
 
         raise APIError(
-            "Product not found.",
-            404,
-            "product_not_found",
+            "Stock changed since it was read. Refresh and try again.",
+            409,
+            "stock_conflict",
         )
 
     previous_quantity = float(
-        product.get(
+        previous.get(
             "stock_quantity",
             0,
         )
     )
 
-    movement_type = payload[
-        "movement_type"
-    ]
-
-    quantity = float(
-        payload["quantity"]
-    )
-
     if movement_type == "add":
 
         new_quantity = (
@@ -579,63 +797,88 @@ def inventory_adjustment(
             - quantity
         )
 
-        if new_quantity < 0:
+    else:
 
-            raise APIError(
-                "Insufficient stock.",
-                409,
-                "insufficient_stock",
+        new_quantity = quantity
+
+    updated = {
+        **previous,
+        "stock_quantity": new_quantity,
+        "stock_version": int(
+            previous.get(
+                "stock_version",
+                0,
             )
+        ) + 1,
+        "updated_at": update["$set"]["updated_at"],
+    }
 
-    elif movement_type == "set":
+    movement = inventory_movement_document(
+        business_id,
+        previous["_id"],
+        adjustment,
+        previous_quantity,
+        new_quantity,
+    )
 
-        new_quantity = quantity
+    return (
+        previous,
+        updated,
+        movement,
+    )
 
-    else:
 
-        raise APIError(
-            "Invalid inventory movement.",
-            422,
-            "invalid_movement",
-        )
+def inventory_adjustment(
+    user_id,
+    product_id,
+    payload,
+):
 
-    updated = products.find_one_and_update(
-        {
-            "_id": product["_id"],
-            "business_id": business["id"],
-        },
-        {
-            "$set": {
-                "stock_quantity": new_quantity,
-                "updated_at": now_utc(),
-            }
-        },
-        return_document=ReturnDocument.AFTER,
+    business = _require_business(
+        user_id
     )
 
-    movement = inventory_movement_document(
-        business["id"],
-        product["_id"],
-        payload,
-        previous_quantity,
-        new_quantity,
-    )
+    def _adjust(session):
 
-    movement_result = collection(
-        "jumuiya_inventory_movements"
-    ).insert_one(
-        movement
+        previous, updated, movement = _adjust_stock(
+            business["id"],
+            product_id,
+            payload,
+            session=session,
+        )
+
+        movement_result = collection(
+            "jumuiya_inventory_movements"
+        ).insert_one(
+            movement,
+            session=session,
+        )
+
+        movement["_id"] = (
+            movement_result.inserted_id
+        )
+
+        return (
+            previous,
+            updated,
+            movement,
+        )
+
+    previous, updated, movement = run_in_transaction(
+        _adjust
     )
 
-    movement["_id"] = (
-        movement_result.inserted_id
+    stats.record_product_change(
+        business["id"],
+        previous,
+        updated,
     )
 
     log_action(
         user_id,
         "inventory.adjusted",
         "product",
-        product["_id"],
+        updated["_id"],
     )
 
     return {
@@ -648,71 +891,550 @@ def inventory_adjustment(
     }
 
 
-# =========================================================
-# CUSTOMERS
-# =========================================================
-
-def create_customer(
+def bulk_inventory_adjustment(
     user_id,
     payload,
 ):
+    """
+    Apply many adjustments in one call (stock-takes).
+
+    Each line is atomic on its own and reports its own
+    outcome; a conflicting or short line is returned as
+    failed without blocking the rest. Movements are written
+    with one insert_many, inside the same transaction as the
+    stock changes when the deployment supports it.
+    """
 
     business = _require_business(
         user_id
     )
 
-    document = customer_document(
-        business["id"],
-        payload,
-    )
+    def _adjust(session):
 
-    result = collection(
-        "jumuiya_customers"
-    ).insert_one(document)
+        applied = []
 
-    document["_id"] = (
-        result.inserted_id
-    )
+        results = []
 
-    log_action(
-        user_id,
-        "customer.created",
-        "customer",
-        result.inserted_id,
-    )
+        for adjustment in payload["adjustments"]:
 
-    return serialise(
-        document
-    )
+            try:
 
+                previous, updated, movement = _adjust_stock(
+                    business["id"],
+                    adjustment["product_id"],
+                    adjustment,
+                    session=session,
+                )
 
-def list_customers(
-    user_id,
-    search=None,
-):
+            except APIError as exc:
 
-    business = _require_business(
-        user_id
-    )
+                results.append({
+                    "product_id": adjustment[
+                        "product_id"
+                    ],
+                    "status": "failed",
+                    "code": exc.code,
+                    "message": exc.message,
+                })
 
-    query = {
-        "business_id": business["id"]
-    }
+                continue
 
-    if search:
+            applied.append((
+                previous,
+                updated,
+                movement,
+            ))
 
-        search = search.strip()
+            results.append({
+                "product_id": str(
+                    updated["_id"]
+                ),
+                "status": "applied",
+                "product": updated,
+                "movement": movement,
+            })
 
-        if search:
+        movements = [
+            movement
+            for _, _, movement in applied
+        ]
 
-            query["$or"] = [
-                {
-                    "name": {
-                        "$regex": re.escape(
-                            search
-                        ),
-                        "$options": "i",
-                    }
+        if movements:
+
+            collection(
+                "jumuiya_inventory_movements"
+            ).insert_many(
+                movements,
+                ordered=False,
+                session=session,
+            )
+
+        return (
+            applied,
+            results,
+        )
+
+    applied, results = run_in_transaction(
+        _adjust
+    )
+
+    for previous, updated, _ in applied:
+
+        stats.record_product_change(
+            business["id"],
+            previous,
+            updated,
+        )
+
+    if applied:
+
+        log_action(
+            user_id,
+            "inventory.bulk_adjusted",
+            "business",
+            business["id"],
+            {
+                "applied": len(applied),
+                "failed": len(results) - len(applied),
+            },
+        )
+
+    return {
+        "applied": len(applied),
+        "failed": len(results) - len(applied),
+        "results": [
+            {
+                **result,
+                **(
+                    {
+                        "product": serialise(
+                            result["product"]
+                        ),
+                        "movement": serialise(
+                            result["movement"]
+                        ),
+                    }
+                    if result["status"] == "applied"
+                    else {}
+                ),
+            }
+            for result in results
+        ],
+    }
+
+
+# =========================================================
+# LINE ITEMS / STOCK
+# =========================================================
+
+def _validate_customer(
+    business_id,
+    customer_id,
+):
+    """
+    Ensure an optional customer belongs to the business.
+    """
+
+    if not customer_id:
+        return
+
+    customer = collection(
+        "jumuiya_customers"
+    ).find_one(
+        {
+            "_id": clean_id(
+                customer_id
+            ),
+            "business_id": business_id,
+        },
+        {
+            "_id": 1,
+        },
+    )
+
+    if not customer:
+
+        raise APIError(
+            "Customer does not belong to this business.",
+            422,
+            "invalid_customer",
+        )
+
+
+def _line_quantities(items):
+    """
+    Combine line items into {product_id: total_quantity},
+    so a product listed twice is checked and decremented
+    once.
+    """
+
+    quantities = {}
+
+    for item in items:
+
+        product_id = str(
+            clean_id(
+                item["product_id"]
+            )
+        )
+
+        quantities[product_id] = (
+            quantities.get(
+                product_id,
+                0.0,
+            )
+            + float(
+                item.get(
+                    "quantity",
+                    0,
+                )
+            )
+        )
+
+    return quantities
+
+
+def _load_products(
+    business_id,
+    product_ids,
+    extra_query=None,
+    session=None,
+):
+    """
+    Fetch every referenced product with a single `$in`
+    query. Returns {product_id: document}.
+    """
+
+    product_ids = list(
+        product_ids
+    )
+
+    if not product_ids:
+        return {}
+
+    query = {
+        "_id": {
+            "$in": [
+                clean_id(product_id)
+                for product_id in product_ids
+            ]
+        },
+        "business_id": business_id,
+        **(extra_query or {}),
+    }
+
+    return {
+        str(document["_id"]): document
+        for document in collection(
+            "jumuiya_products"
+        ).find(
+            query,
+            session=session,
+        )
+    }
+
+
+def _decrement_stock(
+    business_id,
+    quantities,
+    products,
+    session=None,
+):
+    """
+    Deduct stock for every line, guarded by
+    `stock_quantity >= quantity` so concurrent checkouts
+    cannot oversell.
+
+    Returns {product_id: pre-image} for the movement log and
+    the low-stock rollup.
+
+    Inside a transaction this is one bulk_write: `products`
+    (read in the same session) are the pre-images, since a
+    concurrent write to them aborts the transaction, and a
+    shortfall aborts everything.
+
+    Without one it is still one unordered bulk_write, but
+    each update is also a compare-and-set on the
+    `stock_version` read into `products`, so a matched update
+    means that read is the exact pre-image. Updates carry a
+    per-call hold marker; on a shortfall the ones that did
+    apply are found through it and reverted, the products are
+    re-read with one `$in`, and the write is retried (as the
+    set path of _adjust_stock does) unless stock really ran
+    out.
+    """
+
+    if not quantities:
+        return {}
+
+    collection_ = collection(
+        "jumuiya_products"
+    )
+
+    timestamp = now_utc()
+
+    def _query(product_id, quantity):
+
+        return {
+            "_id": clean_id(product_id),
+            "business_id": business_id,
+            "status": "active",
+            "stock_quantity": {
+                "$gte": quantity,
+            },
+        }
+
+    def _update(quantity):
+
+        return {
+            "$inc": {
+                "stock_quantity": -quantity,
+                "stock_version": 1,
+            },
+            "$set": {
+                "updated_at": timestamp,
+            },
+        }
+
+    if session is not None:
+
+        result = collection_.bulk_write(
+            [
+                UpdateOne(
+                    _query(product_id, quantity),
+                    _update(quantity),
+                )
+                for product_id, quantity in quantities.items()
+            ],
+            ordered=False,
+            session=session,
+        )
+
+        if result.matched_count != len(quantities):
+
+            raise APIError(
+                "Insufficient stock for one or more products.",
+                409,
+                "insufficient_stock",
+            )
+
+        return {
+            product_id: products[product_id]
+            for product_id in quantities
+        }
+
+    hold = str(
+        ObjectId()
+    )
+
+    held = {
+        "_id": {
+            "$in": [
+                clean_id(product_id)
+                for product_id in quantities
+            ]
+        },
+        "stock_holds": hold,
+    }
+
+    for _ in range(STOCK_SET_ATTEMPTS):
+
+        operations = []
+
+        for product_id, quantity in quantities.items():
+
+            query = _query(
+                product_id,
+                quantity,
+            )
+
+            query["stock_version"] = _version_filter(
+                products[product_id].get(
+                    "stock_version",
+                    0,
+                )
+            )
+
+            update = _update(
+                quantity
+            )
+
+            update["$addToSet"] = {
+                "stock_holds": hold,
+            }
+
+            operations.append(
+                UpdateOne(
+                    query,
+                    update,
+                )
+            )
+
+        result = collection_.bulk_write(
+            operations,
+            ordered=False,
+        )
+
+        if result.matched_count == len(operations):
+
+            collection_.update_many(
+                held,
+                {
+                    "$pull": {
+                        "stock_holds": hold,
+                    },
+                },
+            )
+
+            return {
+                product_id: products[product_id]
+                for product_id in quantities
+            }
+
+        # Revert the decrements that did apply.
+        reverts = [
+            UpdateOne(
+                {
+                    "_id": document["_id"],
+                    "stock_holds": hold,
+                },
+                {
+                    "$inc": {
+                        "stock_quantity": quantities[
+                            str(document["_id"])
+                        ],
+                        "stock_version": 1,
+                    },
+                    "$pull": {
+                        "stock_holds": hold,
+                    },
+                },
+            )
+            for document in collection_.find(
+                held,
+                {
+                    "_id": 1,
+                },
+            )
+        ]
+
+        if reverts:
+
+            collection_.bulk_write(
+                reverts,
+                ordered=False,
+            )
+
+        products = _load_products(
+            business_id,
+            quantities,
+            {
+                "status": "active",
+            },
+        )
+
+        for product_id, quantity in quantities.items():
+
+            product = products.get(
+                product_id
+            )
+
+            if (
+                product is None
+                or float(
+                    product.get(
+                        "stock_quantity",
+                        0,
+                    )
+                )
+                < quantity
+            ):
+
+                raise APIError(
+                    "Insufficient stock for "
+                    f"{(product or {}).get('name', 'product')}.",
+                    409,
+                    "insufficient_stock",
+                )
+
+    raise APIError(
+        "Stock changed since it was read. Refresh and try again.",
+        409,
+        "stock_conflict",
+    )
+
+
+# =========================================================
+# CUSTOMERS
+# =========================================================
+
+def create_customer(
+    user_id,
+    payload,
+):
+
+    business = _require_business(
+        user_id
+    )
+
+    document = customer_document(
+        business["id"],
+        payload,
+    )
+
+    result = collection(
+        "jumuiya_customers"
+    ).insert_one(document)
+
+    document["_id"] = (
+        result.inserted_id
+    )
+
+    stats.record_customer_created(
+        business["id"]
+    )
+
+    log_action(
+        user_id,
+        "customer.created",
+        "customer",
+        result.inserted_id,
+    )
+
+    return serialise(
+        document
+    )
+
+
+def list_customers(
+    user_id,
+    search=None,
+    cursor=None,
+    limit=LIST_PAGE_SIZE,
+):
+
+    business = _require_business(
+        user_id
+    )
+
+    query = {
+        "business_id": business["id"]
+    }
+
+    if search:
+
+        search = search.strip()
+
+        if search:
+
+            query["$or"] = [
+                {
+                    "name": {
+                        "$regex": re.escape(
+                            search
+                        ),
+                        "$options": "i",
+                    }
                 },
                 {
                     "phone": {
@@ -732,19 +1454,25 @@ def list_customers(
                 },
             ]
 
-    documents = (
+    documents, next_cursor = paginate_keyset(
         collection(
             "jumuiya_customers"
-        )
-        .find(query)
-        .sort(
-            "created_at",
-            -1,
-        )
+        ),
+        query,
+        "created_at",
+        cursor=cursor,
+        limit=limit,
     )
 
-    return serialise_many(
-        documents
+    return (
+        serialise_many(
+            documents
+        ),
+        cursor_meta(
+            limit,
+            next_cursor,
+            cursor,
+        ),
     )
 
 
@@ -761,58 +1489,40 @@ def create_order(
         user_id
     )
 
-    # -----------------------------------------------------
-    # Validate customer ownership
-    # -----------------------------------------------------
-
-    customer_id = payload.get(
-        "customer_id"
+    _validate_customer(
+        business["id"],
+        payload.get(
+            "customer_id"
+        ),
     )
 
-    if customer_id:
-
-        customer = collection(
-            "jumuiya_customers"
-        ).find_one({
-            "_id": clean_id(
-                customer_id
-            ),
-            "business_id": business["id"],
-        })
-
-        if not customer:
-
-            raise APIError(
-                "Customer does not belong to this business.",
-                422,
-                "invalid_customer",
-            )
-
     # -----------------------------------------------------
-    # Validate products
+    # Validate products (one $in query)
     # -----------------------------------------------------
 
-    for item in payload.get(
-        "items",
-        [],
-    ):
+    quantities = _line_quantities(
+        payload.get(
+            "items",
+            [],
+        )
+    )
 
-        product = collection(
-            "jumuiya_products"
-        ).find_one({
-            "_id": clean_id(
-                item["product_id"]
-            ),
-            "business_id": business["id"],
+    products = _load_products(
+        business["id"],
+        quantities,
+        {
             "status": {
                 "$ne": "deleted"
             },
-        })
+        },
+    )
 
-        if not product:
+    for product_id in quantities:
+
+        if product_id not in products:
 
             raise APIError(
-                f"Product {item['product_id']} was not found.",
+                f"Product {product_id} was not found.",
                 422,
                 "invalid_product",
             )
@@ -832,6 +1542,12 @@ def create_order(
         result.inserted_id
     )
 
+    stats.record_order_created(
+        business["id"],
+        document["status"],
+        document["created_at"],
+    )
+
     log_action(
         user_id,
         "order.created",
@@ -847,6 +1563,8 @@ def create_order(
 def list_orders(
     user_id,
     status=None,
+    cursor=None,
+    limit=LIST_PAGE_SIZE,
 ):
 
     business = _require_business(
@@ -860,19 +1578,25 @@ def list_orders(
     if status:
         query["status"] = status
 
-    documents = (
+    documents, next_cursor = paginate_keyset(
         collection(
             "jumuiya_orders"
-        )
-        .find(query)
-        .sort(
-            "created_at",
-            -1,
-        )
+        ),
+        query,
+        "created_at",
+        cursor=cursor,
+        limit=limit,
     )
 
-    return serialise_many(
-        documents
+    return (
+        serialise_many(
+            documents
+        ),
+        cursor_meta(
+            limit,
+            next_cursor,
+            cursor,
+        ),
     )
 
 
@@ -974,10 +1698,13 @@ def update_order_status(
 
         update["completed_at"] = now_utc()
 
+    # Only move from the status that was read, so two
+    # concurrent transitions can't both count in the rollups.
     updated = orders.find_one_and_update(
         {
             "_id": document["_id"],
             "business_id": business["id"],
+            "status": document.get("status"),
         },
         {
             "$set": update
@@ -985,6 +1712,20 @@ def update_order_status(
         return_document=ReturnDocument.AFTER,
     )
 
+    if updated is None:
+
+        raise APIError(
+            "Order changed since it was read. Refresh and try again.",
+            409,
+            "order_conflict",
+        )
+
+    stats.record_order_status_change(
+        business["id"],
+        previous_status,
+        status,
+    )
+
     log_action(
         user_id,
         "order.status_updated",
@@ -1010,53 +1751,38 @@ def record_sale(
         user_id
     )
 
-    # -----------------------------------------------------
-    # Validate customer
-    # -----------------------------------------------------
+    business_id = business["id"]
 
-    customer_id = payload.get(
-        "customer_id"
+    _validate_customer(
+        business_id,
+        payload.get(
+            "customer_id"
+        ),
     )
 
-    if customer_id:
-
-        customer = collection(
-            "jumuiya_customers"
-        ).find_one({
-            "_id": clean_id(
-                customer_id
-            ),
-            "business_id": business["id"],
-        })
-
-        if not customer:
-
-            raise APIError(
-                "Customer does not belong to this business.",
-                422,
-                "invalid_customer",
-            )
+    quantities = _line_quantities(
+        payload.get(
+            "items",
+            [],
+        )
+    )
 
-    # -----------------------------------------------------
-    # Validate stock
-    # -----------------------------------------------------
+    def _record(session):
 
-    for item in payload.get(
-        "items",
-        [],
-    ):
+        # -------------------------------------------------
+        # Validate stock (one $in query)
+        # -------------------------------------------------
 
-        product = collection(
-            "jumuiya_products"
-        ).find_one({
-            "_id": clean_id(
-                item["product_id"]
-            ),
-            "business_id": business["id"],
-            "status": "active",
-        })
+        products = _load_products(
+            business_id,
+            quantities,
+            {
+                "status": "active",
+            },
+            session=session,
+        )
 
-        if not product:
+        if len(products) != len(quantities):
 
             raise APIError(
                 "One or more products were not found.",
@@ -1064,121 +1790,137 @@ def record_sale(
                 "invalid_product",
             )
 
-        requested = float(
-            item["quantity"]
-        )
-
-        available = float(
-            product.get(
-                "stock_quantity",
-                0,
-            )
-        )
+        for product_id, requested in quantities.items():
 
-        if requested > available:
+            product = products[product_id]
 
-            raise APIError(
-                f"Insufficient stock for {product.get('name', 'product')}.",
-                409,
-                "insufficient_stock",
+            available = float(
+                product.get(
+                    "stock_quantity",
+                    0,
+                )
             )
 
-    # -----------------------------------------------------
-    # Create sale
-    # -----------------------------------------------------
+            if requested > available:
 
-    document = sale_document(
-        business["id"],
-        payload,
-    )
+                raise APIError(
+                    f"Insufficient stock for {product.get('name', 'product')}.",
+                    409,
+                    "insufficient_stock",
+                )
 
-    result = collection(
-        "jumuiya_sales"
-    ).insert_one(
-        document
-    )
+        # -------------------------------------------------
+        # Deduct inventory (one bulk_write, retried on a
+        # concurrent stock change; see _decrement_stock)
+        # -------------------------------------------------
 
-    document["_id"] = (
-        result.inserted_id
-    )
+        previous = _decrement_stock(
+            business_id,
+            quantities,
+            products,
+            session=session,
+        )
 
-    # -----------------------------------------------------
-    # Deduct inventory
-    # -----------------------------------------------------
+        # -------------------------------------------------
+        # Create sale
+        # -------------------------------------------------
 
-    for item in payload.get(
-        "items",
-        [],
-    ):
+        document = sale_document(
+            business_id,
+            payload,
+        )
 
-        product_id = clean_id(
-            item["product_id"]
+        result = collection(
+            "jumuiya_sales"
+        ).insert_one(
+            document,
+            session=session,
         )
 
-        quantity = float(
-            item["quantity"]
+        document["_id"] = (
+            result.inserted_id
         )
 
-        product = collection(
-            "jumuiya_products"
-        ).find_one({
-            "_id": product_id,
-            "business_id": business["id"],
-        })
+        # -------------------------------------------------
+        # Movement log (one insert_many)
+        # -------------------------------------------------
 
-        if not product:
-            continue
+        movements = []
 
-        previous_quantity = float(
-            product.get(
-                "stock_quantity",
-                0,
+        low_stock_delta = 0
+
+        # Quantities and the low-stock delta come from the
+        # pre-images, not the earlier read, so a concurrent
+        # sale can't skew either.
+        for product_id, quantity in quantities.items():
+
+            product = previous[product_id]
+
+            previous_quantity = float(
+                product.get(
+                    "stock_quantity",
+                    0,
+                )
             )
-        )
 
-        new_quantity = (
-            previous_quantity
-            - quantity
-        )
+            new_quantity = (
+                previous_quantity
+                - quantity
+            )
 
-        collection(
-            "jumuiya_products"
-        ).update_one(
-            {
-                "_id": product_id,
-                "business_id": business["id"],
-            },
-            {
-                "$set": {
+            movements.append(
+                inventory_movement_document(
+                    business_id,
+                    product["_id"],
+                    {
+                        "movement_type": "remove",
+                        "quantity": quantity,
+                        "reason": "sale",
+                    },
+                    previous_quantity,
+                    new_quantity,
+                )
+            )
+
+            low_stock_delta += stats.product_deltas(
+                product,
+                {
+                    **product,
                     "stock_quantity": new_quantity,
-                    "updated_at": now_utc(),
-                }
-            },
-        )
+                },
+            )["low_stock"]
 
-        movement = inventory_movement_document(
-            business["id"],
-            product_id,
-            {
-                "movement_type": "remove",
-                "quantity": quantity,
-                "reason": "sale",
-            },
-            previous_quantity,
-            new_quantity,
-        )
+        if movements:
 
-        collection(
-            "jumuiya_inventory_movements"
-        ).insert_one(
-            movement
+            collection(
+                "jumuiya_inventory_movements"
+            ).insert_many(
+                movements,
+                ordered=False,
+                session=session,
+            )
+
+        return (
+            document,
+            low_stock_delta,
         )
 
+    document, low_stock_delta = run_in_transaction(
+        _record
+    )
+
+    stats.record_sale(
+        business_id,
+        document["amount"],
+        low_stock_delta,
+        document["sold_at"],
+    )
+
     log_action(
         user_id,
         "sale.created",
         "sale",
-        result.inserted_id,
+        document["_id"],
     )
 
     return serialise(
@@ -1214,6 +1956,12 @@ def create_expense(
         result.inserted_id
     )
 
+    stats.record_expense(
+        business["id"],
+        document["amount"],
+        document["spent_at"],
+    )
+
     log_action(
         user_id,
         "expense.created",
@@ -1228,27 +1976,37 @@ def create_expense(
 
 def list_expenses(
     user_id,
+    cursor=None,
+    limit=LIST_PAGE_SIZE,
 ):
 
     business = _require_business(
         user_id
     )
 
-    documents = (
+    query = {
+        "business_id": business["id"]
+    }
+
+    documents, next_cursor = paginate_keyset(
         collection(
             "jumuiya_expenses"
-        )
-        .find({
-            "business_id": business["id"]
-        })
-        .sort(
-            "spent_at",
-            -1,
-        )
+        ),
+        query,
+        "spent_at",
+        cursor=cursor,
+        limit=limit,
     )
 
-    return serialise_many(
-        documents
+    return (
+        serialise_many(
+            documents
+        ),
+        cursor_meta(
+            limit,
+            next_cursor,
+            cursor,
+        ),
     )
 
 
@@ -1259,149 +2017,87 @@ def list_expenses(
 def dashboard(
     user_id,
 ):
+    """
+    Business dashboard metrics.
+
+    Served from the materialized `jumuiya_business_stats`
+    rollup, so the cost does not grow with sales history.
+    """
 
     business = _require_business(
         user_id
     )
 
-    business_id = business["id"]
-
-    products = collection(
-        "jumuiya_products"
-    )
-
-    orders = collection(
-        "jumuiya_orders"
-    )
-
-    sales = collection(
-        "jumuiya_sales"
+    totals = stats.get_totals(
+        business["id"]
     )
 
-    expenses = collection(
-        "jumuiya_expenses"
-    )
+    return {
+        "business": business,
 
-    customers = collection(
-        "jumuiya_customers"
-    )
+        "metrics": stats.metrics_from_totals(
+            totals
+        ),
+    }
 
-    # -----------------------------------------------------
-    # SALES
-    # -----------------------------------------------------
 
-    sales_result = list(
-        sales.aggregate([
-            {
-                "$match": {
-                    "business_id": business_id
-                }
-            },
-            {
-                "$group": {
-                    "_id": None,
-                    "total": {
-                        "$sum": "$amount"
-                    }
-                }
-            },
-        ])
-    )
-
-    # -----------------------------------------------------
-    # EXPENSES
-    # -----------------------------------------------------
+def dashboard_series(
+    user_id,
+    period="day",
+    start=None,
+    end=None,
+    limit=90,
+):
+    """
+    Daily or monthly sales/expense buckets for charts.
+    """
 
-    expenses_result = list(
-        expenses.aggregate([
-            {
-                "$match": {
-                    "business_id": business_id
-                }
-            },
-            {
-                "$group": {
-                    "_id": None,
-                    "total": {
-                        "$sum": "$amount"
-                    }
-                }
-            },
-        ])
+    business = _require_business(
+        user_id
     )
 
-    total_sales = (
-        float(
-            sales_result[0]["total"]
-        )
-        if sales_result
-        else 0.0
-    )
+    try:
 
-    total_expenses = (
-        float(
-            expenses_result[0]["total"]
+        return stats.series(
+            business["id"],
+            period,
+            start,
+            end,
+            limit,
         )
-        if expenses_result
-        else 0.0
-    )
-
-    # -----------------------------------------------------
-    # COUNTS
-    # -----------------------------------------------------
-
-    product_count = products.count_documents({
-        "business_id": business_id,
-        "status": {
-            "$ne": "deleted"
-        },
-    })
-
-    low_stock_count = products.count_documents({
-        "business_id": business_id,
-        "status": "active",
-        "stock_quantity": {
-            "$lte": 5
-        },
-    })
 
-    customer_count = customers.count_documents({
-        "business_id": business_id
-    })
+    except (
+        TypeError,
+        ValueError,
+    ) as exc:
 
-    pending_orders = orders.count_documents({
-        "business_id": business_id,
-        "status": {
-            "$in": [
-                "pending",
-                "confirmed",
-                "processing",
-            ]
-        },
-    })
+        raise APIError(
+            str(exc),
+            422,
+            "invalid_series",
+        )
 
-    completed_orders = orders.count_documents({
-        "business_id": business_id,
-        "status": "completed",
-    })
 
-    return {
-        "business": business,
+def rebuild_dashboard(
+    user_id,
+):
+    """
+    Recompute the dashboard rollup from source records.
+    """
 
-        "metrics": {
-            "products": product_count,
-            "low_stock": low_stock_count,
-            "customers": customer_count,
-            "pending_orders": pending_orders,
-            "completed_orders": completed_orders,
+    business = _require_business(
+        user_id
+    )
 
-            "sales_total": total_sales,
+    result = stats.rebuild_business_stats(
+        business["id"]
+    )
 
-            "expenses_total": total_expenses,
+    log_action(
+        user_id,
+        "business.stats_rebuilt",
+        "business",
+        business["id"],
+    )
 
-            "net_estimate": (
-                total_sales
-                - total_expenses
-            ),
-        },
-    }
\ No newline at end of file
+    return result
@@ -0,0 +1,796 @@
+# backend/jumuiya/biashara/stats.py
+
+"""
+Materialized Biashara dashboard rollups.
+
+Collection:
+
+    jumuiya_business_stats
+
+Documents:
+
+    {_id: "<business_id>", period: "total", ...}
+    {_id: "<business_id>:day:2026-10-19", period: "day", ...}
+    {_id: "<business_id>:month:2026-10", period: "month", ...}
+
+The write paths in services.py keep these documents current
+with `$inc`, so the dashboard is a single primary-key read no
+matter how much history a shop has. `rebuild_business_stats`
+recomputes everything from the source collections to
+reconcile any drift, marking the total document `complete`;
+reads rebuild any business whose total is not (a write made
+before the first rebuild upserts a total holding only that
+write).
+"""
+
+from __future__ import annotations
+
+import logging
+from datetime import datetime, timezone
+
+from pymongo import UpdateOne
+
+from backend.jumuiya.core.database import collection
+
+
+logger = logging.getLogger("jumuiya.biashara.stats")
+
+
+STATS_COLLECTION = "jumuiya_business_stats"
+
+# Must match the low-stock threshold shown on the dashboard.
+LOW_STOCK_THRESHOLD = 5
+
+ORDER_STATUSES = (
+    "pending",
+    "confirmed",
+    "processing",
+    "completed",
+    "cancelled",
+)
+
+OPEN_ORDER_STATUSES = (
+    "pending",
+    "confirmed",
+    "processing",
+)
+
+PERIODS = (
+    "day",
+    "month",
+)
+
+
+# =========================================================
+# HELPERS
+# =========================================================
+
+def now_utc():
+    return datetime.now(timezone.utc)
+
+
+def _stats():
+    return collection(
+        STATS_COLLECTION
+    )
+
+
+def bucket_keys(
+    moment=None,
+):
+    """
+    Return {"day": "YYYY-MM-DD", "month": "YYYY-MM"}.
+    """
+
+    moment = moment or now_utc()
+
+    return {
+        "day": moment.strftime("%Y-%m-%d"),
+        "month": moment.strftime("%Y-%m"),
+    }
+
+
+def is_low_stock(product):
+    """
+    True when a product counts towards the dashboard's
+    low-stock metric.
+    """
+
+    if not product:
+        return False
+
+    if product.get("status") != "active":
+        return False
+
+    try:
+        quantity = float(
+            product.get(
+                "stock_quantity",
+                0,
+            )
+        )
+
+    except (
+        TypeError,
+        ValueError,
+    ):
+        return False
+
+    return quantity <= LOW_STOCK_THRESHOLD
+
+
+def is_counted_product(product):
+
+    return bool(
+        product
+        and product.get("status") != "deleted"
+    )
+
+
+def product_deltas(
+    before,
+    after,
+):
+    """
+    Rollup deltas caused by a product changing from `before`
+    to `after` (either may be None).
+    """
+
+    return {
+        "products": (
+            int(is_counted_product(after))
+            - int(is_counted_product(before))
+        ),
+        "low_stock": (
+            int(is_low_stock(after))
+            - int(is_low_stock(before))
+        ),
+    }
+
+
+# =========================================================
+# INCREMENTAL UPDATES
+# =========================================================
+
+def apply(
+    business_id,
+    totals=None,
+    buckets=None,
+    moment=None,
+):
+    """
+    Apply `$inc` deltas to the business total document and,
+    when `buckets` is given, to its day/month documents.
+
+    All updates go out as one bulk_write. Rollup failures
+    are logged and never break the business operation;
+    the rebuild job reconciles any drift.
+    """
+
+    totals = {
+        key: value
+        for key, value in (totals or {}).items()
+        if value
+    }
+
+    buckets = {
+        key: value
+        for key, value in (buckets or {}).items()
+        if value
+    }
+
+    if not totals and not buckets:
+        return
+
+    business_id = str(business_id)
+
+    timestamp = now_utc()
+
+    operations = []
+
+    if totals:
+
+        operations.append(
+            UpdateOne(
+                {
+                    "_id": business_id,
+                },
+                {
+                    "$inc": totals,
+                    "$set": {
+                        "updated_at": timestamp,
+                    },
+                    "$setOnInsert": {
+                        "business_id": business_id,
+                        "period": "total",
+                    },
+                },
+                upsert=True,
+            )
+        )
+
+    if buckets:
+
+        for period, key in bucket_keys(
+            moment
+        ).items():
+
+            operations.append(
+                UpdateOne(
+                    {
+                        "_id": f"{business_id}:{period}:{key}",
+                    },
+                    {
+                        "$inc": buckets,
+                        "$set": {
+                            "updated_at": timestamp,
+                        },
+                        "$setOnInsert": {
+                            "business_id": business_id,
+                            "period": period,
+                            "bucket": key,
+                        },
+                    },
+                    upsert=True,
+                )
+            )
+
+    try:
+
+        _stats().bulk_write(
+            operations,
+            ordered=False,
+        )
+
+    except Exception:
+
+        logger.exception(
+            "Failed to update business stats for %s",
+            business_id,
+        )
+
+
+def record_sale(
+    business_id,
+    amount,
+    low_stock_delta=0,
+    moment=None,
+):
+    amount = float(amount)
+
+    apply(
+        business_id,
+        totals={
+            "sales_total": amount,
+            "sales_count": 1,
+            "low_stock": low_stock_delta,
+        },
+        buckets={
+            "sales_total": amount,
+            "sales_count": 1,
+        },
+        moment=moment,
+    )
+
+
+def record_expense(
+    business_id,
+    amount,
+    moment=None,
+):
+    amount = float(amount)
+
+    apply(
+        business_id,
+        totals={
+            "expenses_total": amount,
+            "expenses_count": 1,
+        },
+        buckets={
+            "expenses_total": amount,
+            "expenses_count": 1,
+        },
+        moment=moment,
+    )
+
+
+def record_order_created(
+    business_id,
+    status="pending",
+    moment=None,
+):
+    apply(
+        business_id,
+        totals={
+            f"orders.{status}": 1,
+        },
+        buckets={
+            "orders_created": 1,
+        },
+        moment=moment,
+    )
+
+
+def record_order_status_change(
+    business_id,
+    previous_status,
+    status,
+):
+    if previous_status == status:
+        return
+
+    apply(
+        business_id,
+        totals={
+            f"orders.{previous_status}": -1,
+            f"orders.{status}": 1,
+        },
+    )
+
+
+def record_customer_created(
+    business_id,
+):
+    apply(
+        business_id,
+        totals={
+            "customers": 1,
+        },
+    )
+
+
+def record_product_change(
+    business_id,
+    before,
+    after,
+):
+    apply(
+        business_id,
+        totals=product_deltas(
+            before,
+            after,
+        ),
+    )
+
+
+# =========================================================
+# READS
+# =========================================================
+
+def get_totals(
+    business_id,
+):
+    """
+    Return the total rollup for a business, rebuilding it
+    first if it has never been materialized from history.
+    """
+
+    document = _stats().find_one({
+        "_id": str(business_id),
+    })
+
+    if not (document and document.get("complete")):
+
+        rebuild_business_stats(
+            business_id
+        )
+
+        document = _stats().find_one({
+            "_id": str(business_id),
+        }) or {}
+
+    return document
+
+
+def metrics_from_totals(totals):
+    """
+    Shape a total rollup into the dashboard `metrics` block.
+    """
+
+    orders = totals.get(
+        "orders",
+        {},
+    ) or {}
+
+    sales_total = float(
+        totals.get("sales_total", 0)
+    )
+
+    expenses_total = float(
+        totals.get("expenses_total", 0)
+    )
+
+    return {
+        "products": int(
+            totals.get("products", 0)
+        ),
+        "low_stock": int(
+            totals.get("low_stock", 0)
+        ),
+        "customers": int(
+            totals.get("customers", 0)
+        ),
+        "pending_orders": int(
+            sum(
+                orders.get(status, 0)
+                for status in OPEN_ORDER_STATUSES
+            )
+        ),
+        "completed_orders": int(
+            orders.get("completed", 0)
+        ),
+
+        "sales_total": sales_total,
+
+        "expenses_total": expenses_total,
+
+        "net_estimate": (
+            sales_total
+            - expenses_total
+        ),
+    }
+
+
+def series(
+    business_id,
+    period="day",
+    start=None,
+    end=None,
+    limit=90,
+):
+    """
+    Return day/month buckets for charting, oldest first.
+
+    `start`/`end` are inclusive bucket keys, e.g.
+    "2026-10-01" for days or "2026-10" for months.
+    """
+
+    if period not in PERIODS:
+        raise ValueError(
+            "period must be day or month."
+        )
+
+    query = {
+        "business_id": str(business_id),
+        "period": period,
+    }
+
+    bucket_range = {}
+
+    if start:
+        bucket_range["$gte"] = str(start)
+
+    if end:
+        bucket_range["$lte"] = str(end)
+
+    if bucket_range:
+        query["bucket"] = bucket_range
+
+    documents = list(
+        _stats()
+        .find(
+            query,
+            {
+                "_id": 0,
+                "business_id": 0,
+                "updated_at": 0,
+            },
+        )
+        .sort(
+            "bucket",
+            -1,
+        )
+        .limit(
+            max(
+                1,
+                min(int(limit), 366),
+            )
+        )
+    )
+
+    documents.reverse()
+
+    for document in documents:
+
+        document["net_estimate"] = (
+            float(document.get("sales_total", 0))
+            - float(document.get("expenses_total", 0))
+        )
+
+    return documents
+
+
+# =========================================================
+# REBUILD / RECONCILIATION
+# =========================================================
+
+def _daily_sums(
+    name,
+    business_id,
+    date_field,
+    amount_field="amount",
+):
+    """
+    {day: (sum, count)} for a dated collection.
+    """
+
+    pipeline = [
+        {
+            "$match": {
+                "business_id": business_id,
+            }
+        },
+        {
+            "$group": {
+                "_id": {
+                    "$dateToString": {
+                        "format": "%Y-%m-%d",
+                        "date": f"${date_field}",
+                    }
+                },
+                "total": (
+                    {"$sum": f"${amount_field}"}
+                    if amount_field
+                    else {"$sum": 0}
+                ),
+                "count": {
+                    "$sum": 1
+                },
+            }
+        },
+    ]
+
+    return {
+        row["_id"]: (
+            float(row.get("total") or 0),
+            int(row.get("count") or 0),
+        )
+        for row in collection(name).aggregate(
+            pipeline
+        )
+        if row.get("_id")
+    }
+
+
+def rebuild_business_stats(
+    business_id,
+):
+    """
+    Recompute every rollup document for one business from
+    the source collections and replace the stored values.
+    """
+
+    business_id = str(business_id)
+
+    timestamp = now_utc()
+
+    products = collection(
+        "jumuiya_products"
+    )
+
+    orders_by_status = {
+        status: 0
+        for status in ORDER_STATUSES
+    }
+
+    for row in collection(
+        "jumuiya_orders"
+    ).aggregate([
+        {
+            "$match": {
+                "business_id": business_id,
+            }
+        },
+        {
+            "$group": {
+                "_id": "$status",
+                "count": {
+                    "$sum": 1
+                },
+            }
+        },
+    ]):
+
+        if row["_id"]:
+            orders_by_status[row["_id"]] = row["count"]
+
+    sales = _daily_sums(
+        "jumuiya_sales",
+        business_id,
+        "sold_at",
+    )
+
+    expenses = _daily_sums(
+        "jumuiya_expenses",
+        business_id,
+        "spent_at",
+    )
+
+    orders_created = _daily_sums(
+        "jumuiya_orders",
+        business_id,
+        "created_at",
+        amount_field=None,
+    )
+
+    totals = {
+        "business_id": business_id,
+        "period": "total",
+        "products": products.count_documents({
+            "business_id": business_id,
+            "status": {
+                "$ne": "deleted"
+            },
+        }),
+        "low_stock": products.count_documents({
+            "business_id": business_id,
+            "status": "active",
+            "stock_quantity": {
+                "$lte": LOW_STOCK_THRESHOLD
+            },
+        }),
+        "customers": collection(
+            "jumuiya_customers"
+        ).count_documents({
+            "business_id": business_id,
+        }),
+        "orders": orders_by_status,
+        "sales_total": sum(
+            total for total, _ in sales.values()
+        ),
+        "sales_count": sum(
+            count for _, count in sales.values()
+        ),
+        "expenses_total": sum(
+            total for total, _ in expenses.values()
+        ),
+        "expenses_count": sum(
+            count for _, count in expenses.values()
+        ),
+        "complete": True,
+        "updated_at": timestamp,
+        "rebuilt_at": timestamp,
+    }
+
+    buckets = {}
+
+    def _add(day, field, value):
+
+        for period, key in (
+            ("day", day),
+            ("month", day[:7]),
+        ):
+
+            document = buckets.setdefault(
+                (period, key),
+                {
+                    "business_id": business_id,
+                    "period": period,
+                    "bucket": key,
+                    "sales_total": 0.0,
+                    "sales_count": 0,
+                    "expenses_total": 0.0,
+                    "expenses_count": 0,
+                    "orders_created": 0,
+                    "updated_at": timestamp,
+                },
+            )
+
+            document[field] += value
+
+    for day, (total, count) in sales.items():
+        _add(day, "sales_total", total)
+        _add(day, "sales_count", count)
+
+    for day, (total, count) in expenses.items():
+        _add(day, "expenses_total", total)
+        _add(day, "expenses_count", count)
+
+    for day, (_, count) in orders_created.items():
+        _add(day, "orders_created", count)
+
+    operations = [
+        UpdateOne(
+            {
+                "_id": business_id,
+            },
+            {
+                "$set": totals,
+            },
+            upsert=True,
+        )
+    ]
+
+    for (period, key), document in buckets.items():
+
+        operations.append(
+            UpdateOne(
+                {
+                    "_id": f"{business_id}:{period}:{key}",
+                },
+                {
+                    "$set": document,
+                },
+                upsert=True,
+            )
+        )
+
+    stats = _stats()
+
+    stats.bulk_write(
+        operations,
+        ordered=False,
+    )
+
+    # Remove buckets whose source records no longer exist.
+    stats.delete_many({
+        "business_id": business_id,
+        "period": {
+            "$in": list(PERIODS),
+        },
+        "updated_at": {
+            "$lt": timestamp,
+        },
+    })
+
+    return {
+        "business_id": business_id,
+        "buckets": len(buckets),
+        "metrics": metrics_from_totals(totals),
+    }
+
+
+def rebuild_all_business_stats():
+    """
+    Reconcile the rollups of every active business.
+    Intended for the nightly maintenance run.
+    """
+
+    rebuilt = 0
+    failed = 0
+
+    for business in collection(
+        "jumuiya_businesses"
+    ).find(
+        {
+            "status": {
+                "$ne": "deleted"
+            },
+        },
+        {
+            "_id": 1,
+        },
+    ):
+
+        try:
+
+            rebuild_business_stats(
+                business["_id"]
+            )
+
+            rebuilt += 1
+
+        except Exception:
+
+            failed += 1
+
+            logger.exception(
+                "Failed to rebuild stats for business %s",
+                business["_id"],
+            )
+
+    return {
+        "rebuilt": rebuilt,
+        "failed": failed,
+    }
+
+
+if __name__ == "__main__":
+
+    logging.basicConfig(
+        level=logging.INFO
+    )
+
+    print(
+        rebuild_all_business_stats()
+    )
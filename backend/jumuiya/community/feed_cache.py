@@ -0,0 +1,541 @@
+# backend/jumuiya/community/feed_cache.py
+
+"""
+In-process community feed cache.
+
+The feed is the most frequent Jumuiya read, and almost every
+request asks for the first few pages of one (hub, category)
+view. This module keeps a window of the newest / hottest
+published posts for each view that has been read ("fan-out on
+read": windows are loaded lazily, on first request) and serves
+pages from memory.
+
+Writes keep the loaded windows current instead of dropping
+them:
+
+    create_post / update_post  -> upsert()
+    delete_post                -> remove()
+    react / add_comment        -> upsert() with the new counts
+                                  and hot_score
+
+Writes that land while a window is being read from Mongo are
+journalled and replayed onto it before it is stored, so the
+window cannot miss them.
+
+Pages that run past a window fall back to Mongo. Windows
+also expire after COMMUNITY_FEED_CACHE_TTL seconds, which
+bounds staleness if more than one process serves the API, and
+at most COMMUNITY_FEED_CACHE_WINDOWS views are kept (least
+recently read first out).
+"""
+
+from __future__ import annotations
+
+import bisect
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import timezone
+
+from backend.jumuiya.core.pagination import (
+    decode_cursor,
+    encode_cursor,
+    keyset_sort,
+)
+
+
+FEED_CACHE_SIZE = int(
+    os.getenv(
+        "COMMUNITY_FEED_CACHE_SIZE",
+        "300",
+    )
+)
+
+FEED_CACHE_TTL = float(
+    os.getenv(
+        "COMMUNITY_FEED_CACHE_TTL",
+        "300",
+    )
+)
+
+FEED_CACHE_WINDOWS = int(
+    os.getenv(
+        "COMMUNITY_FEED_CACHE_WINDOWS",
+        "64",
+    )
+)
+
+SORT_FIELDS = {
+    "new": "created_at",
+    "hot": "hot_score",
+}
+
+
+# =========================================================
+# HELPERS
+# =========================================================
+
+def _rank(
+    post,
+    field,
+):
+    """
+    Ascending sort key; windows hold the negated order so
+    bisect can be used on a descending feed.
+    """
+
+    value = post.get(field)
+
+    if hasattr(value, "timestamp"):
+
+        if value.tzinfo is None:
+            value = value.replace(
+                tzinfo=timezone.utc
+            )
+
+        value = value.timestamp()
+
+    return (
+        -(value or 0),
+        _negate_id(post["_id"]),
+    )
+
+
+def _negate_id(object_id):
+    """
+    Descending order for ObjectIds as an ascending key.
+    """
+
+    return bytes(
+        255 - byte
+        for byte in object_id.binary
+    )
+
+
+def _as_stored(post):
+    """
+    Mongo hands back naive UTC datetimes; keep freshly
+    written documents in the same shape so cached and
+    loaded posts serialise identically.
+    """
+
+    return {
+        key: (
+            value.astimezone(timezone.utc).replace(tzinfo=None)
+            if getattr(value, "tzinfo", None) is not None
+            else value
+        )
+        for key, value in post.items()
+    }
+
+
+def _matches(
+    post,
+    hub,
+    category,
+):
+    if post.get("status") != "published":
+        return False
+
+    if hub and post.get("hub") != hub:
+        return False
+
+    if category and post.get("category") != category:
+        return False
+
+    return True
+
+
+# =========================================================
+# WINDOW
+# =========================================================
+
+class FeedWindow:
+    """
+    The top posts of one (hub, category, sort) view.
+    """
+
+    def __init__(
+        self,
+        field,
+        posts,
+        complete,
+    ):
+        self.field = field
+        self.loaded_at = time.monotonic()
+
+        # `complete` means the window holds every matching
+        # post, so running off its end is the real end.
+        self.complete = complete
+
+        self.keys = []
+        self.posts = []
+
+        # Serialised posts, filled on first read.
+        self.rendered = {}
+
+        for post in posts:
+            self.keys.append(
+                _rank(post, field)
+            )
+            self.posts.append(
+                post
+            )
+
+    def expired(self):
+        return (
+            time.monotonic() - self.loaded_at
+            > FEED_CACHE_TTL
+        )
+
+    def remove(self, post_id):
+
+        self.rendered.pop(
+            post_id,
+            None,
+        )
+
+        for index, post in enumerate(self.posts):
+
+            if post["_id"] == post_id:
+
+                del self.keys[index]
+                del self.posts[index]
+
+                return True
+
+        return False
+
+    def insert(self, post):
+
+        key = _rank(
+            post,
+            self.field,
+        )
+
+        index = bisect.bisect_left(
+            self.keys,
+            key,
+        )
+
+        # Past the loaded tail: it belongs to the part of the
+        # feed we don't hold, which Mongo will serve.
+        if index == len(self.keys) and not self.complete:
+            return
+
+        self.keys.insert(index, key)
+        self.posts.insert(index, post)
+
+        if len(self.posts) > FEED_CACHE_SIZE:
+
+            self.keys.pop()
+
+            self.rendered.pop(
+                self.posts.pop()["_id"],
+                None,
+            )
+
+            self.complete = False
+
+    def page(
+        self,
+        cursor,
+        limit,
+        serialize,
+    ):
+        """
+        Return (serialised posts, next_cursor), or None when
+        the page reaches past the window.
+        """
+
+        start = 0
+
+        if cursor:
+
+            value, object_id = decode_cursor(
+                cursor
+            )
+
+            start = bisect.bisect_right(
+                self.keys,
+                _rank(
+                    {
+                        self.field: value,
+                        "_id": object_id,
+                    },
+                    self.field,
+                ),
+            )
+
+        end = start + limit
+
+        if end > len(self.posts) and not self.complete:
+            return None
+
+        posts = self.posts[start:end]
+
+        has_next = (
+            end < len(self.posts)
+            or not self.complete
+        )
+
+        items = []
+
+        for post in posts:
+
+            data = self.rendered.get(
+                post["_id"]
+            )
+
+            if data is None:
+
+                data = self.rendered[
+                    post["_id"]
+                ] = serialize(
+                    post
+                )
+
+            items.append(
+                data
+            )
+
+        return (
+            items,
+            encode_cursor(
+                posts[-1],
+                self.field,
+            )
+            if posts and has_next
+            else None,
+        )
+
+
+# =========================================================
+# CACHE
+# =========================================================
+
+class FeedCache:
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._windows = OrderedDict()
+
+        # (key, journal) per load in progress; writes made
+        # meanwhile are appended and replayed onto the window.
+        self._loading = []
+
+        self.hits = 0
+        self.misses = 0
+
+    def _load(
+        self,
+        source,
+        hub,
+        category,
+        sort,
+    ):
+
+        field = SORT_FIELDS[sort]
+
+        query = {
+            "status": "published",
+        }
+
+        if hub:
+            query["hub"] = hub
+
+        if category:
+            query["category"] = category
+
+        posts = list(
+            source
+            .find(query)
+            .sort(
+                keyset_sort(field)
+            )
+            .limit(
+                FEED_CACHE_SIZE + 1
+            )
+        )
+
+        complete = len(posts) <= FEED_CACHE_SIZE
+
+        return FeedWindow(
+            field,
+            posts[:FEED_CACHE_SIZE],
+            complete,
+        )
+
+    def page(
+        self,
+        source,
+        hub,
+        category,
+        sort,
+        cursor,
+        limit,
+        serialize,
+    ):
+        """
+        Serve one feed page from memory, loading the window
+        from `source` on first use. Returns None when the
+        caller should query Mongo instead.
+        """
+
+        if FEED_CACHE_SIZE <= 0:
+            return None
+
+        key = (
+            hub,
+            category,
+            sort,
+        )
+
+        with self._lock:
+
+            window = self._windows.get(key)
+
+            if window is not None and not window.expired():
+
+                self._windows.move_to_end(key)
+
+                self.hits += 1
+
+            else:
+
+                window = None
+
+                self.misses += 1
+
+                loading = (
+                    key,
+                    [],
+                )
+
+                self._loading.append(
+                    loading
+                )
+
+        if window is None:
+
+            try:
+
+                window = self._load(
+                    source,
+                    hub,
+                    category,
+                    sort,
+                )
+
+            finally:
+
+                with self._lock:
+                    self._loading.remove(
+                        loading
+                    )
+
+            with self._lock:
+
+                for action, value in loading[1]:
+
+                    window.remove(
+                        value
+                        if action == "remove"
+                        else value["_id"]
+                    )
+
+                    if action == "upsert" and _matches(
+                        value,
+                        hub,
+                        category,
+                    ):
+                        window.insert(
+                            value
+                        )
+
+                self._windows[key] = window
+
+                self._windows.move_to_end(key)
+
+                while len(self._windows) > max(
+                    FEED_CACHE_WINDOWS,
+                    1,
+                ):
+                    self._windows.popitem(last=False)
+
+        with self._lock:
+
+            return window.page(
+                cursor,
+                limit,
+                serialize,
+            )
+
+    def upsert(self, post):
+        """
+        Reflect a created/edited/re-ranked post in every
+        loaded window it belongs to.
+        """
+
+        post = _as_stored(
+            post
+        )
+
+        with self._lock:
+
+            for _, journal in self._loading:
+                journal.append(
+                    ("upsert", post)
+                )
+
+            for (hub, category, _), window in self._windows.items():
+
+                window.remove(
+                    post["_id"]
+                )
+
+                if _matches(
+                    post,
+                    hub,
+                    category,
+                ):
+                    window.insert(
+                        post
+                    )
+
+    def remove(self, post_id):
+
+        with self._lock:
+
+            for _, journal in self._loading:
+                journal.append(
+                    ("remove", post_id)
+                )
+
+            for window in self._windows.values():
+                window.remove(
+                    post_id
+                )
+
+    def clear(self):
+
+        with self._lock:
+            self._windows.clear()
+
+    def stats(self):
+
+        with self._lock:
+
+            return {
+                "windows": len(self._windows),
+                "posts": sum(
+                    len(window.posts)
+                    for window in self._windows.values()
+                ),
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+feed_cache = FeedCache()
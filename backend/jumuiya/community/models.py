@@ -2,9 +2,25 @@
 
 from __future__ import annotations
 
+import math
 from datetime import datetime, timezone
 
 
+# Hot ranking: every 10x more engagement is worth this many
+# seconds of recency (12.5 hours).
+HOT_GRAVITY_SECONDS = 45000
+
+# Arbitrary fixed origin so scores stay small numbers.
+HOT_EPOCH = 1_700_000_000
+
+REACTION_TYPES = (
+    "like",
+    "love",
+    "pray",
+    "celebrate",
+)
+
+
 # =========================================================
 # TIME
 # =========================================================
@@ -13,6 +29,73 @@ def now_utc():
     return datetime.now(timezone.utc)
 
 
+# =========================================================
+# HOT RANKING
+# =========================================================
+
+def hot_score(
+    reactions,
+    comments,
+    created_at,
+):
+    """
+    Rank combining engagement and recency.
+
+    Comments count double: they take more effort than a
+    reaction.
+    Scores only grow with time, so a post's score is fixed
+    until it gets new engagement and can be stored and
+    indexed.
+    """
+
+    engagement = max(
+        int(reactions or 0)
+        + 2 * int(comments or 0),
+        1,
+    )
+
+    # Mongo keeps milliseconds; match it so scores computed
+    # before and after a round trip agree.
+    created_at = created_at.replace(
+        microsecond=created_at.microsecond // 1000 * 1000
+    )
+
+    if created_at.tzinfo is None:
+        created_at = created_at.replace(
+            tzinfo=timezone.utc
+        )
+
+    seconds = (
+        created_at.timestamp()
+        - HOT_EPOCH
+    )
+
+    return round(
+        math.log10(engagement)
+        + seconds / HOT_GRAVITY_SECONDS,
+        7,
+    )
+
+
+def post_hot_score(post):
+
+    reactions = sum(
+        (
+            post.get("reaction_counts")
+            or {}
+        ).values()
+    ) or post.get(
+        "likes_count",
+        0,
+    )
+
+    return hot_score(
+        reactions,
+        post.get("comments_count", 0),
+        post["created_at"],
+    )
+
+
 # =========================================================
 # COMMUNITY POST
 # =========================================================
@@ -130,6 +213,14 @@ def post_document(user_id, data):
 
         "comments_count": 0,
 
+        "reaction_counts": {},
+
+        "hot_score": hot_score(
+            0,
+            0,
+            now,
+        ),
+
         "created_at": now,
 
         "updated_at": now,
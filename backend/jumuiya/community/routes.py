@@ -131,19 +131,29 @@ def health():
 @community_bp.get("/feed")
 @require_authenticated
 def get_feed():
+    posts, meta = services.feed(
+        category=request.args.get(
+            "category"
+        ),
+        hub=request.args.get(
+            "hub"
+        ),
+        limit=parse_limit(
+            default=30,
+            maximum=100,
+        ),
+        cursor=request.args.get(
+            "cursor"
+        ),
+        sort=request.args.get(
+            "sort",
+            "new",
+        ),
+    )
+
     return ok(
-        services.feed(
-            category=request.args.get(
-                "category"
-            ),
-            hub=request.args.get(
-                "hub"
-            ),
-            limit=parse_limit(
-                default=30,
-                maximum=100,
-            ),
-        )
+        posts,
+        meta=meta,
     )
 
 
@@ -276,14 +286,24 @@ def remove_post(post_id):
 @require_authenticated
 def get_comments(post_id):
 
+    items, meta = services.comments(
+        post_id,
+        limit=parse_limit(
+            default=50,
+            maximum=200,
+        ),
+        cursor=request.args.get(
+            "cursor"
+        ),
+        order=request.args.get(
+            "order",
+            "oldest",
+        ),
+    )
+
     return ok(
-        services.comments(
-            post_id,
-            limit=parse_limit(
-                default=100,
-                maximum=200,
-            ),
-        )
+        items,
+        meta=meta,
     )
 
 
@@ -321,10 +341,29 @@ def add_comment(post_id):
 )
 @require_authenticated
 def react(post_id):
+    """
+    Toggle a reaction. Optional body:
+
+        {"reaction": "like" | "love" | "pray" | "celebrate"}
+    """
+
+    data = request.get_json(
+        silent=True
+    )
+
+    reaction = (
+        data.get(
+            "reaction",
+            "like",
+        )
+        if isinstance(data, dict)
+        else "like"
+    )
 
     return ok(
         services.react(
             current_user_id(),
             post_id,
+            reaction,
         )
     )
@@ -6,13 +6,29 @@ from datetime import datetime, timezone
 
 from bson import ObjectId
 from bson.errors import InvalidId
-from pymongo import ReturnDocument
+from pymongo import ReturnDocument, UpdateOne
+from pymongo.errors import DuplicateKeyError
 
-from backend.jumuiya.core.database import collection
+from backend.jumuiya.core.database import (
+    collection,
+    run_in_transaction,
+)
 from backend.jumuiya.core.errors import APIError
 from backend.jumuiya.core.audit import log_action
-
-from backend.jumuiya.community.models import post_document
+from backend.jumuiya.core.pagination import (
+    cursor_meta,
+    paginate_keyset,
+)
+
+from backend.jumuiya.community.feed_cache import (
+    SORT_FIELDS,
+    feed_cache,
+)
+from backend.jumuiya.community.models import (
+    REACTION_TYPES,
+    post_document,
+    post_hot_score,
+)
 
 
 # =========================================================
@@ -109,6 +125,10 @@ def create_post(
         result.inserted_id
     )
 
+    feed_cache.upsert(
+        document
+    )
+
     log_action(
         user_id,
         "community.post.created",
@@ -121,6 +141,127 @@ def create_post(
     )
 
 
+# =========================================================
+# HOT RANKING
+# =========================================================
+
+def _rerank(post):
+    """
+    Store the new hot_score after a counter changed and
+    refresh the cached feeds. Returns the updated post.
+    """
+
+    if not post:
+        return post
+
+    score = post_hot_score(
+        post
+    )
+
+    if score != post.get("hot_score"):
+
+        collection(
+            "jumuiya_community_posts"
+        ).update_one(
+            {
+                "_id": post["_id"]
+            },
+            {
+                "$set": {
+                    "hot_score": score
+                }
+            },
+        )
+
+        post["hot_score"] = score
+
+    feed_cache.upsert(
+        post
+    )
+
+    return post
+
+
+def recompute_hot_scores(batch_size=500):
+    """
+    Backfill/repair hot_score for every post whose stored
+    value disagrees with its counters. Runs nightly.
+    """
+
+    posts = collection(
+        "jumuiya_community_posts"
+    )
+
+    operations = []
+
+    updated = 0
+
+    for post in posts.find(
+        {
+            "status": {
+                "$ne": "deleted"
+            },
+        },
+        {
+            "likes_count": 1,
+            "reaction_counts": 1,
+            "comments_count": 1,
+            "created_at": 1,
+            "hot_score": 1,
+        },
+    ):
+
+        if not post.get("created_at"):
+            continue
+
+        score = post_hot_score(
+            post
+        )
+
+        if score == post.get("hot_score"):
+            continue
+
+        operations.append(
+            UpdateOne(
+                {
+                    "_id": post["_id"]
+                },
+                {
+                    "$set": {
+                        "hot_score": score
+                    }
+                },
+            )
+        )
+
+        if len(operations) >= batch_size:
+
+            posts.bulk_write(
+                operations,
+                ordered=False,
+            )
+
+            updated += len(operations)
+
+            operations = []
+
+    if operations:
+
+        posts.bulk_write(
+            operations,
+            ordered=False,
+        )
+
+        updated += len(operations)
+
+    if updated:
+        feed_cache.clear()
+
+    return {
+        "updated": updated,
+    }
+
+
 # =========================================================
 # COMMUNITY FEED
 # =========================================================
@@ -129,9 +270,21 @@ def feed(
     category=None,
     hub=None,
     limit=30,
+    cursor=None,
+    sort="new",
 ):
     """
-    Return published community posts.
+    Return one page of published community posts as
+    (posts, meta). Pass meta["next_cursor"] back as `cursor`
+    for the next page.
+
+    sort:
+
+        new   newest first (default)
+        hot   engagement + recency, see models.hot_score
+
+    The first pages of each view are served from the
+    in-process feed cache.
 
     Community supports:
 
@@ -172,20 +325,57 @@ def feed(
             .lower()
         )
 
-    documents = (
-        collection(
-            "jumuiya_community_posts"
-        )
-        .find(query)
-        .sort(
-            "created_at",
-            -1,
+    sort = str(
+        sort or "new"
+    ).strip().lower()
+
+    if sort not in SORT_FIELDS:
+        raise APIError(
+            "sort must be new or hot.",
+            422,
+            "invalid_sort",
         )
-        .limit(limit)
+
+    source = collection(
+        "jumuiya_community_posts",
+        read_only=True,
+    )
+
+    cached = feed_cache.page(
+        source,
+        query.get("hub"),
+        query.get("category"),
+        sort,
+        cursor,
+        limit,
+        serialize,
     )
 
-    return serialize_many(
-        documents
+    if cached is not None:
+
+        posts, next_cursor = cached
+
+    else:
+
+        documents, next_cursor = paginate_keyset(
+            source,
+            query,
+            SORT_FIELDS[sort],
+            cursor=cursor,
+            limit=limit,
+        )
+
+        posts = serialize_many(
+            documents
+        )
+
+    return (
+        posts,
+        cursor_meta(
+            limit,
+            next_cursor,
+            cursor,
+        ),
     )
 
 
@@ -326,6 +516,10 @@ def update_post(
             "post_not_found",
         )
 
+    feed_cache.upsert(
+        document
+    )
+
     log_action(
         user_id,
         "community.post.updated",
@@ -379,6 +573,10 @@ def delete_post(
             "post_not_found",
         )
 
+    feed_cache.remove(
+        cid(post_id)
+    )
+
     log_action(
         user_id,
         "community.post.deleted",
@@ -460,27 +658,45 @@ def add_comment(
         "updated_at": now_utc(),
     }
 
-    result = collection(
-        "jumuiya_community_comments"
-    ).insert_one(
-        document
+    def _insert(session):
+
+        result = collection(
+            "jumuiya_community_comments"
+        ).insert_one(
+            document,
+            session=session,
+        )
+
+        updated_post = collection(
+            "jumuiya_community_posts"
+        ).find_one_and_update(
+            {
+                "_id": post_id
+            },
+            {
+                "$inc": {
+                    "comments_count": 1
+                }
+            },
+            return_document=ReturnDocument.AFTER,
+            session=session,
+        )
+
+        return (
+            result,
+            updated_post,
+        )
+
+    result, updated_post = run_in_transaction(
+        _insert
     )
 
     document["_id"] = (
         result.inserted_id
     )
 
-    collection(
-        "jumuiya_community_posts"
-    ).update_one(
-        {
-            "_id": post_id
-        },
-        {
-            "$inc": {
-                "comments_count": 1
-            }
-        },
+    _rerank(
+        updated_post
     )
 
     log_action(
@@ -506,8 +722,19 @@ def add_comment(
 
 def comments(
     post_id,
-    limit=100,
+    limit=50,
+    cursor=None,
+    order="oldest",
 ):
+    """
+    Return one page of a post's comments as (comments, meta).
+
+    order:
+
+        oldest   conversation order (default)
+        newest   latest first
+    """
+
     post_id = cid(
         post_id
     )
@@ -518,51 +745,139 @@ def comments(
         TypeError,
         ValueError,
     ):
-        limit = 100
+        limit = 50
 
     limit = max(
         1,
         min(limit, 200),
     )
 
-    documents = (
-        collection(
-            "jumuiya_community_comments"
-        )
-        .find(
-            {
-                "post_id": str(
-                    post_id
-                ),
-                "status": "published",
-            }
-        )
-        .sort(
-            "created_at",
-            1,
+    order = str(
+        order or "oldest"
+    ).strip().lower()
+
+    if order not in {
+        "oldest",
+        "newest",
+    }:
+        raise APIError(
+            "order must be oldest or newest.",
+            422,
+            "invalid_order",
         )
-        .limit(limit)
+
+    documents, next_cursor = paginate_keyset(
+        collection(
+            "jumuiya_community_comments",
+            read_only=True,
+        ),
+        {
+            "post_id": str(
+                post_id
+            ),
+            "status": "published",
+        },
+        "created_at",
+        direction=(
+            1
+            if order == "oldest"
+            else -1
+        ),
+        cursor=cursor,
+        limit=limit,
     )
 
-    return serialize_many(
-        documents
+    return (
+        serialize_many(
+            documents
+        ),
+        cursor_meta(
+            limit,
+            next_cursor,
+            cursor,
+        ),
     )
 
 
 # =========================================================
-# LIKE / UNLIKE
+# REACTIONS
 # =========================================================
 
+def _reaction_update(
+    added=None,
+    removed=None,
+):
+    """
+    Counter `$inc` for a reaction being added, removed or
+    switched from one type to another.
+    """
+
+    increments = {}
+
+    if added:
+
+        increments[
+            f"reaction_counts.{added}"
+        ] = 1
+
+    if removed:
+
+        increments[
+            f"reaction_counts.{removed}"
+        ] = increments.get(
+            f"reaction_counts.{removed}",
+            0,
+        ) - 1
+
+    # likes_count predates reaction_counts and is still
+    # read by older clients.
+    likes = (
+        (added == "like")
+        - (removed == "like")
+    )
+
+    if likes:
+        increments["likes_count"] = likes
+
+    return {
+        "$inc": increments
+    }
+
+
 def react(
     user_id,
     post_id,
+    reaction="like",
 ):
     """
-    Toggle a user's like on a post.
+    Toggle a user's reaction on a post.
 
-    One reaction per user per post.
+    One reaction per user per post, enforced by the unique
+    (post_id, user_id) index on jumuiya_community_reactions:
+
+        no reaction        -> add `reaction`
+        same reaction      -> remove it
+        different reaction -> switch to `reaction`
+
+    Each branch is a single conditional write, and the post
+    counters are only touched when that write actually
+    changed something, so retries and double taps cannot
+    skew the counts. The reaction write and the counter
+    update share one transaction (as in add_comment), so a
+    failure between them cannot leave the counts off.
     """
 
+    reaction = str(
+        reaction or "like"
+    ).strip().lower()
+
+    if reaction not in REACTION_TYPES:
+        raise APIError(
+            "Unsupported reaction.",
+            422,
+            "invalid_reaction",
+        )
+
     post_id = cid(
         post_id
     )
@@ -579,7 +894,10 @@ def react(
         {
             "_id": post_id,
             "status": "published",
-        }
+        },
+        {
+            "_id": 1,
+        },
     )
 
     if not post:
@@ -589,102 +907,281 @@ def react(
             "post_not_found",
         )
 
-    user_id = str(
-        user_id
-    )
+    key = {
+        "post_id": str(
+            post_id
+        ),
+        "user_id": str(
+            user_id
+        ),
+    }
 
-    existing = reactions.find_one(
-        {
-            "post_id": str(
-                post_id
-            ),
-            "user_id": user_id,
-        }
-    )
+    def _react(session):
 
-    if existing:
+        added = None
+        removed = None
 
-        reactions.delete_one(
+        # Same reaction again: toggle off. Legacy reactions
+        # have no type; they were likes.
+        if reactions.find_one_and_delete(
             {
-                "_id": existing["_id"]
-            }
-        )
+                **key,
+                "type": (
+                    {
+                        "$in": [
+                            reaction,
+                            None,
+                        ]
+                    }
+                    if reaction == "like"
+                    else reaction
+                ),
+            },
+            session=session,
+        ):
 
-        posts.update_one(
-            {
-                "_id": post_id,
-                "likes_count": {
-                    "$gt": 0
+            removed = reaction
+
+        else:
+
+            switched = reactions.find_one_and_update(
+                {
+                    **key,
+                    "type": {
+                        "$ne": reaction
+                    },
                 },
-            },
+                {
+                    "$set": {
+                        "type": reaction,
+                        "updated_at": now_utc(),
+                    }
+                },
+                return_document=ReturnDocument.BEFORE,
+                session=session,
+            )
+
+            if switched:
+
+                added = reaction
+
+                removed = switched.get(
+                    "type"
+                ) or "like"
+
+            else:
+
+                reactions.insert_one(
+                    {
+                        **key,
+                        "type": reaction,
+                        "created_at": now_utc(),
+                    },
+                    session=session,
+                )
+
+                added = reaction
+
+        updated_post = posts.find_one_and_update(
             {
-                "$inc": {
-                    "likes_count": -1
-                }
+                "_id": post_id
             },
+            _reaction_update(
+                added,
+                removed,
+            ),
+            return_document=ReturnDocument.AFTER,
+            session=session,
         )
 
-        liked = False
+        return (
+            added,
+            removed,
+            updated_post,
+        )
 
-    else:
+    try:
 
-        try:
+        added, removed, updated_post = run_in_transaction(
+            _react
+        )
 
-            reactions.insert_one(
-                {
-                    "post_id": str(
-                        post_id
-                    ),
-                    "user_id": user_id,
-                    "created_at": now_utc(),
-                }
-            )
+        updated_post = _rerank(
+            updated_post
+        )
 
-        except Exception:
-            # Handles duplicate reaction attempts
-            # safely under concurrent requests.
-            existing = reactions.find_one(
-                {
-                    "post_id": str(
-                        post_id
-                    ),
-                    "user_id": user_id,
-                }
-            )
+    except DuplicateKeyError:
+        # A concurrent request from the same user already
+        # recorded this reaction; the duplicate insert
+        # aborted the transaction, so nothing changed.
+        added = reaction
+        removed = None
 
-            if existing:
-                liked = True
+        updated_post = posts.find_one(
+            {
+                "_id": post_id
+            }
+        )
 
-            else:
-                raise
+    updated_post = updated_post or {}
 
-        posts.update_one(
+    current = (
+        None
+        if removed and not added
+        else reaction
+    )
+
+    return {
+        "liked": current == "like",
+        "reaction": current,
+        "likes_count": updated_post.get(
+            "likes_count",
+            0,
+        ),
+        "reaction_counts": updated_post.get(
+            "reaction_counts",
+            {},
+        ),
+    }
+
+
+# =========================================================
+# COUNTER RECONCILIATION
+# =========================================================
+
+def reconcile_post_counters():
+    """
+    Recount comments and reactions for every post and
+    repair any denormalized counter that drifted. Runs
+    nightly, before the hot scores are recomputed.
+    """
+
+    posts = collection(
+        "jumuiya_community_posts"
+    )
+
+    comment_counts = {
+        row["_id"]: row["count"]
+        for row in collection(
+            "jumuiya_community_comments"
+        ).aggregate([
             {
-                "_id": post_id
+                "$match": {
+                    "status": "published",
+                }
             },
             {
-                "$inc": {
-                    "likes_count": 1
+                "$group": {
+                    "_id": "$post_id",
+                    "count": {
+                        "$sum": 1
+                    },
                 }
             },
-        )
+        ])
+    }
 
-        liked = True
+    reaction_counts = {}
 
-    updated_post = posts.find_one(
+    for row in collection(
+        "jumuiya_community_reactions"
+    ).aggregate([
         {
-            "_id": post_id
-        }
-    )
+            "$group": {
+                "_id": {
+                    "post_id": "$post_id",
+                    "type": {
+                        "$ifNull": [
+                            "$type",
+                            "like",
+                        ]
+                    },
+                },
+                "count": {
+                    "$sum": 1
+                },
+            }
+        },
+    ]):
 
-    return {
-        "liked": liked,
-        "likes_count": (
-            updated_post.get(
-                "likes_count",
+        reaction_counts.setdefault(
+            row["_id"]["post_id"],
+            {},
+        )[row["_id"]["type"]] = row["count"]
+
+    operations = []
+
+    for post in posts.find(
+        {},
+        {
+            "comments_count": 1,
+            "likes_count": 1,
+            "reaction_counts": 1,
+        },
+    ):
+
+        post_key = str(
+            post["_id"]
+        )
+
+        expected = {
+            "comments_count": comment_counts.get(
+                post_key,
                 0,
+            ),
+            "reaction_counts": reaction_counts.get(
+                post_key,
+                {},
+            ),
+        }
+
+        expected["likes_count"] = expected[
+            "reaction_counts"
+        ].get(
+            "like",
+            0,
+        )
+
+        stored_reactions = {
+            name: count
+            for name, count in (
+                post.get("reaction_counts") or {}
+            ).items()
+            if count
+        }
+
+        if (
+            post.get("comments_count") == expected["comments_count"]
+            and post.get("likes_count") == expected["likes_count"]
+            and stored_reactions == expected["reaction_counts"]
+        ):
+            continue
+
+        operations.append(
+            UpdateOne(
+                {
+                    "_id": post["_id"]
+                },
+                {
+                    "$set": expected
+                },
             )
-            if updated_post
-            else 0
-        ),
-    }
\ No newline at end of file
+        )
+
+    for start in range(
+        0,
+        len(operations),
+        500,
+    ):
+
+        posts.bulk_write(
+            operations[start:start + 500],
+            ordered=False,
+        )
+
+    if operations:
+        feed_cache.clear()
+
+    return {
+        "updated": len(operations),
+    }
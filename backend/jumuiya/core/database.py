@@ -2,9 +2,19 @@
 
 from __future__ import annotations
 
-from pymongo import ASCENDING, DESCENDING
+import hashlib
+import json
+import logging
+import os
 
-from backend.db import get_db
+from datetime import datetime, timezone
+
+from pymongo import ASCENDING, DESCENDING, GEOSPHERE, TEXT, IndexModel
+
+from backend.db import get_db, get_read_db
+
+
+logger = logging.getLogger("jumuiya.database")
 
 
 # =========================================================
@@ -18,7 +28,10 @@ JUMUIYA_PREFIX = "jumuiya_"
 # DATABASE / COLLECTION
 # =========================================================
 
-def collection(name: str):
+def collection(
+    name: str,
+    read_only: bool = False,
+):
     """
     Return a Jumuiya collection from the existing RevelaCode
     MongoDB database.
@@ -26,6 +39,9 @@ def collection(name: str):
     Jumuiya uses the SAME MongoDB database as RevelaCode,
     while keeping its own collections under the `jumuiya_`
     namespace.
+
+    Pass read_only=True for list/feed reads that can be
+    served by a secondary (MONGO_READ_ONLY_PREFERENCE).
     """
 
     if not name:
@@ -41,400 +57,994 @@ def collection(name: str):
             "the 'jumuiya_' prefix."
         )
 
+    if read_only:
+        return get_read_db()[name]
+
     return get_db()[name]
 
 
 # =========================================================
-# INDEXES
+# TRANSACTIONS
 # =========================================================
 
-def ensure_indexes():
+def supports_transactions():
     """
-    Create all indexes required by the Jumuiya platform.
+    Whether multi-document transactions can be used.
 
-    Jumuiya shares the existing RevelaCode MongoDB
-    connection/database.
+    JUMUIYA_TRANSACTIONS:
+
+        auto   (default) use them on replica sets/sharded
+               clusters, e.g. MongoDB Atlas
+        true   always
+        false  never
     """
 
-    db = get_db()
+    mode = os.getenv(
+        "JUMUIYA_TRANSACTIONS",
+        "auto",
+    ).strip().lower()
 
-    # =====================================================
-    # SHARED JUMUIYA CORE
-    # =====================================================
+    if mode in ("true", "false"):
+        return mode == "true"
+
+    try:
+
+        topology = (
+            get_db()
+            .client
+            .topology_description
+            .topology_type_name
+        )
+
+    except AttributeError:
+        return False
+
+    return topology in (
+        "ReplicaSetWithPrimary",
+        "Sharded",
+    )
 
-    db["jumuiya_profiles"].create_index(
+
+def run_in_transaction(callback):
+    """
+    Run `callback(session)` inside a multi-document
+    transaction when the deployment supports it, otherwise
+    call `callback(None)`.
+
+    Callbacks must pass `session=session` to every
+    operation and may be retried on transient errors.
+    """
+
+    if not supports_transactions():
+        return callback(None)
+
+    with get_db().client.start_session() as session:
+
+        return session.with_transaction(
+            callback
+        )
+
+
+# =========================================================
+# INDEX SPECIFICATIONS
+# =========================================================
+#
+# Every index required by the Jumuiya platform, declared as:
+#
+#     (collection, keys, options)
+#
+# The schema version is derived from this list, so adding or
+# changing an index automatically triggers a bootstrap on the
+# next deployment, while unchanged deployments skip it.
+# =========================================================
+
+INDEX_SPECS = [
+
+    # -----------------------------------------------------
+    # SHARED JUMUIYA CORE
+    # -----------------------------------------------------
+    (
+        "jumuiya_profiles",
         [
             ("user_id", ASCENDING),
         ],
-        unique=True,
-    )
+        {"unique": True},
+    ),
 
-    db["jumuiya_transactions"].create_index(
+    (
+        "jumuiya_transactions",
         [
             ("user_id", ASCENDING),
             ("created_at", DESCENDING),
-        ]
-    )
+            ("_id", DESCENDING),
+        ],
+        {},
+    ),
+
+    (
+        "jumuiya_wallet_balances",
+        [
+            ("user_id", ASCENDING),
+        ],
+        {},
+    ),
 
-    db["jumuiya_roles"].create_index(
+    (
+        "jumuiya_roles",
         [
             ("user_id", ASCENDING),
             ("role", ASCENDING),
         ],
-        unique=True,
-    )
+        {"unique": True},
+    ),
 
-    db["jumuiya_notifications"].create_index(
+    (
+        "jumuiya_notifications",
         [
             ("user_id", ASCENDING),
             ("created_at", DESCENDING),
-        ]
-    )
+            ("_id", DESCENDING),
+        ],
+        {},
+    ),
 
-    db["jumuiya_audit_logs"].create_index(
+    (
+        "jumuiya_audit_logs",
         [
             ("user_id", ASCENDING),
             ("created_at", DESCENDING),
-        ]
-    )
+        ],
+        {},
+    ),
 
-    db["jumuiya_audit_logs"].create_index(
+    (
+        "jumuiya_audit_logs",
         [
             ("resource", ASCENDING),
             ("resource_id", ASCENDING),
             ("created_at", DESCENDING),
-        ]
-    )
+        ],
+        {},
+    ),
 
-    db["jumuiya_audit_logs"].create_index(
+    (
+        "jumuiya_audit_logs",
         [
             ("action", ASCENDING),
             ("created_at", DESCENDING),
-        ]
-    )
+        ],
+        {},
+    ),
 
-    # =====================================================
+    # -----------------------------------------------------
     # COMMUNITY
-    # =====================================================
-
-    db["jumuiya_community_posts"].create_index(
+    # -----------------------------------------------------
+    (
+        "jumuiya_community_posts",
         [
             ("status", ASCENDING),
             ("created_at", DESCENDING),
-        ]
-    )
+            ("_id", DESCENDING),
+        ],
+        {},
+    ),
 
-    db["jumuiya_community_posts"].create_index(
+    (
+        "jumuiya_community_posts",
         [
             ("category", ASCENDING),
             ("created_at", DESCENDING),
-        ]
-    )
+            ("_id", DESCENDING),
+        ],
+        {},
+    ),
 
-    db["jumuiya_community_posts"].create_index(
+    (
+        "jumuiya_community_posts",
         [
             ("hub", ASCENDING),
             ("created_at", DESCENDING),
-        ]
-    )
+            ("_id", DESCENDING),
+        ],
+        {},
+    ),
+
+    (
+        "jumuiya_community_posts",
+        [
+            ("status", ASCENDING),
+            ("hot_score", DESCENDING),
+            ("_id", DESCENDING),
+        ],
+        {},
+    ),
+
+    (
+        "jumuiya_community_posts",
+        [
+            ("hub", ASCENDING),
+            ("hot_score", DESCENDING),
+            ("_id", DESCENDING),
+        ],
+        {},
+    ),
 
-    db["jumuiya_community_comments"].create_index(
+    (
+        "jumuiya_community_comments",
         [
             ("post_id", ASCENDING),
+            ("status", ASCENDING),
             ("created_at", DESCENDING),
-        ]
-    )
+            ("_id", DESCENDING),
+        ],
+        {},
+    ),
 
-    db["jumuiya_community_comments"].create_index(
+    (
+        "jumuiya_community_comments",
         [
             ("author_user_id", ASCENDING),
             ("created_at", DESCENDING),
-        ]
-    )
+        ],
+        {},
+    ),
 
-    db["jumuiya_community_reactions"].create_index(
+    (
+        "jumuiya_community_reactions",
         [
             ("post_id", ASCENDING),
             ("user_id", ASCENDING),
         ],
-        unique=True,
-    )
+        {"unique": True},
+    ),
 
-    # =====================================================
+    # -----------------------------------------------------
     # MARKETPLACE
-    # =====================================================
-
-    db["jumuiya_marketplace_listings"].create_index(
+    # -----------------------------------------------------
+    (
+        "jumuiya_marketplace_listings",
         [
             ("status", ASCENDING),
             ("created_at", DESCENDING),
-        ]
-    )
+            ("_id", DESCENDING),
+        ],
+        {},
+    ),
 
-    db["jumuiya_marketplace_listings"].create_index(
+    (
+        "jumuiya_marketplace_listings",
         [
             ("hub", ASCENDING),
             ("category", ASCENDING),
             ("created_at", DESCENDING),
-        ]
-    )
+            ("_id", DESCENDING),
+        ],
+        {},
+    ),
 
-    db["jumuiya_marketplace_listings"].create_index(
+    (
+        "jumuiya_marketplace_listings",
         [
             ("seller_user_id", ASCENDING),
             ("created_at", DESCENDING),
-        ]
-    )
+        ],
+        {},
+    ),
 
-    # =====================================================
-    # BIASHARA
-    # =====================================================
+    (
+        "jumuiya_marketplace_listings",
+        [
+            ("status", ASCENDING),
+            ("category", ASCENDING),
+            ("price", ASCENDING),
+            ("_id", ASCENDING),
+        ],
+        {},
+    ),
 
-    db["jumuiya_businesses"].create_index(
+    (
+        "jumuiya_marketplace_listings",
+        [
+            ("status", ASCENDING),
+            ("hub", ASCENDING),
+            ("price", ASCENDING),
+            ("_id", ASCENDING),
+        ],
+        {},
+    ),
+
+    (
+        "jumuiya_marketplace_listings",
+        [
+            ("status", ASCENDING),
+            ("county", ASCENDING),
+            ("created_at", DESCENDING),
+            ("_id", DESCENDING),
+        ],
+        {},
+    ),
+
+    (
+        "jumuiya_marketplace_listings",
+        [
+            ("title", TEXT),
+            ("category", TEXT),
+            ("description", TEXT),
+        ],
+        {
+            "name": "listing_search",
+            "weights": {
+                "title": 10,
+                "category": 5,
+                "description": 1,
+            },
+            # Listings mix English and Swahili; English
+            # stemming would mangle Swahili words.
+            "default_language": "none",
+        },
+    ),
+
+    (
+        "jumuiya_marketplace_listings",
+        [
+            ("geo", GEOSPHERE),
+        ],
+        {},
+    ),
+
+    # -----------------------------------------------------
+    # BIASHARA
+    # -----------------------------------------------------
+    (
+        "jumuiya_businesses",
         [
             ("owner_user_id", ASCENDING),
         ],
-        unique=True,
-    )
+        {"unique": True},
+    ),
 
-    db["jumuiya_businesses"].create_index(
+    (
+        "jumuiya_businesses",
         [
             ("slug", ASCENDING),
         ],
-        unique=True,
-    )
+        {"unique": True},
+    ),
 
-    db["jumuiya_businesses"].create_index(
+    (
+        "jumuiya_businesses",
         [
             ("county", ASCENDING),
             ("category", ASCENDING),
             ("status", ASCENDING),
-        ]
-    )
+        ],
+        {},
+    ),
 
-    db["jumuiya_products"].create_index(
+    (
+        "jumuiya_products",
         [
             ("business_id", ASCENDING),
             ("status", ASCENDING),
-        ]
-    )
+        ],
+        {},
+    ),
 
-    db["jumuiya_products"].create_index(
+    (
+        "jumuiya_products",
         [
             ("business_id", ASCENDING),
             ("category", ASCENDING),
             ("status", ASCENDING),
-        ]
-    )
+        ],
+        {},
+    ),
 
-    db["jumuiya_products"].create_index(
+    (
+        "jumuiya_products",
         [
             ("business_id", ASCENDING),
             ("sku", ASCENDING),
-        ]
-    )
+        ],
+        {},
+    ),
 
-    db["jumuiya_customers"].create_index(
+    (
+        "jumuiya_products",
         [
             ("business_id", ASCENDING),
+            ("status", ASCENDING),
             ("created_at", DESCENDING),
-        ]
-    )
+            ("_id", DESCENDING),
+        ],
+        {},
+    ),
 
-    db["jumuiya_orders"].create_index(
+    (
+        "jumuiya_customers",
         [
             ("business_id", ASCENDING),
             ("created_at", DESCENDING),
-        ]
-    )
+            ("_id", DESCENDING),
+        ],
+        {},
+    ),
+
+    (
+        "jumuiya_orders",
+        [
+            ("business_id", ASCENDING),
+            ("created_at", DESCENDING),
+            ("_id", DESCENDING),
+        ],
+        {},
+    ),
 
-    db["jumuiya_orders"].create_index(
+    (
+        "jumuiya_orders",
         [
             ("business_id", ASCENDING),
             ("status", ASCENDING),
             ("created_at", DESCENDING),
-        ]
-    )
+            ("_id", DESCENDING),
+        ],
+        {},
+    ),
 
-    db["jumuiya_sales"].create_index(
+    (
+        "jumuiya_sales",
         [
             ("business_id", ASCENDING),
             ("sold_at", DESCENDING),
-        ]
-    )
+        ],
+        {},
+    ),
 
-    db["jumuiya_expenses"].create_index(
+    (
+        "jumuiya_expenses",
         [
             ("business_id", ASCENDING),
             ("spent_at", DESCENDING),
-        ]
-    )
+            ("_id", DESCENDING),
+        ],
+        {},
+    ),
 
-    db["jumuiya_inventory_movements"].create_index(
+    (
+        "jumuiya_inventory_movements",
         [
             ("business_id", ASCENDING),
             ("product_id", ASCENDING),
             ("created_at", DESCENDING),
-        ]
-    )
+        ],
+        {},
+    ),
 
-    # =====================================================
-    # SHAMBA
-    # =====================================================
+    (
+        "jumuiya_products",
+        [
+            ("business_id", ASCENDING),
+            ("status", ASCENDING),
+            ("stock_quantity", ASCENDING),
+        ],
+        {},
+    ),
+
+    (
+        "jumuiya_business_stats",
+        [
+            ("business_id", ASCENDING),
+            ("period", ASCENDING),
+            ("bucket", DESCENDING),
+        ],
+        {},
+    ),
 
-    db["jumuiya_farmers"].create_index(
+    # -----------------------------------------------------
+    # SHAMBA
+    # -----------------------------------------------------
+    (
+        "jumuiya_farmers",
         [
             ("user_id", ASCENDING),
         ],
-        unique=True,
-    )
+        {"unique": True},
+    ),
 
-    db["jumuiya_farms"].create_index(
+    (
+        "jumuiya_farms",
         [
             ("owner_user_id", ASCENDING),
             ("created_at", DESCENDING),
-        ]
-    )
+        ],
+        {},
+    ),
 
-    db["jumuiya_farms"].create_index(
+    (
+        "jumuiya_farms",
         [
             ("county", ASCENDING),
             ("status", ASCENDING),
-        ]
-    )
+        ],
+        {},
+    ),
 
-    db["jumuiya_crops"].create_index(
+    (
+        "jumuiya_crops",
         [
             ("farm_id", ASCENDING),
             ("status", ASCENDING),
-        ]
-    )
+        ],
+        {},
+    ),
 
-    db["jumuiya_crops"].create_index(
+    (
+        "jumuiya_crops",
         [
             ("owner_user_id", ASCENDING),
             ("created_at", DESCENDING),
-        ]
-    )
+        ],
+        {},
+    ),
 
-    db["jumuiya_farm_activities"].create_index(
+    (
+        "jumuiya_farm_activities",
         [
             ("farm_id", ASCENDING),
             ("created_at", DESCENDING),
-        ]
-    )
+            ("_id", DESCENDING),
+        ],
+        {},
+    ),
 
-    db["jumuiya_harvests"].create_index(
+    (
+        "jumuiya_harvests",
         [
             ("farm_id", ASCENDING),
             ("created_at", DESCENDING),
-        ]
-    )
+            ("_id", DESCENDING),
+        ],
+        {},
+    ),
 
-    db["jumuiya_harvests"].create_index(
+    (
+        "jumuiya_harvests",
         [
             ("owner_user_id", ASCENDING),
             ("market_status", ASCENDING),
             ("created_at", DESCENDING),
-        ]
-    )
+        ],
+        {},
+    ),
 
-    db["jumuiya_market_prices"].create_index(
+    (
+        "jumuiya_farm_activities",
+        [
+            ("owner_user_id", ASCENDING),
+            ("created_at", DESCENDING),
+        ],
+        {},
+    ),
+
+    (
+        "jumuiya_farm_stats",
+        [
+            ("user_id", ASCENDING),
+            ("scope", ASCENDING),
+            ("farm_id", ASCENDING),
+            ("season", DESCENDING),
+        ],
+        {},
+    ),
+
+    (
+        "jumuiya_market_prices",
         [
             ("crop", ASCENDING),
             ("county", ASCENDING),
             ("created_at", DESCENDING),
-        ]
-    )
+        ],
+        {},
+    ),
 
-    # =====================================================
+    # -----------------------------------------------------
     # ELIMU
-    # =====================================================
-
-    db["jumuiya_education_profiles"].create_index(
+    # -----------------------------------------------------
+    (
+        "jumuiya_education_profiles",
         [
             ("user_id", ASCENDING),
         ],
-        unique=True,
-    )
+        {"unique": True},
+    ),
 
-    db["jumuiya_education_profiles"].create_index(
+    (
+        "jumuiya_education_profiles",
         [
             ("profile_type", ASCENDING),
             ("status", ASCENDING),
-        ]
-    )
+        ],
+        {},
+    ),
+
+    (
+        "jumuiya_education_profiles",
+        [
+            ("school_id", ASCENDING),
+            ("class_name", ASCENDING),
+            ("profile_type", ASCENDING),
+            ("full_name", ASCENDING),
+        ],
+        {},
+    ),
 
-    db["jumuiya_schools"].create_index(
+    (
+        "jumuiya_schools",
         [
             ("owner_user_id", ASCENDING),
         ],
-        unique=True,
-    )
+        {"unique": True},
+    ),
 
-    db["jumuiya_schools"].create_index(
+    (
+        "jumuiya_schools",
         [
             ("county", ASCENDING),
             ("status", ASCENDING),
-        ]
-    )
+        ],
+        {},
+    ),
 
-    db["jumuiya_classes"].create_index(
+    (
+        "jumuiya_classes",
         [
             ("school_id", ASCENDING),
             ("status", ASCENDING),
-        ]
-    )
+            ("created_at", DESCENDING),
+            ("_id", DESCENDING),
+        ],
+        {},
+    ),
 
-    db["jumuiya_lessons"].create_index(
+    (
+        "jumuiya_lessons",
         [
             ("subject", ASCENDING),
             ("created_at", DESCENDING),
-        ]
-    )
+            ("_id", DESCENDING),
+        ],
+        {},
+    ),
 
-    db["jumuiya_lessons"].create_index(
+    (
+        "jumuiya_lessons",
+        [
+            ("created_at", DESCENDING),
+            ("_id", DESCENDING),
+        ],
+        {},
+    ),
+
+    (
+        "jumuiya_lessons",
         [
             ("school_id", ASCENDING),
             ("created_at", DESCENDING),
-        ]
-    )
+        ],
+        {},
+    ),
 
-    db["jumuiya_assignments"].create_index(
+    (
+        "jumuiya_assignments",
         [
             ("school_id", ASCENDING),
             ("class_name", ASCENDING),
             ("created_at", DESCENDING),
-        ]
-    )
+        ],
+        {},
+    ),
 
-    db["jumuiya_fees"].create_index(
+    (
+        "jumuiya_assignments",
+        [
+            ("class_name", ASCENDING),
+            ("created_at", DESCENDING),
+            ("_id", DESCENDING),
+        ],
+        {},
+    ),
+
+    (
+        "jumuiya_assignments",
+        [
+            ("teacher_user_id", ASCENDING),
+            ("class_name", ASCENDING),
+        ],
+        {},
+    ),
+
+    (
+        "jumuiya_fees",
         [
             ("student_user_id", ASCENDING),
             ("created_at", DESCENDING),
-        ]
-    )
+        ],
+        {},
+    ),
 
-    db["jumuiya_fees"].create_index(
+    (
+        "jumuiya_fees",
         [
             ("school_id", ASCENDING),
             ("status", ASCENDING),
             ("created_at", DESCENDING),
-        ]
-    )
+        ],
+        {},
+    ),
 
-    db["jumuiya_cbc_projects"].create_index(
+    (
+        "jumuiya_cbc_projects",
         [
             ("student_user_id", ASCENDING),
             ("created_at", DESCENDING),
-        ]
-    )
+        ],
+        {},
+    ),
 
-    db["jumuiya_cbc_projects"].create_index(
+    (
+        "jumuiya_cbc_projects",
         [
             ("school_id", ASCENDING),
             ("created_at", DESCENDING),
-        ]
+        ],
+        {},
+    ),
+]
+
+
+SCHEMA_META_COLLECTION = "jumuiya_schema_meta"
+
+SCHEMA_META_ID = "indexes"
+
+
+# =========================================================
+# SCHEMA VERSION
+# =========================================================
+
+def schema_version(specs=None):
+    """
+    Stable fingerprint of the declared index specifications.
+    """
+
+    specs = (
+        INDEX_SPECS
+        if specs is None
+        else specs
+    )
+
+    canonical = json.dumps(
+        [
+            [
+                name,
+                [list(key) for key in keys],
+                options,
+            ]
+            for name, keys, options in specs
+        ],
+        sort_keys=True,
+        default=str,
+    )
+
+    return hashlib.sha256(
+        canonical.encode("utf-8")
+    ).hexdigest()[:16]
+
+
+# =========================================================
+# INDEX BOOTSTRAP
+# =========================================================
+
+def _normalize_keys(keys):
+
+    return tuple(
+        (
+            str(field),
+            (
+                int(direction)
+                if isinstance(direction, (int, float))
+                else str(direction)
+            ),
+        )
+        for field, direction in keys
+    )
+
+
+def missing_indexes(
+    specs,
+    existing_collections,
+    existing_indexes,
+):
+    """
+    Return {collection: [IndexModel, ...]} for every spec
+    that is not already present.
+
+    existing_indexes maps collection name to the output of
+    `index_information()`. An index counts as present when
+    either its name or its key pattern already exists.
+    """
+
+    missing = {}
+
+    for name, keys, options in specs:
+
+        model = IndexModel(
+            keys,
+            **options,
+        )
+
+        if name in existing_collections:
+
+            information = existing_indexes.get(
+                name,
+                {},
+            )
+
+            names = set(information)
+
+            patterns = {
+                _normalize_keys(
+                    index.get("key", [])
+                )
+                for index in information.values()
+            }
+
+            if (
+                model.document["name"] in names
+                or _normalize_keys(keys) in patterns
+            ):
+                continue
+
+        missing.setdefault(
+            name,
+            [],
+        ).append(model)
+
+    return missing
+
+
+def bootstrap_schema(
+    force=False,
+    specs=None,
+    meta_id=SCHEMA_META_ID,
+):
+    """
+    Create any missing Jumuiya indexes.
+
+    Other modules sharing the database can pass their own
+    `specs` (same shape as INDEX_SPECS) with a `meta_id` of
+    their own, so their version is tracked separately.
+
+    - Skips entirely when the recorded schema version
+      matches the specs (unless forced).
+    - Fetches collection names once and existing indexes
+      once per collection.
+    - Creates only the missing indexes, one
+      `create_indexes` batch per collection.
+
+    Returns a summary dictionary.
+    """
+
+    db = get_db()
+
+    specs = (
+        INDEX_SPECS
+        if specs is None
+        else specs
+    )
+
+    version = schema_version(
+        specs
+    )
+
+    meta = db[SCHEMA_META_COLLECTION]
+
+    force = force or os.getenv(
+        "JUMUIYA_SCHEMA_FORCE",
+        "false",
+    ).strip().lower() == "true"
+
+    if not force:
+
+        recorded = meta.find_one(
+            {
+                "_id": meta_id,
+            }
+        )
+
+        if (
+            recorded
+            and recorded.get("version") == version
+        ):
+
+            return {
+                "version": version,
+                "skipped": True,
+                "created": 0,
+            }
+
+    existing_collections = set(
+        db.list_collection_names()
+    )
+
+    existing_indexes = {
+        name: db[name].index_information()
+        for name in {
+            spec[0]
+            for spec in specs
+        }
+        if name in existing_collections
+    }
+
+    missing = missing_indexes(
+        specs,
+        existing_collections,
+        existing_indexes,
+    )
+
+    created = 0
+
+    for name, models in missing.items():
+
+        db[name].create_indexes(
+            models
+        )
+
+        created += len(models)
+
+        logger.info(
+            "Created %d index(es) on %s",
+            len(models),
+            name,
+        )
+
+    meta.update_one(
+        {
+            "_id": meta_id,
+        },
+        {
+            "$set": {
+                "version": version,
+                "index_count": len(specs),
+                "applied_at": datetime.now(
+                    timezone.utc
+                ),
+            },
+        },
+        upsert=True,
+    )
+
+    return {
+        "version": version,
+        "skipped": False,
+        "created": created,
+    }
+
+
+def ensure_indexes():
+    """
+    Create all indexes required by the Jumuiya platform.
+
+    Jumuiya shares the existing RevelaCode MongoDB
+    connection/database.
+    """
+
+    result = bootstrap_schema()
+
+    logger.info(
+        "Jumuiya schema %s | skipped=%s | created=%s",
+        result["version"],
+        result["skipped"],
+        result["created"],
     )
 
-    return True
\ No newline at end of file
+    return True
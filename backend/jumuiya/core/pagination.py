@@ -2,6 +2,14 @@
 
 from __future__ import annotations
 
+import base64
+import binascii
+
+from bson import json_util
+from flask import request
+
+from backend.jumuiya.core.errors import APIError
+
 
 # =========================================================
 # PAGINATION PARSER
@@ -204,4 +212,385 @@ def pagination_window(
     return {
         "from": start,
         "to": end,
-    }
\ No newline at end of file
+    }
+
+
+# =========================================================
+# KEYSET (CURSOR) PAGINATION
+# =========================================================
+#
+# Offset pagination makes the server walk and discard every
+# skipped document, so page 500 costs 500 pages. Keyset
+# pagination instead remembers where the previous page ended
+# (sort value + _id as a tie-breaker) and asks the index for
+# the documents after it, so every page costs the same.
+#
+# The cursor is opaque to clients: pass `next_cursor` back as
+# `?cursor=` to get the following page.
+# =========================================================
+
+def parse_cursor_pagination(
+    args,
+    default_limit=20,
+    max_limit=100,
+):
+    """
+    Parse cursor/limit query parameters safely.
+
+    Supported:
+
+        ?cursor=<next_cursor>&limit=20
+
+    Returns:
+
+        cursor   (None for the first page)
+        limit
+    """
+
+    _, limit, _ = parse_pagination(
+        args,
+        default_limit,
+        max_limit,
+    )
+
+    cursor = (
+        args.get(
+            "cursor"
+        )
+        or None
+    )
+
+    return (
+        cursor,
+        limit,
+    )
+
+
+def page_args(
+    default_limit=20,
+    max_limit=200,
+):
+    """
+    Read ?cursor=&limit= from the current request for a
+    keyset-paginated list. Returns (cursor, limit).
+    """
+
+    return parse_cursor_pagination(
+        request.args,
+        default_limit=default_limit,
+        max_limit=max_limit,
+    )
+
+
+def encode_cursor(
+    document,
+    sort_field,
+):
+    """
+    Encode the position just after `document`.
+    """
+
+    raw = json_util.dumps({
+        "v": document.get(
+            sort_field
+        ),
+        "id": document["_id"],
+    })
+
+    return base64.urlsafe_b64encode(
+        raw.encode("utf-8")
+    ).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor):
+    """
+    Return (sort_value, _id) from an encoded cursor.
+    """
+
+    try:
+
+        padded = cursor + (
+            "=" * (-len(cursor) % 4)
+        )
+
+        data = json_util.loads(
+            base64.urlsafe_b64decode(
+                padded.encode("ascii")
+            )
+        )
+
+        return (
+            data["v"],
+            data["id"],
+        )
+
+    except (
+        AttributeError,
+        TypeError,
+        ValueError,
+        KeyError,
+        UnicodeError,
+        binascii.Error,
+    ):
+
+        raise APIError(
+            "Invalid cursor.",
+            400,
+            "invalid_cursor",
+        )
+
+
+def keyset_filter(
+    cursor,
+    sort_field,
+    direction=-1,
+):
+    """
+    Query fragment selecting documents after the cursor in
+    (sort_field, _id) order.
+    """
+
+    value, object_id = decode_cursor(
+        cursor
+    )
+
+    operator = (
+        "$lt"
+        if direction < 0
+        else "$gt"
+    )
+
+    if sort_field == "_id":
+
+        return {
+            "_id": {
+                operator: object_id
+            },
+        }
+
+    return {
+        "$or": [
+            {
+                sort_field: {
+                    operator: value
+                },
+            },
+            {
+                sort_field: value,
+                "_id": {
+                    operator: object_id
+                },
+            },
+        ]
+    }
+
+
+def keyset_sort(
+    sort_field,
+    direction=-1,
+):
+    """
+    Sort specification matching keyset_filter.
+    """
+
+    if sort_field == "_id":
+
+        return [
+            (
+                "_id",
+                direction,
+            ),
+        ]
+
+    return [
+        (
+            sort_field,
+            direction,
+        ),
+        (
+            "_id",
+            direction,
+        ),
+    ]
+
+
+def paginate_keyset(
+    source,
+    query,
+    sort_field="created_at",
+    direction=-1,
+    cursor=None,
+    limit=20,
+    projection=None,
+):
+    """
+    Fetch one keyset page from a collection.
+
+    Indexes should end in (sort_field, _id) after the
+    equality fields of `query` so no page needs an in-memory
+    sort.
+
+    Returns:
+
+        documents
+        next_cursor   (None on the last page)
+    """
+
+    query = dict(
+        query
+    )
+
+    if cursor:
+
+        after = keyset_filter(
+            cursor,
+            sort_field,
+            direction,
+        )
+
+        if "$or" in after and "$or" in query:
+
+            query = {
+                "$and": [
+                    query,
+                    after,
+                ]
+            }
+
+        else:
+
+            query.update(
+                after
+            )
+
+    documents = list(
+        source
+        .find(
+            query,
+            projection,
+        )
+        .sort(
+            keyset_sort(
+                sort_field,
+                direction,
+            )
+        )
+        .limit(
+            limit + 1
+        )
+    )
+
+    if len(documents) <= limit:
+
+        return (
+            documents,
+            None,
+        )
+
+    documents = documents[:limit]
+
+    return (
+        documents,
+        encode_cursor(
+            documents[-1],
+            sort_field,
+        ),
+    )
+
+
+def paginate_pipeline(
+    source,
+    pipeline,
+    sort_field,
+    direction=-1,
+    cursor=None,
+    limit=20,
+    after=None,
+):
+    """
+    Keyset page over an aggregation whose sort key is
+    computed by `pipeline` (text score, $geoNear distance).
+
+    The keyset $match, $sort and $limit are appended after
+    `pipeline`, so the computed field can be used as the
+    cursor position like a stored one. Stages in `after`
+    run on the page only (projections, snippets).
+    """
+
+    stages = list(
+        pipeline
+    )
+
+    if cursor:
+
+        stages.append({
+            "$match": keyset_filter(
+                cursor,
+                sort_field,
+                direction,
+            ),
+        })
+
+    stages.extend([
+        {
+            "$sort": dict(
+                keyset_sort(
+                    sort_field,
+                    direction,
+                )
+            ),
+        },
+        {
+            "$limit": limit + 1,
+        },
+        *(after or []),
+    ])
+
+    documents = list(
+        source.aggregate(
+            stages
+        )
+    )
+
+    if len(documents) <= limit:
+
+        return (
+            documents,
+            None,
+        )
+
+    documents = documents[:limit]
+
+    return (
+        documents,
+        encode_cursor(
+            documents[-1],
+            sort_field,
+        ),
+    )
+
+
+def cursor_meta(
+    limit,
+    next_cursor,
+    cursor=None,
+):
+    """
+    Pagination metadata for keyset pages.
+
+    Shares limit/has_next/has_previous with page_meta so
+    clients can read either shape; totals are omitted because
+    counting would reintroduce the O(n) cost.
+    """
+
+    return {
+        "limit": max(
+            int(limit),
+            1,
+        ),
+        "has_next": next_cursor is not None,
+        "has_previous": bool(
+            cursor
+        ),
+        "next_cursor": next_cursor,
+    }
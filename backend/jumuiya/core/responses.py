@@ -158,4 +158,18 @@ def paginated(
         message=message,
         status_code=200,
         meta=meta,
-    )
\ No newline at end of file
+    )
+
+
+def paged(result):
+    """
+    Wrap an (items, meta) page from a keyset-paginated
+    service call in the standard response.
+    """
+
+    items, meta = result
+
+    return ok(
+        items,
+        meta=meta,
+    )
@@ -0,0 +1,137 @@
+# backend/jumuiya/elimu/roster_cache.py
+
+"""
+In-process class roster cache.
+
+A roster is the list of student profiles in one class of
+one school. Teachers load it for every register, assignment
+and fee screen, so rosters are cached per (school_id,
+class_name) and served from memory.
+
+save_profile invalidates the rosters a student leaves and
+joins. Entries also expire after ELIMU_ROSTER_CACHE_TTL
+seconds, which bounds staleness if more than one process
+serves the API.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections import OrderedDict
+
+
+ROSTER_CACHE_SIZE = int(
+    os.getenv(
+        "ELIMU_ROSTER_CACHE_SIZE",
+        "500",
+    )
+)
+
+ROSTER_CACHE_TTL = float(
+    os.getenv(
+        "ELIMU_ROSTER_CACHE_TTL",
+        "600",
+    )
+)
+
+
+class RosterCache:
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(
+        school_id,
+        class_name,
+    ):
+        return (
+            str(school_id or ""),
+            str(class_name or "").strip().lower(),
+        )
+
+    def get(
+        self,
+        school_id,
+        class_name,
+        load,
+    ):
+        """
+        Return the cached roster, calling `load()` to fill
+        the entry on a miss or after it expires.
+        """
+
+        if ROSTER_CACHE_SIZE <= 0:
+            return load()
+
+        key = self.key(
+            school_id,
+            class_name,
+        )
+
+        with self._lock:
+
+            entry = self._entries.get(key)
+
+            if entry and time.monotonic() - entry[0] <= ROSTER_CACHE_TTL:
+
+                self._entries.move_to_end(key)
+
+                self.hits += 1
+
+                return entry[1]
+
+        self.misses += 1
+
+        roster = load()
+
+        with self._lock:
+
+            self._entries[key] = (
+                time.monotonic(),
+                roster,
+            )
+
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > ROSTER_CACHE_SIZE:
+                self._entries.popitem(last=False)
+
+        return roster
+
+    def invalidate(
+        self,
+        school_id,
+        class_name,
+    ):
+        with self._lock:
+            self._entries.pop(
+                self.key(
+                    school_id,
+                    class_name,
+                ),
+                None,
+            )
+
+    def clear(self):
+
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+
+        with self._lock:
+
+            return {
+                "rosters": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+roster_cache = RosterCache()
@@ -5,8 +5,9 @@ from backend.jumuiya.core.permissions import (
     current_user_id,
 )
 
-from backend.jumuiya.core.responses import ok, created
+from backend.jumuiya.core.responses import ok, created, paged
 from backend.jumuiya.core.errors import APIError
+from backend.jumuiya.core.pagination import page_args
 
 from backend.jumuiya.elimu import schemas, services
 
@@ -122,9 +123,24 @@ def create_school():
 @elimu_bp.get("/classes")
 @require_authenticated
 def get_classes():
-    return ok(
+    cursor, limit = page_args(services.LIST_PAGE_SIZE)
+
+    return paged(
         services.list_classes(
-            current_user_id()
+            current_user_id(),
+            cursor,
+            limit,
+        )
+    )
+
+
+@elimu_bp.get("/classes/<class_id>/roster")
+@require_authenticated
+def get_class_roster(class_id):
+    return ok(
+        services.class_roster(
+            current_user_id(),
+            class_id,
         )
     )
 
@@ -153,10 +169,14 @@ def add_class():
 @elimu_bp.get("/lessons")
 @require_authenticated
 def get_lessons():
-    return ok(
+    cursor, limit = page_args(services.LIST_PAGE_SIZE)
+
+    return paged(
         services.lessons(
             current_user_id(),
             request.args.get("subject"),
+            cursor,
+            limit,
         )
     )
 
@@ -185,10 +205,14 @@ def add_lesson():
 @elimu_bp.get("/assignments")
 @require_authenticated
 def get_assignments():
-    return ok(
+    cursor, limit = page_args(services.LIST_PAGE_SIZE)
+
+    return paged(
         services.assignments(
             current_user_id(),
             request.args.get("class_name"),
+            cursor,
+            limit,
         )
     )
 
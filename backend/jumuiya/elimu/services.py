@@ -2,11 +2,20 @@ from __future__ import annotations
 
 from datetime import datetime, timezone
 
+from bson import ObjectId
+from bson.errors import InvalidId
 from pymongo import ReturnDocument
 
 from backend.jumuiya.core.database import collection
 from backend.jumuiya.core.errors import APIError
 from backend.jumuiya.core.audit import log_action
+from backend.jumuiya.core.pagination import (
+    cursor_meta,
+    paginate_keyset,
+)
+
+from backend.jumuiya.elimu import stats
+from backend.jumuiya.elimu.roster_cache import roster_cache
 
 from backend.jumuiya.elimu.models import (
     education_profile_document,
@@ -39,6 +48,38 @@ def _many(docs):
     return [_ser(doc) for doc in docs]
 
 
+LIST_PAGE_SIZE = 50
+
+ROSTER_FIELDS = {
+    "user_id": 1,
+    "full_name": 1,
+    "admission_number": 1,
+    "phone": 1,
+    "email": 1,
+    "class_name": 1,
+    "status": 1,
+}
+
+
+def _page(name, query, cursor, limit):
+    docs, next_cursor = paginate_keyset(
+        collection(name),
+        query,
+        "created_at",
+        cursor=cursor,
+        limit=limit,
+    )
+
+    return (
+        _many(docs),
+        cursor_meta(
+            limit,
+            next_cursor,
+            cursor,
+        ),
+    )
+
+
 # =========================================================
 # EDUCATION PROFILE
 # =========================================================
@@ -56,6 +97,13 @@ def get_profile(user_id):
 def save_profile(user_id, data):
     now = datetime.now(timezone.utc)
 
+    previous = collection(
+        "jumuiya_education_profiles"
+    ).find_one(
+        {"user_id": str(user_id)},
+        {"school_id": 1, "class_name": 1},
+    )
+
     update = {
         **data,
         "user_id": str(user_id),
@@ -83,6 +131,12 @@ def save_profile(user_id, data):
         doc["_id"],
     )
 
+    for old in filter(None, (previous, doc)):
+        roster_cache.invalidate(
+            old.get("school_id"),
+            old.get("class_name"),
+        )
+
     return _ser(doc)
 
 
@@ -154,7 +208,7 @@ def create_class(user_id, data):
     return _ser(doc)
 
 
-def list_classes(user_id):
+def _require_school(user_id):
     school = my_school(user_id)
 
     if not school:
@@ -164,17 +218,78 @@ def list_classes(user_id):
             "school_required",
         )
 
-    docs = collection(
+    return school
+
+
+def list_classes(user_id, cursor=None, limit=LIST_PAGE_SIZE):
+    school = _require_school(user_id)
+
+    return _page(
+        "jumuiya_classes",
+        {
+            "school_id": school["id"],
+            "status": "active",
+        },
+        cursor,
+        limit,
+    )
+
+
+def class_roster(user_id, class_id):
+    """
+    Students in one of the caller's classes, served from the
+    roster cache keyed by (school_id, class name).
+    """
+
+    school = _require_school(user_id)
+
+    try:
+        class_oid = ObjectId(class_id)
+    except (InvalidId, TypeError):
+        class_oid = class_id
+
+    school_class = collection(
         "jumuiya_classes"
-    ).find({
+    ).find_one({
+        "_id": class_oid,
         "school_id": school["id"],
-        "status": "active",
-    }).sort(
-        "created_at",
-        -1,
+    })
+
+    if not school_class:
+        raise APIError(
+            "Class not found.",
+            404,
+            "class_not_found",
+        )
+
+    def load():
+        return _many(
+            collection(
+                "jumuiya_education_profiles"
+            ).find(
+                {
+                    "school_id": school["id"],
+                    "class_name": school_class["name"],
+                    "profile_type": "student",
+                },
+                ROSTER_FIELDS,
+            ).sort(
+                "full_name",
+                1,
+            )
+        )
+
+    students = roster_cache.get(
+        school["id"],
+        school_class["name"],
+        load,
     )
 
-    return _many(docs)
+    return {
+        "class": _ser(school_class),
+        "students": students,
+        "total": len(students),
+    }
 
 
 # =========================================================
@@ -200,24 +315,29 @@ def create_lesson(user_id, data):
         result.inserted_id,
     )
 
+    stats.record_lesson(doc)
+
     return _ser(doc)
 
 
-def lessons(user_id, subject=None):
+def lessons(
+    user_id,
+    subject=None,
+    cursor=None,
+    limit=LIST_PAGE_SIZE,
+):
     query = {}
 
     if subject:
         query["subject"] = subject
 
-    docs = collection(
-        "jumuiya_lessons"
-    ).find(query).sort(
-        "created_at",
-        -1,
+    return _page(
+        "jumuiya_lessons",
+        query,
+        cursor,
+        limit,
     )
 
-    return _many(docs)
-
 
 # =========================================================
 # ASSIGNMENTS
@@ -242,24 +362,29 @@ def create_assignment(user_id, data):
         result.inserted_id,
     )
 
+    stats.record_assignment(doc)
+
     return _ser(doc)
 
 
-def assignments(user_id, class_name=None):
+def assignments(
+    user_id,
+    class_name=None,
+    cursor=None,
+    limit=LIST_PAGE_SIZE,
+):
     query = {}
 
     if class_name:
         query["class_name"] = class_name
 
-    docs = collection(
-        "jumuiya_assignments"
-    ).find(query).sort(
-        "created_at",
-        -1,
+    return _page(
+        "jumuiya_assignments",
+        query,
+        cursor,
+        limit,
     )
 
-    return _many(docs)
-
 
 # =========================================================
 # FEES
@@ -344,6 +469,11 @@ def student_projects(user_id):
 # =========================================================
 
 def dashboard(user_id):
+    """
+    Lesson and assignment totals come from the materialized
+    counters (one read); the remaining counts are per-user
+    and served by their indexes.
+    """
 
     uid = str(user_id)
 
@@ -351,27 +481,57 @@ def dashboard(user_id):
         "jumuiya_education_profiles"
     ).find_one({
         "user_id": uid
+    }) or {}
+
+    school_id = profile.get("school_id")
+    class_name = profile.get("class_name", "")
+
+    totals, school = stats.get_counters(school_id)
+
+    assignments_collection = collection(
+        "jumuiya_assignments"
+    )
+
+    # Assignments the user set plus those for their class,
+    # without counting the overlap twice.
+    own = assignments_collection.count_documents({
+        "teacher_user_id": uid
     })
 
+    class_assignments = 0
+
+    if class_name:
+        class_assignments = stats.class_count(
+            school if school_id else totals,
+            class_name,
+            "assignments",
+        )
+
+        if own:
+            overlap = {
+                "teacher_user_id": uid,
+                "class_name": class_name,
+            }
+
+            if school_id:
+                overlap["school_id"] = school_id
+
+            own -= assignments_collection.count_documents(
+                overlap
+            )
+
     return {
-        "profile": _ser(profile),
+        "profile": _ser(profile or None),
 
-        "lessons": collection(
-            "jumuiya_lessons"
-        ).count_documents({}),
+        "lessons": int(totals.get("lessons", 0)),
 
-        "assignments": collection(
-            "jumuiya_assignments"
-        ).count_documents({
-            "$or": [
-                {"teacher_user_id": uid},
-                {
-                    "class_name":
-                    profile.get("class_name", "")
-                    if profile else ""
-                },
-            ]
-        }),
+        "school_lessons": (
+            int((school or {}).get("lessons", 0))
+            if school_id
+            else None
+        ),
+
+        "assignments": own + class_assignments,
 
         "projects": collection(
             "jumuiya_cbc_projects"
@@ -384,4 +544,4 @@ def dashboard(user_id):
         ).count_documents({
             "student_user_id": uid
         }),
-    }
\ No newline at end of file
+    }
@@ -0,0 +1,414 @@
+# backend/jumuiya/elimu/stats.py
+
+"""
+Materialized Elimu content counters.
+
+Collection:
+
+    jumuiya_elimu_counters
+
+Documents:
+
+    {_id: "all", scope: "all", lessons, assignments,
+     classes: {<class_key>: {lessons, assignments}}}
+
+    {_id: "school:<school_id>", scope: "school", school_id,
+     lessons, assignments, classes: {...}}
+
+Lesson and assignment counts feed every student dashboard.
+Counting them per request meant scanning jumuiya_lessons on
+each load, which hurts most at the start of term when every
+student opens the app. create_lesson / create_assignment keep
+these documents current with `$inc`; `rebuild_counters`
+recomputes them with one `$facet` aggregation per collection
+and marks them `complete`.
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+from datetime import datetime, timezone
+
+from pymongo import UpdateOne
+
+from backend.jumuiya.core.database import collection
+
+
+logger = logging.getLogger("jumuiya.elimu.stats")
+
+
+COUNTERS_COLLECTION = "jumuiya_elimu_counters"
+
+ALL = "all"
+
+
+# =========================================================
+# HELPERS
+# =========================================================
+
+def now_utc():
+    return datetime.now(timezone.utc)
+
+
+def _counters():
+    return collection(
+        COUNTERS_COLLECTION
+    )
+
+
+def class_key(class_name):
+    """
+    Safe Mongo field name for a class ("Grade 4 East" ->
+    "grade_4_east").
+    """
+
+    return re.sub(
+        r"[^a-z0-9]+",
+        "_",
+        str(class_name or "").strip().lower(),
+    ).strip("_")
+
+
+def counter_id(school_id=None):
+    return (
+        f"school:{school_id}"
+        if school_id
+        else ALL
+    )
+
+
+def _identity(school_id=None):
+
+    if not school_id:
+        return {
+            "scope": ALL,
+        }
+
+    return {
+        "scope": "school",
+        "school_id": str(school_id),
+    }
+
+
+# =========================================================
+# INCREMENTAL UPDATES
+# =========================================================
+
+def _record(
+    kind,
+    document,
+):
+    """
+    Count one new lesson or assignment in the global counter
+    and, when it belongs to a school, that school's counter.
+    """
+
+    increments = {
+        kind: 1,
+    }
+
+    key = class_key(
+        document.get("class_name")
+    )
+
+    if key:
+        increments[f"classes.{key}.{kind}"] = 1
+
+    scopes = [None]
+
+    if document.get("school_id"):
+        scopes.append(
+            str(document["school_id"])
+        )
+
+    timestamp = now_utc()
+
+    try:
+
+        _counters().bulk_write(
+            [
+                UpdateOne(
+                    {
+                        "_id": counter_id(school_id),
+                    },
+                    {
+                        "$inc": increments,
+                        "$set": {
+                            "updated_at": timestamp,
+                        },
+                        "$setOnInsert": _identity(
+                            school_id
+                        ),
+                    },
+                    upsert=True,
+                )
+                for school_id in scopes
+            ],
+            ordered=False,
+        )
+
+    except Exception:
+
+        logger.exception(
+            "Failed to update elimu counters for %s",
+            document.get("_id"),
+        )
+
+
+def record_lesson(lesson):
+    _record(
+        "lessons",
+        lesson,
+    )
+
+
+def record_assignment(assignment):
+    _record(
+        "assignments",
+        assignment,
+    )
+
+
+# =========================================================
+# READS
+# =========================================================
+
+def get_counters(school_id=None):
+    """
+    Return (global counters, school counters or None) in one
+    read, building the counters on first use.
+    """
+
+    ids = [ALL]
+
+    if school_id:
+        ids.append(
+            counter_id(school_id)
+        )
+
+    documents = {
+        document["_id"]: document
+        for document in _counters().find({
+            "_id": {
+                "$in": ids,
+            },
+        })
+    }
+
+    # Counters upserted by a write before the first rebuild
+    # only hold that write; rebuild so history is included.
+    if not documents.get(ALL, {}).get("complete"):
+
+        rebuild_counters()
+
+        return get_counters(
+            school_id
+        )
+
+    return (
+        documents[ALL],
+        documents.get(
+            counter_id(school_id)
+        )
+        if school_id
+        else None,
+    )
+
+
+def class_count(
+    counters,
+    class_name,
+    kind,
+):
+    if not counters:
+        return 0
+
+    key = class_key(
+        class_name
+    )
+
+    return int(
+        counters.get(
+            "classes",
+            {},
+        ).get(
+            key,
+            {},
+        ).get(
+            kind,
+            0,
+        )
+    )
+
+
+# =========================================================
+# REBUILD ($facet)
+# =========================================================
+
+def _facet(name):
+
+    rows = list(
+        collection(
+            name
+        ).aggregate([
+            {
+                "$facet": {
+                    "total": [
+                        {
+                            "$count": "count",
+                        },
+                    ],
+                    "by_school": [
+                        {
+                            "$group": {
+                                "_id": "$school_id",
+                                "count": {
+                                    "$sum": 1
+                                },
+                            }
+                        },
+                    ],
+                    "by_class": [
+                        {
+                            "$group": {
+                                "_id": {
+                                    "school_id": "$school_id",
+                                    "class_name": "$class_name",
+                                },
+                                "count": {
+                                    "$sum": 1
+                                },
+                            }
+                        },
+                    ],
+                },
+            },
+        ])
+    )
+
+    return rows[0] if rows else {}
+
+
+def rebuild_counters():
+    """
+    Recompute every counter document from jumuiya_lessons
+    and jumuiya_assignments.
+    """
+
+    timestamp = now_utc()
+
+    documents = {}
+
+    def _document(school_id=None):
+
+        return documents.setdefault(
+            counter_id(school_id),
+            {
+                **_identity(
+                    school_id
+                ),
+                "lessons": 0,
+                "assignments": 0,
+                "classes": {},
+            },
+        )
+
+    _document()
+
+    for kind, name in (
+        ("lessons", "jumuiya_lessons"),
+        ("assignments", "jumuiya_assignments"),
+    ):
+
+        facets = _facet(
+            name
+        )
+
+        total = facets.get("total") or [{}]
+
+        _document()[kind] = int(
+            total[0].get("count", 0)
+        )
+
+        for row in facets.get("by_school", []):
+
+            if row["_id"]:
+                _document(
+                    row["_id"]
+                )[kind] += row["count"]
+
+        for row in facets.get("by_class", []):
+
+            key = class_key(
+                row["_id"].get("class_name")
+            )
+
+            if not key:
+                continue
+
+            targets = [_document()]
+
+            if row["_id"].get("school_id"):
+                targets.append(
+                    _document(
+                        row["_id"]["school_id"]
+                    )
+                )
+
+            for target in targets:
+
+                counts = target["classes"].setdefault(
+                    key,
+                    {
+                        "lessons": 0,
+                        "assignments": 0,
+                    },
+                )
+
+                counts[kind] += row["count"]
+
+    counters = _counters()
+
+    counters.bulk_write(
+        [
+            UpdateOne(
+                {
+                    "_id": document_id,
+                },
+                {
+                    "$set": {
+                        **document,
+                        "complete": True,
+                        "updated_at": timestamp,
+                    },
+                },
+                upsert=True,
+            )
+            for document_id, document in documents.items()
+        ],
+        ordered=False,
+    )
+
+    counters.delete_many({
+        "updated_at": {
+            "$lt": timestamp,
+        },
+    })
+
+    return {
+        "counters": len(documents),
+        "lessons": documents[ALL]["lessons"],
+        "assignments": documents[ALL]["assignments"],
+    }
+
+
+if __name__ == "__main__":
+
+    logging.basicConfig(
+        level=logging.INFO
+    )
+
+    print(
+        rebuild_counters()
+    )
@@ -13,6 +13,54 @@ def now_utc():
     return datetime.now(timezone.utc)
 
 
+# =========================================================
+# LOCATION
+# =========================================================
+
+def geo_point(
+    latitude,
+    longitude,
+):
+    """
+    Build a GeoJSON point from optional coordinates.
+
+    Returns None when neither is given.
+    """
+
+    if latitude in (None, "") and longitude in (None, ""):
+        return None
+
+    try:
+        latitude = float(latitude)
+        longitude = float(longitude)
+    except (
+        TypeError,
+        ValueError,
+    ):
+        raise ValueError(
+            "latitude and longitude must both be numbers."
+        )
+
+    if not -90 <= latitude <= 90:
+        raise ValueError(
+            "latitude must be between -90 and 90."
+        )
+
+    if not -180 <= longitude <= 180:
+        raise ValueError(
+            "longitude must be between -180 and 180."
+        )
+
+    # GeoJSON order is [longitude, latitude].
+    return {
+        "type": "Point",
+        "coordinates": [
+            longitude,
+            latitude,
+        ],
+    }
+
+
 # =========================================================
 # LISTING DOCUMENT
 # =========================================================
@@ -154,9 +202,30 @@ def listing_document(user_id, data):
         or ""
     ).strip()
 
+    county = str(
+        data.get(
+            "county",
+            "",
+        )
+        or ""
+    ).strip().lower()
+
+    town = str(
+        data.get(
+            "town",
+            "",
+        )
+        or ""
+    ).strip().lower()
+
+    geo = geo_point(
+        data.get("latitude"),
+        data.get("longitude"),
+    )
+
     now = now_utc()
 
-    return {
+    document = {
         "seller_user_id": str(
             user_id
         ),
@@ -179,9 +248,20 @@ def listing_document(user_id, data):
 
         "location": location,
 
+        "county": county,
+
+        "town": town,
+
         "status": "active",
 
         "created_at": now,
 
         "updated_at": now,
-    }
\ No newline at end of file
+    }
+
+    # Only listings with coordinates enter the 2dsphere
+    # index; the rest still match non-distance searches.
+    if geo:
+        document["geo"] = geo
+
+    return document
@@ -13,6 +13,7 @@ from backend.jumuiya.core.responses import (
     created,
 )
 from backend.jumuiya.core.errors import APIError
+from backend.jumuiya.core.pagination import parse_cursor_pagination
 from backend.jumuiya.marketplace import services
 
 
@@ -124,6 +125,32 @@ def number(
     return value
 
 
+def query_number(key):
+    value = request.args.get(
+        key
+    )
+
+    if value in (
+        None,
+        "",
+    ):
+        return None
+
+    try:
+        value = float(
+            value
+        )
+
+    except ValueError:
+        raise APIError(
+            f"{key} must be a number.",
+            422,
+            "validation_error",
+        )
+
+    return value
+
+
 # =========================================================
 # LISTINGS
 # =========================================================
@@ -134,28 +161,71 @@ def number(
 @require_authenticated
 def get_listings():
     """
-    Browse active marketplace listings.
+    Browse and search active marketplace listings.
 
     Optional filters:
 
-        ?hub=biashara
-        ?hub=shamba
-        ?hub=elimu
-        ?hub=community
-
+        ?q=maize seed
+        ?hub=biashara|shamba|elimu|community
         ?category=vegetables
+        ?county=kiambu&town=thika
+        ?min_price=100&max_price=500
+        ?lat=-1.28&lng=36.82&radius_km=10
+
+        ?sort=new|relevance|price_asc|price_desc|distance
+
+    Paging:
+
+        ?limit=30&cursor=<meta.next_cursor>
     """
 
+    cursor, limit = parse_cursor_pagination(
+        request.args,
+        default_limit=services.LISTINGS_PAGE_SIZE,
+        max_limit=100,
+    )
+
+    items, meta = services.search_listings(
+        q=request.args.get(
+            "q"
+        ),
+        hub=request.args.get(
+            "hub"
+        ),
+        category=request.args.get(
+            "category"
+        ),
+        county=request.args.get(
+            "county"
+        ),
+        town=request.args.get(
+            "town"
+        ),
+        min_price=query_number(
+            "min_price"
+        ),
+        max_price=query_number(
+            "max_price"
+        ),
+        latitude=query_number(
+            "lat"
+        ),
+        longitude=query_number(
+            "lng"
+        ),
+        radius_km=query_number(
+            "radius_km"
+        ),
+        sort=request.args.get(
+            "sort"
+        ),
+        cursor=cursor,
+        limit=limit,
+    )
+
     return ok(
-        services.listings(
-            current_user_id(),
-            request.args.get(
-                "hub"
-            ),
-            request.args.get(
-                "category"
-            ),
-        )
+        items,
+        meta=meta,
     )
 
 
@@ -237,6 +307,26 @@ def add_listing():
             "location",
             max_length=200,
         ),
+
+        "county": text(
+            data,
+            "county",
+            max_length=80,
+        ),
+
+        "town": text(
+            data,
+            "town",
+            max_length=80,
+        ),
+
+        "latitude": data.get(
+            "latitude"
+        ),
+
+        "longitude": data.get(
+            "longitude"
+        ),
     }
 
     allowed_hubs = {
@@ -8,7 +8,18 @@ from bson.errors import InvalidId
 from backend.jumuiya.core.database import collection
 from backend.jumuiya.core.errors import APIError
 from backend.jumuiya.core.audit import log_action
-from backend.jumuiya.marketplace.models import listing_document
+from backend.jumuiya.core.pagination import (
+    cursor_meta,
+    paginate_keyset,
+    paginate_pipeline,
+)
+from backend.jumuiya.marketplace.models import (
+    geo_point,
+    listing_document,
+)
+
+
+LISTINGS_PAGE_SIZE = 30
 
 
 # =========================================================
@@ -78,57 +89,346 @@ def serialize_many(docs):
 
 
 # =========================================================
-# LISTINGS
+# LISTINGS / SEARCH
 # =========================================================
 
-def listings(
-    user_id=None,
+EARTH_RADIUS_KM = 6378.1
+
+MAX_RADIUS_KM = 500
+
+SEARCH_SORTS = {
+    "new",
+    "price_asc",
+    "price_desc",
+    "relevance",
+    "distance",
+}
+
+
+def search_listings(
+    q=None,
     hub=None,
     category=None,
+    county=None,
+    town=None,
+    min_price=None,
+    max_price=None,
+    latitude=None,
+    longitude=None,
+    radius_km=None,
+    sort=None,
+    cursor=None,
+    limit=LISTINGS_PAGE_SIZE,
 ):
     """
-    Return active marketplace listings.
+    Search active marketplace listings as (listings, meta).
 
-    Marketplace is public within Jumuiya, so user_id is
-    currently optional.
+    Filters (all optional, combined with AND):
 
-    Future filtering can include:
+        q                       text index on title /
+                                category / description
+        hub, category
+        county, town
+        min_price, max_price
+        latitude, longitude     with radius_km (default 25)
 
-        county
-        town
-        seller
-        price range
-        distance
-        search
+    sort:
+
+        new          newest first (default without q)
+        relevance    text score (default with q)
+        price_asc
+        price_desc
+        distance     nearest first (needs coordinates;
+                     cannot be combined with q)
+
+    Every mode is keyset-paginated on (sort key, _id).
     """
 
+    q = str(
+        q or ""
+    ).strip()
+
     query = {
         "status": "active"
     }
 
-    if hub:
-        query["hub"] = str(
-            hub
-        ).strip().lower()
+    for field, value in (
+        ("hub", hub),
+        ("category", category),
+        ("county", county),
+        ("town", town),
+    ):
+
+        if value:
+            query[field] = str(
+                value
+            ).strip().lower()
+
+    price = {}
+
+    if min_price is not None:
+        price["$gte"] = float(min_price)
+
+    if max_price is not None:
+        price["$lte"] = float(max_price)
+
+    if price:
+        query["price"] = price
+
+    origin = None
+
+    if latitude is not None or longitude is not None:
+
+        try:
+
+            origin = geo_point(
+                latitude,
+                longitude,
+            )
+
+        except ValueError as exc:
 
-    if category:
-        query["category"] = str(
-            category
-        ).strip().lower()
+            raise APIError(
+                str(exc),
+                422,
+                "validation_error",
+            )
 
-    documents = (
-        collection(
-            "jumuiya_marketplace_listings"
+        radius_km = float(
+            radius_km
+            if radius_km is not None
+            else 25
+        )
+
+        # Also rejects NaN, which Mongo would choke on.
+        if not radius_km > 0:
+
+            raise APIError(
+                "radius_km must be greater than 0.",
+                422,
+                "validation_error",
+            )
+
+        radius_km = min(
+            radius_km,
+            MAX_RADIUS_KM,
+        )
+
+    sort = str(
+        sort
+        or (
+            "relevance"
+            if q
+            else "new"
+        )
+    ).strip().lower()
+
+    if sort not in SEARCH_SORTS:
+
+        raise APIError(
+            "Invalid sort.",
+            422,
+            "invalid_sort",
+        )
+
+    if sort == "relevance" and not q:
+
+        raise APIError(
+            "sort=relevance needs a search query.",
+            422,
+            "invalid_sort",
+        )
+
+    if sort == "distance" and (
+        not origin
+        or q
+    ):
+
+        raise APIError(
+            "sort=distance needs latitude/longitude and no search query.",
+            422,
+            "invalid_sort",
         )
-        .find(query)
-        .sort(
+
+    listings_collection = collection(
+        "jumuiya_marketplace_listings",
+        read_only=True,
+    )
+
+    # -----------------------------------------------------
+    # Nearest first: $geoNear computes the distance
+    # -----------------------------------------------------
+
+    if sort == "distance":
+
+        documents, next_cursor = paginate_pipeline(
+            listings_collection,
+            [
+                {
+                    "$geoNear": {
+                        "near": origin,
+                        "distanceField": "distance_m",
+                        "maxDistance": radius_km * 1000,
+                        "query": query,
+                        "spherical": True,
+                    }
+                },
+            ],
+            "distance_m",
+            direction=1,
+            cursor=cursor,
+            limit=limit,
+        )
+
+        return _search_page(
+            documents,
+            next_cursor,
+            cursor,
+            limit,
+        )
+
+    if origin:
+
+        query["geo"] = {
+            "$geoWithin": {
+                "$centerSphere": [
+                    origin["coordinates"],
+                    radius_km / EARTH_RADIUS_KM,
+                ]
+            }
+        }
+
+    if q:
+
+        query["$text"] = {
+            "$search": q
+        }
+
+    # -----------------------------------------------------
+    # Relevance: text score computed in the pipeline
+    # -----------------------------------------------------
+
+    if sort == "relevance":
+
+        documents, next_cursor = paginate_pipeline(
+            listings_collection,
+            [
+                {
+                    "$match": query
+                },
+                {
+                    "$addFields": {
+                        "score": {
+                            "$meta": "textScore"
+                        }
+                    }
+                },
+            ],
+            "score",
+            cursor=cursor,
+            limit=limit,
+        )
+
+        return _search_page(
+            documents,
+            next_cursor,
+            cursor,
+            limit,
+        )
+
+    field, direction = {
+        "new": (
             "created_at",
             -1,
+        ),
+        "price_asc": (
+            "price",
+            1,
+        ),
+        "price_desc": (
+            "price",
+            -1,
+        ),
+    }[sort]
+
+    documents, next_cursor = paginate_keyset(
+        listings_collection,
+        query,
+        field,
+        direction=direction,
+        cursor=cursor,
+        limit=limit,
+    )
+
+    return _search_page(
+        documents,
+        next_cursor,
+        cursor,
+        limit,
+    )
+
+
+def _search_page(
+    documents,
+    next_cursor,
+    cursor,
+    limit,
+):
+
+    items = []
+
+    for document in documents:
+
+        item = serialize(
+            document
+        )
+
+        distance = item.pop(
+            "distance_m",
+            None,
         )
+
+        if distance is not None:
+            item["distance_km"] = round(
+                distance / 1000,
+                2,
+            )
+
+        items.append(
+            item
+        )
+
+    return (
+        items,
+        cursor_meta(
+            limit,
+            next_cursor,
+            cursor,
+        ),
     )
 
-    return serialize_many(
-        documents
+
+def listings(
+    user_id=None,
+    hub=None,
+    category=None,
+    cursor=None,
+    limit=LISTINGS_PAGE_SIZE,
+):
+    """
+    Return one page of active marketplace listings, newest
+    first, as (listings, meta).
+
+    Marketplace is public within Jumuiya, so user_id is
+    currently optional. See search_listings for the full set
+    of filters.
+    """
+
+    return search_listings(
+        hub=hub,
+        category=category,
+        cursor=cursor,
+        limit=limit,
     )
 
 
@@ -10,7 +10,8 @@ notifications_bp=Blueprint("jumuiya_notifications",__name__)
 def get_notifications():
     try:limit=min(max(int(request.args.get("limit",30)),1),100)
     except ValueError:limit=30
-    return ok(services.list_notifications(current_user_id(),limit))
+    items,meta=services.list_notifications(current_user_id(),limit,request.args.get("cursor"))
+    return ok(items,meta=meta)
 
 @notifications_bp.put("/<notification_id>/read")
 @require_authenticated
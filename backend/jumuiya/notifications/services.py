@@ -1,11 +1,14 @@
 from bson import ObjectId
 from backend.jumuiya.core.database import collection
+from backend.jumuiya.core.pagination import cursor_meta,paginate_keyset
 from backend.jumuiya.notifications.models import notification_document
 
 def notify(user_id,data):
     doc=notification_document(user_id,data); r=collection("jumuiya_notifications").insert_one(doc); doc["_id"]=r.inserted_id; return _ser(doc)
 
-def list_notifications(user_id,limit=30):return [_ser(x) for x in collection("jumuiya_notifications").find({"user_id":str(user_id)}).sort("created_at",-1).limit(limit)]
+def list_notifications(user_id,limit=30,cursor=None):
+    docs,next_cursor=paginate_keyset(collection("jumuiya_notifications"),{"user_id":str(user_id)},"created_at",cursor=cursor,limit=limit)
+    return [_ser(x) for x in docs],cursor_meta(limit,next_cursor,cursor)
 
 def mark_read(user_id,notification_id):
     try:oid=ObjectId(notification_id)
@@ -2,6 +2,8 @@ from __future__ import annotations
 
 from datetime import datetime, timezone
 
+from backend.jumuiya.shamba.stats import season_label
+
 
 def now_utc():
     return datetime.now(timezone.utc)
@@ -81,6 +83,11 @@ def farm_activity_document(user_id, farm_id, data):
         "cost": float(data.get("cost", 0)),
         "currency": data.get("currency", "KES"),
         "activity_date": data.get("activity_date"),
+        "season": season_label(
+            data.get("season"),
+            data.get("activity_date"),
+            now,
+        ),
         "created_at": now,
     }
 
@@ -97,6 +104,11 @@ def harvest_document(user_id, farm_id, data):
         "unit": data.get("unit", "kg"),
         "quality": data.get("quality", ""),
         "harvest_date": data.get("harvest_date"),
+        "season": season_label(
+            data.get("season"),
+            data.get("harvest_date"),
+            now,
+        ),
         "market_status": "available",
         "notes": data.get("notes", ""),
         "created_at": now,
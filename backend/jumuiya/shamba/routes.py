@@ -10,9 +10,11 @@ from backend.jumuiya.core.permissions import (
 from backend.jumuiya.core.responses import (
     ok,
     created,
+    paged,
 )
 
 from backend.jumuiya.core.errors import APIError
+from backend.jumuiya.core.pagination import page_args
 
 from backend.jumuiya.shamba import schemas, services
 
@@ -210,10 +212,14 @@ def add_crop(farm_id):
 @shamba_bp.get("/farms/<farm_id>/activities")
 @require_authenticated
 def get_activities(farm_id):
-    return ok(
+    cursor, limit = page_args(services.LIST_PAGE_SIZE)
+
+    return paged(
         services.list_activities(
             current_user_id(),
             farm_id,
+            cursor,
+            limit,
         )
     )
 
@@ -243,10 +249,14 @@ def add_activity(farm_id):
 @shamba_bp.get("/farms/<farm_id>/harvests")
 @require_authenticated
 def get_harvests(farm_id):
-    return ok(
+    cursor, limit = page_args(services.LIST_PAGE_SIZE)
+
+    return paged(
         services.list_harvests(
             current_user_id(),
             farm_id,
+            cursor,
+            limit,
         )
     )
 
@@ -273,6 +283,17 @@ def add_harvest(farm_id):
 # DASHBOARD
 # =========================================================
 
+@shamba_bp.get("/farms/<farm_id>/stats")
+@require_authenticated
+def get_farm_stats(farm_id):
+    return ok(
+        services.farm_stats(
+            current_user_id(),
+            farm_id,
+        )
+    )
+
+
 @shamba_bp.get("/dashboard")
 @require_authenticated
 def get_dashboard():
@@ -157,6 +157,9 @@ def activity_payload(data):
         "activity_date": _text(
             data, "activity_date", False, 40
         ),
+        "season": _text(
+            data, "season", False, 80
+        ),
     }
 
 
@@ -185,6 +188,9 @@ def harvest_payload(data):
         "harvest_date": _text(
             data, "harvest_date", False, 40
         ),
+        "season": _text(
+            data, "season", False, 80
+        ),
         "notes": _text(
             data, "notes", False, 1000
         ),
@@ -7,6 +7,12 @@ from pymongo import ReturnDocument
 from backend.jumuiya.core.database import collection
 from backend.jumuiya.core.errors import APIError
 from backend.jumuiya.core.audit import log_action
+from backend.jumuiya.core.pagination import (
+    cursor_meta,
+    paginate_keyset,
+)
+
+from backend.jumuiya.shamba import stats
 
 from backend.jumuiya.shamba.models import (
     farmer_document,
@@ -17,6 +23,9 @@ from backend.jumuiya.shamba.models import (
 )
 
 
+LIST_PAGE_SIZE = 50
+
+
 # =========================================================
 # HELPERS
 # =========================================================
@@ -50,6 +59,65 @@ def serialise_many(docs):
     return [serialise(doc) for doc in docs]
 
 
+def serialise_stats(doc):
+    out = {
+        "activities": 0,
+        "harvests": 0,
+        "input_cost": 0.0,
+        "revenue_estimate": 0.0,
+        "yield": {},
+        **(serialise(doc) or {}),
+    }
+
+    out.pop("id", None)
+    out.pop("scope", None)
+    out.pop("user_id", None)
+    out.pop("complete", None)
+
+    return out
+
+
+def latest_market_price(crop_name, county=None):
+    """
+    Most recent market price for a crop, preferring the
+    farm's county and falling back to any county.
+    """
+
+    name = str(crop_name or "").strip()
+
+    if not name:
+        return None
+
+    crops = list(dict.fromkeys([
+        name,
+        name.lower(),
+        name.title(),
+    ]))
+
+    prices = collection("jumuiya_market_prices")
+
+    queries = [
+        {"crop": {"$in": crops}},
+    ]
+
+    if county:
+        queries.insert(
+            0,
+            {"crop": {"$in": crops}, "county": county},
+        )
+
+    for query in queries:
+        doc = prices.find_one(
+            query,
+            sort=[("created_at", -1)],
+        )
+
+        if doc and doc.get("price") is not None:
+            return doc
+
+    return None
+
+
 # =========================================================
 # FARMER PROFILE
 # =========================================================
@@ -153,6 +221,8 @@ def create_farm(user_id, data):
         result.inserted_id,
     )
 
+    stats.record_farm(user_id, 1)
+
     return serialise(doc)
 
 
@@ -270,6 +340,8 @@ def delete_farm(user_id, farm_id):
             "farm_not_found",
         )
 
+    stats.record_farm(user_id, -1)
+
     log_action(
         user_id,
         "farm.deleted",
@@ -315,6 +387,8 @@ def create_crop(user_id, farm_id, data):
         },
     )
 
+    stats.record_crop(user_id, doc)
+
     return serialise(doc)
 
 
@@ -374,28 +448,36 @@ def create_activity(user_id, farm_id, data):
         },
     )
 
+    stats.record_activity(doc)
+
     return serialise(doc)
 
 
-def list_activities(user_id, farm_id):
+def list_activities(user_id, farm_id, cursor=None, limit=LIST_PAGE_SIZE):
     farm = get_farm(
         user_id,
         farm_id,
     )
 
-    docs = collection(
-        "jumuiya_farm_activities"
-    ).find(
+    docs, next_cursor = paginate_keyset(
+        collection("jumuiya_farm_activities"),
         {
             "owner_user_id": str(user_id),
             "farm_id": farm["id"],
-        }
-    ).sort(
+        },
         "created_at",
-        -1,
+        cursor=cursor,
+        limit=limit,
     )
 
-    return serialise_many(docs)
+    return (
+        serialise_many(docs),
+        cursor_meta(
+            limit,
+            next_cursor,
+            cursor,
+        ),
+    )
 
 
 # =========================================================
@@ -414,6 +496,21 @@ def create_harvest(user_id, farm_id, data):
         data,
     )
 
+    # Price the harvest when it is recorded so the revenue
+    # rollup and its rebuild agree on the same figure.
+    price = latest_market_price(
+        doc["crop_name"],
+        farm.get("county"),
+    )
+
+    if price:
+        doc["market_price"] = float(price["price"])
+        doc["estimated_value"] = round(
+            doc["quantity"] * doc["market_price"],
+            2,
+        )
+        doc["price_currency"] = price.get("currency", "KES")
+
     result = collection(
         "jumuiya_harvests"
     ).insert_one(doc)
@@ -430,28 +527,36 @@ def create_harvest(user_id, farm_id, data):
         },
     )
 
+    stats.record_harvest(doc)
+
     return serialise(doc)
 
 
-def list_harvests(user_id, farm_id):
+def list_harvests(user_id, farm_id, cursor=None, limit=LIST_PAGE_SIZE):
     farm = get_farm(
         user_id,
         farm_id,
     )
 
-    docs = collection(
-        "jumuiya_harvests"
-    ).find(
+    docs, next_cursor = paginate_keyset(
+        collection("jumuiya_harvests"),
         {
             "owner_user_id": str(user_id),
             "farm_id": farm["id"],
-        }
-    ).sort(
+        },
         "created_at",
-        -1,
+        cursor=cursor,
+        limit=limit,
     )
 
-    return serialise_many(docs)
+    return (
+        serialise_many(docs),
+        cursor_meta(
+            limit,
+            next_cursor,
+            cursor,
+        ),
+    )
 
 
 # =========================================================
@@ -459,90 +564,66 @@ def list_harvests(user_id, farm_id):
 # =========================================================
 
 def dashboard(user_id):
-    user_id = str(user_id)
-
-    farms = collection(
-        "jumuiya_farms"
-    )
+    """
+    Farmer overview from the materialized rollups: one read
+    for the totals and one for the per-farm breakdown.
+    """
 
-    crops = collection(
-        "jumuiya_crops"
-    )
-
-    activities = collection(
-        "jumuiya_farm_activities"
-    )
-
-    harvests = collection(
-        "jumuiya_harvests"
-    )
+    user_id = str(user_id)
 
     farmer = get_farmer(user_id)
 
-    farm_count = farms.count_documents(
-        {
-            "owner_user_id": user_id,
-            "status": {"$ne": "deleted"},
-        }
-    )
+    totals = stats.get_farmer_totals(user_id)
 
-    crop_count = crops.count_documents(
-        {
-            "owner_user_id": user_id,
-            "status": {
-                "$nin": [
-                    "harvested",
-                    "deleted",
-                ]
-            },
-        }
-    )
+    return {
+        "farmer": farmer,
+        "metrics": {
+            "farms": int(totals.get("farms", 0)),
+            "active_crops": int(totals.get("active_crops", 0)),
+            "harvests": int(totals.get("harvests", 0)),
+            "farm_activities": int(totals.get("activities", 0)),
+            "total_activity_cost": float(
+                totals.get("input_cost", 0)
+            ),
+            "revenue_estimate": float(
+                totals.get("revenue_estimate", 0)
+            ),
+            "yield": totals.get("yield", {}),
+        },
+        "farms": [
+            serialise_stats(doc)
+            for doc in stats.farm_rollups(user_id)
+        ],
+    }
 
-    harvest_count = harvests.count_documents(
-        {
-            "owner_user_id": user_id
-        }
-    )
 
-    activity_count = activities.count_documents(
-        {
-            "owner_user_id": user_id
-        }
-    )
+def farm_stats(user_id, farm_id):
+    """
+    Rollup for one farm with its per-season breakdown.
+    """
 
-    activity_cost = list(
-        activities.aggregate(
-            [
-                {
-                    "$match": {
-                        "owner_user_id": user_id
-                    }
-                },
-                {
-                    "$group": {
-                        "_id": None,
-                        "total": {
-                            "$sum": "$cost"
-                        },
-                    }
-                },
-            ]
-        )
+    farm = get_farm(
+        user_id,
+        farm_id,
     )
 
-    total_cost = (
-        float(activity_cost[0]["total"])
-        if activity_cost
-        else 0.0
+    # Builds the farmer's rollups on first use.
+    stats.get_farmer_totals(user_id)
+
+    totals = collection(
+        stats.STATS_COLLECTION
+    ).find_one(
+        {"_id": f"farm:{farm['id']}"}
     )
 
     return {
-        "farmer": farmer,
-        "metrics": {
-            "farms": farm_count,
-            "active_crops": crop_count,
-            "harvests": harvest_count,
-            "farm_activities": activity_count,
-            "total_activity_cost": total_cost,
-        },
+        "farm": farm,
+        "totals": serialise_stats(totals),
+        "seasons": [
+            serialise_stats(doc)
+            for doc in stats.season_rollups(
+                user_id,
+                farm["id"],
+            )
+        ],
     }
@@ -0,0 +1,762 @@
+# backend/jumuiya/shamba/stats.py
+
+"""
+Materialized Shamba analytics rollups.
+
+Collection:
+
+    jumuiya_farm_stats
+
+Documents:
+
+    {_id: "farmer:<user_id>", scope: "farmer", ...}
+    {_id: "farm:<farm_id>", scope: "farm", ...}
+    {_id: "farm:<farm_id>:season:<season>", scope: "season", ...}
+
+Each carries activity/harvest counts, input_cost,
+revenue_estimate and yield ({crop: {unit: quantity}}); the
+farmer document also counts farms and active crops.
+
+The write paths in services.py keep these current with
+`$inc`, so the dashboard is a couple of primary-key reads
+however long a farmer's history is. `rebuild_farmer_stats`
+recomputes everything with one `$facet` aggregation per
+source collection, marking the documents `complete`; reads
+rebuild any farmer whose rollup is not.
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+from datetime import datetime, timezone
+
+from pymongo import UpdateOne
+
+from backend.jumuiya.core.database import collection
+
+
+logger = logging.getLogger("jumuiya.shamba.stats")
+
+
+STATS_COLLECTION = "jumuiya_farm_stats"
+
+INACTIVE_CROP_STATUSES = (
+    "harvested",
+    "deleted",
+)
+
+UNASSIGNED_SEASON = "unassigned"
+
+
+# =========================================================
+# HELPERS
+# =========================================================
+
+def now_utc():
+    return datetime.now(timezone.utc)
+
+
+def _stats():
+    return collection(
+        STATS_COLLECTION
+    )
+
+
+def field_key(value):
+    """
+    Safe Mongo field name for a crop or unit
+    ("Sukuma Wiki" -> "sukuma_wiki").
+    """
+
+    key = re.sub(
+        r"[^a-z0-9]+",
+        "_",
+        str(value or "").strip().lower(),
+    ).strip("_")
+
+    return key or "other"
+
+
+def season_label(
+    season=None,
+    date_text=None,
+    fallback=None,
+):
+    """
+    Season an activity or harvest belongs to.
+
+    An explicit season wins. Otherwise it is derived from the
+    date using Kenya's two rain seasons:
+
+        Mar-Aug  -> "<year>-long-rains"
+        Sep-Feb  -> "<year>-short-rains"  (Jan/Feb belong to
+                                          the previous year)
+    """
+
+    season = str(
+        season or ""
+    ).strip().lower()
+
+    if season:
+        return season
+
+    moment = None
+
+    if date_text:
+
+        try:
+            moment = datetime.strptime(
+                str(date_text)[:7],
+                "%Y-%m",
+            )
+
+        except ValueError:
+            moment = None
+
+    moment = moment or fallback
+
+    if not moment:
+        return UNASSIGNED_SEASON
+
+    if 3 <= moment.month <= 8:
+        return f"{moment.year}-long-rains"
+
+    year = (
+        moment.year - 1
+        if moment.month <= 2
+        else moment.year
+    )
+
+    return f"{year}-short-rains"
+
+
+def _empty(scope, user_id, farm_id=None, season=None):
+
+    document = {
+        "scope": scope,
+        "user_id": str(user_id),
+        "activities": 0,
+        "harvests": 0,
+        "input_cost": 0.0,
+        "revenue_estimate": 0.0,
+        "yield": {},
+    }
+
+    if farm_id is not None:
+        document["farm_id"] = str(farm_id)
+
+    if season is not None:
+        document["season"] = season
+
+    if scope == "farmer":
+        document["farms"] = 0
+        document["active_crops"] = 0
+
+    return document
+
+
+# =========================================================
+# INCREMENTAL UPDATES
+# =========================================================
+
+def apply(
+    user_id,
+    farmer=None,
+    farm_id=None,
+    season=None,
+    scoped=None,
+):
+    """
+    Apply `$inc` deltas: `farmer` to the farmer document and
+    `scoped` to the farmer, farm and farm-season documents.
+
+    All updates go out as one bulk_write. Rollup failures
+    are logged and never break the farm operation; the
+    rebuild job reconciles any drift.
+    """
+
+    scoped = {
+        key: value
+        for key, value in (scoped or {}).items()
+        if value
+    }
+
+    farmer = {
+        **scoped,
+        **{
+            key: value
+            for key, value in (farmer or {}).items()
+            if value
+        },
+    }
+
+    if not farmer:
+        return
+
+    user_id = str(user_id)
+
+    timestamp = now_utc()
+
+    targets = [
+        (
+            f"farmer:{user_id}",
+            farmer,
+            {
+                "scope": "farmer",
+                "user_id": user_id,
+            },
+        ),
+    ]
+
+    if farm_id and scoped:
+
+        farm_id = str(farm_id)
+
+        targets.append((
+            f"farm:{farm_id}",
+            scoped,
+            {
+                "scope": "farm",
+                "user_id": user_id,
+                "farm_id": farm_id,
+            },
+        ))
+
+        if season:
+
+            targets.append((
+                f"farm:{farm_id}:season:{season}",
+                scoped,
+                {
+                    "scope": "season",
+                    "user_id": user_id,
+                    "farm_id": farm_id,
+                    "season": season,
+                },
+            ))
+
+    operations = [
+        UpdateOne(
+            {
+                "_id": document_id,
+            },
+            {
+                "$inc": increments,
+                "$set": {
+                    "updated_at": timestamp,
+                },
+                "$setOnInsert": identity,
+            },
+            upsert=True,
+        )
+        for document_id, increments, identity in targets
+    ]
+
+    try:
+
+        _stats().bulk_write(
+            operations,
+            ordered=False,
+        )
+
+    except Exception:
+
+        logger.exception(
+            "Failed to update farm stats for %s",
+            user_id,
+        )
+
+
+def record_farm(
+    user_id,
+    delta,
+):
+    apply(
+        user_id,
+        farmer={
+            "farms": delta,
+        },
+    )
+
+
+def record_crop(
+    user_id,
+    crop,
+):
+    if crop.get("status") in INACTIVE_CROP_STATUSES:
+        return
+
+    apply(
+        user_id,
+        farmer={
+            "active_crops": 1,
+        },
+    )
+
+
+def record_activity(activity):
+
+    apply(
+        activity["owner_user_id"],
+        farm_id=activity["farm_id"],
+        season=activity.get("season"),
+        scoped={
+            "activities": 1,
+            "input_cost": float(
+                activity.get("cost") or 0
+            ),
+        },
+    )
+
+
+def record_harvest(harvest):
+
+    crop = field_key(
+        harvest.get("crop_name")
+    )
+
+    unit = field_key(
+        harvest.get("unit") or "kg"
+    )
+
+    apply(
+        harvest["owner_user_id"],
+        farm_id=harvest["farm_id"],
+        season=harvest.get("season"),
+        scoped={
+            "harvests": 1,
+            f"yield.{crop}.{unit}": float(
+                harvest.get("quantity") or 0
+            ),
+            "revenue_estimate": float(
+                harvest.get("estimated_value") or 0
+            ),
+        },
+    )
+
+
+# =========================================================
+# READS
+# =========================================================
+
+def get_farmer_totals(user_id):
+    """
+    Return the farmer rollup, building it on first use.
+    """
+
+    user_id = str(user_id)
+
+    document = _stats().find_one({
+        "_id": f"farmer:{user_id}",
+    })
+
+    # A rollup upserted by a write before the first rebuild
+    # only holds that write; rebuild so history is included.
+    if document and document.get("complete"):
+        return document
+
+    return rebuild_farmer_stats(
+        user_id
+    )["farmer"]
+
+
+def farm_rollups(user_id):
+    """
+    Per-farm rollups for a farmer (one indexed query).
+    """
+
+    return list(
+        _stats().find({
+            "user_id": str(user_id),
+            "scope": "farm",
+        })
+    )
+
+
+def season_rollups(
+    user_id,
+    farm_id,
+):
+    return list(
+        _stats().find({
+            "user_id": str(user_id),
+            "scope": "season",
+            "farm_id": str(farm_id),
+        }).sort(
+            "season",
+            -1,
+        )
+    )
+
+
+# =========================================================
+# REBUILD ($facet)
+# =========================================================
+
+def _facet(
+    name,
+    user_id,
+    facets,
+):
+    rows = list(
+        collection(
+            name
+        ).aggregate([
+            {
+                "$match": {
+                    "owner_user_id": user_id,
+                }
+            },
+            {
+                "$addFields": {
+                    "season": {
+                        "$ifNull": [
+                            "$season",
+                            UNASSIGNED_SEASON,
+                        ]
+                    },
+                }
+            },
+            {
+                "$facet": facets,
+            },
+        ])
+    )
+
+    return rows[0] if rows else {}
+
+
+def rebuild_farmer_stats(user_id):
+    """
+    Recompute every rollup document for one farmer from the
+    source collections and replace the stored values.
+    """
+
+    user_id = str(user_id)
+
+    timestamp = now_utc()
+
+    activity_group = {
+        "count": {
+            "$sum": 1
+        },
+        "cost": {
+            "$sum": {
+                "$ifNull": [
+                    "$cost",
+                    0,
+                ]
+            }
+        },
+    }
+
+    activities = _facet(
+        "jumuiya_farm_activities",
+        user_id,
+        {
+            "by_farm": [
+                {
+                    "$group": {
+                        "_id": {
+                            "farm_id": "$farm_id",
+                        },
+                        **activity_group,
+                    }
+                },
+            ],
+            "by_season": [
+                {
+                    "$group": {
+                        "_id": {
+                            "farm_id": "$farm_id",
+                            "season": "$season",
+                        },
+                        **activity_group,
+                    }
+                },
+            ],
+        },
+    )
+
+    harvest_group = {
+        "count": {
+            "$sum": 1
+        },
+        "revenue": {
+            "$sum": {
+                "$ifNull": [
+                    "$estimated_value",
+                    0,
+                ]
+            }
+        },
+    }
+
+    harvests = _facet(
+        "jumuiya_harvests",
+        user_id,
+        {
+            "by_farm": [
+                {
+                    "$group": {
+                        "_id": {
+                            "farm_id": "$farm_id",
+                        },
+                        **harvest_group,
+                    }
+                },
+            ],
+            "by_season": [
+                {
+                    "$group": {
+                        "_id": {
+                            "farm_id": "$farm_id",
+                            "season": "$season",
+                        },
+                        **harvest_group,
+                    }
+                },
+            ],
+            "yield": [
+                {
+                    "$group": {
+                        "_id": {
+                            "farm_id": "$farm_id",
+                            "season": "$season",
+                            "crop": "$crop_name",
+                            "unit": "$unit",
+                        },
+                        "quantity": {
+                            "$sum": {
+                                "$ifNull": [
+                                    "$quantity",
+                                    0,
+                                ]
+                            }
+                        },
+                    }
+                },
+            ],
+        },
+    )
+
+    farmer = _empty(
+        "farmer",
+        user_id,
+    )
+
+    farmer["farms"] = collection(
+        "jumuiya_farms"
+    ).count_documents({
+        "owner_user_id": user_id,
+        "status": {
+            "$ne": "deleted"
+        },
+    })
+
+    farmer["active_crops"] = collection(
+        "jumuiya_crops"
+    ).count_documents({
+        "owner_user_id": user_id,
+        "status": {
+            "$nin": list(
+                INACTIVE_CROP_STATUSES
+            )
+        },
+    })
+
+    farms = {}
+    seasons = {}
+
+    def _targets(key):
+
+        farm_id = str(
+            key.get("farm_id")
+        )
+
+        targets = [
+            farmer,
+            farms.setdefault(
+                farm_id,
+                _empty(
+                    "farm",
+                    user_id,
+                    farm_id,
+                ),
+            ),
+        ]
+
+        if "season" in key:
+
+            return [
+                seasons.setdefault(
+                    (
+                        farm_id,
+                        key["season"],
+                    ),
+                    _empty(
+                        "season",
+                        user_id,
+                        farm_id,
+                        key["season"],
+                    ),
+                ),
+            ]
+
+        return targets
+
+    for row in activities.get("by_farm", []):
+
+        for target in _targets(row["_id"]):
+            target["activities"] += row["count"]
+            target["input_cost"] += float(row["cost"] or 0)
+
+    for row in activities.get("by_season", []):
+
+        for target in _targets(row["_id"]):
+            target["activities"] += row["count"]
+            target["input_cost"] += float(row["cost"] or 0)
+
+    for row in harvests.get("by_farm", []):
+
+        for target in _targets(row["_id"]):
+            target["harvests"] += row["count"]
+            target["revenue_estimate"] += float(row["revenue"] or 0)
+
+    for row in harvests.get("by_season", []):
+
+        for target in _targets(row["_id"]):
+            target["harvests"] += row["count"]
+            target["revenue_estimate"] += float(row["revenue"] or 0)
+
+    for row in harvests.get("yield", []):
+
+        key = row["_id"]
+
+        crop = field_key(
+            key.get("crop")
+        )
+
+        unit = field_key(
+            key.get("unit") or "kg"
+        )
+
+        quantity = float(
+            row["quantity"] or 0
+        )
+
+        for target in (
+            _targets({
+                "farm_id": key.get("farm_id"),
+            })
+            + _targets(key)
+        ):
+
+            crops = target["yield"].setdefault(
+                crop,
+                {},
+            )
+
+            crops[unit] = crops.get(unit, 0) + quantity
+
+    documents = {
+        f"farmer:{user_id}": farmer,
+        **{
+            f"farm:{farm_id}": document
+            for farm_id, document in farms.items()
+        },
+        **{
+            f"farm:{farm_id}:season:{season}": document
+            for (farm_id, season), document in seasons.items()
+        },
+    }
+
+    stats = _stats()
+
+    stats.bulk_write(
+        [
+            UpdateOne(
+                {
+                    "_id": document_id,
+                },
+                {
+                    "$set": {
+                        **document,
+                        "complete": True,
+                        "updated_at": timestamp,
+                    },
+                },
+                upsert=True,
+            )
+            for document_id, document in documents.items()
+        ],
+        ordered=False,
+    )
+
+    # Remove rollups whose source records no longer exist.
+    stats.delete_many({
+        "user_id": user_id,
+        "updated_at": {
+            "$lt": timestamp,
+        },
+    })
+
+    return {
+        "farmer": {
+            "_id": f"farmer:{user_id}",
+            **farmer,
+            "complete": True,
+        },
+        "farms": len(farms),
+        "seasons": len(seasons),
+    }
+
+
+def rebuild_all_farm_stats():
+    """
+    Reconcile the rollups of every farmer.
+    Intended for the nightly maintenance run.
+    """
+
+    rebuilt = 0
+    failed = 0
+
+    for user_id in collection(
+        "jumuiya_farms"
+    ).distinct(
+        "owner_user_id"
+    ):
+
+        try:
+
+            rebuild_farmer_stats(
+                user_id
+            )
+
+            rebuilt += 1
+
+        except Exception:
+
+            failed += 1
+
+            logger.exception(
+                "Failed to rebuild farm stats for %s",
+                user_id,
+            )
+
+    return {
+        "rebuilt": rebuilt,
+        "failed": failed,
+    }
+
+
+if __name__ == "__main__":
+
+    logging.basicConfig(
+        level=logging.INFO
+    )
+
+    print(
+        rebuild_all_farm_stats()
+    )
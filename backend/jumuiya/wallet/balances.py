@@ -0,0 +1,401 @@
+# backend/jumuiya/wallet/balances.py
+
+"""
+Materialized wallet balances.
+
+Collection:
+
+    jumuiya_wallet_balances
+
+Documents:
+
+    {
+        _id: "<user_id>:<currency>",
+        user_id, currency,
+        balance, credits, debits, transaction_count,
+        complete, updated_at,
+    }
+
+`record_transaction` keeps these current with `$inc` in the
+same step as the ledger insert, so a balance check is a single
+indexed read no matter how long a member's history is. The
+ledger in jumuiya_transactions remains the source of truth;
+`reconcile_balances` recomputes every balance from it.
+
+Balances rebuilt from the ledger are marked `complete`. A
+document upserted by `apply` for a member whose history
+predates these documents holds only the new transaction, so
+reads rebuild any member with a document that is not.
+"""
+
+from __future__ import annotations
+
+import logging
+from datetime import datetime, timezone
+
+from backend.jumuiya.core.database import collection
+
+
+logger = logging.getLogger("jumuiya.wallet.balances")
+
+
+BALANCES_COLLECTION = "jumuiya_wallet_balances"
+
+# Differences below this are float noise, not drift.
+TOLERANCE = 0.005
+
+
+# =========================================================
+# HELPERS
+# =========================================================
+
+def now_utc():
+    return datetime.now(timezone.utc)
+
+
+def _balances():
+    return collection(
+        BALANCES_COLLECTION
+    )
+
+
+def balance_id(
+    user_id,
+    currency,
+):
+    return f"{user_id}:{currency}"
+
+
+def _signed(document):
+    """
+    Return (credit, debit) contributed by one transaction.
+    """
+
+    amount = float(
+        document.get(
+            "amount",
+            0,
+        )
+    )
+
+    direction = document.get(
+        "direction"
+    )
+
+    if direction == "credit":
+        return amount, 0.0
+
+    if direction == "debit":
+        return 0.0, amount
+
+    return 0.0, 0.0
+
+
+# =========================================================
+# INCREMENTAL UPDATES
+# =========================================================
+
+def apply(
+    document,
+    session=None,
+):
+    """
+    Fold one newly inserted transaction into its balance.
+    """
+
+    user_id = document["user_id"]
+
+    currency = document["currency"]
+
+    credit, debit = _signed(
+        document
+    )
+
+    _balances().update_one(
+        {
+            "_id": balance_id(
+                user_id,
+                currency,
+            ),
+        },
+        {
+            "$inc": {
+                "balance": credit - debit,
+                "credits": credit,
+                "debits": debit,
+                "transaction_count": 1,
+            },
+            "$set": {
+                "updated_at": now_utc(),
+            },
+            "$setOnInsert": {
+                "user_id": user_id,
+                "currency": currency,
+            },
+        },
+        upsert=True,
+        session=session,
+    )
+
+
+# =========================================================
+# READS
+# =========================================================
+
+def get_balances(user_id):
+    """
+    Return {currency: balance_document} for a user.
+
+    Members whose history predates the balance documents
+    are backfilled from the ledger on first read, including
+    when a new transaction already upserted a partial one.
+    """
+
+    user_id = str(user_id)
+
+    documents = {
+        document["currency"]: document
+        for document in _balances().find({
+            "user_id": user_id,
+        })
+    }
+
+    if documents and all(
+        document.get("complete")
+        for document in documents.values()
+    ):
+        return documents
+
+    has_history = collection(
+        "jumuiya_transactions"
+    ).find_one(
+        {
+            "user_id": user_id,
+        },
+        {
+            "_id": 1,
+        },
+    )
+
+    if not has_history:
+        return {}
+
+    return rebuild_user_balances(
+        user_id
+    )
+
+
+# =========================================================
+# REBUILD / RECONCILE
+# =========================================================
+
+def _ledger_totals(match):
+    """
+    Sum the ledger per (user_id, currency).
+    """
+
+    pipeline = [
+        {
+            "$match": match,
+        },
+        {
+            "$group": {
+                "_id": {
+                    "user_id": "$user_id",
+                    "currency": "$currency",
+                },
+                "credits": {
+                    "$sum": {
+                        "$cond": [
+                            {
+                                "$eq": [
+                                    "$direction",
+                                    "credit",
+                                ]
+                            },
+                            "$amount",
+                            0,
+                        ]
+                    }
+                },
+                "debits": {
+                    "$sum": {
+                        "$cond": [
+                            {
+                                "$eq": [
+                                    "$direction",
+                                    "debit",
+                                ]
+                            },
+                            "$amount",
+                            0,
+                        ]
+                    }
+                },
+                "count": {
+                    "$sum": 1
+                },
+            }
+        },
+    ]
+
+    totals = {}
+
+    for row in collection(
+        "jumuiya_transactions"
+    ).aggregate(
+        pipeline
+    ):
+
+        key = row["_id"]
+
+        currency = str(
+            key.get("currency")
+            or "KES"
+        ).upper()
+
+        credits = float(
+            row.get("credits") or 0
+        )
+
+        debits = float(
+            row.get("debits") or 0
+        )
+
+        totals[
+            (
+                str(key.get("user_id")),
+                currency,
+            )
+        ] = {
+            "user_id": str(key.get("user_id")),
+            "currency": currency,
+            "balance": credits - debits,
+            "credits": credits,
+            "debits": debits,
+            "transaction_count": int(
+                row.get("count") or 0
+            ),
+        }
+
+    return totals
+
+
+def _store(values):
+
+    document = {
+        **values,
+        "complete": True,
+        "updated_at": now_utc(),
+    }
+
+    _balances().replace_one(
+        {
+            "_id": balance_id(
+                values["user_id"],
+                values["currency"],
+            ),
+        },
+        document,
+        upsert=True,
+    )
+
+    return document
+
+
+def rebuild_user_balances(user_id):
+    """
+    Recompute one member's balances from the ledger.
+    """
+
+    user_id = str(user_id)
+
+    return {
+        currency: _store(values)
+        for (_, currency), values in _ledger_totals({
+            "user_id": user_id,
+        }).items()
+    }
+
+
+def reconcile_balances():
+    """
+    Verify every stored balance against the ledger and
+    repair the ones that drifted (e.g. a crash between the
+    ledger insert and the balance update on a deployment
+    without transactions).
+    """
+
+    expected = _ledger_totals({})
+
+    stored = {
+        (
+            document.get("user_id"),
+            document.get("currency"),
+        ): document
+        for document in _balances().find()
+    }
+
+    fixed = 0
+
+    for key, values in expected.items():
+
+        current = stored.pop(
+            key,
+            None,
+        )
+
+        matches = current and all(
+            abs(
+                float(current.get(field) or 0)
+                - values[field]
+            ) < TOLERANCE
+            for field in (
+                "balance",
+                "credits",
+                "debits",
+            )
+        ) and int(
+            current.get("transaction_count") or 0
+        ) == values["transaction_count"]
+
+        if matches and current.get("complete"):
+            continue
+
+        if not matches:
+            logger.warning(
+                "Wallet balance drift for %s/%s: stored=%s ledger=%s",
+                key[0],
+                key[1],
+                current.get("balance") if current else None,
+                values["balance"],
+            )
+
+            fixed += 1
+
+        _store(values)
+
+    # Balances with no ledger rows behind them.
+    for document in stored.values():
+
+        _balances().delete_one({
+            "_id": document["_id"],
+        })
+
+        fixed += 1
+
+    return {
+        "checked": len(expected),
+        "fixed": fixed,
+    }
+
+
+if __name__ == "__main__":
+
+    logging.basicConfig(
+        level=logging.INFO
+    )
+
+    print(
+        reconcile_balances()
+    )
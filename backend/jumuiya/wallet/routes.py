@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from flask import Blueprint
+from flask import Blueprint, request
 
 from backend.jumuiya.core.permissions import (
     require_authenticated,
@@ -31,11 +31,39 @@ wallet_bp = Blueprint(
 def get_ledger():
     """
     Return the authenticated user's wallet balance
-    and transaction history.
+    and one page of transaction history.
+
+    Query:
+
+        ?cursor=<meta.next_cursor>&limit=50&currency=KES
+    """
+
+    data, meta = services.ledger(
+        current_user_id(),
+        cursor=request.args.get("cursor"),
+        limit=request.args.get(
+            "limit",
+            services.LEDGER_PAGE_SIZE,
+        ),
+        currency=request.args.get("currency"),
+    )
+
+    return ok(
+        data,
+        meta=meta,
+    )
+
+
+@wallet_bp.get("/balance")
+@require_authenticated
+def get_balance():
+    """
+    Return the authenticated user's wallet balance only.
     """
 
     return ok(
-        services.ledger(
-            current_user_id()
+        services.balance(
+            current_user_id(),
+            request.args.get("currency"),
         )
-    )
\ No newline at end of file
+    )
@@ -3,11 +3,24 @@
 from __future__ import annotations
 
 from backend.jumuiya.core.audit import log_action
-from backend.jumuiya.core.database import collection
+from backend.jumuiya.core.database import (
+    collection,
+    run_in_transaction,
+)
 from backend.jumuiya.core.errors import APIError
+from backend.jumuiya.core.pagination import (
+    cursor_meta,
+    paginate_keyset,
+)
+from backend.jumuiya.wallet import balances
 from backend.jumuiya.wallet.models import transaction_document
 
 
+LEDGER_PAGE_SIZE = 50
+
+LEDGER_MAX_PAGE_SIZE = 200
+
+
 # =========================================================
 # SERIALIZATION
 # =========================================================
@@ -43,12 +56,7 @@ def _ser(doc):
 # LEDGER
 # =========================================================
 
-def ledger(user_id):
-    """
-    Return the user's wallet ledger and calculated balance.
-
-    The transaction ledger remains the source of truth.
-    """
+def _require_user(user_id):
 
     if user_id is None:
         raise APIError(
@@ -57,89 +65,169 @@ def ledger(user_id):
             "invalid_identity",
         )
 
-    user_id = str(
+    return str(
         user_id
     )
 
-    docs = list(
-        collection(
-            "jumuiya_transactions"
-        )
-        .find({
-            "user_id": user_id
-        })
-        .sort(
-            "created_at",
-            -1,
-        )
-    )
 
-    balance = 0.0
-    currencies = set()
-    transactions = []
-
-    for document in docs:
+def _balance_summary(
+    user_id,
+    currency=None,
+):
+    """
+    Read the materialized balances (one indexed query).
+    """
 
-        amount = float(
-            document.get(
-                "amount",
-                0,
-            )
-        )
+    documents = balances.get_balances(
+        user_id
+    )
 
-        direction = document.get(
-            "direction"
-        )
+    if currency:
 
         currency = str(
-            document.get(
-                "currency",
-                "KES",
-            )
-        ).upper()
-
-        currencies.add(
             currency
-        )
-
-        if direction == "credit":
-            balance += amount
+        ).strip().upper()
 
-        elif direction == "debit":
-            balance -= amount
+    elif len(documents) == 1:
 
-        transactions.append(
-            _ser(document)
+        currency = next(
+            iter(documents)
         )
 
-    # Jumuiya currently operates primarily in KES.
-    # If multiple currencies are introduced later,
-    # balances must be calculated separately.
-    if len(currencies) > 1:
-        raise APIError(
-            "Multiple currencies detected. "
-            "Currency-specific balances are required.",
-            409,
-            "multiple_currencies",
-        )
+    else:
+
+        # Jumuiya operates primarily in KES; members
+        # holding other currencies get them in `balances`.
+        currency = "KES"
 
-    currency = (
-        next(iter(currencies))
-        if currencies
-        else "KES"
+    current = documents.get(
+        currency,
+        {},
     )
 
     return {
         "balance": round(
-            balance,
+            float(
+                current.get(
+                    "balance",
+                    0,
+                )
+            ),
             2,
         ),
 
         "currency": currency,
 
-        "transactions": transactions,
+        "balances": {
+            code: round(
+                float(
+                    document.get(
+                        "balance",
+                        0,
+                    )
+                ),
+                2,
+            )
+            for code, document in documents.items()
+        },
+    }
+
+
+def balance(
+    user_id,
+    currency=None,
+):
+    """
+    Return the user's wallet balance without touching the
+    transaction history.
+    """
+
+    return _balance_summary(
+        _require_user(user_id),
+        currency,
+    )
+
+
+def ledger(
+    user_id,
+    cursor=None,
+    limit=LEDGER_PAGE_SIZE,
+    currency=None,
+):
+    """
+    Return (data, meta): the user's balance and one page of
+    the ledger, newest first, plus cursor_meta().
+
+    Pages are keyset-paginated on (created_at, _id): pass
+    meta `next_cursor` back as `cursor` for the next page. The
+    transaction ledger remains the source of truth; the
+    balance comes from the materialized balance document.
+    """
+
+    user_id = _require_user(
+        user_id
+    )
+
+    try:
+
+        limit = int(
+            limit
+        )
+
+    except (
+        TypeError,
+        ValueError,
+    ):
+
+        limit = LEDGER_PAGE_SIZE
+
+    limit = min(
+        max(
+            limit,
+            1,
+        ),
+        LEDGER_MAX_PAGE_SIZE,
+    )
+
+    query = {
+        "user_id": user_id
     }
 
+    if currency:
+
+        query["currency"] = str(
+            currency
+        ).strip().upper()
+
+    docs, next_cursor = paginate_keyset(
+        collection(
+            "jumuiya_transactions"
+        ),
+        query,
+        "created_at",
+        cursor=cursor,
+        limit=limit,
+    )
+
+    return (
+        {
+            **_balance_summary(
+                user_id,
+                currency,
+            ),
+
+            "transactions": [
+                _ser(document)
+                for document in docs
+            ],
+        },
+        cursor_meta(
+            limit,
+            next_cursor,
+            cursor,
+        ),
+    )
+
 
 # =========================================================
 # RECORD TRANSACTION
@@ -284,10 +372,24 @@ def record_transaction(
         payload,
     )
 
-    result = collection(
-        "jumuiya_transactions"
-    ).insert_one(
-        document
+    def _record(session):
+
+        result = collection(
+            "jumuiya_transactions"
+        ).insert_one(
+            document,
+            session=session,
+        )
+
+        balances.apply(
+            document,
+            session=session,
+        )
+
+        return result
+
+    result = run_in_transaction(
+        _record
     )
 
     document["_id"] = (
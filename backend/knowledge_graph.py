@@ -0,0 +1,521 @@
+# backend/knowledge_graph.py
+
+"""
+In-memory symbol graph over the backend/data datasets.
+
+Sources:
+
+    knowledge_graph.json              "connected" edges
+    crosslinks/symbol_connections.json "crosslink" edges
+    symbol_similarity.json            "similar" edges,
+                                      weight = similarity / 100
+    search_aliases.json               alias -> symbol names
+    <faith>/prophecy.json, people.json node details
+    universal_symbols.json            node categories
+
+Nodes are interned to integer ids and every node keeps a
+frozen adjacency tuple sorted by weight, so a neighbour or
+BFS query touches only small tuples and dicts: no JSON is read
+after the graph is built (once, on first use).
+
+Edges are undirected; an edge listed by several sources keeps
+its highest weight.
+"""
+
+import logging
+import os
+import threading
+from collections import deque
+from typing import Any, Dict, List, Optional, Tuple
+
+from backend.bible_decoder import BibleDecoder
+from backend.data import BASE_DIR as DATA_DIR, load_json_file
+
+
+logger = logging.getLogger(__name__)
+
+
+# =========================================================
+# CONFIGURATION
+# =========================================================
+
+MAX_DEPTH = 3
+
+DEFAULT_LIMIT = 20
+
+MAX_LIMIT = 100
+
+# Per-faith files describing individual symbols.
+FAITH_FILES = (
+    "prophecy.json",
+    "people.json",
+)
+
+EDGE_WEIGHTS = {
+    "connected": 1.0,
+    "crosslink": 1.0,
+    "alias": 1.0,
+}
+
+
+def normalize(term: Any) -> str:
+    return BibleDecoder.normalize_text(
+        term
+    )
+
+
+# =========================================================
+# GRAPH
+# =========================================================
+
+class KnowledgeGraph:
+
+    def __init__(self):
+
+        self._ids: Dict[str, int] = {}
+        self._names: List[str] = []
+        self._details: List[Dict[str, Any]] = []
+        self._aliases: Dict[str, int] = {}
+
+        # Built as dicts, frozen into tuples by _freeze().
+        self._edges: List[Dict[int, Tuple[float, str]]] = []
+        self._adjacency: List[Tuple[Tuple[int, float, str], ...]] = []
+
+    # -----------------------------------------------------
+    # BUILD
+    # -----------------------------------------------------
+
+    def _node(self, name: str) -> int:
+
+        key = normalize(name)
+
+        node_id = self._ids.get(key)
+
+        if node_id is None:
+
+            node_id = len(self._names)
+
+            self._ids[key] = node_id
+            self._names.append(key)
+            self._details.append({})
+            self._edges.append({})
+
+        return node_id
+
+    def add_edge(
+        self,
+        source: str,
+        target: str,
+        kind: str,
+        weight: Optional[float] = None,
+    ) -> None:
+
+        if not normalize(source) or not normalize(target):
+            return
+
+        a = self._node(source)
+        b = self._node(target)
+
+        if a == b:
+            return
+
+        weight = (
+            EDGE_WEIGHTS.get(kind, 1.0)
+            if weight is None
+            else float(weight)
+        )
+
+        for left, right in (
+            (a, b),
+            (b, a),
+        ):
+
+            current = self._edges[left].get(right)
+
+            if current is None or weight > current[0]:
+                self._edges[left][right] = (
+                    weight,
+                    kind,
+                )
+
+    def add_details(
+        self,
+        name: str,
+        details: Dict[str, Any],
+    ) -> None:
+
+        node = self._details[
+            self._node(name)
+        ]
+
+        for field, value in details.items():
+
+            if field == "religion":
+
+                religions = node.setdefault(
+                    "religions",
+                    [],
+                )
+
+                if value not in religions:
+                    religions.append(value)
+
+            else:
+
+                node.setdefault(
+                    field,
+                    value,
+                )
+
+    def add_alias(
+        self,
+        alias: str,
+        name: str,
+    ) -> None:
+
+        alias = normalize(alias)
+
+        if not alias:
+            return
+
+        target = self._node(name)
+
+        if alias in self._ids:
+
+            # The alias is a symbol of its own: link them.
+            self.add_edge(
+                alias,
+                name,
+                "alias",
+            )
+
+        else:
+
+            self._aliases.setdefault(
+                alias,
+                target,
+            )
+
+    def _freeze(self) -> None:
+
+        self._adjacency = [
+            tuple(
+                sorted(
+                    (
+                        (target, weight, kind)
+                        for target, (weight, kind) in edges.items()
+                    ),
+                    key=lambda edge: (
+                        -edge[1],
+                        self._names[edge[0]],
+                    ),
+                )
+            )
+            for edges in self._edges
+        ]
+
+        self._edges = []
+
+    @classmethod
+    def from_data_dir(
+        cls,
+        data_dir: str = DATA_DIR,
+    ) -> "KnowledgeGraph":
+
+        graph = cls()
+
+        def load(*parts):
+
+            data = load_json_file(
+                os.path.join(data_dir, *parts)
+            )
+
+            return data if isinstance(data, dict) else {}
+
+        # Nodes with details first, so aliases can tell
+        # symbols from plain alternative names.
+        for faith in sorted(os.listdir(data_dir)):
+
+            if not os.path.isdir(os.path.join(data_dir, faith)):
+                continue
+
+            for file_name in FAITH_FILES:
+
+                for name, record in load(faith, file_name).items():
+
+                    if not isinstance(record, dict):
+                        continue
+
+                    details = {
+                        field: value
+                        for field, value in record.items()
+                        if field in (
+                            "religion",
+                            "category",
+                            "meaning",
+                            "role",
+                            "status",
+                        )
+                    }
+
+                    details.setdefault(
+                        "religion",
+                        faith.title(),
+                    )
+
+                    graph.add_details(
+                        name,
+                        details,
+                    )
+
+                    if record.get("symbol"):
+                        graph.add_alias(
+                            record["symbol"],
+                            name,
+                        )
+
+        for name, record in load("universal_symbols.json").items():
+
+            if isinstance(record, dict):
+                graph.add_details(
+                    name,
+                    {
+                        "categories": record.get(
+                            "categories",
+                            [],
+                        ),
+                    },
+                )
+
+        for name, record in load("knowledge_graph.json").items():
+
+            for target in (record or {}).get("connected_to", []):
+                graph.add_edge(
+                    name,
+                    target,
+                    "connected",
+                )
+
+        for name, targets in load("crosslinks", "symbol_connections.json").items():
+
+            for target in targets or []:
+                graph.add_edge(
+                    name,
+                    target,
+                    "crosslink",
+                )
+
+        for name, record in load("symbol_similarity.json").items():
+
+            for similar in (record or {}).get("similar_symbols", []):
+
+                if not isinstance(similar, dict):
+                    continue
+
+                graph.add_edge(
+                    name,
+                    similar.get("symbol"),
+                    "similar",
+                    weight=(
+                        float(similar.get("similarity", 100))
+                        / 100.0
+                    ),
+                )
+
+        for name, aliases in load("search_aliases.json").items():
+
+            for alias in aliases or []:
+                graph.add_alias(
+                    alias,
+                    name,
+                )
+
+        graph._freeze()
+
+        logger.info(
+            "✅ Knowledge graph built | nodes=%d | edges=%d | aliases=%d",
+            len(graph._names),
+            sum(len(edges) for edges in graph._adjacency) // 2,
+            len(graph._aliases),
+        )
+
+        return graph
+
+    # -----------------------------------------------------
+    # QUERIES
+    # -----------------------------------------------------
+
+    def resolve(
+        self,
+        term: Any,
+    ) -> Optional[int]:
+        """
+        Node id for a symbol name or one of its aliases.
+        """
+
+        key = normalize(term)
+
+        node_id = self._ids.get(key)
+
+        if node_id is None:
+            node_id = self._aliases.get(key)
+
+        return node_id
+
+    def node(
+        self,
+        term: Any,
+    ) -> Optional[Dict[str, Any]]:
+
+        node_id = self.resolve(term)
+
+        if node_id is None:
+            return None
+
+        return {
+            "symbol": self._names[node_id],
+            **self._details[node_id],
+            "degree": len(self._adjacency[node_id]),
+        }
+
+    def neighbors(
+        self,
+        term: Any,
+        kinds: Optional[set] = None,
+        limit: int = DEFAULT_LIMIT,
+    ) -> List[Dict[str, Any]]:
+
+        node_id = self.resolve(term)
+
+        if node_id is None:
+            return []
+
+        results = []
+
+        for target, weight, kind in self._adjacency[node_id]:
+
+            if kinds and kind not in kinds:
+                continue
+
+            results.append({
+                "symbol": self._names[target],
+                "relation": kind,
+                "weight": round(weight, 4),
+            })
+
+            if len(results) >= limit:
+                break
+
+        return results
+
+    def related(
+        self,
+        term: Any,
+        depth: int = 2,
+        limit: int = DEFAULT_LIMIT,
+        min_weight: float = 0.0,
+    ) -> List[Dict[str, Any]]:
+        """
+        Breadth-first walk up to `depth` hops (capped at
+        MAX_DEPTH). Each symbol is reported once, at its
+        shortest distance, with the product of edge weights
+        along the path as its score and the first hop's
+        relation. Nearer, stronger symbols come first.
+        """
+
+        start = self.resolve(term)
+
+        if start is None:
+            return []
+
+        depth = max(
+            min(int(depth), MAX_DEPTH),
+            1,
+        )
+
+        # node -> (distance, score, relation of first hop)
+        seen = {
+            start: (0, 1.0, None),
+        }
+
+        queue = deque([start])
+
+        while queue:
+
+            current = queue.popleft()
+
+            distance, score, relation = seen[current]
+
+            if distance >= depth:
+                continue
+
+            for target, weight, kind in self._adjacency[current]:
+
+                if target in seen:
+                    continue
+
+                path_score = score * weight
+
+                if path_score < min_weight:
+                    continue
+
+                seen[target] = (
+                    distance + 1,
+                    path_score,
+                    relation or kind,
+                )
+
+                queue.append(target)
+
+        del seen[start]
+
+        ranked = sorted(
+            seen.items(),
+            key=lambda item: (
+                item[1][0],
+                -item[1][1],
+                self._names[item[0]],
+            ),
+        )[:limit]
+
+        return [
+            {
+                "symbol": self._names[node_id],
+                "depth": distance,
+                "score": round(score, 4),
+                "relation": relation,
+            }
+            for node_id, (distance, score, relation) in ranked
+        ]
+
+    def stats(self) -> Dict[str, int]:
+
+        return {
+            "nodes": len(self._names),
+            "edges": sum(len(edges) for edges in self._adjacency) // 2,
+            "aliases": len(self._aliases),
+        }
+
+
+# =========================================================
+# SHARED INSTANCE
+# =========================================================
+
+_GRAPH: Optional[KnowledgeGraph] = None
+_GRAPH_LOCK = threading.Lock()
+
+
+def get_knowledge_graph() -> KnowledgeGraph:
+    """
+    Build the graph on first use; every later call returns
+    the same instance.
+    """
+
+    global _GRAPH
+
+    if _GRAPH is None:
+        with _GRAPH_LOCK:
+            if _GRAPH is None:
+                _GRAPH = KnowledgeGraph.from_data_dir()
+
+    return _GRAPH
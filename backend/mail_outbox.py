@@ -0,0 +1,836 @@
+# backend/mail_outbox.py
+
+from __future__ import annotations
+
+import logging
+import os
+import smtplib
+import sqlite3
+import threading
+import time
+
+from contextlib import contextmanager
+from email.message import EmailMessage
+
+from dotenv import load_dotenv
+
+
+# =========================================================
+# ENVIRONMENT
+# =========================================================
+
+load_dotenv()
+
+logger = logging.getLogger(
+    "mail_outbox"
+)
+
+SMTP_HOST = os.getenv(
+    "SMTP_HOST"
+)
+
+SMTP_PORT = int(
+    os.getenv(
+        "SMTP_PORT",
+        "587",
+    )
+)
+
+SMTP_USER = os.getenv(
+    "SMTP_USER"
+)
+
+SMTP_PASS = os.getenv(
+    "SMTP_PASS"
+)
+
+SMTP_USE_TLS = os.getenv(
+    "SMTP_USE_TLS",
+    "true",
+).lower() == "true"
+
+SMTP_USE_SSL = os.getenv(
+    "SMTP_USE_SSL",
+    "false",
+).lower() == "true"
+
+SMTP_FROM = os.getenv(
+    "SMTP_FROM",
+    SMTP_USER or "",
+)
+
+SMTP_TIMEOUT = int(
+    os.getenv(
+        "SMTP_TIMEOUT",
+        "15",
+    )
+)
+
+MAIL_POOL_SIZE = int(
+    os.getenv(
+        "MAIL_POOL_SIZE",
+        "2",
+    )
+)
+
+MAIL_MAX_ATTEMPTS = int(
+    os.getenv(
+        "MAIL_MAX_ATTEMPTS",
+        "6",
+    )
+)
+
+# Base delay for exponential backoff between retries.
+MAIL_RETRY_BASE_SECONDS = int(
+    os.getenv(
+        "MAIL_RETRY_BASE_SECONDS",
+        "30",
+    )
+)
+
+# SMTP connections idle for longer than this are closed
+# instead of being reused.
+MAIL_CONNECTION_IDLE_SECONDS = int(
+    os.getenv(
+        "MAIL_CONNECTION_IDLE_SECONDS",
+        "240",
+    )
+)
+
+# A message stuck in "sending" for longer than this is
+# assumed to belong to a worker that died mid-send.
+MAIL_SENDING_LEASE_SECONDS = 300
+
+BASE_DIR = os.path.dirname(
+    os.path.abspath(__file__)
+)
+
+OUTBOX_PATH = os.getenv(
+    "MAIL_OUTBOX_PATH",
+    os.path.join(
+        BASE_DIR,
+        "user_data",
+        "mail_outbox.sqlite3",
+    ),
+)
+
+
+def is_configured():
+    """
+    Mail delivery is only enabled when an SMTP host and
+    sender address are configured.
+    """
+
+    return bool(
+        SMTP_HOST
+        and SMTP_FROM
+    )
+
+
+# =========================================================
+# DURABLE OUTBOX (SQLITE SPOOL)
+# =========================================================
+
+class MailOutbox:
+    """
+    SQLite-backed spool of outgoing messages.
+
+    Every message is committed to disk before the request
+    handler returns, so a worker restart never loses mail.
+    Pending rows are picked up again when the delivery
+    worker starts.
+    """
+
+    def __init__(
+        self,
+        path=OUTBOX_PATH,
+    ):
+        self.path = path
+
+        self._lock = threading.Lock()
+
+        os.makedirs(
+            os.path.dirname(path),
+            exist_ok=True,
+        )
+
+        with self._connect() as conn:
+
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS outbox (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    recipient TEXT NOT NULL,
+                    subject TEXT NOT NULL,
+                    text_body TEXT,
+                    html_body TEXT,
+                    status TEXT NOT NULL DEFAULT 'pending',
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    next_attempt_at REAL NOT NULL,
+                    last_error TEXT,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+                """
+            )
+
+            conn.execute(
+                """
+                CREATE INDEX IF NOT EXISTS
+                    idx_outbox_due
+                ON outbox (status, next_attempt_at)
+                """
+            )
+
+    @contextmanager
+    def _connect(self):
+
+        conn = sqlite3.connect(
+            self.path,
+            timeout=10,
+            isolation_level=None,
+        )
+
+        try:
+
+            conn.execute(
+                "PRAGMA journal_mode=WAL"
+            )
+
+            yield conn
+
+        finally:
+
+            conn.close()
+
+    def add(
+        self,
+        recipient,
+        subject,
+        text_body=None,
+        html_body=None,
+    ):
+        timestamp = time.time()
+
+        with self._lock, self._connect() as conn:
+
+            cursor = conn.execute(
+                """
+                INSERT INTO outbox (
+                    recipient, subject, text_body, html_body,
+                    next_attempt_at, created_at, updated_at
+                )
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    recipient,
+                    subject,
+                    text_body,
+                    html_body,
+                    timestamp,
+                    timestamp,
+                    timestamp,
+                ),
+            )
+
+            return cursor.lastrowid
+
+    def claim_due(
+        self,
+        limit=20,
+    ):
+        """
+        Atomically move due messages into the "sending"
+        state and return them.
+        """
+
+        timestamp = time.time()
+
+        with self._lock, self._connect() as conn:
+
+            conn.execute(
+                "BEGIN IMMEDIATE"
+            )
+
+            # Recover messages abandoned by a dead worker.
+            conn.execute(
+                """
+                UPDATE outbox
+                SET status = 'pending', updated_at = ?
+                WHERE status = 'sending' AND updated_at < ?
+                """,
+                (
+                    timestamp,
+                    timestamp - MAIL_SENDING_LEASE_SECONDS,
+                ),
+            )
+
+            rows = conn.execute(
+                """
+                SELECT id, recipient, subject, text_body,
+                       html_body, attempts
+                FROM outbox
+                WHERE status = 'pending'
+                  AND next_attempt_at <= ?
+                ORDER BY next_attempt_at
+                LIMIT ?
+                """,
+                (
+                    timestamp,
+                    limit,
+                ),
+            ).fetchall()
+
+            if rows:
+
+                conn.executemany(
+                    """
+                    UPDATE outbox
+                    SET status = 'sending', updated_at = ?
+                    WHERE id = ?
+                    """,
+                    [
+                        (timestamp, row[0])
+                        for row in rows
+                    ],
+                )
+
+            conn.execute(
+                "COMMIT"
+            )
+
+        return [
+            {
+                "id": row[0],
+                "recipient": row[1],
+                "subject": row[2],
+                "text_body": row[3],
+                "html_body": row[4],
+                "attempts": row[5],
+            }
+            for row in rows
+        ]
+
+    def mark_sent(
+        self,
+        message_id,
+    ):
+        with self._lock, self._connect() as conn:
+
+            conn.execute(
+                "DELETE FROM outbox WHERE id = ?",
+                (message_id,),
+            )
+
+    def mark_failed(
+        self,
+        message,
+        error,
+    ):
+        """
+        Reschedule a message with exponential backoff, or
+        park it as "failed" after MAIL_MAX_ATTEMPTS.
+        """
+
+        attempts = message["attempts"] + 1
+
+        timestamp = time.time()
+
+        status = (
+            "failed"
+            if attempts >= MAIL_MAX_ATTEMPTS
+            else "pending"
+        )
+
+        delay = MAIL_RETRY_BASE_SECONDS * (
+            2 ** (attempts - 1)
+        )
+
+        with self._lock, self._connect() as conn:
+
+            conn.execute(
+                """
+                UPDATE outbox
+                SET status = ?, attempts = ?,
+                    next_attempt_at = ?, last_error = ?,
+                    updated_at = ?
+                WHERE id = ?
+                """,
+                (
+                    status,
+                    attempts,
+                    timestamp + delay,
+                    str(error)[:500],
+                    timestamp,
+                    message["id"],
+                ),
+            )
+
+        return status
+
+    def next_due_in(self):
+        """
+        Seconds until the next pending message is due, or
+        None when the spool is empty.
+        """
+
+        with self._lock, self._connect() as conn:
+
+            row = conn.execute(
+                """
+                SELECT MIN(next_attempt_at)
+                FROM outbox
+                WHERE status = 'pending'
+                """
+            ).fetchone()
+
+        if not row or row[0] is None:
+            return None
+
+        return max(
+            row[0] - time.time(),
+            0,
+        )
+
+    def stats(self):
+
+        with self._lock, self._connect() as conn:
+
+            rows = conn.execute(
+                """
+                SELECT status, COUNT(*)
+                FROM outbox
+                GROUP BY status
+                """
+            ).fetchall()
+
+        return {
+            status: count
+            for status, count in rows
+        }
+
+
+# =========================================================
+# SMTP CONNECTION POOL
+# =========================================================
+
+class SMTPPool:
+    """
+    Small pool of persistent, authenticated SMTP
+    connections so each message does not pay for a new
+    TCP + TLS handshake and login.
+    """
+
+    def __init__(
+        self,
+        size=MAIL_POOL_SIZE,
+    ):
+        self.size = max(
+            int(size),
+            1,
+        )
+
+        self._idle = []
+
+        self._lock = threading.Lock()
+
+    def _open(self):
+
+        if SMTP_USE_SSL:
+
+            server = smtplib.SMTP_SSL(
+                SMTP_HOST,
+                SMTP_PORT,
+                timeout=SMTP_TIMEOUT,
+            )
+
+        else:
+
+            server = smtplib.SMTP(
+                SMTP_HOST,
+                SMTP_PORT,
+                timeout=SMTP_TIMEOUT,
+            )
+
+            server.ehlo()
+
+            if SMTP_USE_TLS:
+
+                server.starttls()
+
+                server.ehlo()
+
+        if SMTP_USER and SMTP_PASS:
+
+            server.login(
+                SMTP_USER,
+                SMTP_PASS,
+            )
+
+        return server
+
+    def acquire(self):
+
+        with self._lock:
+
+            while self._idle:
+
+                server, released_at = self._idle.pop()
+
+                if (
+                    time.time() - released_at
+                    < MAIL_CONNECTION_IDLE_SECONDS
+                ):
+                    return server
+
+                self._close(server)
+
+        return self._open()
+
+    def release(
+        self,
+        server,
+    ):
+        with self._lock:
+
+            if len(self._idle) < self.size:
+
+                self._idle.append(
+                    (server, time.time())
+                )
+
+                return
+
+        self._close(server)
+
+    def discard(
+        self,
+        server,
+    ):
+        self._close(server)
+
+    @staticmethod
+    def _close(server):
+
+        try:
+            server.quit()
+
+        except Exception:
+            pass
+
+    def send(
+        self,
+        message: EmailMessage,
+    ):
+        server = self.acquire()
+
+        try:
+
+            server.send_message(
+                message
+            )
+
+        except (
+            smtplib.SMTPServerDisconnected,
+            ConnectionError,
+        ):
+
+            # The pooled connection went stale; retry once
+            # on a fresh connection before giving up.
+            self.discard(server)
+
+            server = self._open()
+
+            try:
+
+                server.send_message(
+                    message
+                )
+
+            except Exception:
+
+                self.discard(server)
+
+                raise
+
+        except Exception:
+
+            self.discard(server)
+
+            raise
+
+        self.release(server)
+
+
+# =========================================================
+# DELIVERY WORKER
+# =========================================================
+
+def build_message(
+    row,
+):
+    message = EmailMessage()
+
+    message["From"] = SMTP_FROM
+    message["To"] = row["recipient"]
+    message["Subject"] = row["subject"]
+
+    message.set_content(
+        row.get("text_body")
+        or ""
+    )
+
+    if row.get("html_body"):
+
+        message.add_alternative(
+            row["html_body"],
+            subtype="html",
+        )
+
+    return message
+
+
+class MailWorker:
+    """
+    Background thread that drains the outbox through the
+    SMTP pool. Request handlers only enqueue; they never
+    talk to the SMTP server.
+    """
+
+    IDLE_POLL_SECONDS = 60
+
+    def __init__(
+        self,
+        outbox: MailOutbox,
+        pool: SMTPPool,
+    ):
+        self.outbox = outbox
+
+        self.pool = pool
+
+        self._wake = threading.Event()
+
+        self._thread = None
+
+        self._start_lock = threading.Lock()
+
+    def start(self):
+
+        with self._start_lock:
+
+            if (
+                self._thread is not None
+                and self._thread.is_alive()
+            ):
+                return
+
+            self._thread = threading.Thread(
+                target=self._run,
+                name="Mail-Outbox-Worker",
+                daemon=True,
+            )
+
+            self._thread.start()
+
+        logger.info(
+            "🧵 Mail outbox worker started."
+        )
+
+    def wake(self):
+        self._wake.set()
+
+    def drain_once(self):
+
+        sent = 0
+
+        for row in self.outbox.claim_due():
+
+            try:
+
+                self.pool.send(
+                    build_message(row)
+                )
+
+                self.outbox.mark_sent(
+                    row["id"]
+                )
+
+                sent += 1
+
+            except Exception as e:
+
+                status = self.outbox.mark_failed(
+                    row,
+                    e,
+                )
+
+                logger.warning(
+                    "Mail %s to %s failed (%s): %s",
+                    row["id"],
+                    row["recipient"],
+                    status,
+                    e,
+                )
+
+        return sent
+
+    def _run(self):
+
+        while True:
+
+            try:
+
+                while self.drain_once():
+                    pass
+
+                wait = self.outbox.next_due_in()
+
+            except Exception:
+
+                logger.exception(
+                    "Mail outbox worker iteration failed."
+                )
+
+                wait = None
+
+            if wait is None:
+                wait = self.IDLE_POLL_SECONDS
+
+            self._wake.wait(
+                min(
+                    wait,
+                    self.IDLE_POLL_SECONDS,
+                )
+            )
+
+            self._wake.clear()
+
+
+# =========================================================
+# SINGLETONS
+# =========================================================
+
+_worker = None
+_worker_lock = threading.Lock()
+
+
+def get_worker():
+
+    global _worker
+
+    with _worker_lock:
+
+        if _worker is None:
+
+            _worker = MailWorker(
+                MailOutbox(),
+                SMTPPool(),
+            )
+
+            _worker.start()
+
+        return _worker
+
+
+def start_mail_worker():
+    """
+    Start the delivery worker so mail spooled before a
+    restart is delivered without waiting for a new
+    enqueue.
+    """
+
+    if not is_configured():
+
+        logger.info(
+            "ℹ Mail delivery not configured; "
+            "outbox worker not started."
+        )
+
+        return None
+
+    return get_worker()
+
+
+# =========================================================
+# PUBLIC API
+# =========================================================
+
+def enqueue_email(
+    recipient,
+    subject,
+    text_body=None,
+    html_body=None,
+):
+    """
+    Persist a message to the outbox and wake the delivery
+    worker. Returns the outbox id, or None when mail
+    delivery is not configured.
+    """
+
+    if not is_configured():
+        return None
+
+    worker = get_worker()
+
+    message_id = worker.outbox.add(
+        recipient,
+        subject,
+        text_body=text_body,
+        html_body=html_body,
+    )
+
+    worker.wake()
+
+    return message_id
+
+
+CODE_SUBJECTS = {
+    "verify": "Your RevelaCode verification code",
+    "reset": "Your RevelaCode password reset code",
+    "delete": "Confirm your RevelaCode account deletion",
+}
+
+
+def enqueue_code_email(
+    contact,
+    code,
+    purpose="verify",
+):
+    """
+    Queue a one-time code for delivery when the contact is
+    an email address. Phone contacts are ignored.
+
+    Failures are logged and never break the calling
+    request.
+    """
+
+    if not contact or "@" not in str(contact):
+        return None
+
+    try:
+
+        return enqueue_email(
+            str(contact).strip(),
+            CODE_SUBJECTS.get(
+                purpose,
+                CODE_SUBJECTS["verify"],
+            ),
+            text_body=(
+                f"Your RevelaCode code is {code}.\n\n"
+                "It expires in 10 minutes."
+            ),
+            html_body=(
+                "<p>Your RevelaCode code is "
+                f"<strong>{code}</strong>.</p>"
+                "<p>It expires in 10 minutes.</p>"
+            ),
+        )
+
+    except Exception:
+
+        logger.exception(
+            "Failed to enqueue %s email.",
+            purpose,
+        )
+
+        return None
@@ -4,7 +4,7 @@
 import os
 import uuid
 import json
-from pymongo import MongoClient, ASCENDING, DESCENDING
+from pymongo import ASCENDING, DESCENDING
 
 MONGO_URI = os.environ.get('MONGO_URI')
 POSTS_JSON = os.environ.get('POSTS_JSON_PATH','posts.json')
@@ -12,7 +12,9 @@ POSTS_JSON = os.environ.get('POSTS_JSON_PATH','posts.json')
 class PostStore:
     def __init__(self):
         if MONGO_URI:
-            self.client = MongoClient(MONGO_URI)
+            # Reuse the process-wide client instead of opening a second pool.
+            from backend.db import get_client
+            self.client = get_client()
             self.db = self.client.get_database()
             self.collection = self.db.get_collection('community_posts')
             # create indexes
@@ -8,7 +8,12 @@ from backend.utils.auth_keys import get_role
 from backend.utils.audit_logger import log_admin_action
 from backend.models.models import create_user, get_all_users
 from backend.study.lesson_processor import LessonProcessor
-from backend.study.study_service import StudyService
+from backend.study.study_service import (
+    MATERIALS_PAGE_SIZE,
+    StudyService,
+)
+from backend.jumuiya.core.pagination import parse_cursor_pagination
+from backend.services.request_profiler import registry as metrics_registry
 
 # ----------------------------
 # Load environment variables
@@ -183,6 +188,50 @@ def upload_study_material():
 
     db = get_db()
 
+    if "file" in request.files:
+
+        form = request.form
+
+        queued = (
+            LessonProcessor
+            .process_uploaded_file(
+                request.files["file"],
+                metadata={
+                    "title": form.get("title"),
+                    "category": form.get("category"),
+                    "subcategory": form.get("subcategory"),
+                    "year": form.get("year"),
+                }
+            )
+        )
+
+        if not queued.get("success"):
+
+            return jsonify(queued),(
+                413
+                if queued.get("code") == "file_too_large"
+                else 400
+            )
+
+        log_admin_action(
+
+            db,
+
+            action="queue_study_extraction",
+
+            resource=queued["filename"],
+
+            actor="admin",
+
+            metadata={
+
+                "job_id":
+                queued["job_id"]
+            }
+        )
+
+        return jsonify(queued),202
+
     data = request.get_json(
         silent=True
     ) or {}
@@ -236,10 +285,19 @@ def upload_study_material():
             subcategory=subcategory,
             content=content,
             year=year,
-            tags=tags
+            tags=tags,
+            file_hash=data.get(
+                "file_hash"
+            )
         )
     )
 
+    if not result.get("success"):
+
+        return jsonify(
+            result
+        ),400
+
     log_admin_action(
 
         db,
@@ -277,14 +335,20 @@ def upload_study_material():
 @require_role("admin")
 def admin_list_materials():
 
-    category = request.args.get(
-        "category"
+    cursor, limit = parse_cursor_pagination(
+        request.args,
+        MATERIALS_PAGE_SIZE,
+        200,
     )
 
-    materials = (
+    materials, next_cursor = (
         StudyService
         .get_materials(
-            category
+            request.args.get("category"),
+            request.args.get("subcategory"),
+            request.args.get("file_type"),
+            cursor=cursor,
+            limit=limit,
         )
     )
 
@@ -294,7 +358,13 @@ def admin_list_materials():
         materials,
 
         "count":
-        len(materials)
+        len(materials),
+
+        "next_cursor":
+        next_cursor,
+
+        "has_more":
+        next_cursor is not None
 
     }),200
 
@@ -311,33 +381,25 @@ def admin_list_materials():
 @require_role("admin")
 def study_stats():
 
-    materials = (
+    counts = (
         StudyService
-        .get_materials()
+        .count_by_category()
     )
 
-    faith_count = len([
-
-        m for m in materials
-
-        if m.get(
-            "category"
-        )=="faith"
-    ])
-
-    education_count = len([
-
-        m for m in materials
+    faith_count = counts.get(
+        "faith",
+        0
+    )
 
-        if m.get(
-            "category"
-        )=="education"
-    ])
+    education_count = counts.get(
+        "education",
+        0
+    )
 
     return jsonify({
 
         "total_materials":
-        len(materials),
+        sum(counts.values()),
 
         "faith_materials":
         faith_count,
@@ -346,3 +408,37 @@ def study_stats():
         education_count
 
     }),200
+
+
+
+# ----------------------------
+# Request Metrics (REQUEST_PROFILING=true)
+# ----------------------------
+
+@admin_bp.route(
+    "/admin/metrics",
+    methods=["GET"]
+)
+@require_role("admin")
+def request_metrics():
+
+    return jsonify(
+        metrics_registry.snapshot()
+    ),200
+
+
+@admin_bp.route(
+    "/admin/metrics",
+    methods=["DELETE"]
+)
+@require_role("admin")
+def reset_request_metrics():
+
+    metrics_registry.reset()
+
+    return jsonify({
+
+        "message":
+        "Request metrics reset."
+
+    }),200
@@ -1,72 +1,53 @@
 # backend/routes/domain_routes.py
-import pkgutil
-import importlib
 import logging
 
-from flask import Blueprint, request, jsonify, g
+from flask import Blueprint, Response, request, jsonify, g, stream_with_context
 
-from backend import domains
 from backend.services.audit_logger import log_domain_event
 from backend.services.billing_guard import enforce_domain_policy
-from backend.services.ai_router import ask_ai
+from backend.services.domain_registry import (
+    dispatch,
+    dispatch_batch,
+    dispatch_stream,
+    domain_stats,
+    get_domain,
+    list_domains,
+)
 
 logger = logging.getLogger(__name__)
 
 # ---------------- BLUEPRINT ----------------
 domain_bp = Blueprint("domains", __name__)
 
-# ---------------- DOMAIN REGISTRY ----------------
-DOMAIN_REGISTRY = {}
+# Largest batch accepted by POST /domains/<name>/batch.
+MAX_BATCH_QUERIES = 20
 
-def register_domain(name, handler, use_ai=False):
-    """
-    Register a domain with optional AI usage.
-    """
-    if not callable(handler):
-        raise ValueError(f"Handler for domain '{name}' must be callable")
 
-    DOMAIN_REGISTRY[name] = {
-        "handler": handler,
-        "use_ai": bool(use_ai)
+def current_user():
+    # User context (guest-safe)
+    return getattr(g, "user", None) or {
+        "id": "guest",
+        "is_premium": False
     }
 
-def get_domain(name):
-    return DOMAIN_REGISTRY.get(name)
-
-def list_domains():
-    return sorted(DOMAIN_REGISTRY.keys())
-
-# ---------------- AUTO LOADER ----------------
-def auto_load_domains():
-    """
-    Dynamically load all backend/domains/*/service.py files
-    without crashing the app on failure.
-    """
-    for _, module_name, is_pkg in pkgutil.iter_modules(domains.__path__):
-        if not is_pkg:
-            continue
-
-        module_path = f"backend.domains.{module_name}.service"
-        try:
-            importlib.import_module(module_path)
-            logger.info(f"✅ Loaded domain: {module_name}")
-        except ModuleNotFoundError:
-            logger.warning(f"⚠️ No service.py for domain '{module_name}'")
-        except Exception as e:
-            logger.error(f"❌ Failed to load domain '{module_name}': {e}")
-
-# Load domains once at import time
-auto_load_domains()
 
 # ---------------- ROUTES ----------------
 @domain_bp.route("/domains", methods=["GET"])
 def domains_route():
     """List all available domains"""
+    domains = list_domains()
     return jsonify({
-        "available_domains": list_domains(),
-        "count": len(DOMAIN_REGISTRY)
+        "available_domains": domains,
+        "count": len(domains)
     })
 
+
+@domain_bp.route("/domains/stats", methods=["GET"])
+def domains_stats_route():
+    """Per-domain call counts and latency (ms) for this process"""
+    return jsonify({"domains": domain_stats()})
+
+
 @domain_bp.route("/domains/<domain_name>", methods=["POST"])
 def handle_domain(domain_name):
     domain_info = get_domain(domain_name)
@@ -79,27 +60,13 @@ def handle_domain(domain_name):
     if not query:
         return jsonify({"error": "Missing 'query'"}), 400
 
-    # User context (guest-safe)
-    user = getattr(g, "user", None) or {
-        "id": "guest",
-        "is_premium": False
-    }
+    user = current_user()
 
     # Enforce billing / usage rules
-    enforce_domain_policy(domain_name, user)
+    enforce_domain_policy(domain_name, user, policy=domain_info["policy"])
 
     try:
-        if domain_info["use_ai"]:
-            result = ask_ai(
-                prompt=query,
-                domain=domain_name,
-                context=user
-            )
-        else:
-            result = domain_info["handler"](
-                query,
-                user_context=user
-            )
+        result = dispatch(domain_name, query, user_context=user)
 
         log_domain_event(
             user_id=user["id"],
@@ -125,3 +92,132 @@ def handle_domain(domain_name):
             "error": "Domain execution failed",
             "details": str(e)
         }), 500
+
+
+@domain_bp.route("/domains/<domain_name>/batch", methods=["POST"])
+def handle_domain_batch(domain_name):
+    """
+    Several queries in one request; each one counts against
+    the daily limit.
+    """
+    domain_info = get_domain(domain_name)
+    if not domain_info:
+        return jsonify({"error": "Domain not found"}), 404
+
+    data = request.get_json(silent=True) or {}
+    queries = data.get("queries")
+
+    if (
+        not isinstance(queries, list)
+        or not queries
+        or not all(isinstance(query, str) and query for query in queries)
+    ):
+        return jsonify({"error": "'queries' must be a list of strings"}), 400
+
+    if len(queries) > MAX_BATCH_QUERIES:
+        return jsonify({
+            "error": f"At most {MAX_BATCH_QUERIES} queries per batch"
+        }), 400
+
+    user = current_user()
+
+    enforce_domain_policy(
+        domain_name,
+        user,
+        policy=domain_info["policy"],
+        calls=len(queries)
+    )
+
+    try:
+        results = dispatch_batch(domain_name, queries, user_context=user)
+
+        log_domain_event(
+            user_id=user["id"],
+            domain=domain_name,
+            query=" | ".join(queries),
+            status="success",
+            metadata={"batch": len(queries)}
+        )
+
+        return jsonify({"results": results, "count": len(results)}), 200
+
+    except Exception as e:
+        logger.exception("Domain batch execution failed")
+
+        log_domain_event(
+            user_id=user["id"],
+            domain=domain_name,
+            query=" | ".join(queries),
+            status="error",
+            metadata={"error": str(e), "batch": len(queries)}
+        )
+
+        return jsonify({
+            "error": "Domain execution failed",
+            "details": str(e)
+        }), 500
+
+
+@domain_bp.route("/domains/<domain_name>/stream", methods=["POST"])
+def stream_domain(domain_name):
+    """
+    Like POST /domains/<name>, but domains that answer through
+    the AI service send the answer as chunked output while it
+    is generated, using the same prompt as the plain call.
+    """
+    domain_info = get_domain(domain_name)
+    if not domain_info:
+        return jsonify({"error": "Domain not found"}), 404
+
+    data = request.get_json(silent=True) or {}
+    query = data.get("query")
+
+    if not query:
+        return jsonify({"error": "Missing 'query'"}), 400
+
+    user = current_user()
+
+    enforce_domain_policy(domain_name, user, policy=domain_info["policy"])
+
+    try:
+        chunks = dispatch_stream(domain_name, query, user_context=user)
+
+        if chunks is None:
+            result = dispatch(domain_name, query, user_context=user)
+
+    except Exception as e:
+        logger.exception("Domain execution failed")
+
+        log_domain_event(
+            user_id=user["id"],
+            domain=domain_name,
+            query=query,
+            status="error",
+            metadata={"error": str(e)}
+        )
+
+        return jsonify({
+            "error": "Domain execution failed",
+            "details": str(e)
+        }), 500
+
+    log_domain_event(
+        user_id=user["id"],
+        domain=domain_name,
+        query=query,
+        status="stream" if chunks is not None else "success"
+    )
+
+    if chunks is None:
+        return jsonify(result), 200
+
+    response = Response(
+        stream_with_context(chunks),
+        mimetype="application/json"
+    )
+
+    # Let reverse proxies pass chunks through as they arrive.
+    response.headers["X-Accel-Buffering"] = "no"
+    response.headers["Cache-Control"] = "no-store"
+
+    return response
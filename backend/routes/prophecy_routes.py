@@ -3,6 +3,12 @@
 from flask import Blueprint, jsonify, request
 
 from backend.bible_decoder import BibleDecoder
+from backend.knowledge_graph import (
+    DEFAULT_LIMIT,
+    MAX_DEPTH,
+    MAX_LIMIT,
+    get_knowledge_graph,
+)
 
 
 # =========================================================
@@ -22,6 +28,9 @@ prophecy_bp = Blueprint(
 
 decoder = BibleDecoder()
 
+# Related symbols attached to each decoded record.
+DECODE_RELATED_LIMIT = 8
+
 
 # =========================================================
 # HELPERS
@@ -139,6 +148,51 @@ def normalize_decoded_results(decoded):
     return normalized
 
 
+def int_arg(
+    name,
+    default,
+    low,
+    high,
+):
+
+    try:
+        value = int(
+            request.args.get(
+                name,
+                default,
+            )
+        )
+
+    except (TypeError, ValueError):
+        value = default
+
+    return min(
+        max(value, low),
+        high,
+    )
+
+
+def add_related_symbols(decoded):
+    """
+    Attach graph neighbours (two hops) to every decoded
+    record as `related`.
+    """
+
+    graph = get_knowledge_graph()
+
+    for item in decoded:
+
+        if item.get("symbol"):
+
+            item["related"] = graph.related(
+                item["symbol"],
+                depth=2,
+                limit=DECODE_RELATED_LIMIT,
+            )
+
+    return decoded
+
+
 # =========================================================
 # DECODE
 # =========================================================
@@ -298,12 +352,22 @@ def decode_prophecy():
                 "count": 0,
                 "decoded": [],
                 "message": message,
+                # The graph may still know the term.
+                "related": get_knowledge_graph().related(
+                    query,
+                    depth=2,
+                    limit=DECODE_RELATED_LIMIT,
+                ),
             }), 200
 
         # =================================================
         # SUCCESS
         # =================================================
 
+        add_related_symbols(
+            decoded
+        )
+
         return jsonify({
             "success": True,
             "schema_version":
@@ -343,3 +407,73 @@ def decode_prophecy():
             ),
             "error": str(exc),
         }), 500
+
+
+# =========================================================
+# KNOWLEDGE GRAPH
+# =========================================================
+
+@prophecy_bp.route(
+    "/graph/<path:symbol>",
+    methods=["GET"],
+)
+def symbol_graph(symbol):
+    """
+    Graph view of one symbol (or alias).
+
+    Query:
+
+        ?depth=2     hops for `related` (1-3)
+        ?limit=20    max entries per list (1-100)
+
+    Response:
+
+    {
+        "success": true,
+        "symbol": "antichrist",
+        "node": {...},
+        "neighbors": [{"symbol", "relation", "weight"}],
+        "related": [{"symbol", "depth", "score", "relation"}]
+    }
+    """
+
+    graph = get_knowledge_graph()
+
+    node = graph.node(
+        symbol
+    )
+
+    if not node:
+        return jsonify({
+            "success": False,
+            "message": (
+                f'"{symbol}" is not in the knowledge graph.'
+            ),
+        }), 404
+
+    limit = int_arg(
+        "limit",
+        DEFAULT_LIMIT,
+        1,
+        MAX_LIMIT,
+    )
+
+    return jsonify({
+        "success": True,
+        "symbol": node["symbol"],
+        "node": node,
+        "neighbors": graph.neighbors(
+            symbol,
+            limit=limit,
+        ),
+        "related": graph.related(
+            symbol,
+            depth=int_arg(
+                "depth",
+                2,
+                1,
+                MAX_DEPTH,
+            ),
+            limit=limit,
+        ),
+    }), 200
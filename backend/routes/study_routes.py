@@ -1,11 +1,33 @@
 # backend/routes/study_routes.py
 
-from flask import Blueprint, request, jsonify
+import hashlib
+
+from flask import (
+    Blueprint,
+    Response,
+    current_app,
+    jsonify,
+    request,
+    stream_with_context,
+)
 
 from backend.db import get_db
 
-from backend.study.study_service import StudyService
+from backend.jumuiya.core.pagination import (
+    parse_cursor_pagination,
+)
+from backend.study.study_service import (
+    MATERIALS_PAGE_SIZE,
+    SEARCH_PAGE_SIZE,
+    StudyService,
+)
 from backend.study.lesson_processor import LessonProcessor
+from backend.study.extraction_jobs import (
+    get_job,
+    iter_job_text,
+    public_job,
+    read_job_text,
+)
 from backend.study.material_preferences import (
     MaterialPreferences,
 )
@@ -18,6 +40,7 @@ from backend.study.bookmark_service import (
 from backend.study.sda_quarterly_service import (
     SDAQuarterlyService,
 )
+from backend.study.sda_calendar import sda_calendar
 
 
 # =========================================================
@@ -30,6 +53,10 @@ study_bp = Blueprint(
     url_prefix="/study",
 )
 
+# How long clients may cache "no lesson today"; an import
+# can add one at any time.
+SDA_MISSING_MAX_AGE = 300
+
 
 # =========================================================
 # MATERIALS
@@ -41,18 +68,26 @@ study_bp = Blueprint(
 )
 def get_materials():
 
-    category = request.args.get(
-        "category"
+    cursor, limit = parse_cursor_pagination(
+        request.args,
+        MATERIALS_PAGE_SIZE,
+        200,
     )
 
-    materials = StudyService.get_materials(
-        category
+    materials, next_cursor = StudyService.get_materials(
+        request.args.get("category"),
+        request.args.get("subcategory"),
+        request.args.get("file_type"),
+        cursor=cursor,
+        limit=limit,
     )
 
     return jsonify({
         "success": True,
         "count": len(materials),
         "materials": materials,
+        "next_cursor": next_cursor,
+        "has_more": next_cursor is not None,
     }), 200
 
 
@@ -157,16 +192,25 @@ def upload_material():
                 "message": "No file selected.",
             }), 400
 
-        extracted = (
+        queued = (
             LessonProcessor
             .process_uploaded_file(
                 file
             )
         )
 
+        if queued.get("success"):
+            status = 202
+
+        elif queued.get("code") == "file_too_large":
+            status = 413
+
+        else:
+            status = 400
+
         return jsonify(
-            extracted
-        ), 200
+            queued
+        ), status
 
     # -----------------------------------------------------
     # TEXT MATERIAL
@@ -222,12 +266,90 @@ def upload_material():
                 "year"
             ),
             tags=tags,
+            file_hash=data.get(
+                "file_hash"
+            ),
         )
     )
 
     return jsonify(
         result
-    ), 200
+    ), 200 if result.get("success") else 400
+
+
+# =========================================================
+# EXTRACTION JOBS
+# =========================================================
+
+@study_bp.route(
+    "/upload/jobs/<job_id>",
+    methods=["GET"],
+)
+def upload_job_status(
+    job_id,
+):
+
+    job = get_job(
+        job_id
+    )
+
+    if not job:
+        return jsonify({
+            "success": False,
+            "message": "Job not found.",
+        }), 404
+
+    data = public_job(
+        job
+    )
+
+    if (
+        job["status"] == "done"
+        and request.args.get("include") == "content"
+    ):
+        data["content"] = read_job_text(
+            job
+        )
+
+    return jsonify({
+        "success": True,
+        **data,
+    }), 200
+
+
+@study_bp.route(
+    "/upload/jobs/<job_id>/text",
+    methods=["GET"],
+)
+def upload_job_text(
+    job_id,
+):
+
+    job = get_job(
+        job_id
+    )
+
+    if not job:
+        return jsonify({
+            "success": False,
+            "message": "Job not found.",
+        }), 404
+
+    if job["status"] != "done":
+        return jsonify({
+            "success": False,
+            "message": "Extraction not finished.",
+            **public_job(job),
+        }), 409
+
+    return Response(
+        stream_with_context(
+            iter_job_text(
+                job
+            )
+        ),
+        mimetype="text/plain; charset=utf-8",
+    )
 
 
 # =========================================================
@@ -250,16 +372,30 @@ def search_materials():
             "success": True,
             "count": 0,
             "results": [],
+            "next_cursor": None,
+            "has_more": False,
         }), 200
 
-    results = StudyService.search_materials(
-        query
+    cursor, limit = parse_cursor_pagination(
+        request.args,
+        SEARCH_PAGE_SIZE,
+        50,
+    )
+
+    results, next_cursor = StudyService.search_materials(
+        query,
+        category=request.args.get("category"),
+        subcategory=request.args.get("subcategory"),
+        cursor=cursor,
+        limit=limit,
     )
 
     return jsonify({
         "success": True,
         "count": len(results),
         "results": results,
+        "next_cursor": next_cursor,
+        "has_more": next_cursor is not None,
     }), 200
 
 
@@ -474,25 +610,75 @@ def get_bookmarks(user_id):
     methods=["GET"],
 )
 def sda_today():
+    """
+    Today's lesson is the same for every user all day, so
+    the JSON is serialised once per date and cached by
+    clients and proxies until midnight (Nairobi).
+    """
+
+    today = (
+        SDAQuarterlyService
+        .today_date()
+    )
+
+    body, status = sda_calendar.response(
+        (
+            "today",
+            today.isoformat(),
+        ),
+        lambda: sda_today_body(
+            today
+        ),
+    )
+
+    response = Response(
+        body,
+        status=status,
+        mimetype="application/json",
+    )
+
+    response.cache_control.public = True
+
+    response.cache_control.max_age = (
+        SDAQuarterlyService.seconds_until_tomorrow()
+        if status == 200
+        else SDA_MISSING_MAX_AGE
+    )
+
+    response.set_etag(
+        hashlib.sha256(body).hexdigest()[:32]
+    )
+
+    return response.make_conditional(
+        request
+    )
+
+
+def sda_today_body(
+    today,
+):
 
     material = (
         SDAQuarterlyService
-        .get_today()
+        .get_today(
+            today
+        )
     )
 
     if not material:
-        return jsonify({
+
+        return current_app.json.dumps({
             "success": False,
             "message": (
                 "No SDA quarterly lesson "
                 "is available for today."
             ),
-        }), 404
+        }).encode("utf-8"), 404
 
-    return jsonify({
+    return current_app.json.dumps({
         "success": True,
         "material": material,
-    }), 200
+    }).encode("utf-8"), 200
 
 
 # =========================================================
@@ -1,16 +1,404 @@
 # backend/services/ai_router.py
 
-import requests
+"""
+Client for the RevelaCode AI service (REVELA_AI_URL).
+
+    ask_ai     -> one JSON answer (cached)
+    stream_ai  -> the answer as it is generated, for chunked
+                  Flask responses
+
+Both share one keep-alive connection pool, and at most
+AI_MAX_CONCURRENCY calls are in flight: a request that cannot
+get a slot within AI_QUEUE_TIMEOUT seconds gets the "busy"
+fallback instead of blocking a worker thread.
+
+Answers are cached for AI_CACHE_TTL seconds under a hash of
+(prompt, domain, context), so repeated questions about the
+same material are answered from memory.
+
+A circuit breaker opens after AI_BREAKER_THRESHOLD failures
+in a row (timeouts, 429 and 5xx responses). While it is open
+calls return the fallback payload immediately; after
+AI_BREAKER_COOLDOWN seconds one trial call is let through.
+
+Every failure returns the usual {"message": ..., "fallback":
+True} payload, so callers are unchanged.
+"""
+
+import hashlib
+import json
 import os
+import threading
+import time
+
+from collections import OrderedDict
+
+import requests
+
+from requests.adapters import HTTPAdapter
+
 
 REVELA_AI_URL = os.getenv(
     "REVELA_AI_URL"
 )
 
+AI_MAX_CONCURRENCY = int(
+    os.getenv(
+        "AI_MAX_CONCURRENCY",
+        "4"
+    )
+)
+
+AI_QUEUE_TIMEOUT = float(
+    os.getenv(
+        "AI_QUEUE_TIMEOUT",
+        "2"
+    )
+)
+
+AI_CONNECT_TIMEOUT = float(
+    os.getenv(
+        "AI_CONNECT_TIMEOUT",
+        "3"
+    )
+)
+
+AI_READ_TIMEOUT = float(
+    os.getenv(
+        "AI_READ_TIMEOUT",
+        "20"
+    )
+)
+
+AI_CACHE_SIZE = int(
+    os.getenv(
+        "AI_CACHE_SIZE",
+        "500"
+    )
+)
+
+AI_CACHE_TTL = float(
+    os.getenv(
+        "AI_CACHE_TTL",
+        "900"
+    )
+)
+
+AI_BREAKER_THRESHOLD = int(
+    os.getenv(
+        "AI_BREAKER_THRESHOLD",
+        "5"
+    )
+)
+
+AI_BREAKER_COOLDOWN = float(
+    os.getenv(
+        "AI_BREAKER_COOLDOWN",
+        "30"
+    )
+)
+
+
+def fallback(message):
+
+    return {
+        "message": message,
+        "fallback": True
+    }
+
+
+BUSY_MESSAGE = (
+    "AI is currently busy. Please try again shortly."
+)
+
+
+# =========================================================
+# CONNECTION POOL
+# =========================================================
+
+_session = requests.Session()
+
+_session.mount(
+    "http://",
+    HTTPAdapter(
+        pool_connections=1,
+        pool_maxsize=AI_MAX_CONCURRENCY
+    )
+)
+
+_session.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=1,
+        pool_maxsize=AI_MAX_CONCURRENCY
+    )
+)
+
+_slots = threading.BoundedSemaphore(
+    max(
+        AI_MAX_CONCURRENCY,
+        1
+    )
+)
+
+
+# =========================================================
+# CIRCUIT BREAKER
+# =========================================================
+
+class CircuitBreaker:
+
+    def __init__(
+        self,
+        threshold,
+        cooldown
+    ):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self._lock = threading.Lock()
+        self.failures = 0
+        self.opened_at = None
+        self._trial = False
+
+    def allow(self):
+        """
+        True if a call may go upstream. Once the cooldown
+        has passed, a single trial call is allowed.
+        """
+
+        with self._lock:
+
+            if self.opened_at is None:
+                return True
+
+            if (
+                not self._trial
+                and time.monotonic() - self.opened_at >= self.cooldown
+            ):
+
+                self._trial = True
+
+                return True
+
+            return False
+
+    def blocked(self):
+        """
+        True while open and cooling down: the call can be
+        refused before it waits for a slot.
+        """
+
+        with self._lock:
+
+            return (
+                self.opened_at is not None
+                and time.monotonic() - self.opened_at < self.cooldown
+            )
+
+    def record_success(self):
+
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial = False
+
+    def record_failure(self):
+
+        with self._lock:
+
+            self.failures += 1
+
+            if (
+                self._trial
+                or self.failures >= self.threshold
+            ):
+                self.opened_at = time.monotonic()
+
+            self._trial = False
+
+    def state(self):
+
+        with self._lock:
+
+            if self.opened_at is None:
+                return "closed"
+
+            return "half_open" if self._trial else "open"
+
+
+breaker = CircuitBreaker(
+    AI_BREAKER_THRESHOLD,
+    AI_BREAKER_COOLDOWN
+)
+
+
+# =========================================================
+# RESPONSE CACHE
+# =========================================================
+
+class ResponseCache:
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(
+        prompt,
+        domain,
+        context
+    ):
+
+        raw = json.dumps(
+            {
+                "prompt": prompt,
+                "domain": domain,
+                "context": context
+            },
+            sort_keys=True,
+            default=str
+        )
+
+        return hashlib.sha256(
+            raw.encode("utf-8")
+        ).hexdigest()
+
+    def get(self, key):
+
+        with self._lock:
+
+            entry = self._entries.get(key)
+
+            if entry and time.monotonic() - entry[0] <= AI_CACHE_TTL:
+
+                self._entries.move_to_end(key)
+
+                self.hits += 1
+
+                return entry[1]
+
+            self.misses += 1
+
+        return None
+
+    def put(
+        self,
+        key,
+        value
+    ):
+
+        if AI_CACHE_SIZE <= 0:
+            return
+
+        with self._lock:
+
+            self._entries[key] = (
+                time.monotonic(),
+                value
+            )
+
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > AI_CACHE_SIZE:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+
+        with self._lock:
+            self._entries.clear()
+
+
+response_cache = ResponseCache()
+
+
+# =========================================================
+# UPSTREAM CALL
+# =========================================================
+
+def _post(
+    payload,
+    stream=False
+):
+    """
+    POST to the AI service. Returns (response, None) on
+    success or (None, fallback payload) when the call did not
+    succeed; the breaker is updated either way.
+    """
+
+    if not REVELA_AI_URL:
+        return None, fallback(
+            "AI service is not configured."
+        )
+
+    if not breaker.allow():
+        return None, fallback(
+            BUSY_MESSAGE
+        )
+
+    try:
+
+        response = _session.post(
+            REVELA_AI_URL,
+            json=payload,
+            timeout=(
+                AI_CONNECT_TIMEOUT,
+                AI_READ_TIMEOUT
+            ),
+            stream=stream
+        )
+
+    except requests.exceptions.Timeout:
+
+        breaker.record_failure()
+
+        return None, fallback(
+            "AI request timed out."
+        )
+
+    except Exception as e:
+
+        breaker.record_failure()
+
+        return None, fallback(
+            str(e)
+        )
+
+    if (
+        response.status_code == 429
+        or response.status_code >= 500
+    ):
+
+        breaker.record_failure()
+
+        response.close()
+
+        return None, fallback(
+            BUSY_MESSAGE
+            if response.status_code == 429
+            else f"AI service error ({response.status_code})."
+        )
+
+    if response.status_code >= 400:
+
+        # The request was refused, the service is healthy.
+        breaker.record_success()
+
+        response.close()
+
+        return None, fallback(
+            f"AI request rejected ({response.status_code})."
+        )
+
+    return response, None
+
+
 def ask_ai(
     prompt,
     domain=None,
-    context=None
+    context=None,
+    use_cache=True
 ):
 
     payload = {
@@ -20,37 +408,176 @@ def ask_ai(
         "context": context
     }
 
+    key = ResponseCache.key(
+        prompt,
+        domain,
+        context
+    )
+
+    if use_cache:
+
+        cached = response_cache.get(key)
+
+        if cached is not None:
+            return cached
+
+    if breaker.blocked() or not _slots.acquire(
+        timeout=AI_QUEUE_TIMEOUT
+    ):
+        return fallback(
+            BUSY_MESSAGE
+        )
+
     try:
 
-        response = requests.post(
-            REVELA_AI_URL,
-            json=payload,
-            timeout=30
+        response, failed = _post(
+            payload
         )
 
-        if response.status_code == 429:
+        if failed:
+            return failed
 
-            return {
-                "message":
-                "AI is currently busy. Please try again shortly.",
-                "fallback": True
-            }
+        try:
 
-        response.raise_for_status()
+            result = response.json()
 
-        return response.json()
+        except Exception as e:
 
-    except requests.exceptions.Timeout:
+            breaker.record_failure()
 
-        return {
-            "message":
-            "AI request timed out.",
-            "fallback": True
-        }
+            return fallback(
+                str(e)
+            )
 
-    except Exception as e:
+        breaker.record_success()
+
+    finally:
+
+        _slots.release()
+
+    response_cache.put(
+        key,
+        result
+    )
+
+    return result
+
+
+def stream_ai(
+    prompt,
+    domain=None,
+    context=None,
+    use_cache=True
+):
+    """
+    Yield the AI answer as bytes while the service produces
+    it. A cached answer, or the fallback payload, is yielded
+    as one JSON chunk. Complete JSON answers are cached for
+    ask_ai and later streams.
+    """
+
+    payload = {
+
+        "prompt": prompt,
+        "domain": domain,
+        "context": context
+    }
+
+    key = ResponseCache.key(
+        prompt,
+        domain,
+        context
+    )
+
+    if use_cache:
+
+        cached = response_cache.get(key)
+
+        if cached is not None:
+
+            yield json.dumps(
+                cached
+            ).encode("utf-8")
+
+            return
+
+    if breaker.blocked() or not _slots.acquire(
+        timeout=AI_QUEUE_TIMEOUT
+    ):
+
+        yield json.dumps(
+            fallback(BUSY_MESSAGE)
+        ).encode("utf-8")
+
+        return
+
+    try:
+
+        response, failed = _post(
+            payload,
+            stream=True
+        )
+
+        if failed:
+
+            yield json.dumps(
+                failed
+            ).encode("utf-8")
+
+            return
+
+        # The service answered; a client that disconnects
+        # mid-stream says nothing about upstream health.
+        breaker.record_success()
+
+        chunks = []
+
+        completed = False
+
+        try:
+
+            for chunk in response.iter_content(
+                chunk_size=None
+            ):
+
+                if chunk:
+
+                    chunks.append(chunk)
+
+                    yield chunk
+
+            completed = True
+
+        except Exception:
+
+            # Headers arrived but the body did not; the client
+            # already has a partial answer, so just stop.
+            breaker.record_failure()
+
+        finally:
+
+            response.close()
+
+        if not completed:
+            return
+
+        if "json" in response.headers.get(
+            "Content-Type",
+            ""
+        ):
+
+            try:
+
+                response_cache.put(
+                    key,
+                    json.loads(
+                        b"".join(chunks)
+                    )
+                )
+
+            except ValueError:
+                pass
+
+    finally:
 
-        return {
-            "message": str(e),
-            "fallback": True
-        }
\ No newline at end of file
+        _slots.release()
@@ -1,6 +1,39 @@
 # backend/services/billing_guard.py
 
-from flask import abort
+"""
+Domain access policy and usage metering.
+
+Every /domains/<name> call is counted per (user, domain, day)
+before the handler runs, and refused with 429 once the
+domain's daily_limit is reached.
+
+Counters live in the `domain_usage` collection, one document
+per user, domain and day, written with atomic `$inc` upserts
+and removed by a TTL index a few days later.
+
+Counting is write-behind: each process keeps the counters it
+has seen in memory and flushes the increments every
+USAGE_FLUSH_SECONDS (or once USAGE_FLUSH_BATCH are pending) in
+one bulk_write, so a busy user costs one read per day rather
+than a write per call. A counter read from Mongo is re-read
+after USAGE_REFRESH_SECONDS to pick up other processes' calls.
+"""
+
+import atexit
+import logging
+import os
+import threading
+import time
+
+from datetime import datetime, timedelta, timezone
+
+from flask import abort, jsonify, make_response
+from pymongo import ASCENDING, UpdateOne
+
+from backend.db import get_db
+from backend.services.client_keys import usage_key
+
+logger = logging.getLogger(__name__)
 
 DOMAIN_POLICIES = {
     "culture": {
@@ -17,14 +50,308 @@ DOMAIN_POLICIES = {
     }
 }
 
-def enforce_domain_policy(domain, user):
-    policy = DOMAIN_POLICIES.get(domain)
+USAGE_COLLECTION = "domain_usage"
+
+USAGE_FLUSH_SECONDS = float(
+    os.getenv("USAGE_FLUSH_SECONDS", "5")
+)
+
+USAGE_FLUSH_BATCH = int(
+    os.getenv("USAGE_FLUSH_BATCH", "200")
+)
+
+USAGE_REFRESH_SECONDS = float(
+    os.getenv("USAGE_REFRESH_SECONDS", "60")
+)
+
+# Counters are kept a little past their day for reporting.
+USAGE_RETENTION_DAYS = 3
+
+
+def usage_day(now=None):
+    """UTC date the call is counted against."""
+    return (now or datetime.now(timezone.utc)).strftime("%Y-%m-%d")
+
+
+class UsageMeter:
+    """
+    Per-process write-behind buffer over domain_usage.
+
+    For each (user, domain, day) it holds the count last read
+    from Mongo plus the increments not yet flushed; the limit
+    is checked against their sum under one lock.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._pending = 0
+        self._indexes_ready = False
+        self._wake = threading.Event()
+        self._thread = None
+
+    @staticmethod
+    def _id(user_key, domain, day):
+        return f"{user_key}:{domain}:{day}"
+
+    def _collection(self):
+
+        collection = get_db()[USAGE_COLLECTION]
+
+        if not self._indexes_ready:
+
+            collection.create_index(
+                [("expires_at", ASCENDING)],
+                expireAfterSeconds=0
+            )
+
+            collection.create_index(
+                [("user_id", ASCENDING), ("day", ASCENDING)]
+            )
+
+            self._indexes_ready = True
+
+        return collection
+
+    def _stored_count(self, key):
+
+        document = self._collection().find_one(
+            {"_id": key},
+            {"count": 1}
+        )
+
+        return int((document or {}).get("count", 0))
+
+    def consume(self, user_key, domain, limit, calls=1):
+        """
+        Count `calls` calls if they all fit within `limit`
+        for today; otherwise count none.
+
+        Returns (allowed, used) where `used` includes these
+        calls when allowed.
+        """
+
+        day = usage_day()
+
+        key = self._id(user_key, domain, day)
+
+        with self._lock:
+            entry = self._counters.get(key)
+            stale = (
+                entry is None
+                or time.monotonic() - entry["read_at"] > USAGE_REFRESH_SECONDS
+            )
+            flushes = entry["flushes"] if entry else 0
+
+        if stale:
+
+            try:
+                stored = self._stored_count(key)
+            except Exception as e:
+                # Fail open on the local count rather than
+                # refusing every call while Mongo is away.
+                logger.warning("Usage read failed: %s", e)
+                stored = entry["stored"] if entry else 0
+
+            with self._lock:
+
+                entry = self._counters.setdefault(key, {
+                    "user_id": user_key,
+                    "domain": domain,
+                    "day": day,
+                    "stored": 0,
+                    "in_flight": 0,
+                    "pending": 0,
+                    "flushes": 0,
+                    "read_at": 0
+                })
+
+                # Mongo already includes this process's flushed
+                # increments, so it replaces `stored` as is.
+                # (In-flight ones may be counted twice until the
+                # next read, which errs on the strict side.)
+                # If a flush landed while the read was out, the
+                # read may predate it: keep the larger count.
+                if entry["flushes"] == flushes:
+                    entry["stored"] = stored
+                else:
+                    entry["stored"] = max(stored, entry["stored"])
+
+                entry["read_at"] = time.monotonic()
+
+        with self._lock:
+
+            entry = self._counters[key]
+
+            used = (
+                entry["stored"]
+                + entry["in_flight"]
+                + entry["pending"]
+            )
+
+            if limit is not None and used + calls > limit:
+                return False, used
+
+            entry["pending"] += calls
+
+            self._pending += calls
+
+            flush_now = self._pending >= USAGE_FLUSH_BATCH
+
+        self._ensure_flusher()
+
+        if flush_now:
+            self._wake.set()
+
+        return True, used + calls
+
+    def flush(self):
+        """
+        Write pending increments with one bulk_write and drop
+        counters of past days.
+        """
+
+        today = usage_day()
+
+        with self._lock:
+
+            batch = []
+
+            for key, entry in list(self._counters.items()):
+
+                if entry["pending"]:
+
+                    batch.append((key, entry, entry["pending"]))
+
+                    entry["in_flight"] += entry["pending"]
+                    entry["pending"] = 0
+
+                elif entry["day"] != today and not entry["in_flight"]:
+
+                    del self._counters[key]
+
+            self._pending = 0
+
+        if not batch:
+            return 0
+
+        operations = []
+
+        for key, entry, increment in batch:
+
+            expires_at = datetime.strptime(
+                entry["day"], "%Y-%m-%d"
+            ).replace(tzinfo=timezone.utc) + timedelta(days=USAGE_RETENTION_DAYS)
+
+            operations.append(UpdateOne(
+                {"_id": key},
+                {
+                    "$inc": {"count": increment},
+                    "$setOnInsert": {
+                        "user_id": entry["user_id"],
+                        "domain": entry["domain"],
+                        "day": entry["day"],
+                        "expires_at": expires_at
+                    }
+                },
+                upsert=True
+            ))
+
+        try:
+
+            self._collection().bulk_write(operations, ordered=False)
+
+        except Exception:
+
+            logger.exception("Usage flush failed; retrying next cycle")
+
+            with self._lock:
+
+                for key, entry, increment in batch:
+
+                    entry["in_flight"] -= increment
+                    entry["pending"] += increment
+
+                    self._pending += increment
+
+            return 0
+
+        with self._lock:
+
+            for key, entry, increment in batch:
+
+                entry["in_flight"] -= increment
+                entry["stored"] += increment
+                entry["flushes"] += 1
+
+        return len(operations)
+
+    def _ensure_flusher(self):
+
+        if self._thread is not None:
+            return
+
+        with self._lock:
+
+            if self._thread is not None:
+                return
+
+            self._thread = threading.Thread(
+                target=self._run,
+                name="Usage-Meter",
+                daemon=True
+            )
+
+            self._thread.start()
+
+    def _run(self):
+
+        while True:
+
+            self._wake.wait(USAGE_FLUSH_SECONDS)
+
+            self._wake.clear()
+
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("Usage flush failed")
+
+
+usage_meter = UsageMeter()
+
+atexit.register(usage_meter.flush)
+
+
+def enforce_domain_policy(domain, user, policy=None, calls=1):
+    """
+    Check access to `domain` and count `calls` against its
+    daily limit, all or none: a batch that does not fit is
+    refused without using up the remaining calls. `policy`
+    may be passed in when the caller has already resolved it
+    (the domain dispatch table does).
+    """
+    policy = policy or DOMAIN_POLICIES.get(domain)
 
     if not policy:
         abort(400, "Domain policy not found")
 
     if not policy["free"] and not user.get("is_premium"):
-        abort(402, "Upgrade required for this domain")
+        # Werkzeug has no 402 exception, so abort(402) would
+        # raise LookupError; send the response directly.
+        abort(make_response(
+            jsonify({"error": "Upgrade required for this domain"}),
+            402
+        ))
+
+    allowed, used = usage_meter.consume(
+        usage_key(user),
+        domain,
+        policy.get("daily_limit"),
+        calls=calls
+    )
+
+    if not allowed:
+        abort(429, f"Daily limit of {policy['daily_limit']} requests reached for this domain")
 
-    # You already have rate limiting logic → hook here later
     return True
@@ -0,0 +1,54 @@
+# backend/services/client_keys.py
+
+"""
+Who a metered call is counted against.
+
+Signed-in users are counted by id. Guests all share the id
+"guest", so they are counted by client address instead. The
+app runs behind Render's proxy, so request.remote_addr is the
+proxy unless ProxyFix rewrites it from X-Forwarded-For.
+
+Set TRUSTED_PROXY_HOPS to the number of proxies in front of
+the app (default 1). Use 0 when clients connect directly;
+otherwise they could forge X-Forwarded-For.
+"""
+
+import os
+
+from flask import request
+from werkzeug.middleware.proxy_fix import ProxyFix
+
+TRUSTED_PROXY_HOPS = int(
+    os.getenv("TRUSTED_PROXY_HOPS", "1")
+)
+
+
+def install_proxy_fix(app, hops=TRUSTED_PROXY_HOPS):
+    """
+    Trust `hops` X-Forwarded-For / X-Forwarded-Proto headers
+    so remote_addr is the client. No-op when hops is 0.
+    """
+
+    if hops <= 0:
+        return False
+
+    app.wsgi_app = ProxyFix(
+        app.wsgi_app,
+        x_for=hops,
+        x_proto=hops
+    )
+
+    return True
+
+
+def usage_key(user):
+    """
+    The user id, or the client address for guests.
+    """
+
+    user_id = (user or {}).get("id")
+
+    if user_id and user_id != "guest":
+        return str(user_id)
+
+    return f"guest@{request.remote_addr or 'unknown'}"
@@ -1,54 +1,260 @@
-from flask import Blueprint, request, jsonify, g
+# backend/services/domain_registry.py
+
+"""
+The one registry of /domains handlers.
+
+Domain packages (backend/domains/<name>/service.py) call
+register_domain() when imported. discover() imports them once,
+on first use, and every registration lands in a dispatch table
+that also holds the domain's billing policy and use_ai flag,
+so a request is a dict lookup plus the handler call.
+
+Handlers may be plain functions or coroutines, and a domain
+can register a batch_handler(queries, user_context) for
+dispatch_batch(). A domain that answers through the AI service
+can also register its prompt(query) builder, which lets
+dispatch_stream() stream the same prompt its handler sends.
+Every call is timed per domain (see domain_stats()).
+"""
+
+import asyncio
 import importlib
-import pkgutil
-from backend import domains  # domains folder inside backend
+import inspect
+import logging
+import os
+import threading
+import time
+
+from backend.services.ai_router import ask_ai, stream_ai
+from backend.services.billing_guard import DOMAIN_POLICIES
+from backend.services.request_profiler import Series
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.RLock()
+
+_discovered = False
+
+# name -> {"handler", "batch_handler", "use_ai", "prompt",
+#          "ai_domain", "policy", "latency", "errors"}
+DISPATCH_TABLE = {}
+
+
+def register_domain(
+    name,
+    handler,
+    use_ai=False,
+    batch_handler=None,
+    prompt=None,
+    ai_domain=None
+):
+    """
+    Register a domain handler(query, user_context=None).
+
+    use_ai domains send the query straight to the AI service
+    instead of calling the handler. `prompt(query)` is the
+    prompt the handler sends to the AI service (as
+    `ai_domain`, default `name`); registering it makes the
+    domain streamable.
+    """
+    if not callable(handler):
+        raise ValueError(f"Handler for domain '{name}' must be callable")
+
+    if batch_handler is not None and not callable(batch_handler):
+        raise ValueError(f"Batch handler for domain '{name}' must be callable")
+
+    if prompt is not None and not callable(prompt):
+        raise ValueError(f"Prompt builder for domain '{name}' must be callable")
+
+    with _lock:
+        previous = DISPATCH_TABLE.get(name)
 
-domain_bp = Blueprint("domains", __name__)
+        DISPATCH_TABLE[name] = {
+            "handler": handler,
+            "batch_handler": batch_handler,
+            "use_ai": bool(use_ai),
+            "prompt": prompt,
+            "ai_domain": ai_domain or name,
+            "policy": DOMAIN_POLICIES.get(name),
+            # Re-registering keeps the domain's history.
+            "latency": previous["latency"] if previous else Series(),
+            "errors": previous["errors"] if previous else 0
+        }
 
-# ---------------- DOMAIN REGISTRY ----------------
-DOMAIN_REGISTRY = {}
 
-def register_domain(name, handler):
-    DOMAIN_REGISTRY[name] = handler
+def discover():
+    """
+    Import every backend/domains/<name>/service.py once. A
+    domain that fails to import is logged and skipped.
+    """
+    global _discovered
+
+    if _discovered:
+        return
+
+    with _lock:
+        if _discovered:
+            return
+
+        from backend import domains
+
+        # Domain folders have no __init__.py (namespace
+        # packages), which pkgutil.iter_modules does not list.
+        for module_name in sorted(
+            name
+            for path in domains.__path__
+            for name in os.listdir(path)
+            if os.path.isdir(os.path.join(path, name))
+            and not name.startswith(("_", "."))
+        ):
+            module_path = f"backend.domains.{module_name}.service"
+            try:
+                importlib.import_module(module_path)
+                logger.info(f"✅ Loaded domain: {module_name}")
+            except ModuleNotFoundError as e:
+                if e.name == module_path:
+                    logger.warning(f"⚠️ No service.py for domain '{module_name}'")
+                else:
+                    logger.error(f"❌ Failed to load domain '{module_name}': {e}")
+            except Exception as e:
+                logger.error(f"❌ Failed to load domain '{module_name}': {e}")
+
+        _discovered = True
+
 
 def get_domain(name):
-    return DOMAIN_REGISTRY.get(name)
+    discover()
+    return DISPATCH_TABLE.get(name)
+
 
 def list_domains():
-    return list(DOMAIN_REGISTRY.keys())
+    discover()
+    return sorted(DISPATCH_TABLE.keys())
 
-def auto_load_domains():
+
+def _run(handler, *args, **kwargs):
+    result = handler(*args, **kwargs)
+
+    if inspect.isawaitable(result):
+        # Request threads have no running loop.
+        return asyncio.run(result)
+
+    return result
+
+
+def _timed(entry, call):
+    started = time.perf_counter()
+
+    try:
+        return call()
+    except Exception:
+        with _lock:
+            entry["errors"] += 1
+        raise
+    finally:
+        with _lock:
+            entry["latency"].add((time.perf_counter() - started) * 1000)
+
+
+def dispatch(name, query, user_context=None):
     """
-    Dynamically load all domains with service.py
+    Run one query through a domain. Raises KeyError for an
+    unknown domain.
     """
-    for _, module_name, _ in pkgutil.iter_modules(domains.__path__):
-        importlib.import_module(f"backend.domains.{module_name}.service")
-        print(f"Loaded domain: {module_name}")
+    entry = get_domain(name)
 
-# Load all domains when blueprint is imported
-auto_load_domains()
+    if entry is None:
+        raise KeyError(name)
 
-# ---------------- ROUTES ----------------
-@domain_bp.route("/domains", methods=["GET"])
-def domains_route():
-    return jsonify({"available_domains": list_domains()})
+    if entry["use_ai"]:
+        return _timed(entry, lambda: ask_ai(
+            prompt=query,
+            domain=name,
+            context=user_context
+        ))
 
-@domain_bp.route("/domains/<domain_name>", methods=["POST"])
-def handle_domain(domain_name):
-    handler = get_domain(domain_name)
-    if not handler:
-        return jsonify({"error": "Domain not found"}), 404
+    return _timed(entry, lambda: _run(
+        entry["handler"],
+        query,
+        user_context=user_context
+    ))
 
-    data = request.json
-    query = data.get("query")
-    user = getattr(g, "user", {"id": "guest", "is_premium": False})
 
-    # Optional: enforce billing / audit logic
-    # enforce_domain_policy(domain_name, user)
-    # log_domain_event(user_id=user.get("id"), domain=domain_name, query=query, status="success")
+def _timed_stream(entry, chunks):
+    started = time.perf_counter()
 
     try:
-        result = handler(query, user_context=user)
-        return jsonify(result)
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        yield from chunks
+    except Exception:
+        with _lock:
+            entry["errors"] += 1
+        raise
+    finally:
+        with _lock:
+            entry["latency"].add((time.perf_counter() - started) * 1000)
+
+
+def dispatch_stream(name, query, user_context=None):
+    """
+    Stream one query's AI answer as byte chunks, or return
+    None when the domain does not answer through the AI
+    service (use dispatch() then). Raises KeyError for an
+    unknown domain.
+    """
+    entry = get_domain(name)
+
+    if entry is None:
+        raise KeyError(name)
+
+    if entry["prompt"] is not None:
+        prompt = entry["prompt"](query)
+    elif entry["use_ai"]:
+        prompt = query
+    else:
+        return None
+
+    return _timed_stream(entry, stream_ai(
+        prompt=prompt,
+        domain=entry["ai_domain"],
+        context=user_context
+    ))
+
+
+def dispatch_batch(name, queries, user_context=None):
+    """
+    Run several queries through a domain: in one call when it
+    registered a batch_handler, otherwise one by one.
+    """
+    entry = get_domain(name)
+
+    if entry is None:
+        raise KeyError(name)
+
+    if entry["batch_handler"] is not None:
+        return _timed(entry, lambda: list(_run(
+            entry["batch_handler"],
+            list(queries),
+            user_context=user_context
+        )))
+
+    return [
+        dispatch(name, query, user_context=user_context)
+        for query in queries
+    ]
+
+
+def domain_stats():
+    """Per-domain call count, errors and latency (ms)."""
+    discover()
+
+    with _lock:
+        return {
+            name: {
+                **entry["latency"].summary(),
+                "errors": entry["errors"],
+                "use_ai": entry["use_ai"],
+                "streams": entry["use_ai"] or entry["prompt"] is not None,
+                "daily_limit": (entry["policy"] or {}).get("daily_limit")
+            }
+            for name, entry in sorted(DISPATCH_TABLE.items())
+        }
@@ -0,0 +1,727 @@
+# backend/services/request_profiler.py
+
+"""
+Opt-in request profiling.
+
+Enable with:
+
+    REQUEST_PROFILING=true
+
+Records, per endpoint:
+
+    - request latency (histogram + recent-sample percentiles)
+    - Mongo command counts and durations
+    - JSON serialization time
+    - response payload sizes
+
+Optionally (REQUEST_PROFILING_SAMPLER=true) a sampling
+profiler captures the stacks of in-flight requests and dumps
+slow ones as folded stacks, ready for flamegraph.pl /
+speedscope.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import os
+import sys
+import threading
+import time
+
+from collections import Counter, deque
+
+from flask import g, request
+from flask.json.provider import DefaultJSONProvider
+from pymongo import monitoring
+
+
+logger = logging.getLogger(
+    "request_profiler"
+)
+
+
+# =========================================================
+# CONFIGURATION
+# =========================================================
+
+def _env_flag(
+    name,
+    default="false",
+):
+    return os.getenv(
+        name,
+        default,
+    ).strip().lower() == "true"
+
+
+PROFILING_ENABLED = _env_flag(
+    "REQUEST_PROFILING"
+)
+
+SAMPLER_ENABLED = (
+    PROFILING_ENABLED
+    and _env_flag(
+        "REQUEST_PROFILING_SAMPLER"
+    )
+)
+
+SAMPLE_INTERVAL_MS = int(
+    os.getenv(
+        "REQUEST_PROFILING_SAMPLE_MS",
+        "10",
+    )
+)
+
+SLOW_REQUEST_MS = int(
+    os.getenv(
+        "REQUEST_PROFILING_SLOW_MS",
+        "1000",
+    )
+)
+
+PROFILE_DIR = os.getenv(
+    "REQUEST_PROFILING_DIR",
+    os.path.join(
+        os.path.dirname(
+            os.path.dirname(
+                os.path.abspath(__file__)
+            )
+        ),
+        "user_data",
+        "profiles",
+    ),
+)
+
+# Recent samples kept per endpoint for percentile maths.
+RESERVOIR_SIZE = 2048
+
+# Upper bounds (ms) of the latency histogram buckets.
+LATENCY_BUCKETS_MS = (
+    5, 10, 25, 50, 100, 250, 500,
+    1000, 2500, 5000, 10000,
+)
+
+
+# =========================================================
+# METRIC PRIMITIVES
+# =========================================================
+
+def percentile(
+    values,
+    pct,
+):
+    """
+    Nearest-rank percentile of an unsorted sequence.
+    """
+
+    if not values:
+        return None
+
+    ordered = sorted(values)
+
+    rank = max(
+        math.ceil(
+            pct / 100.0 * len(ordered)
+        ) - 1,
+        0,
+    )
+
+    return ordered[
+        min(rank, len(ordered) - 1)
+    ]
+
+
+class Series:
+    """
+    Count/total plus a bounded window of recent values.
+    """
+
+    def __init__(self):
+
+        self.count = 0
+
+        self.total = 0.0
+
+        self.max = 0.0
+
+        self.recent = deque(
+            maxlen=RESERVOIR_SIZE
+        )
+
+    def add(
+        self,
+        value,
+    ):
+        self.count += 1
+
+        self.total += value
+
+        if value > self.max:
+            self.max = value
+
+        self.recent.append(
+            value
+        )
+
+    def summary(
+        self,
+        digits=2,
+    ):
+        recent = list(
+            self.recent
+        )
+
+        def _round(value):
+
+            return (
+                round(value, digits)
+                if value is not None
+                else None
+            )
+
+        return {
+            "count": self.count,
+            "mean": _round(
+                self.total / self.count
+                if self.count
+                else None
+            ),
+            "max": _round(self.max),
+            "p50": _round(percentile(recent, 50)),
+            "p95": _round(percentile(recent, 95)),
+            "p99": _round(percentile(recent, 99)),
+        }
+
+
+class EndpointStats:
+
+    def __init__(self):
+
+        self.latency_ms = Series()
+
+        self.mongo_calls = Series()
+
+        self.mongo_ms = Series()
+
+        self.json_ms = Series()
+
+        self.payload_bytes = Series()
+
+        self.status_codes = Counter()
+
+        self.histogram = [0] * (
+            len(LATENCY_BUCKETS_MS) + 1
+        )
+
+    def observe(
+        self,
+        latency_ms,
+        mongo_calls,
+        mongo_ms,
+        json_ms,
+        payload_bytes,
+        status_code,
+    ):
+        self.latency_ms.add(latency_ms)
+
+        self.mongo_calls.add(mongo_calls)
+
+        self.mongo_ms.add(mongo_ms)
+
+        self.json_ms.add(json_ms)
+
+        if payload_bytes is not None:
+            self.payload_bytes.add(payload_bytes)
+
+        self.status_codes[status_code] += 1
+
+        for index, bound in enumerate(
+            LATENCY_BUCKETS_MS
+        ):
+            if latency_ms <= bound:
+                self.histogram[index] += 1
+                break
+
+        else:
+            self.histogram[-1] += 1
+
+    def summary(self):
+
+        labels = [
+            f"<={bound}ms"
+            for bound in LATENCY_BUCKETS_MS
+        ] + [
+            f">{LATENCY_BUCKETS_MS[-1]}ms"
+        ]
+
+        return {
+            "latency_ms": self.latency_ms.summary(),
+            "histogram": dict(
+                zip(labels, self.histogram)
+            ),
+            "mongo_calls": self.mongo_calls.summary(),
+            "mongo_ms": self.mongo_ms.summary(),
+            "json_ms": self.json_ms.summary(),
+            "payload_bytes": self.payload_bytes.summary(0),
+            "status_codes": {
+                str(code): count
+                for code, count in self.status_codes.items()
+            },
+        }
+
+
+# =========================================================
+# REGISTRY
+# =========================================================
+
+class MetricsRegistry:
+
+    def __init__(self):
+
+        self._lock = threading.Lock()
+
+        self.reset()
+
+    def reset(self):
+
+        with self._lock:
+
+            self.started_at = time.time()
+
+            self.endpoints = {}
+
+            self.mongo_commands = {}
+
+            self.slow_profiles = deque(
+                maxlen=50
+            )
+
+    def observe_request(
+        self,
+        endpoint,
+        **values,
+    ):
+        with self._lock:
+
+            stats = self.endpoints.get(endpoint)
+
+            if stats is None:
+
+                stats = self.endpoints[endpoint] = (
+                    EndpointStats()
+                )
+
+            stats.observe(**values)
+
+    def observe_command(
+        self,
+        command_name,
+        duration_ms,
+    ):
+        with self._lock:
+
+            series = self.mongo_commands.get(
+                command_name
+            )
+
+            if series is None:
+
+                series = self.mongo_commands[
+                    command_name
+                ] = Series()
+
+            series.add(duration_ms)
+
+    def record_slow_profile(
+        self,
+        entry,
+    ):
+        with self._lock:
+            self.slow_profiles.append(entry)
+
+    def snapshot(self):
+
+        with self._lock:
+
+            return {
+                "enabled": PROFILING_ENABLED,
+                "sampler_enabled": SAMPLER_ENABLED,
+                "since": self.started_at,
+                "endpoints": {
+                    name: stats.summary()
+                    for name, stats in sorted(
+                        self.endpoints.items()
+                    )
+                },
+                "mongo_commands": {
+                    name: series.summary()
+                    for name, series in sorted(
+                        self.mongo_commands.items()
+                    )
+                },
+                "slow_profiles": list(
+                    self.slow_profiles
+                ),
+            }
+
+
+registry = MetricsRegistry()
+
+# Per-thread accumulator for the request currently being
+# served; pymongo runs command listeners on the calling
+# thread, so this attributes Mongo work to the request.
+_local = threading.local()
+
+
+def _current():
+    return getattr(
+        _local,
+        "request",
+        None,
+    )
+
+
+# =========================================================
+# MONGO COMMAND LISTENER
+# =========================================================
+
+class MongoCommandListener(monitoring.CommandListener):
+
+    def started(self, event):
+        pass
+
+    def _finish(self, event):
+
+        duration_ms = event.duration_micros / 1000.0
+
+        registry.observe_command(
+            event.command_name,
+            duration_ms,
+        )
+
+        current = _current()
+
+        if current is not None:
+
+            current["mongo_calls"] += 1
+
+            current["mongo_ms"] += duration_ms
+
+    def succeeded(self, event):
+        self._finish(event)
+
+    def failed(self, event):
+        self._finish(event)
+
+
+def mongo_event_listeners():
+    """
+    Listeners to pass to MongoClient(event_listeners=...).
+    Empty unless profiling is enabled, so the default
+    deployment pays nothing.
+    """
+
+    if not PROFILING_ENABLED:
+        return []
+
+    return [
+        MongoCommandListener()
+    ]
+
+
+# =========================================================
+# JSON SERIALIZATION TIMING
+# =========================================================
+
+class TimedJSONProvider(DefaultJSONProvider):
+
+    def dumps(self, obj, **kwargs):
+
+        started = time.perf_counter()
+
+        try:
+            return super().dumps(obj, **kwargs)
+
+        finally:
+
+            current = _current()
+
+            if current is not None:
+
+                current["json_ms"] += (
+                    time.perf_counter() - started
+                ) * 1000.0
+
+
+# =========================================================
+# SAMPLING PROFILER
+# =========================================================
+
+class StackSampler:
+    """
+    Periodically samples the Python stack of every thread
+    that is serving a request. Samples are folded into
+    "frame;frame;frame" keys so slow requests can be
+    dumped straight into flamegraph tooling.
+    """
+
+    def __init__(
+        self,
+        interval_ms=SAMPLE_INTERVAL_MS,
+    ):
+        self.interval = max(
+            interval_ms,
+            1,
+        ) / 1000.0
+
+        self._active = {}
+
+        self._lock = threading.Lock()
+
+        self._thread = None
+
+    def start(self):
+
+        if self._thread is not None:
+            return
+
+        self._thread = threading.Thread(
+            target=self._run,
+            name="Request-Stack-Sampler",
+            daemon=True,
+        )
+
+        self._thread.start()
+
+    def begin(
+        self,
+        thread_id,
+    ):
+        samples = Counter()
+
+        with self._lock:
+            self._active[thread_id] = samples
+
+        return samples
+
+    def end(
+        self,
+        thread_id,
+    ):
+        with self._lock:
+            return self._active.pop(
+                thread_id,
+                None,
+            )
+
+    @staticmethod
+    def fold(frame):
+
+        names = []
+
+        while frame is not None:
+
+            code = frame.f_code
+
+            names.append(
+                f"{code.co_name} "
+                f"({os.path.basename(code.co_filename)}"
+                f":{frame.f_lineno})"
+            )
+
+            frame = frame.f_back
+
+        return ";".join(
+            reversed(names)
+        )
+
+    def _run(self):
+
+        while True:
+
+            time.sleep(self.interval)
+
+            with self._lock:
+                active = dict(self._active)
+
+            if not active:
+                continue
+
+            frames = sys._current_frames()
+
+            for thread_id, samples in active.items():
+
+                frame = frames.get(thread_id)
+
+                if frame is not None:
+                    samples[self.fold(frame)] += 1
+
+
+sampler = StackSampler()
+
+
+def dump_folded_stacks(
+    endpoint,
+    latency_ms,
+    samples,
+):
+    """
+    Write folded stacks for a slow request and return the
+    file path.
+    """
+
+    os.makedirs(
+        PROFILE_DIR,
+        exist_ok=True,
+    )
+
+    safe_endpoint = "".join(
+        char if char.isalnum() else "_"
+        for char in endpoint
+    )
+
+    path = os.path.join(
+        PROFILE_DIR,
+        f"{int(time.time() * 1000)}_"
+        f"{safe_endpoint}_{int(latency_ms)}ms.folded",
+    )
+
+    with open(
+        path,
+        "w",
+        encoding="utf-8",
+    ) as file:
+
+        for stack, count in samples.most_common():
+            file.write(f"{stack} {count}\n")
+
+    return path
+
+
+# =========================================================
+# FLASK MIDDLEWARE
+# =========================================================
+
+def _before_request():
+
+    _local.request = {
+        "started": time.perf_counter(),
+        "mongo_calls": 0,
+        "mongo_ms": 0.0,
+        "json_ms": 0.0,
+    }
+
+    if SAMPLER_ENABLED:
+
+        g._profiler_samples = sampler.begin(
+            threading.get_ident()
+        )
+
+
+def _after_request(response):
+
+    current = _current()
+
+    if current is None:
+        return response
+
+    latency_ms = (
+        time.perf_counter() - current["started"]
+    ) * 1000.0
+
+    endpoint = (
+        request.endpoint
+        or "<unmatched>"
+    )
+
+    payload_bytes = (
+        None
+        if response.is_streamed
+        else response.calculate_content_length()
+    )
+
+    registry.observe_request(
+        endpoint,
+        latency_ms=latency_ms,
+        mongo_calls=current["mongo_calls"],
+        mongo_ms=current["mongo_ms"],
+        json_ms=current["json_ms"],
+        payload_bytes=payload_bytes,
+        status_code=response.status_code,
+    )
+
+    response.headers["Server-Timing"] = (
+        f"app;dur={latency_ms:.1f}, "
+        f"mongo;dur={current['mongo_ms']:.1f}, "
+        f"json;dur={current['json_ms']:.1f}"
+    )
+
+    if SAMPLER_ENABLED:
+
+        samples = sampler.end(
+            threading.get_ident()
+        )
+
+        if samples and latency_ms >= SLOW_REQUEST_MS:
+
+            try:
+
+                path = dump_folded_stacks(
+                    endpoint,
+                    latency_ms,
+                    samples,
+                )
+
+                registry.record_slow_profile({
+                    "endpoint": endpoint,
+                    "path": request.path,
+                    "latency_ms": round(latency_ms, 2),
+                    "samples": sum(samples.values()),
+                    "file": path,
+                })
+
+            except OSError as e:
+
+                logger.warning(
+                    "Failed to dump slow request profile: %s",
+                    e,
+                )
+
+    return response
+
+
+def _teardown_request(error=None):
+
+    _local.request = None
+
+    if SAMPLER_ENABLED:
+        sampler.end(threading.get_ident())
+
+
+def install_request_profiler(app):
+    """
+    Attach the profiling hooks to the Flask app. No-op
+    unless REQUEST_PROFILING=true.
+    """
+
+    if not PROFILING_ENABLED:
+        return False
+
+    app.json = TimedJSONProvider(app)
+
+    app.before_request(_before_request)
+
+    app.after_request(_after_request)
+
+    app.teardown_request(_teardown_request)
+
+    if SAMPLER_ENABLED:
+        sampler.start()
+
+    logger.info(
+        "Request profiling enabled (sampler=%s).",
+        SAMPLER_ENABLED,
+    )
+
+    return True
@@ -0,0 +1,1073 @@
+# backend/study/extraction_jobs.py
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+import sqlite3
+import threading
+import time
+import uuid
+
+from concurrent.futures import (
+    ProcessPoolExecutor,
+    as_completed,
+)
+from contextlib import contextmanager
+
+from backend.study.file_extractors import FileExtractors
+
+
+# =========================================================
+# ENVIRONMENT
+# =========================================================
+
+logger = logging.getLogger(
+    "study.extraction"
+)
+
+EXTRACTION_PROCESSES = int(
+    os.getenv(
+        "EXTRACTION_PROCESSES",
+        str(
+            min(
+                os.cpu_count() or 1,
+                4,
+            )
+        ),
+    )
+)
+
+# Pages handed to one worker process at a time.
+EXTRACTION_PAGES_PER_TASK = int(
+    os.getenv(
+        "EXTRACTION_PAGES_PER_TASK",
+        "8",
+    )
+)
+
+EXTRACTION_MAX_ATTEMPTS = int(
+    os.getenv(
+        "EXTRACTION_MAX_ATTEMPTS",
+        "3",
+    )
+)
+
+# Finished jobs keep their upload (and extracted text) for
+# this long even if no study material references it, so
+# /study/upload/jobs/<id>/text keeps working.
+EXTRACTION_RETENTION_DAYS = float(
+    os.getenv(
+        "EXTRACTION_RETENTION_DAYS",
+        "30",
+    )
+)
+
+# A job stuck in "running" for longer than this is assumed
+# to belong to a worker that died mid-extraction.
+EXTRACTION_LEASE_SECONDS = 900
+
+STREAM_CHUNK_SIZE = 64 * 1024
+
+BASE_DIR = os.path.dirname(
+    os.path.dirname(
+        os.path.abspath(__file__)
+    )
+)
+
+JOBS_PATH = os.getenv(
+    "EXTRACTION_JOBS_PATH",
+    os.path.join(
+        BASE_DIR,
+        "user_data",
+        "extraction_jobs.sqlite3",
+    ),
+)
+
+CACHE_DIR = os.getenv(
+    "EXTRACTION_CACHE_DIR",
+    os.path.join(
+        BASE_DIR,
+        "user_data",
+        "extraction_cache",
+    ),
+)
+
+SUPPORTED_TYPES = (
+    "pdf",
+    "docx",
+    "txt",
+)
+
+
+def file_sha256(path):
+
+    digest = hashlib.sha256()
+
+    with open(path, "rb") as f:
+
+        for block in iter(
+            lambda: f.read(1024 * 1024),
+            b"",
+        ):
+            digest.update(block)
+
+    return digest.hexdigest()
+
+
+# =========================================================
+# PAGE CACHE
+# =========================================================
+
+class PageCache:
+    """
+    Extracted text stored per page under the file's SHA-256:
+
+        <CACHE_DIR>/<hash>/pages/000001.txt
+        <CACHE_DIR>/<hash>/manifest.json   (once complete)
+
+    Pages are written as soon as they are extracted, so an
+    interrupted job resumes where it stopped and a duplicate
+    upload of a finished file costs nothing. Text is read
+    back page by page, never joined in memory.
+    """
+
+    def __init__(
+        self,
+        root=CACHE_DIR,
+    ):
+        self.root = root
+
+    def _dir(self, file_hash):
+        return os.path.join(
+            self.root,
+            file_hash,
+        )
+
+    def _page_path(self, file_hash, number):
+        return os.path.join(
+            self._dir(file_hash),
+            "pages",
+            f"{number:06d}.txt",
+        )
+
+    def has_page(self, file_hash, number):
+        return os.path.exists(
+            self._page_path(
+                file_hash,
+                number,
+            )
+        )
+
+    def write_page(self, file_hash, number, text):
+
+        path = self._page_path(
+            file_hash,
+            number,
+        )
+
+        os.makedirs(
+            os.path.dirname(path),
+            exist_ok=True,
+        )
+
+        temporary = f"{path}.{uuid.uuid4().hex}.tmp"
+
+        with open(temporary, "w", encoding="utf-8") as f:
+            f.write(text or "")
+
+        os.replace(temporary, path)
+
+    def manifest(self, file_hash):
+
+        try:
+
+            with open(
+                os.path.join(
+                    self._dir(file_hash),
+                    "manifest.json",
+                ),
+                "r",
+                encoding="utf-8",
+            ) as f:
+
+                return json.load(f)
+
+        except (OSError, ValueError):
+            return None
+
+    def mark_complete(self, file_hash, pages):
+
+        path = os.path.join(
+            self._dir(file_hash),
+            "manifest.json",
+        )
+
+        os.makedirs(
+            os.path.dirname(path),
+            exist_ok=True,
+        )
+
+        temporary = f"{path}.tmp"
+
+        with open(temporary, "w", encoding="utf-8") as f:
+
+            json.dump(
+                {
+                    "pages": pages,
+                    "completed_at": time.time(),
+                },
+                f,
+            )
+
+        os.replace(temporary, path)
+
+    def iter_text(
+        self,
+        file_hash,
+        chunk_size=STREAM_CHUNK_SIZE,
+    ):
+        """
+        Yield the extracted text in chunks, pages separated
+        by newlines.
+        """
+
+        manifest = self.manifest(file_hash) or {}
+
+        for number in range(manifest.get("pages", 0)):
+
+            path = self._page_path(
+                file_hash,
+                number,
+            )
+
+            if not os.path.exists(path):
+                continue
+
+            with open(path, "r", encoding="utf-8") as f:
+
+                for chunk in iter(
+                    lambda: f.read(chunk_size),
+                    "",
+                ):
+                    yield chunk
+
+            yield "\n"
+
+    def read_text(self, file_hash):
+        return "".join(
+            self.iter_text(file_hash)
+        )
+
+
+# =========================================================
+# DURABLE JOB STORE (SQLITE)
+# =========================================================
+
+class ExtractionJobs:
+    """
+    SQLite-backed record of extraction jobs.
+
+    A job is committed before the upload request returns,
+    so a restart never loses one; pending and abandoned
+    jobs are picked up again when the worker starts.
+    """
+
+    COLUMNS = (
+        "id",
+        "filename",
+        "file_type",
+        "path",
+        "file_hash",
+        "status",
+        "pages_done",
+        "pages_total",
+        "attempts",
+        "error",
+        "metadata",
+        "created_at",
+        "updated_at",
+    )
+
+    def __init__(
+        self,
+        path=JOBS_PATH,
+    ):
+        self.path = path
+
+        self._lock = threading.Lock()
+
+        os.makedirs(
+            os.path.dirname(path),
+            exist_ok=True,
+        )
+
+        with self._connect() as conn:
+
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    filename TEXT NOT NULL,
+                    file_type TEXT NOT NULL,
+                    path TEXT NOT NULL,
+                    file_hash TEXT NOT NULL,
+                    status TEXT NOT NULL DEFAULT 'pending',
+                    pages_done INTEGER NOT NULL DEFAULT 0,
+                    pages_total INTEGER,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    error TEXT,
+                    metadata TEXT,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+                """
+            )
+
+            conn.execute(
+                """
+                CREATE INDEX IF NOT EXISTS
+                    idx_jobs_status
+                ON jobs (status, created_at)
+                """
+            )
+
+    @contextmanager
+    def _connect(self):
+
+        conn = sqlite3.connect(
+            self.path,
+            timeout=10,
+            isolation_level=None,
+        )
+
+        try:
+
+            conn.execute(
+                "PRAGMA journal_mode=WAL"
+            )
+
+            yield conn
+
+        finally:
+
+            conn.close()
+
+    def _row(self, row):
+
+        if not row:
+            return None
+
+        job = dict(
+            zip(
+                self.COLUMNS,
+                row,
+            )
+        )
+
+        job["metadata"] = json.loads(
+            job["metadata"] or "{}"
+        )
+
+        return job
+
+    def add(
+        self,
+        filename,
+        file_type,
+        path,
+        file_hash,
+        status="pending",
+        pages_total=None,
+        metadata=None,
+    ):
+        timestamp = time.time()
+
+        job_id = uuid.uuid4().hex
+
+        with self._lock, self._connect() as conn:
+
+            conn.execute(
+                """
+                INSERT INTO jobs (
+                    id, filename, file_type, path, file_hash,
+                    status, pages_done, pages_total, metadata,
+                    created_at, updated_at
+                )
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    job_id,
+                    filename,
+                    file_type,
+                    path,
+                    file_hash,
+                    status,
+                    pages_total or 0,
+                    pages_total,
+                    json.dumps(metadata or {}),
+                    timestamp,
+                    timestamp,
+                ),
+            )
+
+        return self.get(job_id)
+
+    def get(self, job_id):
+
+        with self._lock, self._connect() as conn:
+
+            row = conn.execute(
+                f"""
+                SELECT {", ".join(self.COLUMNS)}
+                FROM jobs
+                WHERE id = ?
+                """,
+                (str(job_id),),
+            ).fetchone()
+
+        return self._row(row)
+
+    def claim_next(self):
+        """
+        Atomically move the oldest pending job into the
+        "running" state and return it.
+        """
+
+        timestamp = time.time()
+
+        with self._lock, self._connect() as conn:
+
+            conn.execute(
+                "BEGIN IMMEDIATE"
+            )
+
+            # Recover jobs abandoned by a dead worker.
+            conn.execute(
+                """
+                UPDATE jobs
+                SET status = 'pending', updated_at = ?
+                WHERE status = 'running' AND updated_at < ?
+                """,
+                (
+                    timestamp,
+                    timestamp - EXTRACTION_LEASE_SECONDS,
+                ),
+            )
+
+            row = conn.execute(
+                f"""
+                SELECT {", ".join(self.COLUMNS)}
+                FROM jobs
+                WHERE status = 'pending'
+                ORDER BY created_at
+                LIMIT 1
+                """
+            ).fetchone()
+
+            if row:
+
+                conn.execute(
+                    """
+                    UPDATE jobs
+                    SET status = 'running',
+                        attempts = attempts + 1,
+                        updated_at = ?
+                    WHERE id = ?
+                    """,
+                    (
+                        timestamp,
+                        row[0],
+                    ),
+                )
+
+            conn.execute(
+                "COMMIT"
+            )
+
+        return self._row(row)
+
+    def progress(
+        self,
+        job_id,
+        pages_done,
+        pages_total,
+    ):
+        with self._lock, self._connect() as conn:
+
+            conn.execute(
+                """
+                UPDATE jobs
+                SET pages_done = ?, pages_total = ?,
+                    updated_at = ?
+                WHERE id = ?
+                """,
+                (
+                    pages_done,
+                    pages_total,
+                    time.time(),
+                    job_id,
+                ),
+            )
+
+    def mark_done(
+        self,
+        job_id,
+        pages_total,
+    ):
+        with self._lock, self._connect() as conn:
+
+            conn.execute(
+                """
+                UPDATE jobs
+                SET status = 'done', pages_done = ?,
+                    pages_total = ?, error = NULL,
+                    updated_at = ?
+                WHERE id = ?
+                """,
+                (
+                    pages_total,
+                    pages_total,
+                    time.time(),
+                    job_id,
+                ),
+            )
+
+    def mark_failed(
+        self,
+        job,
+        error,
+    ):
+        """
+        Requeue a job, or park it as "failed" after
+        EXTRACTION_MAX_ATTEMPTS. Pages already cached are
+        kept, so a retry only extracts what is missing.
+        """
+
+        status = (
+            "failed"
+            if job["attempts"] + 1 >= EXTRACTION_MAX_ATTEMPTS
+            else "pending"
+        )
+
+        with self._lock, self._connect() as conn:
+
+            conn.execute(
+                """
+                UPDATE jobs
+                SET status = ?, error = ?, updated_at = ?
+                WHERE id = ?
+                """,
+                (
+                    status,
+                    str(error)[:500],
+                    time.time(),
+                    job["id"],
+                ),
+            )
+
+        return status
+
+    def active_hashes(self):
+        """
+        Hashes of files with unfinished jobs.
+        """
+
+        with self._lock, self._connect() as conn:
+
+            rows = conn.execute(
+                """
+                SELECT DISTINCT file_hash
+                FROM jobs
+                WHERE status IN ('pending', 'running')
+                """
+            ).fetchall()
+
+        return {
+            row[0]
+            for row in rows
+        }
+
+    def retained_hashes(
+        self,
+        retention_days=EXTRACTION_RETENTION_DAYS,
+    ):
+        """
+        Hashes upload GC must keep: unfinished jobs, plus
+        jobs finished within `retention_days`.
+        """
+
+        since = time.time() - retention_days * 24 * 60 * 60
+
+        with self._lock, self._connect() as conn:
+
+            rows = conn.execute(
+                """
+                SELECT DISTINCT file_hash
+                FROM jobs
+                WHERE status IN ('pending', 'running')
+                   OR (status = 'done' AND updated_at >= ?)
+                """,
+                (since,),
+            ).fetchall()
+
+        return {
+            row[0]
+            for row in rows
+        }
+
+    def stats(self):
+
+        with self._lock, self._connect() as conn:
+
+            rows = conn.execute(
+                """
+                SELECT status, COUNT(*)
+                FROM jobs
+                GROUP BY status
+                """
+            ).fetchall()
+
+        return {
+            status: count
+            for status, count in rows
+        }
+
+
+# =========================================================
+# WORKER
+# =========================================================
+
+class ExtractionWorker:
+    """
+    Background thread that runs extraction jobs. PDF pages
+    are extracted in parallel in a process pool (text
+    extraction is CPU-bound, so threads would serialise on
+    the GIL); each finished page goes straight to the cache.
+    """
+
+    IDLE_POLL_SECONDS = 60
+
+    def __init__(
+        self,
+        jobs: ExtractionJobs,
+        cache: PageCache,
+        processes=EXTRACTION_PROCESSES,
+    ):
+        self.jobs = jobs
+
+        self.cache = cache
+
+        self.processes = max(
+            int(processes),
+            1,
+        )
+
+        self._pool = None
+
+        self._wake = threading.Event()
+
+        self._thread = None
+
+        self._start_lock = threading.Lock()
+
+    def start(self):
+
+        with self._start_lock:
+
+            if (
+                self._thread is not None
+                and self._thread.is_alive()
+            ):
+                return
+
+            self._thread = threading.Thread(
+                target=self._run,
+                name="Study-Extraction-Worker",
+                daemon=True,
+            )
+
+            self._thread.start()
+
+        logger.info(
+            "🧵 Study extraction worker started."
+        )
+
+    def wake(self):
+        self._wake.set()
+
+    def pool(self):
+
+        if self._pool is None:
+
+            # "spawn" keeps the children free of the parent's
+            # Mongo client and threads.
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.processes,
+                mp_context=multiprocessing.get_context(
+                    "spawn"
+                ),
+            )
+
+        return self._pool
+
+    def _extract_pdf(self, job):
+
+        file_hash = job["file_hash"]
+
+        total = FileExtractors.pdf_page_count(
+            job["path"]
+        )
+
+        missing = [
+            number
+            for number in range(total)
+            if not self.cache.has_page(
+                file_hash,
+                number,
+            )
+        ]
+
+        done = total - len(missing)
+
+        self.jobs.progress(
+            job["id"],
+            done,
+            total,
+        )
+
+        # Contiguous runs of missing pages, split into tasks.
+        ranges = []
+
+        for number in missing:
+
+            if (
+                ranges
+                and ranges[-1][1] == number
+                and ranges[-1][1] - ranges[-1][0]
+                < EXTRACTION_PAGES_PER_TASK
+            ):
+                ranges[-1][1] = number + 1
+
+            else:
+                ranges.append(
+                    [number, number + 1]
+                )
+
+        # Small files are not worth a round trip to the pool.
+        if len(ranges) == 1:
+
+            results = [
+                (
+                    ranges[0][0],
+                    FileExtractors.extract_pdf_pages(
+                        job["path"],
+                        *ranges[0],
+                    ),
+                )
+            ]
+
+        else:
+
+            futures = {
+                self.pool().submit(
+                    FileExtractors.extract_pdf_pages,
+                    job["path"],
+                    start,
+                    stop,
+                ): start
+                for start, stop in ranges
+            }
+
+            results = (
+                (
+                    futures[future],
+                    future.result(),
+                )
+                for future in as_completed(futures)
+            )
+
+        for start, pages in results:
+
+            for offset, text in enumerate(pages):
+
+                self.cache.write_page(
+                    file_hash,
+                    start + offset,
+                    text,
+                )
+
+            done += len(pages)
+
+            self.jobs.progress(
+                job["id"],
+                done,
+                total,
+            )
+
+        return total
+
+    def _extract_single(self, job):
+
+        extractor = {
+            "docx": FileExtractors.extract_docx,
+            "txt": FileExtractors.extract_txt,
+        }[job["file_type"]]
+
+        self.cache.write_page(
+            job["file_hash"],
+            0,
+            extractor(
+                job["path"]
+            ),
+        )
+
+        return 1
+
+    def run(self, job):
+
+        manifest = self.cache.manifest(
+            job["file_hash"]
+        )
+
+        if manifest:
+            pages = manifest["pages"]
+
+        elif job["file_type"] == "pdf":
+            pages = self._extract_pdf(job)
+
+        else:
+            pages = self._extract_single(job)
+
+        if not manifest:
+            self.cache.mark_complete(
+                job["file_hash"],
+                pages,
+            )
+
+        self.jobs.mark_done(
+            job["id"],
+            pages,
+        )
+
+        _notify_done(
+            job
+        )
+
+    def drain_once(self):
+
+        job = self.jobs.claim_next()
+
+        if not job:
+            return False
+
+        try:
+
+            self.run(job)
+
+        except Exception as e:
+
+            status = self.jobs.mark_failed(
+                job,
+                e,
+            )
+
+            logger.warning(
+                "Extraction job %s (%s) failed (%s): %s",
+                job["id"],
+                job["filename"],
+                status,
+                e,
+            )
+
+        return True
+
+    def _run(self):
+
+        while True:
+
+            try:
+
+                while self.drain_once():
+                    pass
+
+            except Exception:
+
+                logger.exception(
+                    "Extraction worker iteration failed."
+                )
+
+            self._wake.wait(
+                self.IDLE_POLL_SECONDS
+            )
+
+            self._wake.clear()
+
+
+# =========================================================
+# SINGLETONS
+# =========================================================
+
+_worker = None
+_worker_lock = threading.Lock()
+
+# Callbacks run with each job once its text is cached.
+_done_hooks = []
+
+
+def get_worker():
+
+    global _worker
+
+    with _worker_lock:
+
+        if _worker is None:
+
+            _worker = ExtractionWorker(
+                ExtractionJobs(),
+                PageCache(),
+            )
+
+            _worker.start()
+
+        return _worker
+
+
+# =========================================================
+# PUBLIC API
+# =========================================================
+
+def on_job_done(callback):
+    """
+    Register `callback(job)` to run once a job's text is in
+    the cache: on the worker thread after extraction, or
+    straight from enqueue_extraction when the file was
+    already extracted. Failures are logged, not raised.
+    """
+
+    _done_hooks.append(
+        callback
+    )
+
+    return callback
+
+
+def _notify_done(job):
+
+    for callback in _done_hooks:
+
+        try:
+
+            callback(job)
+
+        except Exception:
+
+            logger.exception(
+                "Completion hook for extraction job %s failed.",
+                job["id"],
+            )
+
+
+def public_job(job):
+    """
+    Job fields safe to return to clients.
+    """
+
+    if not job:
+        return None
+
+    return {
+        "job_id": job["id"],
+        "filename": job["filename"],
+        "file_type": job["file_type"],
+        "status": job["status"],
+        "pages_done": job["pages_done"],
+        "pages_total": job["pages_total"],
+        "error": (
+            job["error"]
+            if job["status"] == "failed"
+            else None
+        ),
+        "metadata": job["metadata"],
+    }
+
+
+def enqueue_extraction(
+    path,
+    filename,
+    file_type,
+    metadata=None,
+    file_hash=None,
+):
+    """
+    Record an extraction job for a saved upload and wake the
+    worker. A file whose text is already cached is marked
+    done immediately. Pass `file_hash` when the caller has
+    already hashed the file.
+    """
+
+    file_type = str(
+        file_type
+    ).lower()
+
+    if file_type not in SUPPORTED_TYPES:
+        raise ValueError(
+            f"{file_type} not supported"
+        )
+
+    worker = get_worker()
+
+    file_hash = file_hash or file_sha256(
+        path
+    )
+
+    manifest = worker.cache.manifest(
+        file_hash
+    )
+
+    job = worker.jobs.add(
+        filename,
+        file_type,
+        path,
+        file_hash,
+        status="done" if manifest else "pending",
+        pages_total=(
+            manifest["pages"]
+            if manifest
+            else None
+        ),
+        metadata=metadata,
+    )
+
+    if manifest:
+        _notify_done(job)
+
+    else:
+        worker.wake()
+
+    return job
+
+
+def get_job(job_id):
+    return get_worker().jobs.get(
+        job_id
+    )
+
+
+def iter_job_text(job):
+    """
+    Stream the extracted text of a finished job.
+    """
+
+    return get_worker().cache.iter_text(
+        job["file_hash"]
+    )
+
+
+def read_job_text(job):
+    return get_worker().cache.read_text(
+        job["file_hash"]
+    )
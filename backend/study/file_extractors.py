@@ -1,31 +1,64 @@
-from PyPDF2 import PdfReader
-from docx import Document
-
-
 class FileExtractors:
 
 
     @staticmethod
     def extract_pdf(path):
 
-        reader = PdfReader(path)
+        return "".join(
 
-        text = ""
+            page_text + "\n"
 
-        for page in reader.pages:
+            for page_text in FileExtractors.extract_pdf_pages(
+                path
+            )
 
-            page_text = page.extract_text()
+            if page_text
+        )
 
-            if page_text:
 
-                text += page_text + "\n"
+    @staticmethod
+    def pdf_page_count(path):
 
-        return text
+        # Imported lazily: PyPDF2 is only needed once an
+        # upload is processed, not at app startup.
+        from PyPDF2 import PdfReader
+
+        return len(
+            PdfReader(path).pages
+        )
+
+
+    @staticmethod
+    def extract_pdf_pages(
+        path,
+        start=0,
+        stop=None
+    ):
+        """
+        Text of pages [start, stop) as a list, one entry
+        per page. Runs in extraction worker processes, so
+        it opens its own reader.
+        """
+
+        from PyPDF2 import PdfReader
+
+        reader = PdfReader(path)
+
+        pages = reader.pages[start:stop]
+
+        return [
+
+            page.extract_text() or ""
+
+            for page in pages
+        ]
 
 
     @staticmethod
     def extract_docx(path):
 
+        from docx import Document
+
         doc = Document(path)
 
         return "\n".join(
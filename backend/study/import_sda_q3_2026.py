@@ -39,26 +39,48 @@ Optional:
 Dry run:
 
     python -m backend.study.import_sda_q3_2026 --dry-run
+
+Re-import lessons already recorded in the checkpoint:
+
+    python -m backend.study.import_sda_q3_2026 --force
+
+Lessons are fetched and extracted by a small thread pool
+(SDA_IMPORT_WORKERS) and written one lesson per bulk_write.
+Pages and PDFs are cached on disk with their ETag /
+Last-Modified, so re-fetches are conditional, and finished
+lessons are recorded in a checkpoint file: a restart skips
+them instead of downloading and parsing them again.
 """
 
 from __future__ import annotations
 
 import argparse
+import hashlib
 import io
+import json
 import logging
+import os
 import re
 import sys
+import threading
+import time
+from concurrent.futures import (
+    ThreadPoolExecutor,
+    as_completed,
+)
 from datetime import date, timedelta
 from typing import Dict, List, Optional
 from urllib.parse import urljoin
 
 import requests
+from requests.structures import CaseInsensitiveDict
 from bs4 import BeautifulSoup
 from PyPDF2 import PdfReader
 
 from backend.study.sda_quarterly_service import (
     SDAQuarterlyService,
 )
+from backend.study.study_service import StudyService
 
 
 # =========================================================
@@ -117,6 +139,36 @@ DAY_OFFSETS = {
     for index, day in enumerate(DAYS)
 }
 
+# Lessons fetched and extracted at the same time. Kept low:
+# the importer runs inside the web process after a deploy.
+IMPORT_WORKERS = max(
+    int(
+        os.getenv(
+            "SDA_IMPORT_WORKERS",
+            "2",
+        )
+    ),
+    1,
+)
+
+CACHE_DIR = os.getenv(
+    "SDA_IMPORT_CACHE_DIR",
+    os.path.join(
+        os.path.dirname(
+            os.path.dirname(
+                os.path.abspath(__file__)
+            )
+        ),
+        "user_data",
+        "sda_import_cache",
+    ),
+)
+
+CHECKPOINT_PATH = os.path.join(
+    CACHE_DIR,
+    f"checkpoint_{YEAR}_q{QUARTER}.json",
+)
+
 
 # =========================================================
 # LOGGING
@@ -140,9 +192,7 @@ logger = logging.getLogger(
 # HTTP SESSION
 # =========================================================
 
-SESSION = requests.Session()
-
-SESSION.headers.update({
+HEADERS = {
     "User-Agent": (
         "RevelaCode Study Importer/1.0 "
         "(SDA Quarterly Integration)"
@@ -151,7 +201,192 @@ SESSION.headers.update({
         "text/html,application/xhtml+xml,"
         "application/pdf;q=0.9,*/*;q=0.8"
     ),
-})
+}
+
+_local = threading.local()
+
+
+def get_session() -> requests.Session:
+    """
+    One Session per worker thread: Sessions keep a
+    connection pool per host but are not thread-safe.
+    """
+
+    session = getattr(
+        _local,
+        "session",
+        None,
+    )
+
+    if session is None:
+
+        session = requests.Session()
+
+        session.headers.update(
+            HEADERS
+        )
+
+        _local.session = session
+
+    return session
+
+
+# =========================================================
+# HTTP CACHE
+# =========================================================
+
+class CachedResponse:
+    """
+    The parts of a response the importer reads, whether it
+    came from the network or from the disk cache.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        content: bytes,
+        headers: Dict,
+        from_cache: bool = False,
+    ):
+        self.url = url
+        self.content = content
+        self.headers = CaseInsensitiveDict(
+            headers
+        )
+        self.from_cache = from_cache
+
+    @property
+    def text(self) -> str:
+
+        return self.content.decode(
+            "utf-8",
+            errors="replace",
+        )
+
+
+class HTTPCache:
+    """
+    Downloaded bodies stored under the SHA-256 of their URL:
+
+        <CACHE_DIR>/http/<key>.body
+        <CACHE_DIR>/http/<key>.json   (url, etag, last_modified,
+                                       content_type)
+
+    A cached URL is re-requested with If-None-Match /
+    If-Modified-Since, so an unchanged page or PDF costs a
+    304 instead of a full download.
+    """
+
+    def __init__(self, root: str):
+        self.root = os.path.join(
+            root,
+            "http",
+        )
+
+    def _paths(self, url: str):
+
+        key = hashlib.sha256(
+            url.encode("utf-8")
+        ).hexdigest()
+
+        base = os.path.join(
+            self.root,
+            key,
+        )
+
+        return (
+            f"{base}.body",
+            f"{base}.json",
+        )
+
+    def load(
+        self,
+        url: str,
+    ) -> Optional[Dict]:
+
+        body_path, meta_path = self._paths(
+            url
+        )
+
+        try:
+
+            with open(
+                meta_path,
+                "r",
+                encoding="utf-8",
+            ) as f:
+                meta = json.load(f)
+
+            with open(
+                body_path,
+                "rb",
+            ) as f:
+                meta["content"] = f.read()
+
+            return meta
+
+        except (OSError, ValueError):
+            return None
+
+    def store(
+        self,
+        url: str,
+        response: requests.Response,
+    ) -> None:
+
+        body_path, meta_path = self._paths(
+            url
+        )
+
+        os.makedirs(
+            self.root,
+            exist_ok=True,
+        )
+
+        meta = {
+            "url": url,
+            "etag": response.headers.get(
+                "ETag"
+            ),
+            "last_modified": response.headers.get(
+                "Last-Modified"
+            ),
+            "content_type": response.headers.get(
+                "Content-Type",
+                "",
+            ),
+            "fetched_at": time.time(),
+        }
+
+        # Body first, metadata last, each replaced atomically:
+        # an entry whose metadata is missing is a cache miss.
+        for path, data, mode in (
+            (body_path, response.content, "wb"),
+            (meta_path, json.dumps(meta), "w"),
+        ):
+
+            temporary = f"{path}.{threading.get_ident()}.tmp"
+
+            with open(
+                temporary,
+                mode,
+                **(
+                    {}
+                    if "b" in mode
+                    else {"encoding": "utf-8"}
+                ),
+            ) as f:
+                f.write(data)
+
+            os.replace(
+                temporary,
+                path,
+            )
+
+
+HTTP_CACHE = HTTPCache(
+    CACHE_DIR
+)
 
 
 # =========================================================
@@ -162,21 +397,77 @@ def fetch_url(
     url: str,
     *,
     timeout: int = 60,
-) -> requests.Response:
+) -> CachedResponse:
 
-    logger.info(
-        "🌐 Fetching: %s",
-        url,
+    cached = HTTP_CACHE.load(
+        url
     )
 
-    response = SESSION.get(
+    headers = {}
+
+    if cached:
+
+        if cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+
+        if cached.get("last_modified"):
+            headers["If-Modified-Since"] = cached[
+                "last_modified"
+            ]
+
+    logger.info(
+        "🌐 Fetching: %s%s",
         url,
-        timeout=timeout,
+        " (conditional)" if headers else "",
     )
 
+    try:
+
+        response = get_session().get(
+            url,
+            headers=headers,
+            timeout=timeout,
+        )
+
+    except requests.RequestException as exc:
+
+        if not cached:
+            raise
+
+        logger.warning(
+            "⚠ Using cached copy of %s: %s",
+            url,
+            exc,
+        )
+
+        response = None
+
+    if response is None or response.status_code == 304:
+
+        return CachedResponse(
+            url,
+            cached["content"],
+            {
+                "Content-Type": cached.get(
+                    "content_type",
+                    "",
+                ),
+            },
+            from_cache=True,
+        )
+
     response.raise_for_status()
 
-    return response
+    HTTP_CACHE.store(
+        url,
+        response,
+    )
+
+    return CachedResponse(
+        url,
+        response.content,
+        dict(response.headers),
+    )
 
 
 # =========================================================
@@ -553,6 +844,68 @@ def extract_pdf_text(
     )
 
 
+def extract_pdf_text_cached(
+    pdf_bytes: bytes,
+) -> str:
+    """
+    extract_pdf_text, memoised on disk by the PDF's SHA-256
+    so an unchanged PDF is parsed once.
+    """
+
+    digest = hashlib.sha256(
+        pdf_bytes
+    ).hexdigest()
+
+    path = os.path.join(
+        CACHE_DIR,
+        "text",
+        f"{digest}.txt",
+    )
+
+    try:
+
+        with open(
+            path,
+            "r",
+            encoding="utf-8",
+        ) as f:
+
+            logger.info(
+                "📖 Using cached PDF text %s",
+                digest[:12],
+            )
+
+            return f.read()
+
+    except OSError:
+        pass
+
+    text = extract_pdf_text(
+        pdf_bytes
+    )
+
+    os.makedirs(
+        os.path.dirname(path),
+        exist_ok=True,
+    )
+
+    temporary = f"{path}.{threading.get_ident()}.tmp"
+
+    with open(
+        temporary,
+        "w",
+        encoding="utf-8",
+    ) as f:
+        f.write(text)
+
+    os.replace(
+        temporary,
+        path,
+    )
+
+    return text
+
+
 # =========================================================
 # DAY HEADING DETECTION
 # =========================================================
@@ -715,7 +1068,7 @@ def build_lesson_payload(
         pdf_url
     )
 
-    full_text = extract_pdf_text(
+    full_text = extract_pdf_text_cached(
         pdf_bytes
     )
 
@@ -777,28 +1130,141 @@ def build_lesson_payload(
                 **metadata,
                 "source_url": page_url,
                 "pdf_url": pdf_url,
+                "pdf_sha256": hashlib.sha256(
+                    pdf_bytes
+                ).hexdigest(),
                 "days": days,
             }
         ],
     }
 
 
+# =========================================================
+# CHECKPOINT
+# =========================================================
+
+class Checkpoint:
+    """
+    Lessons already imported this quarter, kept in a JSON
+    file next to the HTTP cache:
+
+        {"lessons": {"8": {"pdf_url": ..., "pdf_sha256": ...,
+                           "days": 7, "imported_at": ...}}}
+
+    The file is rewritten atomically after every stored
+    lesson, so an interrupted run loses at most the lessons
+    that were still in flight.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self.lessons = self._read()
+
+    def _read(self) -> Dict:
+
+        try:
+
+            with open(
+                self.path,
+                "r",
+                encoding="utf-8",
+            ) as f:
+
+                return {
+                    int(number): entry
+                    for number, entry in json.load(f).get(
+                        "lessons",
+                        {},
+                    ).items()
+                }
+
+        except (OSError, ValueError, AttributeError):
+            return {}
+
+    def is_done(
+        self,
+        lesson_number: int,
+    ) -> bool:
+
+        return lesson_number in self.lessons
+
+    def mark_done(
+        self,
+        lesson: Dict,
+    ) -> None:
+
+        with self._lock:
+
+            self.lessons[
+                int(lesson["lesson_number"])
+            ] = {
+                "lesson_title": lesson.get(
+                    "lesson_title"
+                ),
+                "pdf_url": lesson.get(
+                    "pdf_url"
+                ),
+                "pdf_sha256": lesson.get(
+                    "pdf_sha256"
+                ),
+                "days": len(
+                    lesson.get(
+                        "days",
+                        [],
+                    )
+                ),
+                "imported_at": time.time(),
+            }
+
+            os.makedirs(
+                os.path.dirname(self.path),
+                exist_ok=True,
+            )
+
+            temporary = f"{self.path}.tmp"
+
+            with open(
+                temporary,
+                "w",
+                encoding="utf-8",
+            ) as f:
+
+                json.dump(
+                    {
+                        "year": YEAR,
+                        "quarter": QUARTER,
+                        "lessons": {
+                            str(number): entry
+                            for number, entry in sorted(
+                                self.lessons.items()
+                            )
+                        },
+                    },
+                    f,
+                    indent=2,
+                )
+
+            os.replace(
+                temporary,
+                self.path,
+            )
+
+
 # =========================================================
 # IMPORT LESSON
 # =========================================================
 
-def import_lesson(
+def prepare_lesson(
     lesson_number: int,
-    *,
-    dry_run: bool = False,
 ) -> Dict:
+    """
+    Fetch, extract and split one lesson. Runs on a worker
+    thread; nothing is written to MongoDB here.
+    """
 
     logger.info(
-        "=============================================="
-    )
-
-    logger.info(
-        "📚 Importing SDA Q3 2026 Lesson %d",
+        "📚 Preparing SDA Q3 2026 Lesson %d",
         lesson_number,
     )
 
@@ -811,24 +1277,17 @@ def import_lesson(
     ][0]
 
     logger.info(
-        "✅ Lesson: %s",
+        "✅ Lesson %d: %s | 📅 %s → %s | 📄 %d daily sections",
+        lesson_number,
         lesson.get(
             "lesson_title"
         ),
-    )
-
-    logger.info(
-        "📅 Week: %s → %s",
         lesson.get(
             "week_start"
         ),
         lesson.get(
             "week_end"
         ),
-    )
-
-    logger.info(
-        "📄 Daily sections: %d",
         len(
             lesson.get(
                 "days",
@@ -837,6 +1296,23 @@ def import_lesson(
         ),
     )
 
+    return payload
+
+
+def store_lesson(
+    payload: Dict,
+    *,
+    dry_run: bool = False,
+) -> Dict:
+    """
+    Write a prepared lesson: its seven days go to MongoDB in
+    one bulk_write (SDAQuarterlyService.import_quarter).
+    """
+
+    lesson = payload[
+        "lessons"
+    ][0]
+
     if dry_run:
 
         for day in lesson["days"]:
@@ -856,25 +1332,98 @@ def import_lesson(
             "lesson": lesson,
         }
 
-    result = (
+    return (
         SDAQuarterlyService
         .import_quarter(
             payload
         )
     )
 
-    return result
+
+def import_lesson(
+    lesson_number: int,
+    *,
+    dry_run: bool = False,
+) -> Dict:
+
+    return store_lesson(
+        prepare_lesson(
+            lesson_number
+        ),
+        dry_run=dry_run,
+    )
 
 
 # =========================================================
 # IMPORT ALL Q3
 # =========================================================
 
+def pending_lessons(
+    lesson_numbers: List[int],
+    checkpoint: Checkpoint,
+) -> List[int]:
+    """
+    Lessons still to import. A checkpointed lesson is only
+    skipped while all seven of its days are in MongoDB, so a
+    wiped or partial collection is repaired on the next run.
+    """
+
+    done = [
+        number
+        for number in lesson_numbers
+        if checkpoint.is_done(number)
+    ]
+
+    if not done:
+        return list(
+            lesson_numbers
+        )
+
+    try:
+
+        stored = (
+            SDAQuarterlyService
+            .imported_lesson_numbers(
+                YEAR,
+                QUARTER,
+            )
+        )
+
+    except Exception as exc:
+
+        logger.warning(
+            "⚠ Could not verify checkpoint against "
+            "MongoDB, re-importing: %s",
+            exc,
+        )
+
+        return list(
+            lesson_numbers
+        )
+
+    return [
+        number
+        for number in lesson_numbers
+        if number not in done
+        or number not in stored
+    ]
+
+
 def import_q3(
     *,
     lesson_number: Optional[int] = None,
     dry_run: bool = False,
+    force: bool = False,
+    workers: Optional[int] = None,
 ) -> Dict:
+    """
+    Import the quarter (or one lesson).
+
+    Lessons are prepared on up to `workers` threads and
+    stored as they finish; each stored lesson is
+    checkpointed. Without `force`, checkpointed lessons are
+    skipped. Dry runs neither write nor checkpoint.
+    """
 
     lesson_numbers = (
         [lesson_number]
@@ -887,39 +1436,105 @@ def import_q3(
         )
     )
 
-    results = []
+    if not dry_run:
+        StudyService.ensure_indexes()
 
-    for number in lesson_numbers:
+    checkpoint = Checkpoint(
+        CHECKPOINT_PATH
+    )
 
-        try:
+    pending = (
+        list(lesson_numbers)
+        if force or dry_run
+        else pending_lessons(
+            lesson_numbers,
+            checkpoint,
+        )
+    )
 
-            result = import_lesson(
-                number,
-                dry_run=dry_run,
-            )
+    results = [
+        {
+            "lesson": number,
+            "success": True,
+            "skipped": True,
+        }
+        for number in lesson_numbers
+        if number not in pending
+    ]
 
-            results.append(
-                {
-                    "lesson": number,
-                    "success": True,
-                    "result": result,
-                }
-            )
+    if results:
 
-        except Exception as exc:
+        logger.info(
+            "⏭ Skipping %d checkpointed lesson(s)",
+            len(results),
+        )
 
-            logger.exception(
-                "❌ Lesson %d failed",
-                number,
-            )
+    if pending:
+
+        with ThreadPoolExecutor(
+            max_workers=min(
+                workers or IMPORT_WORKERS,
+                len(pending),
+            ),
+            thread_name_prefix="SDA-Import",
+        ) as pool:
+
+            futures = {
+                pool.submit(
+                    prepare_lesson,
+                    number,
+                ): number
+                for number in pending
+            }
 
-            results.append(
-                {
-                    "lesson": number,
-                    "success": False,
-                    "error": str(exc),
-                }
-            )
+            # Writes stay on this thread, one lesson at a
+            # time, as each download finishes.
+            for future in as_completed(
+                futures
+            ):
+
+                number = futures[future]
+
+                try:
+
+                    payload = future.result()
+
+                    result = store_lesson(
+                        payload,
+                        dry_run=dry_run,
+                    )
+
+                    if not dry_run:
+                        checkpoint.mark_done(
+                            payload["lessons"][0]
+                        )
+
+                    results.append(
+                        {
+                            "lesson": number,
+                            "success": True,
+                            "result": result,
+                        }
+                    )
+
+                except Exception as exc:
+
+                    logger.exception(
+                        "❌ Lesson %d failed",
+                        number,
+                    )
+
+                    results.append(
+                        {
+                            "lesson": number,
+                            "success": False,
+                            "error": str(exc),
+                        }
+                    )
+
+    results.sort(
+        key=lambda item: item["lesson"]
+    )
 
     successful = sum(
         1
@@ -927,6 +1542,12 @@ def import_q3(
         if item["success"]
     )
 
+    skipped = sum(
+        1
+        for item in results
+        if item.get("skipped")
+    )
+
     failed = (
         len(results)
         - successful
@@ -940,6 +1561,7 @@ def import_q3(
             results
         ),
         "successful": successful,
+        "skipped": skipped,
         "failed": failed,
         "results": results,
     }
@@ -979,6 +1601,25 @@ def parse_args():
         ),
     )
 
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help=(
+            "Re-import lessons already "
+            "recorded in the checkpoint."
+        ),
+    )
+
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=IMPORT_WORKERS,
+        help=(
+            "Lessons to fetch and extract "
+            "in parallel."
+        ),
+    )
+
     return parser.parse_args()
 
 
@@ -993,6 +1634,11 @@ def main():
     result = import_q3(
         lesson_number=args.lesson,
         dry_run=args.dry_run,
+        force=args.force,
+        workers=max(
+            args.workers,
+            1,
+        ),
     )
 
     print()
@@ -1016,6 +1662,11 @@ def main():
         f"{result['successful']}"
     )
 
+    print(
+        f"Skipped            : "
+        f"{result['skipped']}"
+    )
+
     print(
         f"Failed             : "
         f"{result['failed']}"
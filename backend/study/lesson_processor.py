@@ -1,23 +1,34 @@
 # backend/study/lesson_processor.py
 
 import os
+import re
 import json
+import logging
 
 from uuid import uuid4
 from datetime import datetime
 
+from backend.db import get_db
 from backend.models.StudyMaterial import (
     StudyMaterial
 )
 from backend.study.upload_service import (
-    UploadService
+    UploadService,
+    UploadTooLarge,
 )
 
-from backend.study.file_extractors import (
-    FileExtractors
+from backend.study.extraction_jobs import (
+    SUPPORTED_TYPES,
+    enqueue_extraction,
+    on_job_done,
+    public_job,
+    read_job_text,
 )
 
-from backend.db import get_db
+
+logger = logging.getLogger(
+    "study.lessons"
+)
 
 
 BASE_DIR = os.path.dirname(
@@ -30,6 +41,10 @@ STUDY_STORAGE = os.path.join(
     "study_materials"
 )
 
+SHA256_PATTERN = re.compile(
+    r"^[0-9a-f]{64}$"
+)
+
 
 class LessonProcessor:
 
@@ -44,11 +59,23 @@ class LessonProcessor:
 
 
     @staticmethod
-    def process_uploaded_file(file):
+    def process_uploaded_file(
+        file,
+        metadata=None
+    ):
+        """
+        Save an upload and queue its text extraction.
+
+        Extraction runs on the background worker; clients
+        poll /study/upload/jobs/<job_id> and read the text
+        from /study/upload/jobs/<job_id>/text when done.
+        """
 
         try:
 
-            filename = file.filename
+            filename = (
+                file.filename
+            )
 
             extension = (
                 filename.split(
@@ -56,39 +83,7 @@ class LessonProcessor:
                 )[-1].lower()
             )
 
-            # -----------------
-            # Save physical file
-            # -----------------
-
-            path = (
-                UploadService.save(
-                    file
-                )
-            )
-
-            # -----------------
-            # File handlers
-            # -----------------
-
-            extractors = {
-
-                "pdf":
-                FileExtractors.extract_pdf,
-
-                "docx":
-                FileExtractors.extract_docx,
-
-                "txt":
-                FileExtractors.extract_txt
-            }
-
-            extractor = (
-                extractors.get(
-                    extension
-                )
-            )
-
-            if not extractor:
+            if extension not in SUPPORTED_TYPES:
 
                 return {
 
@@ -98,16 +93,20 @@ class LessonProcessor:
                     f"{extension} not supported"
                 }
 
-            # -----------------
-            # Extract text
-            # -----------------
-
-            content = (
-                extractor(
-                    path
+            stored = (
+                UploadService.store(
+                    file
                 )
             )
 
+            job = enqueue_extraction(
+                stored["path"],
+                filename,
+                extension,
+                metadata=metadata,
+                file_hash=stored["sha256"]
+            )
+
             return {
 
                 "success": True,
@@ -116,92 +115,100 @@ class LessonProcessor:
 
                 "file_type": extension,
 
-                "content": content,
+                # Reference this from the material's
+                # file_hash so the blob survives upload GC.
+                "file_hash": stored["sha256"],
+
+                "size": stored["size"],
 
-                "path": path
+                "deduplicated": stored["deduplicated"],
+
+                **public_job(
+                    job
+                )
             }
 
-        except Exception as e:
+        except UploadTooLarge as e:
 
             return {
 
                 "success": False,
 
-                "error": str(e)
-            }
-
-        # -----------------
-        # Save Mongo
-        # -----------------
+                "code": "file_too_large",
 
-        try:
+                "message": str(e)
+            }
 
-            db = get_db()
+        except Exception as e:
 
-            material_data[
-                "file_backup"
-            ] = filename
+            return {
 
-            material_data[
-                "created_at"
-            ] = str(
-                datetime.utcnow()
-            )
+                "success": False,
+                "error": str(e)
+            }
 
-            # Prevent duplicate uploads
 
-            existing = db[
-                "study_materials"
-            ].find_one({
 
-                "title": title,
-                "category": category,
-                "subcategory": subcategory
+    @staticmethod
+    def process_text_material(
+        title,
+        category,
+        subcategory,
+        content,
+        year=None,
+        tags=None,
+        file_hash=None
+    ):
+        """
+        Create a study material from text.
 
-            })
+        `file_hash` (as returned by the upload endpoint) links
+        the material to its uploaded file, which keeps the
+        blob from upload GC.
+        """
 
-            if existing:
+        if file_hash and not SHA256_PATTERN.match(
+            str(file_hash)
+        ):
 
-                existing["_id"] = str(
-                    existing["_id"]
-                )
+            return {
 
-                return {
+                "success": False,
 
-                    "success": False,
+                "message": "file_hash is invalid."
+            }
 
-                    "message":
-                    "Material already exists",
+        material = StudyMaterial(
+            title=title,
+            category=category,
+            subcategory=subcategory,
+            content=content,
+            year=year,
+            tags=tags
+        ).to_dict()
 
-                    "material":
-                    existing
-                }
+        if file_hash:
+            material["file_hash"] = file_hash
 
+        try:
 
-            result = db[
+            result = get_db()[
                 "study_materials"
             ].insert_one(
-                material_data
-            )
-
-            material_data[
-                "_id"
-            ] = str(
-                result.inserted_id
+                material
             )
 
-
         except Exception as e:
 
-            print(
-                "Mongo Error:",
-                str(e)
-            )
+            return {
 
+                "success": False,
+                "error": str(e)
+            }
 
-        # -----------------
-        # IMPORTANT
-        # -----------------
+        material["_id"] = str(
+            result.inserted_id
+        )
 
         return {
 
@@ -210,46 +217,59 @@ class LessonProcessor:
             "message":
             "Study material created",
 
-            "file":
-            filename,
-
-            "material":
-            material_data
+            "material": material
         }
 
 
 
     @staticmethod
-    def process_uploaded_file(
-        file
-    ):
-
-        try:
-
-            filename = (
-                file.filename
+    def material_from_job(job):
+        """
+        Create the study material for a finished extraction
+        job whose upload carried title, category and
+        subcategory metadata (the admin upload form), linked
+        to the upload through its file_hash.
+        """
+
+        metadata = job.get(
+            "metadata"
+        ) or {}
+
+        if not all([
+            metadata.get("title"),
+            metadata.get("category"),
+            metadata.get("subcategory")
+        ]):
+
+            return None
+
+        result = LessonProcessor.process_text_material(
+            title=metadata["title"],
+            category=metadata["category"],
+            subcategory=metadata["subcategory"],
+            content=read_job_text(
+                job
+            ),
+            year=metadata.get(
+                "year"
+            ),
+            tags=metadata.get(
+                "tags"
+            ),
+            file_hash=job["file_hash"]
+        )
+
+        if not result.get("success"):
+
+            logger.warning(
+                "Could not create material for extraction job %s: %s",
+                job["id"],
+                result.get("message") or result.get("error"),
             )
 
-            content = (
-                file.read()
-            )
+        return result
 
-            text = content.decode(
-                "utf-8",
-                errors="ignore"
-            )
-
-            return {
 
-                "success": True,
-                "content": text,
-                "filename": filename
-            }
-
-        except Exception as e:
-
-            return {
-
-                "success": False,
-                "error": str(e)
-            }
\ No newline at end of file
+on_job_done(
+    LessonProcessor.material_from_job
+)
@@ -0,0 +1,248 @@
+# backend/study/sda_calendar.py
+
+"""
+In-process SDA lesson calendar.
+
+Daily lessons never change once imported, and every app open
+asks for today's lesson, so lessons are kept in memory by
+date (YYYY-MM-DD) instead of being read from Mongo per call:
+
+    get_today / get_by_date / get_current_week -> days
+    get_quarter                                -> quarters (and
+                                                  their days)
+
+Loading one day preloads the rest of its quarter, so after
+the first request of a quarter every daily lookup is a dict
+read. Dates without a lesson are remembered too.
+
+The /sda/today JSON is also kept pre-serialised per date
+(`response`), so that endpoint skips both the lookup and
+jsonify.
+
+SDAQuarterlyService.import_lesson clears the calendar.
+Entries also expire after SDA_CALENDAR_TTL seconds, which
+bounds staleness if more than one process serves the API.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections import OrderedDict
+
+
+SDA_CALENDAR_SIZE = int(
+    os.getenv(
+        "SDA_CALENDAR_SIZE",
+        "1000",
+    )
+)
+
+SDA_CALENDAR_TTL = float(
+    os.getenv(
+        "SDA_CALENDAR_TTL",
+        "3600",
+    )
+)
+
+# Serialised responses kept (one per date and endpoint).
+RESPONSE_CACHE_SIZE = 16
+
+
+class SDACalendar:
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._days = OrderedDict()
+        self._quarters = {}
+        self._responses = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _fresh(stamp):
+
+        return time.monotonic() - stamp <= SDA_CALENDAR_TTL
+
+    # -----------------------------------------------------
+    # DAYS
+    # -----------------------------------------------------
+
+    def days(
+        self,
+        dates,
+    ):
+        """
+        Return ({date: material or None}, missing_dates) for
+        the given ISO dates.
+        """
+
+        found = {}
+
+        missing = []
+
+        with self._lock:
+
+            for day in dates:
+
+                entry = self._days.get(day)
+
+                if entry and self._fresh(entry[0]):
+
+                    self._days.move_to_end(day)
+
+                    found[day] = entry[1]
+
+                else:
+
+                    missing.append(day)
+
+            self.hits += len(found)
+
+            self.misses += len(missing)
+
+        return found, missing
+
+    def store_days(
+        self,
+        materials,
+        dates=(),
+    ):
+        """
+        Cache `materials` under their lesson date, and record
+        the other `dates` as having no lesson.
+        """
+
+        now = time.monotonic()
+
+        with self._lock:
+
+            for day in dates:
+
+                self._days[day] = (
+                    now,
+                    None,
+                )
+
+            for material in materials:
+
+                day = (
+                    material.get(
+                        "metadata",
+                        {}
+                    ).get(
+                        "lesson_date"
+                    )
+                )
+
+                if day:
+
+                    self._days[day] = (
+                        now,
+                        material,
+                    )
+
+                    self._days.move_to_end(day)
+
+            while len(self._days) > SDA_CALENDAR_SIZE:
+                self._days.popitem(last=False)
+
+    # -----------------------------------------------------
+    # QUARTERS
+    # -----------------------------------------------------
+
+    def quarter(
+        self,
+        year,
+        quarter,
+    ):
+
+        with self._lock:
+
+            entry = self._quarters.get(
+                (int(year), int(quarter))
+            )
+
+            if entry and self._fresh(entry[0]):
+                return entry[1]
+
+        return None
+
+    def store_quarter(
+        self,
+        year,
+        quarter,
+        materials,
+    ):
+
+        with self._lock:
+
+            self._quarters[
+                (int(year), int(quarter))
+            ] = (
+                time.monotonic(),
+                materials,
+            )
+
+        self.store_days(
+            materials
+        )
+
+    # -----------------------------------------------------
+    # SERIALISED RESPONSES
+    # -----------------------------------------------------
+
+    def response(
+        self,
+        key,
+        build,
+    ):
+        """
+        Return the cached value for `key`, calling `build()`
+        to fill it on a miss or after it expires.
+        """
+
+        with self._lock:
+
+            entry = self._responses.get(key)
+
+            if entry and self._fresh(entry[0]):
+                return entry[1]
+
+        value = build()
+
+        with self._lock:
+
+            self._responses[key] = (
+                time.monotonic(),
+                value,
+            )
+
+            self._responses.move_to_end(key)
+
+            while len(self._responses) > RESPONSE_CACHE_SIZE:
+                self._responses.popitem(last=False)
+
+        return value
+
+    def clear(self):
+
+        with self._lock:
+            self._days.clear()
+            self._quarters.clear()
+            self._responses.clear()
+
+    def stats(self):
+
+        with self._lock:
+
+            return {
+                "days": len(self._days),
+                "quarters": len(self._quarters),
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+sda_calendar = SDACalendar()
@@ -1,11 +1,15 @@
 # backend/study/sda_quarterly_service.py
 
+from copy import deepcopy
 from datetime import date, datetime, timedelta
 from typing import Any, Dict, List, Optional
 from zoneinfo import ZoneInfo
 import uuid
 
+from pymongo import UpdateOne
+
 from backend.db import get_db
+from backend.study.sda_calendar import sda_calendar
 
 
 class SDAQuarterlyService:
@@ -92,6 +96,30 @@ class SDAQuarterlyService:
             cls.TIMEZONE
         ).date()
 
+    @classmethod
+    def seconds_until_tomorrow(cls) -> int:
+        """
+        Seconds left in today's date in Kenya, i.e. how long
+        today's lesson stays today's lesson.
+        """
+
+        now = datetime.now(
+            cls.TIMEZONE
+        )
+
+        midnight = datetime.combine(
+            now.date() + timedelta(days=1),
+            datetime.min.time(),
+            tzinfo=cls.TIMEZONE,
+        )
+
+        return max(
+            int(
+                (midnight - now).total_seconds()
+            ),
+            1,
+        )
+
     @staticmethod
     def format_date(
         value: Optional[date],
@@ -528,6 +556,201 @@ class SDAQuarterlyService:
             "material": material,
         }
 
+    # =====================================================
+    # UPSERT DAILY LESSONS (BATCH)
+    # =====================================================
+
+    @classmethod
+    def upsert_daily_lessons(
+        cls,
+        materials: List[Dict[str, Any]],
+    ) -> List[Dict[str, Any]]:
+        """
+        Upsert several daily lessons in one bulk_write.
+
+        Documents are matched on their lesson key, so
+        re-importing a lesson updates it in place; the
+        original created_at is kept through $setOnInsert.
+        Returns one result per material, in order, shaped
+        like upsert_daily_lesson's.
+        """
+
+        if not materials:
+            return []
+
+        collection = get_db()[
+            cls.COLLECTION
+        ]
+
+        keys = []
+
+        for material in materials:
+
+            lesson_key = (
+                material.get(
+                    "metadata",
+                    {}
+                ).get(
+                    "lesson_key"
+                )
+            )
+
+            if not lesson_key:
+                raise ValueError(
+                    "SDA material is missing lesson_key."
+                )
+
+            keys.append(
+                lesson_key
+            )
+
+        existing = {
+            document["id"]: document
+            for document in collection.find(
+                {
+                    "id": {
+                        "$in": keys,
+                    },
+                },
+                {
+                    "id": 1,
+                    "created_at": 1,
+                },
+            )
+        }
+
+        now = datetime.utcnow().isoformat()
+
+        operations = []
+
+        for lesson_key, material in zip(
+            keys,
+            materials,
+        ):
+
+            material.pop(
+                "_id",
+                None,
+            )
+
+            fields = {
+                key: value
+                for key, value in material.items()
+                if key != "created_at"
+            }
+
+            fields["updated_at"] = now
+
+            operations.append(
+                UpdateOne(
+                    {
+                        "id": lesson_key,
+                    },
+                    {
+                        "$set": fields,
+                        "$setOnInsert": {
+                            "created_at": now,
+                        },
+                    },
+                    upsert=True,
+                )
+            )
+
+        result = collection.bulk_write(
+            operations,
+            ordered=False,
+        )
+
+        upserted = result.upserted_ids or {}
+
+        results = []
+
+        for index, (lesson_key, material) in enumerate(
+            zip(
+                keys,
+                materials,
+            )
+        ):
+
+            material["updated_at"] = now
+
+            if lesson_key in existing:
+
+                material["created_at"] = (
+                    existing[lesson_key].get(
+                        "created_at"
+                    )
+                    or now
+                )
+
+                material["_id"] = str(
+                    existing[lesson_key]["_id"]
+                )
+
+                action = "updated"
+
+            else:
+
+                material["created_at"] = now
+
+                if index in upserted:
+                    material["_id"] = str(
+                        upserted[index]
+                    )
+
+                action = "created"
+
+            results.append({
+                "success": True,
+                "action": action,
+                "material": material,
+            })
+
+        return results
+
+    # =====================================================
+    # IMPORTED LESSONS
+    # =====================================================
+
+    @classmethod
+    def imported_lesson_numbers(
+        cls,
+        year: int,
+        quarter: int,
+    ) -> set:
+        """
+        Lesson numbers of a quarter whose seven daily
+        lessons are all stored.
+        """
+
+        rows = get_db()[
+            cls.COLLECTION
+        ].aggregate([
+            {
+                "$match": {
+                    "subcategory":
+                        cls.SUBCATEGORY,
+                    "year": int(year),
+                    "metadata.quarter":
+                        int(quarter),
+                },
+            },
+            {
+                "$group": {
+                    "_id": "$metadata.lesson_number",
+                    "days": {
+                        "$addToSet": "$metadata.day",
+                    },
+                },
+            },
+        ])
+
+        return {
+            row["_id"]
+            for row in rows
+            if len(row["days"]) >= 7
+        }
+
     # =====================================================
     # IMPORT ONE LESSON
     # =====================================================
@@ -594,33 +817,26 @@ class SDAQuarterlyService:
                 )
             )
 
-        results = []
-
-        for day_item in days:
-
-            if not isinstance(
+        materials = [
+            cls.build_daily_material(
+                quarter,
+                lesson,
+                day_item,
+            )
+            for day_item in days
+            if isinstance(
                 day_item,
                 dict,
-            ):
-                continue
-
-            material = (
-                cls.build_daily_material(
-                    quarter,
-                    lesson,
-                    day_item,
-                )
             )
+        ]
 
-            result = (
-                cls.upsert_daily_lesson(
-                    material
-                )
-            )
+        # All days are built (and validated) before
+        # anything is written.
+        results = cls.upsert_daily_lessons(
+            materials
+        )
 
-            results.append(
-                result
-            )
+        sda_calendar.clear()
 
         return {
             "success": True,
@@ -723,6 +939,102 @@ class SDAQuarterlyService:
             "lessons": processed,
         }
 
+    # =====================================================
+    # CALENDAR
+    # =====================================================
+
+    @classmethod
+    def get_days(
+        cls,
+        dates: List[date],
+    ) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        {date: material or None} for the given dates, served
+        from the in-process calendar. Dates it does not hold
+        are read in one query, and the quarter of every
+        lesson found is preloaded.
+        """
+
+        isos = [
+            day.isoformat()
+            for day in dates
+        ]
+
+        found, missing = sda_calendar.days(
+            isos
+        )
+
+        if missing:
+
+            collection = get_db()[
+                cls.COLLECTION
+            ]
+
+            materials = list(
+                collection.find(
+                    {
+                        "subcategory":
+                            cls.SUBCATEGORY,
+                        "metadata.lesson_date": {
+                            "$in": missing,
+                        },
+                    }
+                )
+            )
+
+            for material in materials:
+
+                if material.get("_id"):
+                    material["_id"] = str(
+                        material["_id"]
+                    )
+
+                found.setdefault(
+                    material["metadata"]["lesson_date"],
+                    material,
+                )
+
+            sda_calendar.store_days(
+                [
+                    found[day]
+                    for day in missing
+                    if found.get(day)
+                ],
+                dates=[
+                    day
+                    for day in missing
+                    if not found.get(day)
+                ],
+            )
+
+            for year, quarter in {
+                (
+                    material.get("year"),
+                    material["metadata"].get(
+                        "quarter"
+                    ),
+                )
+                for material in materials
+            }:
+
+                if year and quarter:
+
+                    cls.get_quarter(
+                        year,
+                        quarter,
+                    )
+
+        # Deep copies, so callers can't edit the cached
+        # lessons (or their nested metadata).
+        return {
+            day: (
+                deepcopy(found[day])
+                if found.get(day)
+                else None
+            )
+            for day in isos
+        }
+
     # =====================================================
     # TODAY
     # =====================================================
@@ -733,33 +1045,14 @@ class SDAQuarterlyService:
         target_date: Optional[date] = None,
     ) -> Optional[Dict[str, Any]]:
 
-        db = get_db()
-
         target_date = (
             target_date
             or cls.today_date()
         )
 
-        material = db[
-            cls.COLLECTION
-        ].find_one(
-            {
-                "subcategory":
-                    cls.SUBCATEGORY,
-                "metadata.lesson_date":
-                    target_date.isoformat(),
-            }
-        )
-
-        if not material:
-            return None
-
-        if material.get("_id"):
-            material["_id"] = str(
-                material["_id"]
-            )
-
-        return material
+        return cls.get_days(
+            [target_date]
+        )[target_date.isoformat()]
 
     # =====================================================
     # BY DATE
@@ -807,51 +1100,18 @@ class SDAQuarterlyService:
             )
         )
 
-        week_end = (
-            week_start
-            + timedelta(
-                days=6
+        days = cls.get_days(
+            cls.generate_week_dates(
+                week_start
             )
         )
 
-        db = get_db()
-
-        materials = list(
-            db[
-                cls.COLLECTION
-            ].find(
-                {
-                    "subcategory":
-                        cls.SUBCATEGORY,
-                    "metadata.lesson_date": {
-                        "$gte":
-                            week_start.isoformat(),
-                        "$lte":
-                            week_end.isoformat(),
-                    },
-                }
-            )
-        )
-
-        for material in materials:
-
-            if material.get("_id"):
-                material["_id"] = str(
-                    material["_id"]
-                )
-
-        materials.sort(
-            key=lambda item:
-                item.get(
-                    "metadata",
-                    {}
-                ).get(
-                    "lesson_date",
-                    "",
-                )
-        )
-
-        return materials
+        # Dates ascend, so the week is already in order.
+        return [
+            material
+            for material in days.values()
+            if material
+        ]
 
     # =====================================================
     # QUARTER
@@ -864,46 +1124,62 @@ class SDAQuarterlyService:
         quarter: int,
     ) -> List[Dict[str, Any]]:
 
-        db = get_db()
-
-        materials = list(
-            db[
-                cls.COLLECTION
-            ].find(
-                {
-                    "subcategory":
-                        cls.SUBCATEGORY,
-                    "year": int(year),
-                    "metadata.quarter":
-                        int(quarter),
-                }
-            )
+        materials = sda_calendar.quarter(
+            year,
+            quarter,
         )
 
-        for material in materials:
+        if materials is None:
+
+            db = get_db()
+
+            materials = list(
+                db[
+                    cls.COLLECTION
+                ].find(
+                    {
+                        "subcategory":
+                            cls.SUBCATEGORY,
+                        "year": int(year),
+                        "metadata.quarter":
+                            int(quarter),
+                    }
+                )
+            )
 
-            if material.get("_id"):
-                material["_id"] = str(
-                    material["_id"]
+            for material in materials:
+
+                if material.get("_id"):
+                    material["_id"] = str(
+                        material["_id"]
+                    )
+
+            materials.sort(
+                key=lambda item: (
+                    item.get(
+                        "metadata",
+                        {}
+                    ).get(
+                        "lesson_number",
+                        0,
+                    ),
+                    item.get(
+                        "metadata",
+                        {}
+                    ).get(
+                        "lesson_date",
+                        "",
+                    ),
                 )
+            )
 
-        materials.sort(
-            key=lambda item: (
-                item.get(
-                    "metadata",
-                    {}
-                ).get(
-                    "lesson_number",
-                    0,
-                ),
-                item.get(
-                    "metadata",
-                    {}
-                ).get(
-                    "lesson_date",
-                    "",
-                ),
+            sda_calendar.store_quarter(
+                year,
+                quarter,
+                materials,
             )
-        )
 
-        return materials
+        return [
+            deepcopy(material)
+            for material in materials
+        ]
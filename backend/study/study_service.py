@@ -1,12 +1,22 @@
 # backend/study/study_service.py
 
 import os
+import re
 import json
+import threading
 
 from bson import ObjectId
 from bson.errors import InvalidId
-
-from backend.db import get_db
+from pymongo import ASCENDING, DESCENDING, TEXT
+from pymongo.errors import ConnectionFailure
+
+from backend.db import get_db, get_read_db
+from backend.jumuiya.core.database import bootstrap_schema
+from backend.jumuiya.core.errors import APIError
+from backend.jumuiya.core.pagination import (
+    paginate_keyset,
+    paginate_pipeline,
+)
 
 
 BASE_DIR = os.path.dirname(
@@ -19,6 +29,200 @@ STUDY_PATH = os.path.join(
     "study_materials"
 )
 
+# List and search results leave out the extracted text;
+# clients fetch it from /study/material/<id>.
+SUMMARY_PROJECTION = {
+    "content": 0
+}
+
+SEARCH_PAGE_SIZE = 20
+
+SEARCH_INDEX = "study_material_search"
+
+SEARCH_WEIGHTS = {
+    "title": 10,
+    "tags": 5,
+    "metadata.lesson_title": 5,
+    "content": 1,
+}
+
+SEARCH_MAX_TERMS = 8
+
+SNIPPET_LENGTH = 240
+
+SNIPPET_LEAD = 80
+
+MATERIALS_PAGE_SIZE = 50
+
+# Indexes behind study browse, search and the SDA calendar,
+# in the jumuiya INDEX_SPECS shape: (collection, keys, options).
+# Built once at startup by StudyService.ensure_indexes().
+STUDY_SCHEMA_META_ID = "study_indexes"
+
+STUDY_INDEX_SPECS = [
+    (
+        "study_materials",
+        [
+            (field, TEXT)
+            for field in SEARCH_WEIGHTS
+        ],
+        {
+            "name": SEARCH_INDEX,
+            "weights": SEARCH_WEIGHTS,
+            # Materials mix English and Swahili, so no
+            # stemming; a "language" field on a document must
+            # not pick the analyser either.
+            "default_language": "none",
+            "language_override": "search_language",
+        },
+    ),
+    (
+        "study_materials",
+        [
+            ("category", ASCENDING),
+            ("_id", DESCENDING),
+        ],
+        {},
+    ),
+    (
+        "study_materials",
+        [
+            ("category", ASCENDING),
+            ("subcategory", ASCENDING),
+            ("_id", DESCENDING),
+        ],
+        {},
+    ),
+    (
+        "study_materials",
+        [
+            ("id", ASCENDING),
+        ],
+        {},
+    ),
+    (
+        "study_materials",
+        [
+            ("subcategory", ASCENDING),
+            ("metadata.lesson_date", ASCENDING),
+        ],
+        {},
+    ),
+]
+
+
+# =========================================================
+# LOCAL MATERIALS
+# =========================================================
+
+class LocalMaterialIndex:
+    """
+    In-memory copy of the JSON materials under STUDY_PATH,
+    used when Mongo is unavailable.
+
+    The files are parsed once and re-read only when a
+    directory in the tree changes (its mtime moves when files
+    are added, removed or renamed), so a fallback read costs
+    a few stat calls instead of a full os.walk + json.load.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._signature = None
+        self._materials = []
+        self._by_id = {}
+
+    def _current_signature(self):
+
+        if not os.path.exists(self.path):
+            return ()
+
+        return tuple(
+            (
+                root,
+                os.stat(root).st_mtime_ns
+            )
+            for root, dirs, files in os.walk(self.path)
+        )
+
+    def _load(self):
+
+        materials = []
+
+        for root, dirs, files in os.walk(self.path):
+
+            for file in sorted(files):
+
+                if not file.endswith(".json"):
+                    continue
+
+                try:
+
+                    path = os.path.join(
+                        root,
+                        file
+                    )
+
+                    with open(
+                        path,
+                        "r",
+                        encoding="utf-8"
+                    ) as f:
+
+                        materials.append(
+                            json.load(f)
+                        )
+
+                except Exception as e:
+
+                    print(f"Read error: {e}")
+
+        return materials
+
+    def materials(self):
+
+        signature = self._current_signature()
+
+        with self._lock:
+
+            if signature != self._signature:
+
+                self._materials = self._load()
+
+                self._by_id = {}
+
+                for material in self._materials:
+
+                    for key in (
+                        "_id",
+                        "id",
+                        "material_id"
+                    ):
+
+                        if material.get(key):
+                            self._by_id.setdefault(
+                                str(material[key]),
+                                material
+                            )
+
+                self._signature = signature
+
+            return self._materials
+
+    def get(self, material_id):
+
+        self.materials()
+
+        return self._by_id.get(
+            str(material_id)
+        )
+
+
+local_index = LocalMaterialIndex(
+    STUDY_PATH
+)
+
 
 class StudyService:
 
@@ -33,84 +237,127 @@ class StudyService:
     def get_materials(
         category=None,
         subcategory=None,
-        file_type=None
+        file_type=None,
+        cursor=None,
+        limit=MATERIALS_PAGE_SIZE
     ):
+        """
+        One page of material summaries (no `content`), newest
+        first. Returns (materials, next_cursor).
 
-        db = get_db()
-
-        query = {}
-
-        if category:
-            query["category"] = category
+        When Mongo is unreachable the local JSON library is
+        used instead; it is small and returned in one page.
+        Other database errors are raised.
+        """
 
-        if subcategory:
-            query["subcategory"] = subcategory
+        db = get_read_db()
 
-        if file_type:
-            query["file_type"] = file_type
+        query = StudyService._filters(
+            category,
+            subcategory,
+            file_type
+        )
 
         try:
 
-            materials = list(
-                db["study_materials"].find(query)
+            materials, next_cursor = paginate_keyset(
+                db["study_materials"],
+                query,
+                "_id",
+                cursor=cursor,
+                limit=limit,
+                projection=SUMMARY_PROJECTION,
             )
 
             for material in materials:
                 material["_id"] = str(material["_id"])
 
-            return materials
+            return materials, next_cursor
 
-        except Exception as e:
+        except ConnectionFailure as e:
 
             print(f"Database error: {e}")
 
-            return StudyService.load_local(
-                category
-            )
+            return [
+                {
+                    key: value
+                    for key, value in material.items()
+                    if key not in SUMMARY_PROJECTION
+                }
+                for material in local_index.materials()
+                if all(
+                    material.get(field) == value
+                    for field, value in query.items()
+                )
+            ], None
 
     @staticmethod
-    def load_local(category=None):
+    def _filters(
+        category=None,
+        subcategory=None,
+        file_type=None
+    ):
 
-        materials = []
+        query = {}
 
-        if not os.path.exists(STUDY_PATH):
-            return materials
+        if category:
+            query["category"] = category
 
-        for root, dirs, files in os.walk(STUDY_PATH):
+        if subcategory:
+            query["subcategory"] = subcategory
 
-            for file in files:
+        if file_type:
+            query["file_type"] = file_type
 
-                if not file.endswith(".json"):
-                    continue
+        return query
 
-                try:
+    @staticmethod
+    def count_by_category():
+        """
+        {category: count} without reading any documents.
+        """
 
-                    path = os.path.join(
-                        root,
-                        file
-                    )
+        db = get_read_db()
 
-                    with open(
-                        path,
-                        "r",
-                        encoding="utf-8"
-                    ) as f:
+        try:
 
-                        data = json.load(f)
+            return {
+                row["_id"]: row["count"]
+                for row in db["study_materials"].aggregate([
+                    {
+                        "$group": {
+                            "_id": "$category",
+                            "count": {
+                                "$sum": 1
+                            }
+                        }
+                    }
+                ])
+            }
 
-                    if (
-                        category and
-                        data.get("category") != category
-                    ):
-                        continue
+        except Exception as e:
+
+            print(f"Database error: {e}")
 
-                    materials.append(data)
+            counts = {}
 
-                except Exception as e:
+            for material in local_index.materials():
 
-                    print(f"Read error: {e}")
+                category = material.get("category")
 
-        return materials
+                counts[category] = counts.get(category, 0) + 1
+
+            return counts
+
+    @staticmethod
+    def load_local(category=None):
+
+        return [
+            material
+            for material in local_index.materials()
+            if not category
+            or material.get("category") == category
+        ]
 
     @staticmethod
     def get_material_by_id(material_id):
@@ -163,16 +410,12 @@ class StudyService:
         # --------------------------------------
         try:
 
-            materials = StudyService.load_local()
-
-            for material in materials:
+            material = local_index.get(
+                material_id
+            )
 
-                if (
-                    material.get("_id") == material_id
-                    or material.get("id") == material_id
-                    or material.get("material_id") == material_id
-                ):
-                    return material
+            if material:
+                return material
 
         except Exception as e:
 
@@ -182,53 +425,255 @@ class StudyService:
 
         return None
 
+    # =====================================================
+    # SEARCH
+    # =====================================================
+
     @staticmethod
-    def search_materials(query):
+    def ensure_indexes(force=False):
+        """
+        Create any missing STUDY_INDEX_SPECS indexes. Run at
+        startup (and by the SDA importer); a single version
+        check when they already exist.
+        """
+
+        return bootstrap_schema(
+            force=force,
+            specs=STUDY_INDEX_SPECS,
+            meta_id=STUDY_SCHEMA_META_ID,
+        )
 
-        db = get_db()
+    @staticmethod
+    def search_terms(query):
+        """
+        Lower-cased word terms of a user query. The terms are
+        used as plain text, never as a regex.
+        """
 
-        try:
+        terms = []
 
-            results = list(
+        for term in re.findall(
+            r"\w+",
+            str(query or "").lower()
+        ):
 
-                db["study_materials"].find({
+            if len(term) > 1 and term not in terms:
+                terms.append(term)
 
-                    "$or": [
+        return terms[:SEARCH_MAX_TERMS]
 
-                        {
-                            "title": {
-                                "$regex": query,
-                                "$options": "i"
+    @staticmethod
+    def _snippet_stage(terms):
+        """
+        $addFields computing a snippet of `content` around the
+        first matched term, so the full text never leaves Mongo.
+        """
+
+        text = {
+            "$ifNull": [
+                "$content",
+                ""
+            ]
+        }
+
+        lowered = {
+            "$toLower": text
+        }
+
+        not_found = {
+            "$strLenCP": text
+        }
+
+        position = {
+            "$min": [
+                {
+                    "$let": {
+                        "vars": {
+                            "at": {
+                                "$indexOfCP": [
+                                    lowered,
+                                    term
+                                ]
                             }
                         },
-
-                        {
-                            "content": {
-                                "$regex": query,
-                                "$options": "i"
-                            }
+                        "in": {
+                            "$cond": [
+                                {
+                                    "$gte": [
+                                        "$$at",
+                                        0
+                                    ]
+                                },
+                                "$$at",
+                                not_found
+                            ]
+                        }
+                    }
+                }
+                for term in terms
+            ]
+        }
+
+        return {
+            "$addFields": {
+                "snippet": {
+                    "$let": {
+                        "vars": {
+                            "at": position,
+                            "length": not_found
                         },
+                        "in": {
+                            "$substrCP": [
+                                text,
+                                {
+                                    "$cond": [
+                                        {
+                                            "$gte": [
+                                                "$$at",
+                                                "$$length"
+                                            ]
+                                        },
+                                        0,
+                                        {
+                                            "$max": [
+                                                {
+                                                    "$subtract": [
+                                                        "$$at",
+                                                        SNIPPET_LEAD
+                                                    ]
+                                                },
+                                                0
+                                            ]
+                                        }
+                                    ]
+                                },
+                                SNIPPET_LENGTH
+                            ]
+                        }
+                    }
+                }
+            }
+        }
+
+    @staticmethod
+    def highlights(text, terms):
+        """
+        [start, end] offsets of the query terms in `text`,
+        for the client to mark up.
+        """
+
+        if not text or not terms:
+            return []
+
+        pattern = re.compile(
+            "|".join(
+                re.escape(term)
+                for term in sorted(
+                    terms,
+                    key=len,
+                    reverse=True
+                )
+            ),
+            re.IGNORECASE
+        )
+
+        return [
+            [match.start(), match.end()]
+            for match in pattern.finditer(text)
+        ]
+
+    @staticmethod
+    def search_materials(
+        query,
+        category=None,
+        subcategory=None,
+        cursor=None,
+        limit=SEARCH_PAGE_SIZE
+    ):
+        """
+        Ranked full-text search.
 
-                        {
-                            "tags": {
-                                "$regex": query,
-                                "$options": "i"
+        Returns (results, next_cursor). Results are ordered by
+        text score (title and tags weigh more than content),
+        omit `content`, and carry a `snippet` with
+        `highlights` offsets.
+        """
+
+        terms = StudyService.search_terms(
+            query
+        )
+
+        if not terms:
+            return [], None
+
+        db = get_read_db()
+
+        match = {
+            "$text": {
+                "$search": " ".join(terms)
+            }
+        }
+
+        if category:
+            match["category"] = category
+
+        if subcategory:
+            match["subcategory"] = subcategory
+
+        try:
+
+            results, next_cursor = paginate_pipeline(
+                db["study_materials"],
+                [
+                    {
+                        "$match": match
+                    },
+                    {
+                        "$addFields": {
+                            "score": {
+                                "$meta": "textScore"
                             }
                         }
+                    },
+                ],
+                "score",
+                cursor=cursor,
+                limit=limit,
+                after=[
+                    StudyService._snippet_stage(
+                        terms
+                    ),
+                    {
+                        "$project": SUMMARY_PROJECTION
+                    },
+                ],
+            )
 
-                    ]
+        # A missing text index is an OperationFailure and is
+        # raised, not hidden behind an empty result.
+        except ConnectionFailure as e:
 
-                })
+            print(f"Search error: {e}")
 
+            raise APIError(
+                "Search is temporarily unavailable.",
+                503,
+                "search_unavailable",
             )
 
-            for material in results:
-                material["_id"] = str(material["_id"])
+        for material in results:
 
-            return results
+            material["_id"] = str(material["_id"])
 
-        except Exception as e:
-
-            print(f"Search error: {e}")
+            material["highlights"] = {
+                "title": StudyService.highlights(
+                    material.get("title"),
+                    terms
+                ),
+                "snippet": StudyService.highlights(
+                    material.get("snippet"),
+                    terms
+                ),
+            }
 
-            return []
+        return results, next_cursor
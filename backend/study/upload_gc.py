@@ -0,0 +1,109 @@
+# backend/study/upload_gc.py
+
+import os
+
+from backend.db import get_db
+from backend.study.extraction_jobs import (
+    CACHE_DIR,
+    ExtractionJobs,
+)
+from backend.study.upload_service import UploadService
+
+
+def _stem(path):
+
+    return os.path.basename(
+        str(path)
+    ).split(".")[0]
+
+
+def referenced_hashes():
+    """
+    Blob names referenced by study materials: their
+    file_hash, or the stored file name of older materials
+    that only carry a path.
+    """
+
+    hashes = set()
+
+    materials = get_db()["study_materials"].find(
+
+        {
+            "$or": [
+                {"file_hash": {"$nin": [None, ""]}},
+                {"metadata.file_hash": {"$nin": [None, ""]}},
+                {"file_path": {"$nin": [None, ""]}},
+                {"file_backup": {"$nin": [None, ""]}},
+            ]
+        },
+
+        {
+            "file_hash": 1,
+            "metadata.file_hash": 1,
+            "file_path": 1,
+            "file_backup": 1,
+        }
+    )
+
+    for material in materials:
+
+        for value in (
+            material.get("file_hash"),
+            (material.get("metadata") or {}).get("file_hash"),
+        ):
+
+            if value:
+                hashes.add(str(value))
+
+        for value in (
+            material.get("file_path"),
+            material.get("file_backup"),
+        ):
+
+            if value:
+                hashes.add(_stem(value))
+
+    return hashes
+
+
+def collect_upload_garbage():
+    """
+    Remove uploaded blobs (and their extraction cache) that
+    no study material references and no extraction job still
+    needs (unfinished, or finished within
+    EXTRACTION_RETENTION_DAYS). Intended for the nightly
+    maintenance run.
+
+    The references are read before anything is deleted; if
+    Mongo cannot be read the pass is skipped.
+    """
+
+    try:
+
+        referenced = referenced_hashes()
+
+    except Exception as e:
+
+        print(f"Upload GC skipped: {e}")
+
+        return {
+            "removed": 0,
+            "freed_bytes": 0,
+            "skipped": True,
+        }
+
+    return UploadService.collect_garbage(
+
+        referenced,
+
+        active_hashes=ExtractionJobs().retained_hashes(),
+
+        cache_dir=CACHE_DIR
+    )
+
+
+if __name__ == "__main__":
+
+    print(
+        collect_upload_garbage()
+    )
@@ -1,4 +1,8 @@
+import hashlib
 import os
+import re
+import shutil
+import time
 
 from uuid import uuid4
 from werkzeug.utils import secure_filename
@@ -17,21 +21,95 @@ UPLOAD_FOLDER = os.path.join(
     "uploads"
 )
 
+MAX_UPLOAD_BYTES = int(
+
+    os.getenv(
+
+        "STUDY_UPLOAD_MAX_BYTES",
+
+        str(50 * 1024 * 1024)
+    )
+)
+
+CHUNK_SIZE = 1024 * 1024
+
+# Blobs younger than this are never collected: their
+# material may not have been created yet.
+GC_GRACE_SECONDS = 24 * 60 * 60
+
+SHA256_PATTERN = re.compile(
+    r"^[0-9a-f]{64}$"
+)
+
+SHARD_PATTERN = re.compile(
+    r"^[0-9a-f]{2}$"
+)
+
+
+class UploadTooLarge(ValueError):
+    pass
+
 
 class UploadService:
+    """
+    Content-addressed upload storage.
+
+    Files are stored once under their SHA-256:
+
+        user_data/uploads/<h[:2]>/<sha256>.<ext>
+
+    The hash is computed while the upload is streamed to
+    disk, so identical files uploaded twice share one blob
+    (and one set of extraction results, which are keyed by
+    the same hash).
+    """
 
 
     @staticmethod
-    def save(file):
+    def blob_path(
 
-        if not os.path.exists(
+        file_hash,
 
-            UPLOAD_FOLDER
-        ):
+        extension
+    ):
 
-            os.makedirs(
-                UPLOAD_FOLDER
-            )
+        return os.path.join(
+
+            UPLOAD_FOLDER,
+
+            file_hash[:2],
+
+            f"{file_hash}.{extension}"
+        )
+
+
+    @staticmethod
+    def store(
+
+        file,
+
+        max_bytes=MAX_UPLOAD_BYTES
+    ):
+        """
+        Stream an upload to disk, hashing as it goes.
+
+        Returns {path, sha256, size, extension, deduplicated}.
+        Raises UploadTooLarge past `max_bytes`.
+        """
+
+        temporary_dir = os.path.join(
+
+            UPLOAD_FOLDER,
+
+            "tmp"
+        )
+
+        os.makedirs(
+
+            temporary_dir,
+
+            exist_ok=True
+        )
 
         filename = secure_filename(
             file.filename
@@ -40,21 +118,291 @@ class UploadService:
         extension = (
             filename.split(
                 "."
-            )[-1]
+            )[-1].lower()
         )
 
-        unique_name = (
+        temporary = os.path.join(
+
+            temporary_dir,
 
-            f"{uuid4()}.{extension}"
+            f"{uuid4()}.part"
         )
 
-        path = os.path.join(
+        digest = hashlib.sha256()
+
+        size = 0
+
+        try:
+
+            with open(temporary, "wb") as out:
+
+                while True:
+
+                    chunk = file.stream.read(
+                        CHUNK_SIZE
+                    )
+
+                    if not chunk:
+                        break
+
+                    size += len(chunk)
+
+                    if size > max_bytes:
+
+                        raise UploadTooLarge(
+
+                            f"File exceeds the "
+                            f"{max_bytes / (1024 * 1024):g} MB "
+                            f"upload limit."
+                        )
+
+                    digest.update(chunk)
+
+                    out.write(chunk)
+
+            file_hash = digest.hexdigest()
+
+            path = UploadService.blob_path(
+
+                file_hash,
+
+                extension
+            )
+
+            deduplicated = os.path.exists(
+                path
+            )
+
+            if deduplicated:
+
+                os.remove(temporary)
+
+                # Keep reused blobs out of the next GC pass.
+                os.utime(path)
+
+            else:
+
+                os.makedirs(
+
+                    os.path.dirname(path),
+
+                    exist_ok=True
+                )
+
+                os.replace(
+
+                    temporary,
+
+                    path
+                )
+
+        except BaseException:
+
+            if os.path.exists(temporary):
+                os.remove(temporary)
+
+            raise
+
+        return {
+
+            "path": path,
+
+            "sha256": file_hash,
+
+            "size": size,
+
+            "extension": extension,
+
+            "deduplicated": deduplicated
+        }
+
+
+    @staticmethod
+    def save(file):
+
+        return UploadService.store(
+            file
+        )["path"]
+
+
+    @staticmethod
+    def collect_garbage(
+
+        referenced_hashes,
+
+        active_hashes=(),
+
+        cache_dir=None,
+
+        grace_seconds=GC_GRACE_SECONDS
+    ):
+        """
+        Delete blobs whose hash is neither referenced by a
+        material nor held by an extraction job,
+        along with their cached extraction results. Recent
+        blobs are kept for `grace_seconds`.
+
+        Only content-addressed blobs (<h[:2]>/<sha256>.<ext>)
+        are considered; legacy uploads elsewhere in the folder
+        are left alone. Abandoned tmp/*.part files past the
+        grace period are cleared separately.
+        """
+
+        keep = set(referenced_hashes) | set(active_hashes)
+
+        cutoff = time.time() - grace_seconds
+
+        removed = 0
+
+        freed = 0
+
+        partials = 0
+
+        if not os.path.exists(UPLOAD_FOLDER):
+
+            return {
+
+                "removed": 0,
+
+                "freed_bytes": 0,
+
+                "partials_removed": 0
+            }
+
+        for shard in os.listdir(UPLOAD_FOLDER):
+
+            shard_dir = os.path.join(
+
+                UPLOAD_FOLDER,
+
+                shard
+            )
+
+            if (
+                not SHARD_PATTERN.match(shard)
+                or not os.path.isdir(shard_dir)
+            ):
+                continue
+
+            for name in os.listdir(shard_dir):
+
+                file_hash = name.split(".")[0]
+
+                if (
+                    not SHA256_PATTERN.match(file_hash)
+                    or not file_hash.startswith(shard)
+                    or file_hash in keep
+                ):
+                    continue
+
+                path = os.path.join(
+
+                    shard_dir,
+
+                    name
+                )
+
+                size = UploadService._remove_stale(
+
+                    path,
+
+                    cutoff
+                )
+
+                if size is None:
+                    continue
+
+                removed += 1
+
+                freed += size
+
+                if cache_dir:
+
+                    shutil.rmtree(
+
+                        os.path.join(
+
+                            cache_dir,
+
+                            file_hash
+                        ),
+
+                        ignore_errors=True
+                    )
+
+        temporary_dir = os.path.join(
 
             UPLOAD_FOLDER,
 
-            unique_name
+            "tmp"
         )
 
-        file.save(path)
+        if os.path.isdir(temporary_dir):
+
+            for name in os.listdir(temporary_dir):
+
+                if not name.endswith(".part"):
+                    continue
+
+                size = UploadService._remove_stale(
+
+                    os.path.join(
+
+                        temporary_dir,
+
+                        name
+                    ),
+
+                    cutoff
+                )
+
+                if size is None:
+                    continue
+
+                partials += 1
+
+                freed += size
+
+        return {
+
+            "removed": removed,
+
+            "freed_bytes": freed,
+
+            "partials_removed": partials
+        }
+
+
+    @staticmethod
+    def _remove_stale(
+
+        path,
+
+        cutoff
+    ):
+        """
+        Remove a file last modified before `cutoff`.
+        Returns its size, or None if it was kept.
+        """
+
+        try:
+
+            stat = os.stat(path)
+
+        except OSError:
+            return None
+
+        if stat.st_mtime > cutoff:
+            return None
+
+        try:
+
+            os.remove(path)
+
+        except OSError as e:
+
+            print(f"Upload GC error: {e}")
+
+            return None
 
-        return path
\ No newline at end of file
+        return stat.st_size
@@ -0,0 +1,26 @@
+from flask import Flask
+from services.client_keys import install_proxy_fix, usage_key
+
+def make_app(hops):
+    app = Flask(__name__)
+    install_proxy_fix(app, hops=hops)
+    app.add_url_rule("/key", "key", lambda: usage_key(None))
+    return app
+
+def key_for(app, client):
+    return app.test_client().get("/key", headers={"X-Forwarded-For": client}, environ_base={"REMOTE_ADDR": "10.0.0.1"}).get_data(as_text=True)
+
+def test_guests_behind_proxy_get_separate_keys():
+    app = make_app(1)
+    assert key_for(app, "203.0.113.5") == "guest@203.0.113.5"
+    assert key_for(app, "198.51.100.7") == "guest@198.51.100.7"
+
+def test_forwarded_for_ignored_without_trusted_hops():
+    app = make_app(0)
+    assert key_for(app, "203.0.113.5") == "guest@10.0.0.1"
+
+def test_signed_in_users_keyed_by_id():
+    app = make_app(1)
+    with app.test_request_context("/"):
+        assert usage_key({"id": 42}) == "42"
+        assert usage_key({"id": "guest"}) == "guest@unknown"
@@ -0,0 +1,22 @@
+from services.request_profiler import Series, percentile
+
+def test_percentile_is_nearest_rank():
+    assert percentile(range(1, 11), 50) == 5
+    assert percentile([2, 1], 50) == 1
+    assert percentile(range(1, 101), 95) == 95
+    assert percentile(range(1, 11), 99) == 10
+    assert percentile([7], 0) == 7
+
+def test_percentile_of_nothing():
+    assert percentile([], 50) is None
+
+def test_series_summary():
+    series = Series()
+    for value in range(1, 11):
+        series.add(value)
+    summary = series.summary()
+    assert summary["count"] == 10
+    assert summary["mean"] == 5.5
+    assert summary["max"] == 10
+    assert (summary["p50"], summary["p95"], summary["p99"]) == (5, 10, 10)
+    assert Series().summary()["p50"] is None
@@ -1,5 +1,5 @@
 import pytest
-from jumuiya.biashara.schemas import business_payload, product_payload, customer_payload, order_payload, expense_payload
+from jumuiya.biashara.schemas import business_payload, product_payload, customer_payload, order_payload, expense_payload, bulk_inventory_payload
 
 def test_business_requires_name():
     with pytest.raises(ValueError): business_payload({})
@@ -15,3 +15,6 @@ def test_order_requires_items():
 
 def test_expense_requires_title():
     with pytest.raises(ValueError): expense_payload({"amount":100})
+
+def test_bulk_inventory_requires_product_id():
+    with pytest.raises(ValueError): bulk_inventory_payload({"adjustments":[{"movement_type":"add","quantity":1}]})
@@ -8,8 +8,8 @@ BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 DOMAINS_DIR = os.path.join(BASE_DIR, "domains")
 
 SERVICE_TEMPLATE = """\
-from services.ai_router import ask_ai
-from services.domain_registry import register_domain
+from backend.services.ai_router import ask_ai
+from backend.services.domain_registry import register_domain
 
 DOMAIN_NAME = "{domain_name}"
 DOMAIN_META = {{
@@ -21,13 +21,13 @@ DOMAIN_META = {{
     "created_at": "{created_at}"
 }}
 
-def handler(query, user_context=None):
+def build_prompt(query):
     \"\"\"
     Auto-generated service for {display_name}.
     Governance level: {governance_level}
     \"\"\"
 
-    prompt = f\"\"\"
+    return f\"\"\"
     You are a {persona}.
     
     Domain: {display_name}
@@ -43,13 +43,14 @@ def handler(query, user_context=None):
     {{query}}
     \"\"\"
 
+def handler(query, user_context=None):
     return ask_ai(
-        prompt=prompt,
+        prompt=build_prompt(query),
         domain=DOMAIN_NAME,
         context=user_context
     )
 
-register_domain(DOMAIN_NAME, handler)
+register_domain(DOMAIN_NAME, handler, prompt=build_prompt)
 """
 
 INIT_TEMPLATE = """\
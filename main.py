@@ -6,14 +6,13 @@ import logging
 import os
 import threading
 import time
+from contextlib import contextmanager
 from datetime import datetime
 
 from dotenv import load_dotenv
 from flask import Flask, jsonify
 from flask_cors import CORS
 
-from backend.study.import_sda_q3_2026 import import_q3
-
 
 # =========================================================
 # ENVIRONMENT
@@ -34,6 +33,51 @@ logging.basicConfig(
 logger = logging.getLogger("main")
 
 
+# =========================================================
+# STARTUP TIMING
+# =========================================================
+
+STARTUP_STARTED = time.perf_counter()
+
+STARTUP_PHASES = []
+
+
+@contextmanager
+def startup_phase(
+    name: str,
+):
+    """
+    Time one phase of app startup and log it.
+    """
+
+    started = time.perf_counter()
+
+    try:
+
+        yield
+
+    finally:
+
+        elapsed_ms = (
+            time.perf_counter()
+            - started
+        ) * 1000
+
+        STARTUP_PHASES.append({
+            "phase": name,
+            "ms": round(
+                elapsed_ms,
+                1,
+            ),
+        })
+
+        logger.info(
+            "⏱ startup phase %s took %.1f ms",
+            name,
+            elapsed_ms,
+        )
+
+
 if os.getenv("FLASK_ENV") != "production":
     logger.info(
         "MONGO_URI loaded: %s",
@@ -48,6 +92,17 @@ if os.getenv("FLASK_ENV") != "production":
 app = Flask(__name__)
 
 
+# =========================================================
+# PROXY (client address for guest metering)
+# =========================================================
+
+from backend.services.client_keys import install_proxy_fix
+
+install_proxy_fix(
+    app
+)
+
+
 # =========================================================
 # CORS
 # =========================================================
@@ -83,13 +138,39 @@ CORS(
 )
 
 
+# =========================================================
+# REQUEST PROFILING (opt-in: REQUEST_PROFILING=true)
+# =========================================================
+
+try:
+
+    from backend.services.request_profiler import (
+        install_request_profiler
+    )
+
+    install_request_profiler(
+        app
+    )
+
+except Exception as e:
+
+    logger.warning(
+        "Request profiler not installed: %s",
+        e,
+    )
+
+
 # =========================================================
 # DATABASE INIT
 # =========================================================
 
 try:
 
-    from backend.db import db
+    with startup_phase(
+        "database"
+    ):
+
+        from backend.db import db
 
     logger.info(
         "MongoDB initialized successfully"
@@ -119,19 +200,23 @@ def register_bp(
 
     try:
 
-        module = __import__(
-            import_path,
-            fromlist=[bp_name],
-        )
+        with startup_phase(
+            bp_name
+        ):
 
-        bp = getattr(
-            module,
-            bp_name,
-        )
+            module = __import__(
+                import_path,
+                fromlist=[bp_name],
+            )
 
-        app.register_blueprint(
-            bp
-        )
+            bp = getattr(
+                module,
+                bp_name,
+            )
+
+            app.register_blueprint(
+                bp
+            )
 
         logger.info(
             "%s registered (%s)",
@@ -184,13 +269,17 @@ register_bp(
 
 try:
 
-    from backend.jumuiya.integration.register import (
-        register_jumuiya
-    )
+    with startup_phase(
+        "jumuiya"
+    ):
 
-    register_jumuiya(
-        app
-    )
+        from backend.jumuiya.integration.register import (
+            register_jumuiya
+        )
+
+        register_jumuiya(
+            app
+        )
 
     logger.info(
         "✅ Jumuiya platform registered"
@@ -210,11 +299,15 @@ except Exception as e:
 
 try:
 
-    from backend.routes.study_routes import study_bp
+    with startup_phase(
+        "study_bp"
+    ):
 
-    app.register_blueprint(
-        study_bp
-    )
+        from backend.routes.study_routes import study_bp
+
+        app.register_blueprint(
+            study_bp
+        )
 
     logger.info(
         "study_bp registered"
@@ -227,6 +320,35 @@ except Exception as e:
         e,
     )
 
+# Browse, search and SDA calendar indexes are built here, not
+# on the request path; a failure is logged, and the affected
+# queries then raise rather than return empty results.
+if db is not None:
+
+    try:
+
+        with startup_phase(
+            "study_indexes"
+        ):
+
+            from backend.study.study_service import StudyService
+
+            result = StudyService.ensure_indexes()
+
+        logger.info(
+            "Study indexes %s | skipped=%s | created=%s",
+            result["version"],
+            result["skipped"],
+            result["created"],
+        )
+
+    except Exception as e:
+
+        logger.exception(
+            "Study index initialization failed: %s",
+            e,
+        )
+
 
 # =========================================================
 # APPLICATION ROUTES
@@ -270,12 +392,16 @@ register_bp(
 
 try:
 
-    from backend.routes.admin_routes import admin_bp
+    with startup_phase(
+        "admin_bp"
+    ):
 
-    app.register_blueprint(
-        admin_bp,
-        url_prefix="/api",
-    )
+        from backend.routes.admin_routes import admin_bp
+
+        app.register_blueprint(
+            admin_bp,
+            url_prefix="/api",
+        )
 
     logger.info(
         "admin_bp registered with /api prefix"
@@ -295,12 +421,16 @@ except Exception as e:
 
 try:
 
-    from backend.routes.support_routes import support_bp
+    with startup_phase(
+        "support_bp"
+    ):
 
-    app.register_blueprint(
-        support_bp,
-        url_prefix="/api/support",
-    )
+        from backend.routes.support_routes import support_bp
+
+        app.register_blueprint(
+            support_bp,
+            url_prefix="/api/support",
+        )
 
     logger.info(
         "support_bp registered with /api/support prefix"
@@ -324,6 +454,32 @@ register_bp(
 )
 
 
+# =========================================================
+# STARTUP SUMMARY
+# =========================================================
+
+STARTUP_TOTAL_MS = round(
+    (
+        time.perf_counter()
+        - STARTUP_STARTED
+    ) * 1000,
+    1,
+)
+
+logger.info(
+    "🚀 App ready in %.1f ms | slowest phases: %s",
+    STARTUP_TOTAL_MS,
+    ", ".join(
+        f"{phase['phase']}={phase['ms']}ms"
+        for phase in sorted(
+            STARTUP_PHASES,
+            key=lambda phase: phase["ms"],
+            reverse=True,
+        )[:5]
+    ),
+)
+
+
 # =========================================================
 # ROOT HEALTH
 # =========================================================
@@ -340,6 +496,27 @@ def index():
     }), 200
 
 
+def mongo_pool_stats():
+
+    if db is None:
+        return None
+
+    try:
+
+        from backend.db import pool_stats
+
+        return pool_stats()
+
+    except Exception as e:
+
+        logger.warning(
+            "Mongo pool stats unavailable: %s",
+            e,
+        )
+
+        return None
+
+
 @app.route(
     "/health",
     methods=["GET"],
@@ -353,6 +530,8 @@ def health():
             os.getenv("MONGO_URI")
         ),
         "jumuiya": True,
+        "startup_ms": STARTUP_TOTAL_MS,
+        "mongo_pool": mongo_pool_stats(),
     }), 200
 
 
@@ -390,11 +569,18 @@ def maybe_import_sda_q3_2026():
 
     try:
 
+        # Imported here so requests/bs4/PyPDF2 are only
+        # loaded when the importer is enabled.
+        from backend.study.import_sda_q3_2026 import (
+            import_q3
+        )
+
         result = import_q3()
 
         logger.info(
             "✅ SDA Q3 2026 import finished | "
-            "requested=%s | successful=%s | failed=%s",
+            "requested=%s | successful=%s | "
+            "skipped=%s | failed=%s",
             result.get(
                 "lessons_requested",
                 0,
@@ -403,6 +589,10 @@ def maybe_import_sda_q3_2026():
                 "successful",
                 0,
             ),
+            result.get(
+                "skipped",
+                0,
+            ),
             result.get(
                 "failed",
                 0,
@@ -472,7 +662,7 @@ def daily_runner_loop():
             try:
 
                 from backend.daily_runner import (
-                    run_pipeline
+                    run_pipeline,
                 )
 
                 logger.info(
@@ -509,6 +699,72 @@ def daily_runner_loop():
         )
 
 
+def reconciliation_runner_loop():
+    """
+    Jumuiya rollup rebuilds and upload GC, at
+    daily_runner.RUN_HOUR rather than at startup, and outside
+    the working-directory change of daily_runner_loop.
+    """
+
+    try:
+
+        from backend.daily_runner import (
+            reconciliation_loop,
+        )
+
+    except Exception as e:
+
+        logger.exception(
+            "Reconciliation scheduler not started: %s",
+            e,
+        )
+
+        return
+
+    reconciliation_loop()
+
+
+# =========================================================
+# LAZY RESOURCE WARM-UP
+# =========================================================
+
+def warm_lazy_resources():
+    """
+    Load datasets that are otherwise parsed on first use,
+    after the app is already serving requests.
+    """
+
+    with startup_phase(
+        "warmup.symbols_data"
+    ):
+
+        from backend.bible_decoder import (
+            get_symbols_data
+        )
+
+        get_symbols_data()
+
+    with startup_phase(
+        "warmup.knowledge_graph"
+    ):
+
+        from backend.knowledge_graph import (
+            get_knowledge_graph
+        )
+
+        get_knowledge_graph()
+
+    with startup_phase(
+        "warmup.domains"
+    ):
+
+        from backend.services.domain_registry import (
+            discover
+        )
+
+        discover()
+
+
 # =========================================================
 # BACKGROUND JOB CONTROL
 # =========================================================
@@ -552,6 +808,40 @@ def start_background_jobs():
 
     start_sda_importer()
 
+    # -----------------------------------------------------
+    # WARM-UP (opt-in: STARTUP_WARMUP=true)
+    # -----------------------------------------------------
+
+    if os.getenv(
+        "STARTUP_WARMUP",
+        "false",
+    ).strip().lower() == "true":
+
+        threading.Thread(
+            target=warm_lazy_resources,
+            name="Startup-Warmup",
+            daemon=True,
+        ).start()
+
+    # -----------------------------------------------------
+    # MAIL OUTBOX
+    # -----------------------------------------------------
+
+    try:
+
+        from backend.mail_outbox import (
+            start_mail_worker
+        )
+
+        start_mail_worker()
+
+    except Exception as e:
+
+        logger.warning(
+            "Mail outbox worker not started: %s",
+            e,
+        )
+
     # -----------------------------------------------------
     # DAILY RUNNER
     # -----------------------------------------------------
@@ -564,6 +854,12 @@ def start_background_jobs():
 
     daily_thread.start()
 
+    threading.Thread(
+        target=reconciliation_runner_loop,
+        name="Reconciliation",
+        daemon=True,
+    ).start()
+
     logger.info(
         "🧵 Daily runner thread started."
     )